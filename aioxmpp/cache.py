@@ -31,6 +31,7 @@
 
 """
 
+import collections
 import collections.abc
 
 
@@ -38,6 +39,9 @@ class LRUDict(collections.abc.MutableMapping):
     """
     Size-restricted dictionary with Least Recently Used expiry policy.
 
+    :param sizeof: Function which returns the size of a value.
+    :type sizeof: :class:`callable` or :data:`None`
+
     .. versionadded:: 0.9
 
     The :class:`LRUDict` supports normal dictionary-style access and implements
@@ -45,32 +49,68 @@ class LRUDict(collections.abc.MutableMapping):
 
     When the :attr:`maxsize` is exceeded, as many entries as needed to get
     below the :attr:`maxsize` are removed from the dict. Least recently used
-    entries are purged first. Setting an entry does *not* count as use!
+    entries are purged first. Setting an entry, including overwriting an
+    existing one, counts as use.
+
+    If `sizeof` is :data:`None` (the default), each entry has a size of one,
+    so that :attr:`maxsize` limits the number of entries. Otherwise,
+    `sizeof` is called with each value when it is set, and :attr:`maxsize`
+    limits the sum of the sizes of all entries (see :attr:`size`). A value
+    whose size alone exceeds the :attr:`maxsize` is not stored; an existing
+    entry for its key is removed instead.
+
+    All operations except changing :attr:`maxsize` take constant time (not
+    counting `sizeof` and the purging of old entries).
 
     .. autoattribute:: maxsize
+
+    .. autoattribute:: size
+
+    The dictionary keeps statistics about its use, which are not reset by
+    :meth:`clear`:
+
+    .. autoattribute:: hits
+
+    .. autoattribute:: misses
+
+    .. autoattribute:: evictions
+
+    .. versionchanged:: 0.10
+
+       The implementation was changed to use constant time per operation and
+       the statistics attributes were added. Testing for membership with
+       ``in`` does not count as use anymore. Overwriting an existing entry now
+       reliably makes it the most recently used entry. The `sizeof` argument
+       and :attr:`size` were added.
     """
 
-    def __init__(self, **kwargs):
+    def __init__(self, *, sizeof=None, **kwargs):
         super().__init__(**kwargs)
-        self.__data = {}
-        self.__data_used = {}
+        self.__data = collections.OrderedDict()
+        self.__sizeof = sizeof
+        self.__sizes = {}
+        self.__size = 0
         self.__maxsize = 1
-        self.__ctr = 0
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
 
     def _purge_old(self, n):
-        keys_in_age_order = sorted(
-            self.__data_used.items(),
-            key=lambda x: x[1]
-        )
-        keys_to_delete = keys_in_age_order[:n]
-        for key, _ in keys_to_delete:
-            del self.__data[key]
-            del self.__data_used[key]
-        keys_to_keep = keys_in_age_order[n:]
-        # avoid the counter becoming large
-        self.__ctr = len(keys_to_keep)
-        for i, (key, _) in enumerate(keys_to_keep):
-            self.__data_used[key] = i
+        popitem = self.__data.popitem
+        for _ in range(n):
+            popitem(last=False)
+        self.__evictions += n
+
+    def _purge_to_maxsize(self):
+        maxsize = self.__maxsize
+        if maxsize is None:
+            return
+        popitem = self.__data.popitem
+        sizes = self.__sizes
+        while self.__size > maxsize:
+            key, _ = popitem(last=False)
+            self.__size -= sizes.pop(key)
+            self.__evictions += 1
 
     @property
     def maxsize(self):
@@ -92,34 +132,99 @@ class LRUDict(collections.abc.MutableMapping):
         if value is not None and value <= 0:
             raise ValueError("maxsize must be positive integer or None")
         self.__maxsize = value
-        if self.__maxsize is not None and len(self.__data) > self.__maxsize:
+        if self.__sizeof is not None:
+            self._purge_to_maxsize()
+        elif (self.__maxsize is not None and
+                len(self.__data) > self.__maxsize):
             self._purge_old(len(self.__data) - self.__maxsize)
 
+    @property
+    def size(self):
+        """
+        Sum of the sizes of all entries. Without `sizeof`, this is the number
+        of entries.
+
+        .. versionadded:: 0.10
+        """
+        if self.__sizeof is None:
+            return len(self.__data)
+        return self.__size
+
+    @property
+    def hits(self):
+        """
+        Number of successful lookups.
+
+        .. versionadded:: 0.10
+        """
+        return self.__hits
+
+    @property
+    def misses(self):
+        """
+        Number of lookups which raised :class:`KeyError`.
+
+        .. versionadded:: 0.10
+        """
+        return self.__misses
+
+    @property
+    def evictions(self):
+        """
+        Number of entries which have been purged because the :attr:`maxsize`
+        was exceeded. Entries removed explicitly are not counted.
+
+        .. versionadded:: 0.10
+        """
+        return self.__evictions
+
     def __len__(self):
         return len(self.__data)
 
     def __iter__(self):
         return iter(self.__data)
 
+    def __contains__(self, key):
+        return key in self.__data
+
     def __setitem__(self, key, value):
-        if self.__maxsize is not None and len(self.__data) >= self.__maxsize:
-            self._purge_old(len(self.__data) - (self.__maxsize - 1))
-        self.__data[key] = value
-        self.__data_used[key] = self.__ctr
+        if self.__sizeof is not None:
+            self._set_sized(key, value)
+            return
+        data = self.__data
+        if key in data:
+            data.move_to_end(key)
+        elif self.__maxsize is not None and len(data) >= self.__maxsize:
+            self._purge_old(len(data) - (self.__maxsize - 1))
+        data[key] = value
 
     def __getitem__(self, key):
-        result = self.__data[key]
-        counter = self.__ctr
-        counter += 1
-        self.__ctr = counter
-        self.__data_used[key] = counter
+        try:
+            result = self.__data[key]
+        except KeyError:
+            self.__misses += 1
+            raise
+        self.__data.move_to_end(key)
+        self.__hits += 1
         return result
 
+    def _set_sized(self, key, value):
+        size = self.__sizeof(value)
+        if key in self.__data:
+            del self[key]
+        if self.__maxsize is not None and size > self.__maxsize:
+            return
+        self.__data[key] = value
+        self.__sizes[key] = size
+        self.__size += size
+        self._purge_to_maxsize()
+
     def __delitem__(self, key):
         del self.__data[key]
-        del self.__data_used[key]
+        if self.__sizeof is not None:
+            self.__size -= self.__sizes.pop(key)
 
     def clear(self):
         self.__data.clear()
-        self.__data_used.clear()
-        self.__ctr = 0
+        self.__sizes.clear()
+        self.__size = 0
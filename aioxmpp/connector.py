@@ -53,6 +53,7 @@ import asyncio
 import aioxmpp.errors as errors
 import aioxmpp.nonza as nonza
 import aioxmpp.protocol as protocol
+import aioxmpp.security_layer as security_layer
 import aioxmpp.ssl_transport as ssl_transport
 
 from aioxmpp.utils import namespaces
@@ -115,6 +116,16 @@ class BaseConnector(metaclass=abc.ABCMeta):
         """
 
 
+def _setup_ssl_context(metadata, verifier, transport):
+    ssl_context_factory = metadata.ssl_context_factory
+    if isinstance(ssl_context_factory, security_layer.TLSContextCache):
+        return ssl_context_factory.get_context(verifier, transport)
+
+    ssl_context = ssl_context_factory()
+    verifier.setup_context(ssl_context, transport)
+    return ssl_context
+
+
 class STARTTLSConnector(BaseConnector):
     """
     Establish an XML stream using STARTTLS.
@@ -178,74 +189,81 @@ class STARTTLSConnector(BaseConnector):
             stream.abort()
             raise
 
-        features = yield from features_future
-
         try:
-            features[nonza.StartTLSFeature]
-        except KeyError:
-            if metadata.tls_required:
-                message = (
-                    "STARTTLS not supported by server, but required by client"
-                )
+            features = yield from features_future
+
+            try:
+                features[nonza.StartTLSFeature]
+            except KeyError:
+                if metadata.tls_required:
+                    message = (
+                        "STARTTLS not supported by server, but required by "
+                        "client"
+                    )
+
+                    protocol.send_stream_error_and_close(
+                        stream,
+                        condition=(namespaces.streams, "policy-violation"),
+                        text=message,
+                    )
+
+                    raise errors.TLSUnavailable(message)
+                else:
+                    return transport, stream, (yield from features_future)
+
+            response = yield from protocol.send_and_wait_for(
+                stream,
+                [
+                    nonza.StartTLS(),
+                ],
+                [
+                    nonza.StartTLSFailure,
+                    nonza.StartTLSProceed,
+                ]
+            )
 
-                protocol.send_stream_error_and_close(
-                    stream,
-                    condition=(namespaces.streams, "policy-violation"),
-                    text=message,
-                )
+            if not isinstance(response, nonza.StartTLSProceed):
+                if metadata.tls_required:
+                    message = (
+                        "server failed to STARTTLS"
+                    )
+
+                    protocol.send_stream_error_and_close(
+                        stream,
+                        condition=(namespaces.streams, "policy-violation"),
+                        text=message,
+                    )
 
-                raise errors.TLSUnavailable(message)
-            else:
+                    raise errors.TLSUnavailable(message)
                 return transport, stream, (yield from features_future)
 
-        response = yield from protocol.send_and_wait_for(
-            stream,
-            [
-                nonza.StartTLS(),
-            ],
-            [
-                nonza.StartTLSFailure,
-                nonza.StartTLSProceed,
-            ]
-        )
+            verifier = metadata.certificate_verifier_factory()
+            yield from verifier.pre_handshake(
+                domain,
+                host,
+                port,
+                metadata,
+            )
 
-        if not isinstance(response, nonza.StartTLSProceed):
-            if metadata.tls_required:
-                message = (
-                    "server failed to STARTTLS"
-                )
+            ssl_context = _setup_ssl_context(metadata, verifier, transport)
 
-                protocol.send_stream_error_and_close(
+            yield from stream.starttls(
+                ssl_context=ssl_context,
+                post_handshake_callback=verifier.post_handshake,
+            )
+
+            features_future = \
+                yield from protocol.reset_stream_and_get_features(
                     stream,
-                    condition=(namespaces.streams, "policy-violation"),
-                    text=message,
+                    timeout=negotiation_timeout,
                 )
 
-                raise errors.TLSUnavailable(message)
-            return transport, stream, (yield from features_future)
-
-        verifier = metadata.certificate_verifier_factory()
-        yield from verifier.pre_handshake(
-            domain,
-            host,
-            port,
-            metadata,
-        )
-
-        ssl_context = metadata.ssl_context_factory()
-        verifier.setup_context(ssl_context, transport)
-
-        yield from stream.starttls(
-            ssl_context=ssl_context,
-            post_handshake_callback=verifier.post_handshake,
-        )
-
-        features_future = yield from protocol.reset_stream_and_get_features(
-            stream,
-            timeout=negotiation_timeout,
-        )
-
-        return transport, stream, features_future
+            return transport, stream, features_future
+        except asyncio.CancelledError:
+            # do not leak the connection if the attempt is cancelled, e.g.
+            # because another connection option won the race
+            stream.abort()
+            raise
 
 
 class XMPPOverTLSConnector(BaseConnector):
@@ -303,9 +321,7 @@ class XMPPOverTLSConnector(BaseConnector):
         )
 
         def context_factory(transport):
-            ssl_context = metadata.ssl_context_factory()
-            verifier.setup_context(ssl_context, transport)
-            return ssl_context
+            return _setup_ssl_context(metadata, verifier, transport)
 
         try:
             transport, _ = yield from ssl_transport.create_starttls_connection(
@@ -323,4 +339,8 @@ class XMPPOverTLSConnector(BaseConnector):
             stream.abort()
             raise
 
-        return transport, stream, (yield from features_future)
+        try:
+            return transport, stream, (yield from features_future)
+        except asyncio.CancelledError:
+            stream.abort()
+            raise
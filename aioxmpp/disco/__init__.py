@@ -67,6 +67,8 @@ The detailed documentation of the classes follows:
 
 .. currentmodule:: aioxmpp.disco
 
+.. autoclass:: SharedDiscoCache
+
 Entity information
 ------------------
 
@@ -116,4 +118,5 @@ Item queries
 
 from . import xso  # NOQA
 from .service import (DiscoClient, DiscoServer, Node, StaticNode,  # NOQA
-                      mount_as_node, register_feature, RegisteredFeature)
+                      mount_as_node, register_feature, RegisteredFeature,
+                      SharedDiscoCache)
@@ -479,6 +479,140 @@ class DiscoServer(service.Service, Node):
         del self._node_mounts[mountpoint]
 
 
+class SharedDiscoCache:
+    """
+    Cache for Service Discovery results which can be shared between multiple
+    :class:`DiscoClient` instances.
+
+    :param ttl: Initial value for :attr:`ttl`.
+    :type ttl: :class:`float`
+    :param maxsize: Initial value for :attr:`maxsize`.
+    :type maxsize: :class:`int`
+
+    By default, each :class:`DiscoClient` has its own cache. In a process
+    which runs many clients, this means that the same service (for example
+    the MUC or HTTP upload service of a domain) is queried once per client.
+    If the same :class:`SharedDiscoCache` is assigned to the
+    :attr:`DiscoClient.shared_cache` of the clients, queries are coalesced:
+    while a query for a (`jid`, `node`) pair is in flight, other clients wait
+    for its result instead of sending their own query, and a successful result
+    is re-used for :attr:`ttl` seconds.
+
+    Only queries to domain JIDs (i.e. those without localpart and resource)
+    are shared. The responses of other entities may depend on the entity
+    sending the query (for example, a user only discloses information to
+    their contacts) and are thus never shared.
+
+    Errors are not shared: if a query fails or is cancelled (for example
+    because the stream of the client which sent it was destroyed), the
+    clients which waited for it send their own query.
+
+    The result objects are shared between the clients and **must not** be
+    modified.
+
+    .. attribute:: ttl
+
+       Time in seconds for which a successful result is re-used.
+
+    .. autoattribute:: maxsize
+
+    .. automethod:: is_shareable
+
+    .. automethod:: get
+
+    .. automethod:: put
+
+    .. automethod:: clear
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, *, ttl=300, maxsize=1000):
+        super().__init__()
+        self.ttl = ttl
+        self._entries = aioxmpp.cache.LRUDict()
+        self._entries.maxsize = maxsize
+
+    @property
+    def maxsize(self):
+        """
+        Maximum number of entries (info and items queries combined) in the
+        cache.
+        """
+        return self._entries.maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        self._entries.maxsize = value
+
+    @staticmethod
+    def is_shareable(jid):
+        """
+        Return whether queries to `jid` are shared.
+        """
+        return jid.localpart is None and jid.resource is None
+
+    def _entry_done(self, key, fut):
+        try:
+            entry = self._entries[key]
+        except KeyError:
+            return
+        if entry[0] is not fut:
+            return
+        if fut.cancelled() or fut.exception() is not None:
+            del self._entries[key]
+            return
+        self._entries[key] = (
+            fut,
+            asyncio.get_event_loop().time() + self.ttl,
+        )
+
+    def get(self, kind, jid, node):
+        """
+        Return the future for a query.
+
+        :param kind: Either ``"info"`` or ``"items"``.
+        :param jid: The entity which was queried.
+        :param node: The node which was queried.
+        :raises KeyError: if there is no valid entry for the query.
+        :rtype: :class:`asyncio.Future`
+
+        The future may not be done yet.
+        """
+        key = kind, jid, node
+        fut, expires_at = self._entries[key]
+        if (expires_at is not None and
+                expires_at <= asyncio.get_event_loop().time()):
+            del self._entries[key]
+            raise KeyError(key)
+        return fut
+
+    def put(self, kind, jid, node, fut):
+        """
+        Store the future for a query.
+
+        :param kind: Either ``"info"`` or ``"items"``.
+        :param jid: The entity which is queried.
+        :param node: The node which is queried.
+        :param fut: The future which will receive the result.
+        :type fut: :class:`asyncio.Future`
+
+        The entry is removed if `fut` receives an exception or is cancelled.
+        Otherwise, it expires :attr:`ttl` seconds after `fut` is done.
+        """
+        key = kind, jid, node
+        self._entries[key] = fut, None
+        fut.add_done_callback(functools.partial(self._entry_done, key))
+
+    def clear(self):
+        """
+        Remove all entries.
+
+        Queries which are in flight are not cancelled.
+        """
+        self._entries.clear()
+
+
 class DiscoClient(service.Service):
     """
     Provide cache-backed Service Discovery (:xep:`30`) queries.
@@ -515,6 +649,12 @@ class DiscoClient(service.Service):
     .. autoattribute:: items_cache_size
        :annotation: = 100
 
+    To share results between multiple clients, a :class:`SharedDiscoCache`
+    can be used:
+
+    .. autoattribute:: shared_cache
+       :annotation: = None
+
     Usage example, assuming that you have a :class:`.node.Client` `client`::
 
       import aioxmpp.disco as disco
@@ -542,6 +682,7 @@ class DiscoClient(service.Service):
         self._info_pending.maxsize = 10000
         self._items_pending = aioxmpp.cache.LRUDict()
         self._items_pending.maxsize = 100
+        self._shared_cache = None
 
         self.client.on_stream_destroyed.connect(
             self._clear_cache
@@ -576,6 +717,51 @@ class DiscoClient(service.Service):
     def items_cache_size(self, value):
         self._items_pending.maxsize = value
 
+    @property
+    def shared_cache(self):
+        """
+        The :class:`SharedDiscoCache` used in addition to the own caches of
+        this client, or :data:`None`.
+
+        Queries which are not found in the own caches are looked up in the
+        shared cache (unless `require_fresh` is set), and queries sent by this
+        client are added to the shared cache (unless `no_cache` is set). See
+        :class:`SharedDiscoCache` for details.
+
+        .. versionadded:: 0.10
+        """
+        return self._shared_cache
+
+    @shared_cache.setter
+    def shared_cache(self, value):
+        self._shared_cache = value
+
+    def _is_shared(self, jid):
+        return (self._shared_cache is not None and
+                self._shared_cache.is_shareable(jid))
+
+    @asyncio.coroutine
+    def _query_shared(self, kind, jid, node, timeout):
+        # returns the successfully completed future of the shared query
+        request = self._shared_cache.get(kind, jid, node)
+        try:
+            if timeout is not None:
+                try:
+                    yield from asyncio.wait_for(
+                        asyncio.shield(request),
+                        timeout=timeout)
+                except asyncio.TimeoutError:
+                    raise TimeoutError()
+            else:
+                yield from asyncio.shield(request)
+        except Exception:
+            if not request.done():
+                # the timeout hit or we have been cancelled
+                raise
+            # the query of another client failed; the caller sends its own
+            raise KeyError(kind, jid, node)
+        return request
+
     def _clear_cache(self):
         for fut in self._info_pending.values():
             if not fut.done():
@@ -651,6 +837,9 @@ class DiscoClient(service.Service):
         The `timeout` can be used to restrict the time to wait for a
         response. If the timeout triggers, :class:`TimeoutError` is raised.
 
+        If a :attr:`shared_cache` is set, it is consulted after the own cache
+        of the client and before a new request is sent.
+
         If :meth:`~.StanzaStream.send` raises an
         exception, all queries which were running simultanously for the same
         target re-raise that exception. The result is not cached though. If a
@@ -660,6 +849,10 @@ class DiscoClient(service.Service):
         .. versionchanged:: 0.9
 
             The `no_cache` argument was added.
+
+        .. versionchanged:: 0.10
+
+            Support for :attr:`shared_cache` was added.
         """
         key = jid, node
 
@@ -674,6 +867,22 @@ class DiscoClient(service.Service):
                 except asyncio.CancelledError:
                     pass
 
+            if self._is_shared(jid):
+                try:
+                    request = yield from self._query_shared(
+                        "info", jid, node, timeout
+                    )
+                except KeyError:
+                    pass
+                else:
+                    # later queries are answered from the own cache, so that
+                    # on_info_result is only emitted once
+                    if not no_cache:
+                        self._info_pending[key] = request
+                    result = request.result()
+                    self.on_info_result(jid, node, result)
+                    return result
+
         request = asyncio.async(
             self.send_and_decode_info_query(jid, node)
         )
@@ -687,6 +896,8 @@ class DiscoClient(service.Service):
 
         if not no_cache:
             self._info_pending[key] = request
+            if self._is_shared(jid):
+                self._shared_cache.put("info", jid, node, request)
         try:
             if timeout is not None:
                 try:
@@ -743,6 +954,17 @@ class DiscoClient(service.Service):
                 except asyncio.CancelledError:
                     pass
 
+            if self._is_shared(jid):
+                try:
+                    request = yield from self._query_shared(
+                        "items", jid, node, timeout
+                    )
+                except KeyError:
+                    pass
+                else:
+                    self._items_pending[key] = request
+                    return request.result()
+
         request_iq = stanza.IQ(to=jid, type_=structs.IQType.GET)
         request_iq.payload = disco_xso.ItemsQuery(node=node)
 
@@ -751,6 +973,8 @@ class DiscoClient(service.Service):
         )
 
         self._items_pending[key] = request
+        if self._is_shared(jid):
+            self._shared_cache.put("items", jid, node, request)
         try:
             if timeout is not None:
                 try:
@@ -85,11 +85,27 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
 
     .. autoattribute:: local_jid
 
+    For monitoring, the following attribute is available:
+
+    .. attribute:: unhandled_count
+
+       The number of stanzas passed to :meth:`_feed` for which no callback
+       was found.
+
+       .. versionadded:: 0.10
+
+    .. versionchanged:: 0.10
+
+       The callbacks are kept in a per-type index, so that dispatching a
+       stanza takes at most one lookup for the full and one for the bare
+       sender JID, independent of the number of registered callbacks.
     """
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._map = {}
+        self._index = {}
+        self.unhandled_count = 0
 
     @abc.abstractproperty
     def local_jid(self):
@@ -117,23 +133,99 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
         if from_ is None:
             from_ = self.local_jid
 
-        keys = [
-            (stanza.type_, from_, False),
-            (stanza.type_, from_.bare(), True),
-            (None, from_, False),
-            (None, from_.bare(), True),
-            (stanza.type_, None, False),
-            (None, from_, False),
-            (None, None, False),
-        ]
-
-        for key in keys:
+        table = self._index.get(stanza.type_)
+        if table is None:
+            table = self._index.get(None)
+
+        cb = None
+        if table is not None:
+            exact, wildcard, default = table
+            match = exact.get(from_)
+            if wildcard:
+                if not from_.is_bare:
+                    bare_match = wildcard.get(from_.bare())
+                else:
+                    bare_match = wildcard.get(from_)
+                if     (bare_match is not None and
+                        (match is None or bare_match[0] < match[0])):
+                    match = bare_match
+            if match is not None:
+                cb = match[1]
+            else:
+                cb = default
+
+        if cb is None:
+            self.unhandled_count += 1
+            return False
+
+        cb(stanza)
+        return True
+
+    def _resolve(self, table_type, from_, wildcard_resource):
+        """
+        Return the callback with the highest priority for stanzas of type
+        `table_type` for the given registration slot as tuple
+        ``(priority, callback)``, or :data:`None` if there is none.
+
+        Lower values for priority are more specific. The priorities are
+        chosen such that comparing the entry for the full JID with the entry
+        for the bare JID gives the lookup order documented in
+        :meth:`register_callback`.
+        """
+        priority = 1 if wildcard_resource else 0
+        types = (None,) if table_type is None else (table_type, None)
+        for type_ in types:
             try:
-                cb = self._map[key]
+                return priority, self._map[type_, from_, wildcard_resource]
             except KeyError:
+                pass
+            priority += 2
+        return None
+
+    def _update_index(self, type_, from_, wildcard_resource):
+        if type_ is None:
+            tables = list(self._index.items())
+        else:
+            try:
+                tables = [(type_, self._index[type_])]
+            except KeyError:
+                self._rebuild_table(type_)
+                return
+
+        for table_type, (exact, wildcard, _) in tables:
+            if from_ is None:
+                default = self._map.get((table_type, None, False))
+                if default is None:
+                    default = self._map.get((None, None, False))
+                self._index[table_type] = exact, wildcard, default
+                continue
+
+            table = wildcard if wildcard_resource else exact
+            entry = self._resolve(table_type, from_, wildcard_resource)
+            if entry is None:
+                table.pop(from_, None)
+            else:
+                table[from_] = entry
+
+        if type_ is None and None not in self._index:
+            self._rebuild_table(None)
+
+    def _rebuild_table(self, table_type):
+        exact = {}
+        wildcard = {}
+        for type_, from_, wildcard_resource in self._map:
+            if from_ is None:
                 continue
-            cb(stanza)
-            return
+            if type_ is not None and type_ != table_type:
+                continue
+            table = wildcard if wildcard_resource else exact
+            table[from_] = self._resolve(table_type, from_, wildcard_resource)
+
+        default = self._map.get((table_type, None, False))
+        if default is None:
+            default = self._map.get((None, None, False))
+
+        self._index[table_type] = exact, wildcard, default
 
     def register_callback(self, type_, from_, cb, *,
                           wildcard_resource=True):
@@ -209,6 +301,7 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
             )
 
         self._map[type_, from_, wildcard_resource] = cb
+        self._update_index(type_, from_, wildcard_resource)
 
     def unregister_callback(self, type_, from_, *,
                             wildcard_resource=True):
@@ -231,6 +324,7 @@ class SimpleStanzaDispatcher(metaclass=abc.ABCMeta):
             wildcard_resource = False
 
         self._map.pop((type_, from_, wildcard_resource))
+        self._update_index(type_, from_, wildcard_resource)
 
     @contextlib.contextmanager
     def handler_context(self, type_, from_, cb, *, wildcard_resource=True):
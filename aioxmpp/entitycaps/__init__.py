@@ -20,8 +20,8 @@
 #
 ########################################################################
 """
-:mod:`~aioxmpp.entitycaps` --- Entity Capabilities support (:xep:`390`, :xep:`0115`)
-####################################################################################
+:mod:`~aioxmpp.entitycaps` --- Entity Capabilities (:xep:`390`, :xep:`0115`)
+############################################################################
 
 This module provides support for :xep:`XEP-0115 (Entity Capabilities) <0115>`
 and :xep:`XEP-0390 (Entity Capabilities 2.0) <0390>`. To use it,
@@ -53,11 +53,23 @@ Service
 
 .. autoclass:: Cache
 
+.. autoclass:: SingleFileDatabase
+
+.. autoclass:: MemoryOverlay
+
+.. autofunction:: default_memory_overlay
+
 .. currentmodule:: aioxmpp.entitycaps.xso
 
 
 """
 
-from .service import EntityCapsService, Cache  # NOQA
+from .service import (  # NOQA
+    EntityCapsService,
+    Cache,
+    MemoryOverlay,
+    default_memory_overlay,
+)
+from .db import SingleFileDatabase  # NOQA
 from . import xso  # NOQA
 Service = EntityCapsService
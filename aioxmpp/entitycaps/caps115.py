@@ -21,24 +21,48 @@
 ########################################################################
 import base64
 import collections
+import functools
 import hashlib
 import pathlib
 import urllib.parse
 
 from xml.sax.saxutils import escape
 
+import aioxmpp.cache
+
 from .common import AbstractKey, AbstractImplementation
 from . import xso as caps_xso
 
 
+# features and identities rarely change, but the strings are rebuilt whenever
+# the disco info of an entity is hashed; caching the escaped and encoded parts
+# leaves only the sorting and joining to be done
+_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _escape_encode(s):
+    return escape(s).encode("utf-8")
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _identity_part(category, type_, lang, name):
+    return b"/".join([
+        _escape_encode(category),
+        _escape_encode(type_),
+        _escape_encode(lang),
+        _escape_encode(name),
+    ])
+
+
 def build_identities_string(identities):
     identities = [
-        b"/".join([
-            escape(identity.category).encode("utf-8"),
-            escape(identity.type_).encode("utf-8"),
-            escape(str(identity.lang or "")).encode("utf-8"),
-            escape(identity.name or "").encode("utf-8"),
-        ])
+        _identity_part(
+            identity.category,
+            identity.type_,
+            str(identity.lang or ""),
+            identity.name or "",
+        )
         for identity in identities
     ]
 
@@ -51,7 +75,7 @@ def build_identities_string(identities):
 
 
 def build_features_string(features):
-    features = list(escape(feature).encode("utf-8") for feature in features)
+    features = [_escape_encode(feature) for feature in features]
 
     if len(set(features)) != len(features):
         raise ValueError("duplicate feature")
@@ -110,19 +134,32 @@ def build_forms_string(forms):
     return b"<".join(parts)
 
 
+# the strings built from a query are sorted and thus identify its contents;
+# the same disco info is hashed over and over again (once for every presence
+# broadcast of the own client and for every verification of a peer's caps)
+_hash_cache = aioxmpp.cache.LRUDict()
+_hash_cache.maxsize = 128
+
+
 def hash_query(query, algo):
-    hashimpl = hashlib.new(algo)
-    hashimpl.update(
-        build_identities_string(query.identities)
-    )
-    hashimpl.update(
-        build_features_string(query.features)
-    )
-    hashimpl.update(
-        build_forms_string(query.exts)
+    input = (
+        build_identities_string(query.identities),
+        build_features_string(query.features),
+        build_forms_string(query.exts),
     )
 
-    return base64.b64encode(hashimpl.digest()).decode("ascii")
+    try:
+        return _hash_cache[algo, input]
+    except KeyError:
+        pass
+
+    hashimpl = hashlib.new(algo)
+    for part in input:
+        hashimpl.update(part)
+
+    result = base64.b64encode(hashimpl.digest()).decode("ascii")
+    _hash_cache[algo, input] = result
+    return result
 
 
 Key = collections.namedtuple("Key", ["algo", "node"])
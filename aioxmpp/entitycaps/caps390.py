@@ -22,14 +22,24 @@
 import base64
 import pathlib
 import collections
+import functools
 import urllib.parse
 
+import aioxmpp.cache
 import aioxmpp.hashes
 
 from .common import AbstractKey
 from . import xso as caps_xso
 
 
+_CACHE_SIZE = 4096
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _process_feature(feature):
+    return feature.encode("utf-8")+b"\x1f"
+
+
 def _process_features(features):
     """
     Generate the `Features String` from an iterable of features.
@@ -43,20 +53,30 @@ def _process_features(features):
     :xep:`390`.
     """
     parts = [
-        feature.encode("utf-8")+b"\x1f"
+        _process_feature(feature)
         for feature in features
     ]
     parts.sort()
     return b"".join(parts)+b"\x1c"
 
 
-def _process_identity(identity):
-    category = (identity.category or "").encode("utf-8")+b"\x1f"
-    type_ = (identity.type_ or "").encode("utf-8")+b"\x1f"
-    lang = str(identity.lang or "").encode("utf-8")+b"\x1f"
-    name = (identity.name or "").encode("utf-8")+b"\x1f"
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _process_identity_parts(category, type_, lang, name):
+    return b"\x1f".join([
+        category.encode("utf-8"),
+        type_.encode("utf-8"),
+        lang.encode("utf-8"),
+        name.encode("utf-8"),
+    ]) + b"\x1f\x1e"
+
 
-    return b"".join([category, type_, lang, name]) + b"\x1e"
+def _process_identity(identity):
+    return _process_identity_parts(
+        identity.category or "",
+        identity.type_ or "",
+        str(identity.lang or ""),
+        identity.name or "",
+    )
 
 
 def _process_identities(identities):
@@ -168,6 +188,11 @@ class Implementation:
     def __init__(self, algorithms, **kwargs):
         super().__init__(**kwargs)
         self.__algorithms = algorithms
+        # maps hash inputs to the keys calculated from them, so that
+        # switching back to a previously seen set of features and identities
+        # does not require hashing again
+        self.__keys_cache = aioxmpp.cache.LRUDict()
+        self.__keys_cache.maxsize = 16
 
     def extract_keys(self, presence):
         if presence.xep0390_caps is None:
@@ -188,5 +213,14 @@ class Implementation:
 
     def calculate_keys(self, query_response):
         input = _get_hash_input(query_response)
-        for algo in self.__algorithms:
-            yield Key(algo, _calculate_hash(algo, input))
+        try:
+            return iter(self.__keys_cache[input])
+        except KeyError:
+            pass
+
+        keys = tuple(
+            Key(algo, _calculate_hash(algo, input))
+            for algo in self.__algorithms
+        )
+        self.__keys_cache[input] = keys
+        return iter(keys)
@@ -0,0 +1,466 @@
+########################################################################
+# File name: db.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import contextlib
+import mmap
+import os
+import pathlib
+import struct
+import tempfile
+import threading
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+
+_MAGIC = b"aioxmpp-capsdb\x00\x01"
+_RECORD_HEADER = struct.Struct(">HI")
+
+
+def _key_to_str(key):
+    if isinstance(key, str):
+        return key
+    return pathlib.PurePath(key.path).as_posix()
+
+
+def _file_id(stat):
+    return stat.st_dev, stat.st_ino
+
+
+class SingleFileDatabase:
+    """
+    Entity capabilities database which stores all entries in a single file.
+
+    :param path: Path to the database file.
+    :type path: :class:`pathlib.Path`
+    :param readonly: Whether the database is opened read-only.
+    :type readonly: :class:`bool`
+
+    The file consists of a header and a sequence of records, each holding the
+    key and the serialised disco#info response (the same data which is stored
+    in the files of a directory based database). New records are appended to
+    the file; if a key occurs more than once, the last record wins.
+
+    The file is memory-mapped and the index (mapping the keys to the position
+    of their data) is built by scanning the record headers when the database
+    is opened. A lookup thus neither opens a file nor reads more than the
+    data of the requested entry.
+
+    If the file does not exist, it is created (unless `readonly` is true, in
+    which case the database is empty). A record which is only partially
+    written (e.g. because the process was killed) is ignored and removed
+    by the next process which writes to the file.
+
+    The methods are safe to call from multiple threads, which allows to run
+    :meth:`flush` in an executor.
+
+    Multiple processes can use the same file. Writes (:meth:`flush`,
+    :meth:`compact` and the removal of partial records) are serialised with
+    an advisory lock (:func:`fcntl.flock`) on the file. Before appending, the
+    records which other processes appended since the file was last read are
+    added to the index, and a file which has been replaced by :meth:`compact`
+    of another process is read again. Entries written by other processes thus
+    become visible on the next :meth:`flush` or :meth:`compact`. On platforms
+    without :mod:`fcntl`, only one process may write to the file.
+
+    .. automethod:: get
+
+    .. automethod:: keys
+
+    .. automethod:: add
+
+    .. automethod:: flush
+
+    .. automethod:: compact
+
+    .. automethod:: import_directory
+
+    .. automethod:: close
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, path, *, readonly=False):
+        super().__init__()
+        self._path = pathlib.Path(path)
+        self._readonly = readonly
+        # _lock protects the in-memory state and is only held briefly;
+        # _write_lock serialises the operations which write the file or
+        # replace the memory map, so that those can do their I/O without
+        # blocking readers
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._index = {}
+        self._pending = {}
+        self._mmap = None
+        self._file_id = None
+        self._end = len(_MAGIC)
+        self._closed = False
+        self._load()
+
+    @property
+    def path(self):
+        """
+        The path of the database file.
+        """
+        return self._path
+
+    def _load(self):
+        if self._readonly:
+            try:
+                f = self._path.open("rb")
+            except FileNotFoundError:
+                return
+            with f:
+                self._check_magic(f)
+                self._replace_state(*self._read(f, None, len(_MAGIC)),
+                                    written={})
+            return
+
+        # create the file if needed, without truncating a file which another
+        # process has created in the meantime
+        self._path.open("ab").close()
+        with self._open_locked() as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                f.write(_MAGIC)
+                f.flush()
+            self._check_magic(f)
+            new_mmap, file_id, locations, end = self._read(
+                f, None, len(_MAGIC),
+            )
+            self._truncate_partial(f, end)
+            self._replace_state(new_mmap, file_id, locations, end,
+                                written={})
+
+    def _check_magic(self, f):
+        f.seek(0)
+        magic = f.read(len(_MAGIC))
+        if magic != _MAGIC:
+            raise ValueError(
+                "{} is not an entity caps database".format(self._path)
+            )
+
+    @contextlib.contextmanager
+    def _open_locked(self):
+        # open the file for writing and hold the advisory lock on it; if the
+        # file has been replaced while waiting for the lock, the replacement
+        # is opened instead
+        while True:
+            f = self._path.open("r+b")
+            try:
+                if fcntl is None:
+                    break
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                if (_file_id(os.fstat(f.fileno())) ==
+                        _file_id(os.stat(str(self._path)))):
+                    break
+            except:  # NOQA
+                f.close()
+                raise
+            f.close()
+
+        with f:
+            try:
+                yield f
+            finally:
+                if fcntl is not None:
+                    # the memory maps share the lock with the file, so it
+                    # has to be released explicitly
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read(self, f, file_id, end):
+        # map the file and index the records which have been appended after
+        # `end`, the end of the records already known from the file
+        # identified by `file_id`; if the file is another one (because it has
+        # been replaced) or shorter (which should not happen), all records
+        # are indexed
+        stat = os.fstat(f.fileno())
+        new_file_id = _file_id(stat)
+        if new_file_id != file_id or stat.st_size < end:
+            end = len(_MAGIC)
+        new_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        locations = {}
+        if stat.st_size > end:
+            end = self._scan(new_mmap, end, locations)
+        return new_mmap, new_file_id, locations, end
+
+    def _scan(self, data, offset, index):
+        size = len(data)
+        header_size = _RECORD_HEADER.size
+        while offset + header_size <= size:
+            key_len, value_len = _RECORD_HEADER.unpack_from(data, offset)
+            key_start = offset + header_size
+            value_start = key_start + key_len
+            record_end = value_start + value_len
+            if record_end > size:
+                # partially written record
+                break
+            key = data[key_start:value_start].decode("utf-8")
+            index[key] = (value_start, value_len)
+            offset = record_end
+        return offset
+
+    def _truncate_partial(self, f, end):
+        # crash recovery: a partially written record can only be left behind
+        # by a writer which died, as writers hold the lock; remove it so that
+        # new records can be appended
+        if os.fstat(f.fileno()).st_size > end:
+            f.truncate(end)
+
+    def _check_writable(self):
+        if self._readonly:
+            raise RuntimeError("database is read-only")
+        if self._closed:
+            raise RuntimeError("database is closed")
+
+    def _serialise_records(self, items, offset, index):
+        # returns the records for `items` to be written at `offset` and
+        # stores the location of their data in `index`
+        parts = []
+        header_size = _RECORD_HEADER.size
+        for key, data in items:
+            encoded_key = key.encode("utf-8")
+            parts.append(_RECORD_HEADER.pack(len(encoded_key), len(data)))
+            parts.append(encoded_key)
+            parts.append(data)
+            offset += header_size + len(encoded_key)
+            index[key] = (offset, len(data))
+            offset += len(data)
+        return b"".join(parts), offset
+
+    def _replace_state(self, new_mmap, file_id, locations, end, written):
+        # install the memory map of the new file contents, update the index
+        # with the `locations` of the records read or written and forget the
+        # pending entries which have been written (unless they have been
+        # replaced in the meantime); if the file has been replaced, the
+        # `locations` replace the index
+        with self._lock:
+            old_mmap = self._mmap
+            self._mmap = new_mmap
+            if file_id != self._file_id:
+                self._index = dict(locations)
+            else:
+                self._index.update(locations)
+            self._file_id = file_id
+            self._end = end
+            for key, data in written.items():
+                if self._pending.get(key) is data:
+                    del self._pending[key]
+
+        if old_mmap is not None:
+            old_mmap.close()
+
+    def get(self, key):
+        """
+        Return the serialised disco#info response stored for `key`.
+
+        :param key: The entity caps key or its :attr:`path` as string.
+        :raises KeyError: if there is no entry for `key`.
+        :rtype: :class:`bytes`
+
+        Entries added with :meth:`add` are returned even if they have not been
+        flushed yet.
+        """
+        key = _key_to_str(key)
+        with self._lock:
+            try:
+                return self._pending[key]
+            except KeyError:
+                pass
+            offset, length = self._index[key]
+            return self._mmap[offset:offset+length]
+
+    def keys(self):
+        """
+        Return a set of the keys (as strings) of all entries.
+        """
+        with self._lock:
+            return set(self._index) | set(self._pending)
+
+    def __contains__(self, key):
+        key = _key_to_str(key)
+        with self._lock:
+            return key in self._pending or key in self._index
+
+    def __len__(self):
+        return len(self.keys())
+
+    def add(self, key, data):
+        """
+        Add an entry to the database.
+
+        :param key: The entity caps key or its :attr:`path` as string.
+        :param data: The serialised disco#info response.
+        :type data: :class:`bytes`
+        :raises RuntimeError: if the database is read-only or closed.
+
+        The entry is kept in memory until :meth:`flush` is called. This allows
+        to write many entries at once.
+        """
+        self._check_writable()
+        key = _key_to_str(key)
+        with self._lock:
+            self._pending[key] = bytes(data)
+
+    def _flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            pending = dict(self._pending)
+            file_id = self._file_id
+            end = self._end
+
+        with self._open_locked() as f:
+            # pick up the records appended by other processes; this only
+            # reads the record headers which are not known yet
+            new_mmap, file_id, locations, end = self._read(f, file_id, end)
+            new_mmap.close()
+            self._truncate_partial(f, end)
+
+            data, new_end = self._serialise_records(pending.items(), end,
+                                                    locations)
+            f.seek(end)
+            f.write(data)
+            f.flush()
+            # the locations of the new records are known already, so the
+            # file does not need to be scanned again
+            new_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self._replace_state(new_mmap, file_id, locations, new_end, pending)
+
+    def flush(self):
+        """
+        Append all entries added since the last flush to the file.
+
+        Entries can be looked up and added while the file is written.
+        """
+        with self._write_lock:
+            if self._closed:
+                # add() refuses entries after close(), so there is nothing
+                # to write
+                return
+            self._flush()
+
+    def compact(self):
+        """
+        Rewrite the database file so that it contains only one record per key.
+
+        :raises RuntimeError: if the database is read-only or closed.
+
+        Pending entries and the records written by other processes are
+        included. The new file replaces the old file atomically.
+        """
+        self._check_writable()
+
+        with self._write_lock:
+            with self._lock:
+                self._check_writable()
+                pending = dict(self._pending)
+
+            with self._open_locked() as f:
+                # read all records from the file, as other processes may
+                # have written to it
+                old_mmap, _, locations, _ = self._read(f, None, len(_MAGIC))
+                try:
+                    items = {
+                        key: old_mmap[offset:offset+length]
+                        for key, (offset, length) in locations.items()
+                    }
+                finally:
+                    old_mmap.close()
+                items.update(pending)
+
+                locations = {}
+                data, end = self._serialise_records(
+                    sorted(items.items()),
+                    len(_MAGIC),
+                    locations,
+                )
+
+                with tempfile.NamedTemporaryFile(
+                        dir=str(self._path.parent),
+                        delete=False) as tmpf:
+                    try:
+                        tmpf.write(_MAGIC)
+                        tmpf.write(data)
+                        tmpf.flush()
+                        new_mmap = mmap.mmap(tmpf.fileno(), 0,
+                                             access=mmap.ACCESS_READ)
+                        file_id = _file_id(os.fstat(tmpf.fileno()))
+                    except:  # NOQA
+                        os.unlink(tmpf.name)
+                        raise
+
+                try:
+                    # other processes waiting for the lock notice that the
+                    # file has been replaced and open the new one
+                    os.replace(tmpf.name, str(self._path))
+                except:  # NOQA
+                    new_mmap.close()
+                    os.unlink(tmpf.name)
+                    raise
+
+            self._replace_state(new_mmap, file_id, locations, end, pending)
+
+    def import_directory(self, path):
+        """
+        Add all entries from a directory based database.
+
+        :param path: Root directory of the database.
+        :type path: :class:`pathlib.Path`
+        :return: The number of imported entries.
+        :rtype: :class:`int`
+
+        The entries are added as with :meth:`add` and need to be flushed.
+        """
+        path = pathlib.Path(path)
+        count = 0
+        for entry_path in sorted(path.glob("**/*.xml")):
+            if not entry_path.is_file():
+                continue
+            self.add(entry_path.relative_to(path).as_posix(),
+                     entry_path.read_bytes())
+            count += 1
+        return count
+
+    def close(self):
+        """
+        Flush pending entries and close the memory map.
+
+        Afterwards, the database is empty and :meth:`add` and :meth:`compact`
+        raise :class:`RuntimeError`. Calling :meth:`close` again has no
+        effect.
+        """
+        with self._write_lock:
+            if self._closed:
+                return
+            if not self._readonly:
+                self._flush()
+            with self._lock:
+                self._closed = True
+                old_mmap = self._mmap
+                self._mmap = None
+                self._index = {}
+
+        if old_mmap is not None:
+            old_mmap.close()
@@ -23,10 +23,13 @@ import asyncio
 import collections
 import copy
 import functools
+import io
 import logging
+import operator
 import os
 import tempfile
 
+import aioxmpp.cache
 import aioxmpp.callbacks
 import aioxmpp.disco as disco
 import aioxmpp.service
@@ -42,6 +45,144 @@ from . import caps115, caps390
 logger = logging.getLogger("aioxmpp.entitycaps")
 
 
+class MemoryOverlay:
+    """
+    Size-restricted in-memory cache of decoded entity capabilities
+    information.
+
+    :param max_bytes: Initial value for :attr:`max_bytes`.
+    :type max_bytes: :class:`int`
+
+    The entries are :class:`~.disco.xso.InfoQuery` objects keyed by the caps
+    key. Each entry is accounted with the size in bytes of its serialised
+    form. When the total exceeds :attr:`max_bytes`, the least recently used
+    entries are evicted. The bookkeeping is done by a
+    :class:`~aioxmpp.cache.LRUDict`.
+
+    As entries are keyed by a hash of their contents and only verified
+    entries are added, an overlay can safely be shared by all
+    :class:`Cache` instances in a process (see :func:`default_memory_overlay`),
+    which avoids holding the same information once per client. The overlay
+    stores a copy of each entry passed to :meth:`put` and :meth:`get` returns
+    a copy of the stored entry, so that the users of the overlay cannot
+    modify each other's entries.
+
+    .. autoattribute:: max_bytes
+
+    .. autoattribute:: total_bytes
+
+    .. autoattribute:: hits
+
+    .. autoattribute:: misses
+
+    .. autoattribute:: evictions
+
+    .. automethod:: get
+
+    .. automethod:: put
+
+    .. automethod:: clear
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, max_bytes=4*1024*1024):
+        super().__init__()
+        # the values are (entry, size) pairs
+        self._entries = aioxmpp.cache.LRUDict(sizeof=operator.itemgetter(1))
+        self.max_bytes = max_bytes
+
+    @property
+    def max_bytes(self):
+        """
+        Maximum accounted size of all entries in bytes. Reducing this value
+        evicts entries immediately.
+        """
+        return self._entries.maxsize
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        if value <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._entries.maxsize = value
+
+    @property
+    def total_bytes(self):
+        """
+        Accounted size of all entries in bytes.
+        """
+        return self._entries.size
+
+    @property
+    def hits(self):
+        """
+        Number of lookups which found an entry.
+        """
+        return self._entries.hits
+
+    @property
+    def misses(self):
+        """
+        Number of lookups which did not find an entry.
+        """
+        return self._entries.misses
+
+    @property
+    def evictions(self):
+        """
+        Number of entries evicted because :attr:`max_bytes` was exceeded.
+        """
+        return self._entries.evictions
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Return a copy of the entry for `key`.
+
+        :raises KeyError: if there is no entry for `key`.
+        """
+        entry, _ = self._entries[key]
+        return copy.deepcopy(entry)
+
+    def put(self, key, entry, size):
+        """
+        Add or replace the entry for `key`.
+
+        :param entry: The entity capabilities information.
+        :type entry: :class:`~.disco.xso.InfoQuery`
+        :param size: The size of the serialised `entry` in bytes.
+        :type size: :class:`int`
+
+        A copy of `entry` is stored. Entries larger than :attr:`max_bytes` are
+        not stored.
+        """
+        self._entries[key] = copy.deepcopy(entry), size
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+
+
+_default_memory_overlay = MemoryOverlay()
+
+
+def default_memory_overlay():
+    """
+    Return a process-wide :class:`MemoryOverlay` which can be passed to
+    :class:`Cache` instances to share entries between them.
+
+    .. versionadded:: 0.10
+    """
+    return _default_memory_overlay
+
+
 class Cache:
     """
     This provides a two-level cache for entity capabilities information. The
@@ -57,12 +198,37 @@ class Cache:
     In addition to serving the databases, it provides deduplication for queries
     by holding a cache of futures looking up the same hash.
 
+    Entries added with :meth:`add_cache_entry` are kept in memory. By
+    default, each cache has its own, unbounded, overlay for this. If a
+    :class:`MemoryOverlay` is passed as `memory_overlay`, it is used instead
+    and entries found in the single-file databases are added to it, too. Pass
+    the result of :func:`default_memory_overlay` to share the entries among
+    all caches in the process.
+
+    .. versionchanged:: 0.10
+
+       The `memory_overlay` argument was added.
+
+    .. autoattribute:: memory_overlay
+
     Database management (user API):
 
     .. automethod:: set_system_db_path
 
     .. automethod:: set_user_db_path
 
+    .. automethod:: set_system_db
+
+    .. automethod:: set_user_db
+
+    .. attribute:: user_db_flush_delay
+
+       Delay in seconds after which entries added to the database set with
+       :meth:`set_user_db` are written to disk. All entries added in the
+       meantime are written at once.
+
+       .. versionadded:: 0.10
+
     Queries (API intended for :class:`Service`):
 
     .. automethod:: create_query_future
@@ -72,11 +238,16 @@ class Cache:
     .. automethod:: lookup
     """
 
-    def __init__(self):
+    def __init__(self, *, memory_overlay=None):
         self._lookup_cache = {}
-        self._memory_overlay = {}
+        self._memory_overlay = memory_overlay
+        self._local_overlay = {}
         self._system_db_path = None
         self._user_db_path = None
+        self._system_db = None
+        self._user_db = None
+        self._user_db_flush_handle = None
+        self.user_db_flush_delay = 1.0
 
     def _erase_future(self, key, fut):
         try:
@@ -87,46 +258,112 @@ class Cache:
             if existing is fut:
                 del self._lookup_cache[key]
 
+    @property
+    def memory_overlay(self):
+        """
+        The :class:`MemoryOverlay` used by this cache or :data:`None` if
+        the cache uses its own overlay.
+        """
+        return self._memory_overlay
+
     def set_system_db_path(self, path):
         self._system_db_path = path
 
     def set_user_db_path(self, path):
         self._user_db_path = path
 
+    def set_system_db(self, db):
+        """
+        Use a :class:`~.entitycaps.SingleFileDatabase` as trusted database.
+
+        :param db: The database or :data:`None` to remove it.
+        :type db: :class:`~.entitycaps.SingleFileDatabase`
+
+        The database is consulted before the directory set with
+        :meth:`set_system_db_path`, if any.
+
+        .. versionadded:: 0.10
+        """
+        self._system_db = db
+
+    def set_user_db(self, db):
+        """
+        Use a :class:`~.entitycaps.SingleFileDatabase` as user-level
+        database.
+
+        :param db: The database or :data:`None` to remove it.
+        :type db: :class:`~.entitycaps.SingleFileDatabase`
+
+        The database is consulted before the directory set with
+        :meth:`set_user_db_path`, if any. New entries are added to the
+        database instead of the directory and written in batches (see
+        :attr:`user_db_flush_delay`). Call
+        :meth:`~.entitycaps.SingleFileDatabase.close` on shutdown to write
+        entries which have not been written yet.
+
+        .. versionadded:: 0.10
+        """
+        self._user_db = db
+
+    def _flush_user_db(self):
+        self._user_db_flush_handle = None
+        if self._user_db is None:
+            return
+        asyncio.async(asyncio.get_event_loop().run_in_executor(
+            None,
+            self._user_db.flush,
+        ))
+
+    def _lookup_in_file_db(self, db, key):
+        data = db.get(key)
+        return (
+            aioxmpp.xml.read_single_xso(io.BytesIO(data),
+                                        disco.xso.InfoQuery),
+            len(data),
+        )
+
+    def _lookup_in_dir_db(self, db_path, key):
+        try:
+            f = (db_path / key.path).open("rb")
+        except OSError:
+            raise KeyError(key)
+        with f:
+            # the size of the file is not known without an additional system
+            # call; such entries are not added to the memory overlay
+            return aioxmpp.xml.read_single_xso(f, disco.xso.InfoQuery), None
+
+    def _lookup_in_overlay(self, key):
+        if self._memory_overlay is None:
+            return self._local_overlay[key]
+        return self._memory_overlay.get(key)
+
     def lookup_in_database(self, key):
         try:
-            result = self._memory_overlay[key]
+            result = self._lookup_in_overlay(key)
         except KeyError:
             pass
         else:
             logger.debug("memory cache hit: %s", key)
             return result
 
-        key_path = key.path
+        sources = [
+            ("system db", self._system_db, self._lookup_in_file_db),
+            ("system db", self._system_db_path, self._lookup_in_dir_db),
+            ("user db", self._user_db, self._lookup_in_file_db),
+            ("user db", self._user_db_path, self._lookup_in_dir_db),
+        ]
 
-        if self._system_db_path is not None:
-            try:
-                f = (
-                    self._system_db_path / key_path
-                ).open("rb")
-            except OSError:
-                pass
-            else:
-                logger.debug("system db hit: %s", key)
-                with f:
-                    return aioxmpp.xml.read_single_xso(f, disco.xso.InfoQuery)
-
-        if self._user_db_path is not None:
+        for name, db, lookup in sources:
+            if db is None:
+                continue
             try:
-                f = (
-                    self._user_db_path / key_path
-                ).open("rb")
-            except OSError:
-                pass
-            else:
-                logger.debug("user db hit: %s", key)
-                with f:
-                    return aioxmpp.xml.read_single_xso(f, disco.xso.InfoQuery)
+                result, size = lookup(db, key)
+            except KeyError:
+                continue
+            logger.debug("%s hit: %s", name, key)
+            if size is not None and self._memory_overlay is not None:
+                self._memory_overlay.put(key, result, size)
+            return result
 
         raise KeyError(key)
 
@@ -176,6 +413,14 @@ class Cache:
         self._lookup_cache[key] = fut
         return fut
 
+    def _serialise_entry(self, entry):
+        buf = io.BytesIO()
+        if entry.captured_events is not None:
+            write_events(buf, entry.captured_events)
+        else:
+            aioxmpp.xml.write_single_xso(entry, buf)
+        return buf.getvalue()
+
     def add_cache_entry(self, key, entry):
         """
         Add the given `entry` (which must be a :class:`~.disco.xso.InfoQuery`
@@ -184,9 +429,24 @@ class Cache:
         actually map to `node` with the given `hash_` function, it is expected
         that the caller perfoms the validation.
         """
-        copied_entry = copy.copy(entry)
-        self._memory_overlay[key] = copied_entry
-        if self._user_db_path is not None:
+        data = None
+        if self._memory_overlay is not None:
+            data = self._serialise_entry(entry)
+            # the overlay stores its own copy
+            self._memory_overlay.put(key, entry, len(data))
+        else:
+            self._local_overlay[key] = copy.copy(entry)
+        if self._user_db is not None:
+            if data is None:
+                data = self._serialise_entry(entry)
+            self._user_db.add(key, data)
+            if self._user_db_flush_handle is None:
+                self._user_db_flush_handle = \
+                    asyncio.get_event_loop().call_later(
+                        self.user_db_flush_delay,
+                        self._flush_user_db,
+                    )
+        elif self._user_db_path is not None:
             asyncio.async(asyncio.get_event_loop().run_in_executor(
                 None,
                 writeback,
@@ -282,6 +542,7 @@ class EntityCapsService(aioxmpp.service.Service):
 
         self.__active_hashsets = []
         self.__key_users = collections.Counter()
+        self.__update_scheduled = False
 
     @property
     def xep115_support(self):
@@ -356,7 +617,13 @@ class EntityCapsService(aioxmpp.service.Service):
         disco.DiscoServer,
         "on_info_changed")
     def _info_changed(self):
+        if self.__update_scheduled:
+            # multiple changes within one loop iteration (e.g. when several
+            # features are registered at once) only cause one
+            # re-calculation and thus at most one presence re-broadcast
+            return
         self.logger.debug("info changed, scheduling re-calculation of version")
+        self.__update_scheduled = True
         asyncio.get_event_loop().call_soon(
             self.update_hash
         )
@@ -478,6 +745,7 @@ class EntityCapsService(aioxmpp.service.Service):
         return True
 
     def update_hash(self):
+        self.__update_scheduled = False
         node = disco.StaticNode.clone(self.disco_server)
         info = node.as_info_xso()
 
@@ -501,17 +769,21 @@ class EntityCapsService(aioxmpp.service.Service):
     _xep390_feature = disco.register_feature(namespaces.xep0390_caps)
 
 
+def write_events(f, captured_events):
+    generator = aioxmpp.xml.XMPPXMLGenerator(
+        f,
+        short_empty_elements=True)
+    generator.startDocument()
+    aioxmpp.xso.events_to_sax(captured_events, generator)
+    generator.endDocument()
+
+
 def writeback(path, captured_events):
     aioxmpp.utils.mkdir_exist_ok(path.parent)
     with tempfile.NamedTemporaryFile(dir=str(path.parent),
                                      delete=False) as tmpf:
         try:
-            generator = aioxmpp.xml.XMPPXMLGenerator(
-                tmpf,
-                short_empty_elements=True)
-            generator.startDocument()
-            aioxmpp.xso.events_to_sax(captured_events, generator)
-            generator.endDocument()
+            write_events(tmpf, captured_events)
         except:
             os.unlink(tmpf.name)
             raise
@@ -58,6 +58,20 @@ reconfigure the resolver whenever DNS timeouts occur are disabled.
 
 .. autofunction:: set_resolver
 
+Asynchronous resolver
+---------------------
+
+By default, the queries are made with the blocking :mod:`dns.resolver` in an
+executor. When many clients resolve names at the same time, this occupies the
+threads of the executor and sends the same queries over and over again. An
+:class:`AsyncResolver` can be installed with :func:`set_resolver` instead; it
+talks to the nameservers directly using :mod:`asyncio` and caches the
+results::
+
+  aioxmpp.network.set_resolver(aioxmpp.network.AsyncResolver())
+
+.. autoclass:: AsyncResolver
+
 Querying records
 ================
 
@@ -86,12 +100,22 @@ import functools
 import itertools
 import logging
 import random
+import struct
 import threading
+import time
 
 import dns
+import dns.exception
 import dns.flags
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
 import dns.resolver
 
+from .cache import LRUDict
+
 logger = logging.getLogger(__name__)
 
 _state = threading.local()
@@ -142,6 +166,277 @@ def set_resolver(resolver):
     _state.overridden_resolver = True
 
 
+class _DatagramQueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, request, fut):
+        super().__init__()
+        self._request = request
+        self._fut = fut
+
+    def datagram_received(self, data, addr):
+        if self._fut.done():
+            return
+        try:
+            response = dns.message.from_wire(data)
+        except dns.exception.DNSException:
+            return
+        if not self._request.is_response(response):
+            # stray or spoofed datagram, keep waiting
+            return
+        self._fut.set_result(response)
+
+    def error_received(self, exc):
+        if not self._fut.done():
+            self._fut.set_exception(exc)
+
+    def connection_lost(self, exc):
+        if not self._fut.done():
+            self._fut.set_exception(exc or ConnectionError())
+
+
+class AsyncResolver:
+    """
+    DNS resolver which uses :mod:`asyncio` instead of blocking calls and
+    caches the results.
+
+    :param nameservers: Addresses of the nameservers to use.
+    :type nameservers: :class:`list` of :class:`str`
+    :param port: Port at which the nameservers are contacted.
+    :type port: :class:`int`
+    :param timeout: Time to wait for a response from a single nameserver.
+    :type timeout: :class:`float` in seconds
+    :param negative_ttl: Maximum time to cache negative responses.
+    :type negative_ttl: :class:`float` in seconds
+    :param max_ttl: Maximum time to cache any response.
+    :type max_ttl: :class:`float` in seconds
+    :param cache_size: Maximum number of cached responses.
+    :type cache_size: :class:`int`
+
+    If `nameservers` is :data:`None`, the nameservers of the system-wide
+    configuration (as read by :class:`dns.resolver.Resolver`) are used.
+
+    The resolver implements the subset of the :class:`dns.resolver.Resolver`
+    interface used by :func:`repeated_query`, except that :meth:`query` is a
+    coroutine. To use it, pass it to :func:`set_resolver` or as `resolver`
+    argument to :func:`repeated_query`.
+
+    Queries are sent via UDP to the nameservers in order, until one of them
+    responds with an answer or NXDOMAIN. Truncated responses are repeated over
+    TCP.
+
+    Responses are cached for the TTL of the answer. Negative responses
+    (NXDOMAIN and empty answers) are cached for the TTL given by the SOA
+    record in the response (as described in :rfc:`2308`), but at most for
+    `negative_ttl` seconds. Timeouts and server failures are not cached.
+    When more than `cache_size` responses are cached, the least recently used
+    ones are discarded. Concurrent identical queries are only sent once.
+
+    .. automethod:: query
+
+    .. automethod:: set_flags
+
+    .. automethod:: clear_cache
+
+    .. versionadded:: 0.10
+    """
+
+    _NXDOMAIN = object()
+
+    def __init__(self, nameservers=None, *,
+                 port=53,
+                 timeout=2.0,
+                 negative_ttl=300,
+                 max_ttl=86400,
+                 cache_size=1024):
+        super().__init__()
+        if nameservers is None:
+            nameservers = dns.resolver.Resolver().nameservers
+        self.nameservers = list(nameservers)
+        self.port = port
+        self.timeout = timeout
+        self.negative_ttl = negative_ttl
+        self.max_ttl = max_ttl
+        self.flags = dns.flags.RD
+        self._cache = LRUDict()
+        self._cache.maxsize = cache_size
+        self._in_flight = {}
+
+    def set_flags(self, flags):
+        """
+        Set the flags used in the queries.
+        """
+        self.flags = flags
+
+    def clear_cache(self):
+        """
+        Remove all cached responses.
+        """
+        self._cache.clear()
+
+    @asyncio.coroutine
+    def _query_udp(self, request, nameserver, loop):
+        fut = asyncio.Future(loop=loop)
+        transport, _ = yield from loop.create_datagram_endpoint(
+            lambda: _DatagramQueryProtocol(request, fut),
+            remote_addr=(nameserver, self.port),
+        )
+        try:
+            transport.sendto(request.to_wire())
+            return (yield from fut)
+        finally:
+            transport.close()
+
+    @asyncio.coroutine
+    def _query_tcp(self, request, nameserver, loop):
+        reader, writer = yield from asyncio.open_connection(
+            nameserver, self.port,
+            loop=loop,
+        )
+        try:
+            wire = request.to_wire()
+            writer.write(struct.pack(">H", len(wire)) + wire)
+            length, = struct.unpack(">H", (yield from reader.readexactly(2)))
+            response = dns.message.from_wire(
+                (yield from reader.readexactly(length))
+            )
+        finally:
+            writer.close()
+        if not request.is_response(response):
+            raise dns.exception.FormError("response does not match query")
+        return response
+
+    @asyncio.coroutine
+    def _resolve(self, qname, rdtype, rdclass, flags, tcp):
+        loop = asyncio.get_event_loop()
+        request = dns.message.make_query(qname, rdtype, rdclass)
+        request.flags = flags
+
+        timed_out = False
+        for nameserver in self.nameservers:
+            try:
+                if not tcp:
+                    response = yield from asyncio.wait_for(
+                        self._query_udp(request, nameserver, loop),
+                        timeout=self.timeout,
+                    )
+                    if response.flags & dns.flags.TC:
+                        response = yield from asyncio.wait_for(
+                            self._query_tcp(request, nameserver, loop),
+                            timeout=self.timeout,
+                        )
+                else:
+                    response = yield from asyncio.wait_for(
+                        self._query_tcp(request, nameserver, loop),
+                        timeout=self.timeout,
+                    )
+            except asyncio.TimeoutError:
+                timed_out = True
+                continue
+            except (OSError, EOFError, dns.exception.DNSException) as exc:
+                logger.debug("query to %s failed: %s", nameserver, exc)
+                continue
+
+            rcode = response.rcode()
+            if rcode == dns.rcode.NXDOMAIN:
+                return self._NXDOMAIN, self._negative_ttl(response)
+            if rcode != dns.rcode.NOERROR:
+                logger.debug("nameserver %s responded with %s",
+                             nameserver, dns.rcode.to_text(rcode))
+                continue
+
+            try:
+                answer = dns.resolver.Answer(qname, rdtype, rdclass, response)
+            except dns.resolver.NoAnswer:
+                return response, self._negative_ttl(response)
+            return response, min(answer.expiration - time.time(),
+                                 self.max_ttl)
+
+        if timed_out:
+            raise dns.resolver.Timeout()
+        raise dns.resolver.NoNameservers()
+
+    def _negative_ttl(self, response):
+        for rrset in response.authority:
+            if rrset.rdtype == dns.rdatatype.SOA:
+                return min(rrset.ttl, rrset[0].minimum, self.negative_ttl)
+        return self.negative_ttl
+
+    @staticmethod
+    def _make_result(qname, rdtype, rdclass, response, raise_on_no_answer):
+        if response is AsyncResolver._NXDOMAIN:
+            raise dns.resolver.NXDOMAIN()
+        return dns.resolver.Answer(qname, rdtype, rdclass, response,
+                                   raise_on_no_answer=raise_on_no_answer)
+
+    @asyncio.coroutine
+    def query(self, qname, rdtype=dns.rdatatype.A,
+              rdclass=dns.rdataclass.IN,
+              tcp=False,
+              raise_on_no_answer=True):
+        """
+        Query the nameservers.
+
+        :param qname: The name to query.
+        :type qname: :class:`str` or :class:`dns.name.Name`
+        :param rdtype: The record type to query.
+        :param rdclass: The record class to query.
+        :param tcp: Whether to use TCP instead of UDP.
+        :type tcp: :class:`bool`
+        :param raise_on_no_answer: Whether to raise if the answer is empty.
+        :type raise_on_no_answer: :class:`bool`
+        :raises dns.resolver.NXDOMAIN: if the name does not exist.
+        :raises dns.resolver.NoAnswer: if the answer is empty and
+            `raise_on_no_answer` is true.
+        :raises dns.resolver.Timeout: if no nameserver responded in time.
+        :raises dns.resolver.NoNameservers: if no nameserver was able to
+            answer the query.
+        :rtype: :class:`dns.resolver.Answer`
+
+        The arguments have the same meaning as for
+        :meth:`dns.resolver.Resolver.query`.
+        """
+        if isinstance(qname, str):
+            qname = dns.name.from_text(qname)
+        if isinstance(rdtype, str):
+            rdtype = dns.rdatatype.from_text(rdtype)
+        if isinstance(rdclass, str):
+            rdclass = dns.rdataclass.from_text(rdclass)
+
+        loop = asyncio.get_event_loop()
+        key = qname, rdtype, rdclass, self.flags
+
+        try:
+            response, expires_at = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            if expires_at > loop.time():
+                return self._make_result(qname, rdtype, rdclass, response,
+                                         raise_on_no_answer)
+            del self._cache[key]
+
+        in_flight_key = key + (tcp,)
+        try:
+            fut = self._in_flight[in_flight_key]
+        except KeyError:
+            fut = asyncio.async(self._resolve(qname, rdtype, rdclass,
+                                              self.flags, tcp))
+            self._in_flight[in_flight_key] = fut
+
+            def done(fut):
+                del self._in_flight[in_flight_key]
+                if fut.cancelled() or fut.exception() is not None:
+                    return
+                response, ttl = fut.result()
+                if ttl > 0:
+                    self._cache[key] = response, loop.time() + ttl
+
+            fut.add_done_callback(done)
+
+        response, _ = yield from asyncio.shield(fut)
+        return self._make_result(qname, rdtype, rdclass, response,
+                                 raise_on_no_answer)
+
+
 @asyncio.coroutine
 def repeated_query(qname, rdtype,
                    nattempts=None,
@@ -194,7 +489,8 @@ def repeated_query(qname, rdtype,
     This is a coroutine; the query is executed in an `executor` using the
     :meth:`asyncio.BaseEventLoop.run_in_executor` of the current event loop. By
     default, the default executor provided by the event loop is used, but it
-    can be overridden using the `executor` argument.
+    can be overridden using the `executor` argument. If the resolver is an
+    :class:`AsyncResolver`, no executor is used.
 
     If the used resolver raises :class:`dns.resolver.NoNameservers`
     (semantically, that no nameserver was able to answer the request), this
@@ -207,11 +503,29 @@ def repeated_query(qname, rdtype,
     :class:`~dns.resolver.NoNameservers` exception is treated as normal
     timeout. If the exception re-occurs in the second query, it is re-raised,
     as it indicates a serious configuration problem.
+
+    .. versionchanged:: 0.10
+
+       Support for :class:`AsyncResolver` was added.
     """
     global _state
 
     loop = asyncio.get_event_loop()
 
+    def run_query(**kwargs):
+        if isinstance(resolver, AsyncResolver):
+            return resolver.query(qname, rdtype, tcp=use_tcp, **kwargs)
+        return loop.run_in_executor(
+            executor,
+            functools.partial(
+                resolver.query,
+                qname,
+                rdtype,
+                tcp=use_tcp,
+                **kwargs
+            )
+        )
+
     # tlr = thread-local resolver
     use_tlr = False
     if resolver is None:
@@ -242,15 +556,7 @@ def repeated_query(qname, rdtype,
     for i in range(nattempts):
         resolver.set_flags(dns.flags.RD | dns.flags.AD)
         try:
-            answer = yield from loop.run_in_executor(
-                executor,
-                functools.partial(
-                    resolver.query,
-                    qname,
-                    rdtype,
-                    tcp=use_tcp
-                )
-            )
+            answer = yield from run_query()
 
             if require_ad and not (answer.response.flags & dns.flags.AD):
                 raise ValueError("DNSSEC validation not available")
@@ -262,15 +568,7 @@ def repeated_query(qname, rdtype,
         except (dns.resolver.NoNameservers):
             resolver.set_flags(dns.flags.RD | dns.flags.AD | dns.flags.CD)
             try:
-                yield from loop.run_in_executor(
-                    executor,
-                    functools.partial(
-                        resolver.query,
-                        qname,
-                        rdtype,
-                        tcp=use_tcp,
-                        raise_on_no_answer=False
-                    ))
+                yield from run_query(raise_on_no_answer=False)
             except (dns.resolver.Timeout, TimeoutError):
                 handle_timeout()
                 continue
@@ -53,6 +53,8 @@ Connecting streams low-level
 
 .. autofunction:: connect_xmlstream
 
+.. autoclass:: ConnectionOptionCache
+
 Utilities
 =========
 
@@ -60,7 +62,9 @@ Utilities
 
 """
 import asyncio
+import collections
 import contextlib
+import functools
 import logging
 import warnings
 
@@ -140,25 +144,54 @@ def discover_connectors(
     function is not deterministic.
 
     .. versionadded:: 0.6
+
+    .. versionchanged:: 0.10
+
+       The :rfc:`6120` and :xep:`368` SRV records are looked up concurrently.
     """
 
     domain_encoded = domain.encode("idna")
 
+    # the lookups are independent of each other; running them concurrently
+    # halves the time spent waiting for DNS
+    starttls_srv_lookup = asyncio.async(network.lookup_srv(
+        domain_encoded,
+        "xmpp-client",
+    ))
+    tls_srv_lookup = asyncio.async(network.lookup_srv(
+        domain_encoded,
+        "xmpps-client",
+    ))
+
+    pending = {starttls_srv_lookup, tls_srv_lookup}
     try:
-        starttls_srv_records = yield from network.lookup_srv(
-            domain_encoded,
-            "xmpp-client",
-        )
+        while pending:
+            done, pending = yield from asyncio.wait(
+                pending,
+                return_when=asyncio.FIRST_EXCEPTION,
+            )
+            for lookup in done:
+                exc = lookup.exception()
+                if exc is not None and not isinstance(exc, ValueError):
+                    # the result of the other lookup does not matter anymore
+                    raise exc
+    finally:
+        if pending:
+            for lookup in pending:
+                lookup.cancel()
+            # retrieve the outcome of the cancelled lookups, so that their
+            # exceptions are not reported as never retrieved
+            yield from asyncio.gather(*pending, return_exceptions=True)
+
+    try:
+        starttls_srv_records = starttls_srv_lookup.result()
         starttls_srv_disabled = False
     except ValueError:
         starttls_srv_records = []
         starttls_srv_disabled = True
 
     try:
-        tls_srv_records = yield from network.lookup_srv(
-            domain_encoded,
-            "xmpps-client",
-        )
+        tls_srv_records = tls_srv_lookup.result()
         tls_srv_disabled = False
     except ValueError:
         tls_srv_records = []
@@ -207,13 +240,49 @@ def discover_connectors(
     return options
 
 
+@asyncio.coroutine
+def _negotiate_sasl(transport, xmlstream, features, exceptions,
+                    jid, metadata, negotiation_timeout):
+    """
+    Helper function for :func:`_try_options` and :func:`_race_options`.
+
+    Return the stream features after SASL or :data:`None` if SASL is not
+    available on the stream.
+    """
+    try:
+        return (yield from security_layer.negotiate_sasl(
+            transport,
+            xmlstream,
+            metadata.sasl_providers,
+            negotiation_timeout,
+            jid,
+            features,
+        ))
+    except errors.SASLUnavailable as exc:
+        protocol.send_stream_error_and_close(
+            xmlstream,
+            condition=(namespaces.streams, "policy-violation"),
+            text=str(exc),
+        )
+        exceptions.append(exc)
+        return None
+    except Exception as exc:
+        protocol.send_stream_error_and_close(
+            xmlstream,
+            condition=(namespaces.streams, "undefined-condition"),
+            text=str(exc),
+        )
+        raise
+
+
 @asyncio.coroutine
 def _try_options(options, exceptions,
                  jid, metadata, negotiation_timeout, loop, logger):
     """
     Helper function for :func:`connect_xmlstream`.
     """
-    for host, port, conn in options:
+    for option in options:
+        host, port, conn = option
         logger.debug(
             "domain %s: trying to connect to %r:%s using %r",
             jid.domain, host, port, conn
@@ -241,36 +310,232 @@ def _try_options(options, exceptions,
             conn,
         )
 
-        try:
-            features = yield from security_layer.negotiate_sasl(
-                transport,
-                xmlstream,
-                metadata.sasl_providers,
-                negotiation_timeout,
-                jid,
-                features,
-            )
-        except errors.SASLUnavailable as exc:
-            protocol.send_stream_error_and_close(
-                xmlstream,
-                condition=(namespaces.streams, "policy-violation"),
-                text=str(exc),
-            )
-            exceptions.append(exc)
+        features = yield from _negotiate_sasl(
+            transport, xmlstream, features, exceptions,
+            jid, metadata, negotiation_timeout,
+        )
+        if features is None:
             continue
-        except Exception as exc:
-            protocol.send_stream_error_and_close(
-                xmlstream,
-                condition=(namespaces.streams, "undefined-condition"),
-                text=str(exc),
+
+        return option, transport, xmlstream, features
+
+    return None
+
+
+@asyncio.coroutine
+def _race_connect(pending, exceptions,
+                  jid, metadata, negotiation_timeout, loop, logger, delay):
+    """
+    Helper function for :func:`_race_options`.
+
+    Start connection attempts for the options in the deque `pending`, in
+    order. The next attempt is started when the previous attempt failed or
+    after `delay` seconds, whichever comes first. The first attempt which
+    succeeds wins and all other attempts are cancelled. The options of all
+    started attempts are removed from `pending`, so that each option is tried
+    at most once.
+
+    Return the winning option and the result of its
+    :meth:`~.BaseConnector.connect` call or :data:`None` if all attempts
+    failed.
+    """
+    running = collections.OrderedDict()
+    start_next = True
+    try:
+        while pending or running:
+            if start_next and pending:
+                option = pending.popleft()
+                host, port, conn = option
+                logger.debug(
+                    "domain %s: trying to connect to %r:%s using %r",
+                    jid.domain, host, port, conn
+                )
+                task = asyncio.async(conn.connect(
+                    loop,
+                    metadata,
+                    jid.domain,
+                    host,
+                    port,
+                    negotiation_timeout,
+                    base_logger=logger,
+                ), loop=loop)
+                running[task] = option
+
+            done, _ = yield from asyncio.wait(
+                list(running),
+                timeout=delay if pending else None,
+                return_when=asyncio.FIRST_COMPLETED,
+                loop=loop,
             )
-            raise
 
-        return transport, xmlstream, features
+            # start the next attempt either because the delay passed or
+            # because an attempt failed
+            start_next = True
+
+            for task in list(running):
+                if task not in done:
+                    continue
+                option = running.pop(task)
+                host, port, conn = option
+                try:
+                    result = task.result()
+                except OSError as exc:
+                    logger.warning(
+                        "connection failed: %s", exc
+                    )
+                    exceptions.append(exc)
+                    continue
+
+                logger.debug(
+                    "domain %s: connection succeeded using %r",
+                    jid.domain,
+                    conn,
+                )
+                return option, result
+    finally:
+        for task in running:
+            if task.done() and not task.cancelled():
+                if task.exception() is None:
+                    # lost the race narrowly
+                    _, xmlstream, _ = task.result()
+                    xmlstream.abort()
+            else:
+                task.cancel()
 
     return None
 
 
+@asyncio.coroutine
+def _race_options(options, exceptions,
+                  jid, metadata, negotiation_timeout, loop, logger, delay):
+    """
+    Helper function for :func:`connect_xmlstream`.
+
+    Like :func:`_try_options`, but races the connection attempts as described
+    in :rfc:`8305`.
+    """
+    pending = collections.deque(options)
+    while pending:
+        result = yield from _race_connect(
+            pending, exceptions,
+            jid, metadata, negotiation_timeout, loop, logger, delay,
+        )
+        if result is None:
+            return None
+
+        option, (transport, xmlstream, features) = result
+        features = yield from _negotiate_sasl(
+            transport, xmlstream, features, exceptions,
+            jid, metadata, negotiation_timeout,
+        )
+        if features is None:
+            continue
+
+        return option, transport, xmlstream, features
+
+    return None
+
+
+class ConnectionOptionCache:
+    """
+    Cache for connection options, to be used with :func:`connect_xmlstream`.
+
+    :param ttl: Initial value for :attr:`ttl`.
+    :type ttl: :class:`float` in seconds
+
+    For each domain, the cache holds the options returned by
+    :func:`discover_connectors` and the option with which the last connection
+    succeeded. Reconnecting to the same domain thus neither requires DNS
+    queries nor trying options which are known not to work.
+
+    The cache is keyed by domain and can be shared between multiple
+    :class:`Client` instances.
+
+    .. attribute:: ttl
+
+       Time for which the discovered options are used before
+       :func:`discover_connectors` is called again. The option with which the
+       last connection succeeded does not expire; it is discarded when a
+       connection attempt with it fails.
+
+    .. automethod:: get_options
+
+    .. automethod:: set_options
+
+    .. automethod:: forget_options
+
+    .. automethod:: get_preferred
+
+    .. automethod:: set_preferred
+
+    .. automethod:: forget_preferred
+
+    .. automethod:: clear
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, *, ttl=300):
+        super().__init__()
+        self.ttl = ttl
+        self._options = {}
+        self._preferred = {}
+
+    def get_options(self, domain):
+        """
+        Return the cached connection options for `domain`.
+
+        :raises KeyError: if there are no options for `domain` or if they
+            have expired.
+        """
+        options, expires_at = self._options[domain]
+        if expires_at <= asyncio.get_event_loop().time():
+            del self._options[domain]
+            raise KeyError(domain)
+        return list(options)
+
+    def set_options(self, domain, options):
+        """
+        Store the connection options for `domain` for :attr:`ttl` seconds.
+        """
+        self._options[domain] = (
+            list(options),
+            asyncio.get_event_loop().time() + self.ttl,
+        )
+
+    def forget_options(self, domain):
+        """
+        Remove the connection options for `domain`, if any.
+        """
+        self._options.pop(domain, None)
+
+    def get_preferred(self, domain):
+        """
+        Return the option with which the last connection to `domain`
+        succeeded or :data:`None`.
+        """
+        return self._preferred.get(domain)
+
+    def set_preferred(self, domain, option):
+        """
+        Store the option with which a connection to `domain` succeeded.
+        """
+        self._preferred[domain] = option
+
+    def forget_preferred(self, domain):
+        """
+        Remove the preferred option for `domain`, if any.
+        """
+        self._preferred.pop(domain, None)
+
+    def clear(self):
+        """
+        Remove all entries.
+        """
+        self._options.clear()
+        self._preferred.clear()
+
+
 @asyncio.coroutine
 def connect_xmlstream(
         jid,
@@ -278,7 +543,9 @@ def connect_xmlstream(
         negotiation_timeout=60.,
         override_peer=[],
         loop=None,
-        logger=logger):
+        logger=logger,
+        happy_eyeballs_delay=None,
+        option_cache=None):
     """
     Prepare and connect a :class:`aioxmpp.protocol.XMLStream` to a server
     responsible for the given `jid` and authenticate against that server using
@@ -298,6 +565,12 @@ def connect_xmlstream(
     :type loop: :class:`asyncio.BaseEventLoop`
     :param logger: Logger to use (defaults to module-wide logger)
     :type logger: :class:`logging.Logger`
+    :param happy_eyeballs_delay: Delay between starting connection attempts,
+                                 or :data:`None` to try the options one after
+                                 the other.
+    :type happy_eyeballs_delay: :class:`float` in seconds or :data:`None`
+    :param option_cache: Cache for the connection options.
+    :type option_cache: :class:`ConnectionOptionCache` or :data:`None`
     :raises ValueError: if the domain from the `jid` announces that XMPP is not
                         supported at all.
     :raises aioxmpp.errors.TLSFailure: if all connection attempts fail and one
@@ -332,6 +605,26 @@ def connect_xmlstream(
     fail and the set of encountered errors includes a TLS error, the TLS error
     is re-raised instead of raising a :class:`aioxmpp.errors.MultiOSError`.
 
+    If `happy_eyeballs_delay` is not :data:`None`, the connection options are
+    raced against each other, in the spirit of :rfc:`8305`: the attempts are
+    started in order, the next one being started when the previous one failed
+    or when `happy_eyeballs_delay` seconds passed without a result. The first
+    attempt which establishes the (TLS-secured, if applicable) stream wins;
+    the other attempts are cancelled and their connections closed. SASL is
+    only negotiated on the winning stream. If that fails with
+    :class:`~.errors.SASLUnavailable`, the race continues with the options
+    which have not been attempted yet. In racing mode, the exceptions in the
+    :class:`~.errors.MultiOSError` are in the order in which the attempts
+    failed.
+
+    If `option_cache` is given, the connection option which succeeded last
+    time for the domain of the `jid` is tried directly after the options in
+    `override_peer`. Instead of calling :func:`discover_connectors`, the
+    options from the cache are used if they have not expired yet. If all
+    cached options fail, they are discarded from the cache and
+    :func:`discover_connectors` is used after all. Options which have already
+    failed during the call are not tried again.
+
     Return a triple ``(transport, xmlstream, features)``. `transport`
     the underlying :class:`asyncio.Transport` which is used for the `xmlstream`
     :class:`~.protocol.XMLStream` instance. `features` is the
@@ -345,34 +638,79 @@ def connect_xmlstream(
        The explicit raising of TLS errors has been introduced. Before, TLS
        errors were treated like any other connection error, possibly masking
        configuration problems.
+
+    .. versionchanged:: 0.10
+
+       The `happy_eyeballs_delay` and `option_cache` arguments were added.
     """
     loop = asyncio.get_event_loop() if loop is None else loop
 
+    if happy_eyeballs_delay is None:
+        try_options = _try_options
+    else:
+        try_options = functools.partial(_race_options,
+                                        delay=happy_eyeballs_delay)
+
     options = list(override_peer)
 
     exceptions = []
+    tried = set()
 
-    result = yield from _try_options(
-        options,
-        exceptions,
-        jid, metadata, negotiation_timeout, loop, logger,
-    )
+    @asyncio.coroutine
+    def try_untried(options):
+        # an option which failed before in this call would only fail again;
+        # connectors are stateless, so options from different sources are
+        # compared by their class
+        untried = []
+        for host, port, conn in options:
+            key = host, port, type(conn)
+            if key not in tried:
+                tried.add(key)
+                untried.append((host, port, conn))
+        options = untried
+        return (yield from try_options(
+            options,
+            exceptions,
+            jid, metadata, negotiation_timeout, loop, logger,
+        ))
+
+    result = yield from try_untried(options)
     if result is not None:
-        return result
+        return result[1:]
 
-    options = list((yield from discover_connectors(
-        jid.domain,
-        loop=loop,
-        logger=logger,
-    )))
+    if option_cache is not None:
+        preferred = option_cache.get_preferred(jid.domain)
+        if preferred is not None:
+            result = yield from try_untried([preferred])
+            if result is not None:
+                return result[1:]
+            option_cache.forget_preferred(jid.domain)
+
+        try:
+            options = option_cache.get_options(jid.domain)
+        except KeyError:
+            pass
+        else:
+            result = yield from try_untried(options)
+            if result is None:
+                # the cached options might be outdated
+                option_cache.forget_options(jid.domain)
+
+    if result is None:
+        options = list((yield from discover_connectors(
+            jid.domain,
+            loop=loop,
+            logger=logger,
+        )))
+        if option_cache is not None:
+            option_cache.set_options(jid.domain, options)
+
+        result = yield from try_untried(options)
 
-    result = yield from _try_options(
-        options,
-        exceptions,
-        jid, metadata, negotiation_timeout, loop, logger,
-    )
     if result is not None:
-        return result
+        if option_cache is not None:
+            option_cache.set_preferred(jid.domain, result[0])
+        return result[1:]
 
     if not options and not override_peer:
         raise ValueError("no options to connect to XMPP domain {!r}".format(
@@ -518,6 +856,27 @@ class Client:
 
        .. versionadded:: 0.6
 
+    .. attribute:: happy_eyeballs_delay
+        :annotation: = None
+
+        If not :data:`None`, the connection options are raced against each
+        other when connecting, with attempts being started this many seconds
+        apart. See the `happy_eyeballs_delay` argument to
+        :func:`connect_xmlstream`.
+
+        .. versionadded:: 0.10
+
+    .. attribute:: connection_option_cache
+        :annotation: = None
+
+        A :class:`ConnectionOptionCache` to use when connecting. With a cache,
+        reconnecting first tries the option with which the last connection
+        succeeded and re-uses the discovered options until they expire. The
+        cache may be shared between clients. See the `option_cache` argument
+        to :func:`connect_xmlstream`.
+
+        .. versionadded:: 0.10
+
     .. autoattribute:: resumption_timeout
         :annotation: = None
 
@@ -703,6 +1062,8 @@ class Client:
         self.backoff_factor = 1.2
         self.backoff_cap = timedelta(seconds=60)
         self.override_peer = list(override_peer)
+        self.happy_eyeballs_delay = None
+        self.connection_option_cache = None
         self._max_initial_attempts = max_initial_attempts
         self._resumption_timeout = None
 
@@ -873,6 +1234,12 @@ class Client:
                 ))
         override_peer += self.override_peer
 
+        connect_kwargs = {}
+        if self.happy_eyeballs_delay is not None:
+            connect_kwargs["happy_eyeballs_delay"] = self.happy_eyeballs_delay
+        if self.connection_option_cache is not None:
+            connect_kwargs["option_cache"] = self.connection_option_cache
+
         tls_transport, xmlstream, features = \
             yield from connect_xmlstream(
                 self._local_jid,
@@ -880,7 +1247,8 @@ class Client:
                 negotiation_timeout=self.negotiation_timeout.total_seconds(),
                 override_peer=override_peer,
                 loop=self._loop,
-                logger=self.logger)
+                logger=self.logger,
+                **connect_kwargs)
 
         self._had_connection = True
 
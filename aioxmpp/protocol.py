@@ -160,6 +160,69 @@ class DebugWrapper:
         self._flush()
 
 
+class CoalescingWrapper:
+    """
+    Collect the data written to it and pass it to `dest` in a single write
+    call.
+
+    The collected data is written when the next iteration of the event loop
+    runs (if `max_delay` is zero) or after `max_delay` seconds have passed
+    since the first write into an empty buffer, whichever happens first, or
+    as soon as at least `max_bytes` have been collected.
+
+    This is deliberately not providing a ``flush`` method, because
+    :class:`~.xml.XMPPXMLGenerator` calls that after each top-level element;
+    use :meth:`flush_pending` to force the collected data out.
+    """
+
+    def __init__(self, dest, loop, max_delay, max_bytes):
+        self.dest = dest
+        self._loop = loop
+        self._max_delay = max_delay
+        self._max_bytes = max_bytes
+        self._pieces = []
+        self._size = 0
+        self._handle = None
+
+    def write(self, data):
+        # data may be a memoryview of a buffer which is re-used by the writer,
+        # so we have to copy
+        self._pieces.append(bytes(data))
+        self._size += len(data)
+        if self._size >= self._max_bytes:
+            self.flush_pending()
+        elif self._handle is None:
+            if self._max_delay:
+                self._handle = self._loop.call_later(self._max_delay,
+                                                     self.flush_pending)
+            else:
+                self._handle = self._loop.call_soon(self.flush_pending)
+
+    def flush_pending(self):
+        """
+        Write all collected data to `dest` immediately.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._pieces:
+            return
+        data = b"".join(self._pieces)
+        self._pieces.clear()
+        self._size = 0
+        self.dest.write(data)
+
+    def discard(self):
+        """
+        Drop all collected data without writing it.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        self._pieces.clear()
+        self._size = 0
+
+
 class XMLStream(asyncio.Protocol):
     """
     XML stream implementation. This is an streaming :class:`asyncio.Protocol`
@@ -182,6 +245,37 @@ class XMLStream(asyncio.Protocol):
     child for logging purposes. This eases debugging and allows for
     connection-specific loggers.
 
+    `parser_factory` may be a callable which returns a new incremental XML
+    parser each time it is called; the default is
+    :func:`aioxmpp.xml.make_parser`. Passing :class:`aioxmpp.xml.ExpatParser`
+    selects the parser backend which drives :mod:`pyexpat` directly, which is
+    considerably faster for stanza-heavy streams.
+
+    `coalesce_delay` enables write coalescing if it is not :data:`None`. In
+    that case, the data of XSOs sent with :meth:`send_xso` is collected and
+    written to the transport in one piece, instead of writing each XSO
+    separately. The data is written at the latest after `coalesce_delay`
+    seconds (with zero meaning at the end of the current event loop
+    iteration) or as soon as at least `coalesce_max_bytes` bytes have been
+    collected. Elements which are not stanzas (such as stream management
+    acknowledgements and requests or stream negotiation elements) are always
+    written immediately, together with any collected data. Write coalescing
+    saves system calls and TLS records when many small stanzas are sent in
+    bursts.
+
+    `limits` may be a :class:`aioxmpp.xml.StanzaLimits` instance which
+    restricts the size and shape of received stanzas. The limits are enforced
+    while the stanza is parsed; a stanza which exceeds a limit causes a
+    ``policy-violation`` stream error and the stream is closed. The byte limit
+    is checked on slices of the received data (see :attr:`LIMITS_SLICE_SIZE`)
+    and may thus be exceeded by up to two slices before the violation is
+    detected.
+
+    .. versionchanged:: 0.10
+
+       The `parser_factory`, `coalesce_delay`, `coalesce_max_bytes` and
+       `limits` arguments were added.
+
     Receiving XSOs:
 
     .. attribute:: stanza_parser
@@ -254,13 +348,27 @@ class XMLStream(asyncio.Protocol):
     on_closing = callbacks.Signal()
     shutdown_timeout = 15
 
+    #: Size of the slices in which received data is fed to the parser if a
+    #: byte limit for stanzas is set.
+    LIMITS_SLICE_SIZE = 4096
+
     def __init__(self, to,
                  features_future,
                  sorted_attributes=False,
                  base_logger=logging.getLogger("aioxmpp"),
-                 loop=None):
+                 loop=None,
+                 parser_factory=None,
+                 coalesce_delay=None,
+                 coalesce_max_bytes=16384,
+                 limits=None):
         self._to = to
         self._sorted_attributes = sorted_attributes
+        self._parser_factory = parser_factory
+        self._coalesce_delay = coalesce_delay
+        self._coalesce_max_bytes = coalesce_max_bytes
+        self._coalescer = None
+        self._limits = limits
+        self._rx_stanza_bytes = 0
         self._logger = base_logger.getChild("XMLStream")
         self._transport = None
         self._features_future = features_future
@@ -302,10 +410,15 @@ class XMLStream(asyncio.Protocol):
             text += " (at: {})".format(at)
         return RuntimeError(text)
 
+    def _flush_pending_writes(self):
+        if self._coalescer is not None:
+            self._coalescer.flush_pending()
+
     def _close_transport(self):
         if self._transport_closing:
             return
         self._transport_closing = True
+        self._flush_pending_writes()
         self._transport.close()
 
     def _stream_starts_closing(self, task):
@@ -422,9 +535,39 @@ class XMLStream(asyncio.Protocol):
         self._features_future.set_result(features)
         self._features_future = None
 
+    def _rx_feed_limited(self, blob):
+        limits = self._limits
+        parser = self._parser
+        processor = self._processor
+        step = self.LIMITS_SLICE_SIZE
+        for offset in range(0, len(blob), step):
+            if self._processor is not processor:
+                # the stream was reset or killed by a callback; the data
+                # belongs to the parser it was received for
+                parser.feed(blob[offset:])
+                return
+            events = processor.stream_level_events
+            chunk = blob[offset:offset+step]
+            parser.feed(chunk)
+            if processor.stream_level_events != events:
+                # the slice reached the stream level (a stanza ended or data
+                # between stanzas was seen); without byte offsets from the
+                # parser, the remainder of the slice is not counted
+                self._rx_stanza_bytes = 0
+                continue
+            # everything else belongs to a stanza, including the start tag
+            # which is still being received
+            self._rx_stanza_bytes += len(chunk)
+            if self._rx_stanza_bytes > limits.max_stanza_bytes:
+                raise limits.violation("stanza_bytes", self._rx_stanza_bytes)
+
     def _rx_feed(self, blob):
         try:
-            self._parser.feed(blob)
+            if (self._limits is not None and
+                    self._limits.max_stanza_bytes is not None):
+                self._rx_feed_limited(blob)
+            else:
+                self._parser.feed(blob)
         except sax.SAXParseException as exc:
             if     (exc.getException().args[0].startswith(
                     pyexpat.errors.XML_ERROR_UNDEFINED_ENTITY)):
@@ -522,6 +665,7 @@ class XMLStream(asyncio.Protocol):
                 self._smachine.state == State.CLOSED):
             return
         self._writer.close()
+        self._flush_pending_writes()
         if self._transport.can_write_eof():
             self._transport.write_eof()
         if self._smachine.state == State.STREAM_HEADER_SENT:
@@ -550,6 +694,14 @@ class XMLStream(asyncio.Protocol):
         if self._writer:
             self._writer.abort()
 
+        if self._coalescer is not None:
+            if self._smachine.state == State.CLOSED:
+                # the transport is gone, nothing can be written anymore
+                self._coalescer.discard()
+            else:
+                self._coalescer.flush_pending()
+            self._coalescer = None
+
         self._processor = None
         self._parser = None
 
@@ -561,13 +713,26 @@ class XMLStream(asyncio.Protocol):
         self._processor.on_stream_header = self._rx_stream_header
         self._processor.on_stream_footer = self._rx_stream_footer
         self._processor.on_exception = self._rx_exception
-        self._parser = xml.make_parser()
+        self._processor.limits = self._limits
+        self._rx_stanza_bytes = 0
+        if self._parser_factory is None:
+            self._parser = xml.make_parser()
+        else:
+            self._parser = self._parser_factory()
         self._parser.setContentHandler(self._processor)
 
+        dest = self._transport
+        if self._coalesce_delay is not None:
+            self._coalescer = CoalescingWrapper(
+                dest,
+                self._loop,
+                self._coalesce_delay,
+                self._coalesce_max_bytes,
+            )
+            dest = self._coalescer
+
         if self._logger.getEffectiveLevel() <= logging.DEBUG:
-            dest = DebugWrapper(self._transport, self._logger)
-        else:
-            dest = self._transport
+            dest = DebugWrapper(dest, self._logger)
         self._writer = xml.XMLStreamWriter(
             dest,
             self._to,
@@ -593,6 +758,7 @@ class XMLStream(asyncio.Protocol):
         self._require_connection(accept_partial=True)
         self._reset_state()
         self._writer.start()
+        self._flush_pending_writes()
         self._smachine.rewind(State.STREAM_HEADER_SENT)
 
     def abort(self):
@@ -615,6 +781,7 @@ class XMLStream(asyncio.Protocol):
         if self._smachine.state == State.READY:
             self._smachine.state = State.CLOSED
             return
+        self._flush_pending_writes()
         if     (self._smachine.state != State.CLOSING and
                 self._transport.can_write_eof()):
             self._transport.write_eof()
@@ -646,9 +813,16 @@ class XMLStream(asyncio.Protocol):
            *no* content is sent over the stream. The stream is still valid and
            usable afterwards.
 
+        If write coalescing is enabled (see `coalesce_delay`), stanzas may be
+        written to the transport after :meth:`send_xso` returns; all other
+        XSOs are written immediately.
+
         """
         self._require_connection()
         self._writer.send(obj)
+        if     (self._coalescer is not None and
+                not isinstance(obj, stanza.StanzaBase)):
+            self._coalescer.flush_pending()
 
     def can_starttls(self):
         """
@@ -681,6 +855,7 @@ class XMLStream(asyncio.Protocol):
         if not self.can_starttls():
             raise RuntimeError("starttls not available on transport")
 
+        self._flush_pending_writes()
         yield from self._transport.starttls(ssl_context,
                                             post_handshake_callback)
         self._reset_state()
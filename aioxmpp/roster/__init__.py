@@ -42,6 +42,8 @@ This subpackage provides :class:`.RosterClient`, a service to interact with
 
 .. autoclass:: Item
 
+.. autoclass:: RosterJournal
+
 .. module:: aioxmpp.roster.xso
 
 .. currentmodule:: aioxmpp.roster.xso
@@ -65,4 +67,5 @@ versioning:
 """
 
 from .service import RosterClient, Item  # NOQA
+from .journal import RosterJournal  # NOQA
 Service = RosterClient  # NOQA
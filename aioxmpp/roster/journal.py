@@ -0,0 +1,209 @@
+########################################################################
+# File name: journal.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import json
+import logging
+import os
+import pathlib
+import tempfile
+
+
+logger = logging.getLogger(__name__)
+
+
+class RosterJournal:
+    """
+    Persistent roster store which records changes in an append-only journal.
+
+    :param path: Path to the journal file.
+    :type path: :class:`pathlib.Path`
+    :param compact_after: Number of records after which the journal is
+                          compacted.
+    :type compact_after: :class:`int`
+
+    The journal is a text file with one JSON object per line. Each line either
+    sets a roster item (using the format of :meth:`.Item.export_as_json`),
+    removes a roster item or sets the roster version. Replaying the journal
+    from the beginning yields the roster as it was when the last record was
+    written.
+
+    This allows to persist a roster for roster versioning (:rfc:`6121`) without
+    serialising the whole roster on each roster push: only the changed items
+    are appended. Once more than `compact_after` records have been appended,
+    :attr:`needs_compaction` becomes true and the owner is expected to call
+    :meth:`compact`, which rewrites the journal with one record per item.
+
+    A record which has only partially been written (e.g. because the process
+    was killed) is discarded when loading.
+
+    Use :attr:`.RosterClient.journal` to attach a journal to a roster client.
+
+    .. autoattribute:: path
+
+    .. autoattribute:: needs_compaction
+
+    .. automethod:: load
+
+    .. automethod:: append
+
+    .. automethod:: compact
+
+    .. automethod:: discard
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, path, *, compact_after=1000):
+        super().__init__()
+        self._path = pathlib.Path(path)
+        self._compact_after = compact_after
+        self._nappended = 0
+
+    @property
+    def path(self):
+        """
+        The path of the journal file.
+        """
+        return self._path
+
+    @property
+    def needs_compaction(self):
+        """
+        Whether more than `compact_after` records have been appended since the
+        journal was last compacted.
+        """
+        return self._nappended > self._compact_after
+
+    def load(self):
+        """
+        Replay the journal.
+
+        :return: The roster version and a dictionary which maps the string
+                 representations of the JIDs to the item data.
+        :rtype: pair of :class:`str` (or :data:`None`) and :class:`dict`
+
+        :raises ValueError: if a record is corrupt.
+        :raises OSError: if the file cannot be read.
+
+        If the file does not exist, the roster is empty and the version is
+        :data:`None`.
+        """
+        version = None
+        items = {}
+        nrecords = 0
+
+        try:
+            data = self._path.read_bytes()
+        except FileNotFoundError:
+            return version, items
+
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            logger.debug("discarding partial record at end of %s",
+                         self._path)
+            with self._path.open("r+b") as f:
+                f.truncate(end)
+
+        for lineno, line in enumerate(data[:end].splitlines(), 1):
+            record = json.loads(line.decode("utf-8"))
+            nrecords += 1
+            try:
+                if "ver" in record:
+                    version = record["ver"]
+                elif record.get("remove"):
+                    items.pop(record["jid"], None)
+                else:
+                    items[record["jid"]] = record["item"]
+            except (AttributeError, KeyError, TypeError) as exc:
+                raise ValueError(
+                    "malformed record in line {} of {}".format(
+                        lineno,
+                        self._path,
+                    )
+                ) from exc
+
+        # records which a compacted journal would not contain
+        self._nappended = max(nrecords - len(items) - 1, 0)
+        return version, items
+
+    def append(self, version, changes):
+        """
+        Append changes to the journal.
+
+        :param version: The roster version after the changes.
+        :type version: :class:`str` or :data:`None`
+        :param changes: Pairs of the string representation of a JID and the
+                        item data; the data is :data:`None` for removed items.
+        :type changes: iterable of pairs
+        """
+        lines = []
+        for jid, data in changes:
+            if data is None:
+                record = {"jid": jid, "remove": True}
+            else:
+                record = {"jid": jid, "item": data}
+            lines.append(json.dumps(record, sort_keys=True))
+        lines.append(json.dumps({"ver": version}))
+
+        with self._path.open("a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+        self._nappended += len(lines)
+
+    def compact(self, version, items):
+        """
+        Replace the journal with a snapshot of the roster.
+
+        :param version: The current roster version.
+        :type version: :class:`str` or :data:`None`
+        :param items: The roster items.
+        :type items: :class:`dict` mapping the string representation of the
+                     JIDs to the item data
+
+        The new file replaces the old file atomically.
+        """
+        with tempfile.NamedTemporaryFile(mode="w",
+                                         encoding="utf-8",
+                                         dir=str(self._path.parent),
+                                         delete=False) as tmpf:
+            try:
+                for jid, data in sorted(items.items()):
+                    tmpf.write(json.dumps({"jid": jid, "item": data},
+                                          sort_keys=True))
+                    tmpf.write("\n")
+                tmpf.write(json.dumps({"ver": version}))
+                tmpf.write("\n")
+            except:  # NOQA
+                os.unlink(tmpf.name)
+                raise
+
+        os.replace(tmpf.name, str(self._path))
+        self._nappended = 0
+
+    def discard(self):
+        """
+        Delete the journal file, if it exists.
+        """
+        try:
+            self._path.unlink()
+        except FileNotFoundError:
+            pass
+        self._nappended = 0
@@ -374,6 +374,12 @@ class RosterClient(aioxmpp.service.Service):
     services won’t delete roster contents between two connections on the same
     :class:`.Client` instance.
 
+    For large rosters, exporting and importing the whole roster is expensive.
+    Alternatively, a :class:`~aioxmpp.roster.RosterJournal` can be attached,
+    which only records the changes:
+
+    .. autoattribute:: journal
+
     .. versionchanged:: 0.8
 
        This class was formerly known as :class:`aioxmpp.roster.Service`. It
@@ -413,6 +419,97 @@ class RosterClient(aioxmpp.service.Service):
         self.items = {}
         self.groups = {}
         self.version = None
+        self._journal = None
+        self._journal_loaded = False
+
+    @property
+    def journal(self):
+        """
+        The :class:`~aioxmpp.roster.RosterJournal` used to persist the roster,
+        or :data:`None` (the default).
+
+        The journal is loaded lazily: its contents replace the roster (like
+        :meth:`import_from_json` does) right before the roster is requested
+        from the server for the first time after the journal has been set.
+        Afterwards, each roster push is appended to the journal, and a full
+        roster sent by the server replaces the journal contents. The journal
+        is compacted when it has grown too much (see
+        :attr:`~aioxmpp.roster.RosterJournal.needs_compaction`). The file
+        operations run in the default executor of the event loop.
+
+        If the journal cannot be read or is corrupt, the error is logged, the
+        journal is discarded and the full roster is requested from the
+        server.
+
+        .. versionadded:: 0.10
+        """
+        return self._journal
+
+    @journal.setter
+    def journal(self, value):
+        self._journal = value
+        self._journal_loaded = False
+
+    @asyncio.coroutine
+    def _load_journal(self):
+        logger.debug("loading roster from journal %s", self._journal.path)
+        self._journal_loaded = True
+        loop = asyncio.get_event_loop()
+        try:
+            version, items = yield from loop.run_in_executor(
+                None,
+                self._journal.load,
+            )
+            self._import_items(version, items)
+        except (OSError, ValueError, KeyError, AttributeError, TypeError):
+            logger.exception("failed to load roster journal, discarding it")
+            # request the full roster; it replaces the journal contents
+            self._import_items(None, {})
+            try:
+                yield from loop.run_in_executor(None, self._journal.discard)
+            except OSError:
+                logger.exception("failed to discard roster journal")
+
+    @asyncio.coroutine
+    def _compact_journal(self):
+        items = {
+            str(jid): item.export_as_json()
+            for jid, item in self.items.items()
+        }
+        try:
+            yield from asyncio.get_event_loop().run_in_executor(
+                None,
+                self._journal.compact,
+                self.version,
+                items,
+            )
+        except OSError:
+            logger.exception("failed to compact roster journal")
+
+    @asyncio.coroutine
+    def _append_to_journal(self, xso_items):
+        changes = []
+        for xso_item in xso_items:
+            try:
+                item = self.items[xso_item.jid]
+            except KeyError:
+                changes.append((str(xso_item.jid), None))
+            else:
+                changes.append((str(xso_item.jid), item.export_as_json()))
+
+        try:
+            yield from asyncio.get_event_loop().run_in_executor(
+                None,
+                self._journal.append,
+                self.version,
+                changes,
+            )
+        except OSError:
+            logger.exception("failed to append to roster journal")
+            return
+
+        if self._journal.needs_compaction:
+            yield from self._compact_journal()
 
     def _update_entry(self, xso_item):
         try:
@@ -494,6 +591,9 @@ class RosterClient(aioxmpp.service.Service):
 
             self.version = request.ver
 
+            if self._journal is not None and self._journal_loaded:
+                yield from self._append_to_journal(request.items)
+
     @aioxmpp.dispatcher.presence_handler(
         aioxmpp.structs.PresenceType.SUBSCRIBE,
         None)
@@ -535,6 +635,9 @@ class RosterClient(aioxmpp.service.Service):
         iq.payload = roster_xso.Query()
 
         with (yield from self.__roster_lock):
+            if self._journal is not None and not self._journal_loaded:
+                yield from self._load_journal()
+
             logger.debug("requesting initial roster")
             if self.client.stream_features.has_feature(
                     roster_xso.RosterVersioningFeature):
@@ -570,6 +673,9 @@ class RosterClient(aioxmpp.service.Service):
             for item in response.items:
                 self._update_entry(item)
 
+            if self._journal is not None:
+                yield from self._compact_journal()
+
             self.on_initial_roster_received()
             return True
 
@@ -598,11 +704,14 @@ class RosterClient(aioxmpp.service.Service):
         be used for roster versioning. See below (in the docs of
         :class:`Service`).
         """
-        self.version = data.get("ver", None)
+        self._import_items(data.get("ver", None), data.get("items", {}))
+
+    def _import_items(self, version, items):
+        self.version = version
 
         self.items.clear()
         self.groups.clear()
-        for jid, data in data.get("items", {}).items():
+        for jid, data in items.items():
             jid = structs.JID.fromstr(jid)
             item = Item(jid)
             item.update_from_json(data)
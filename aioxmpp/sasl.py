@@ -31,19 +31,36 @@ It provides an XMPP adaptor for :mod:`aiosasl`.
 
 .. autoclass:: SASLXMPPInterface
 
+SCRAM key caching
+=================
+
+.. autoclass:: SCRAMKeyCache
+
+.. autoclass:: CachingSCRAM
+
 The XSOs for SASL authentication can be found in :mod:`aioxmpp.nonza`.
 
 """
 
 import asyncio
+import base64
+import functools
+import hashlib
+import hmac
 import logging
+import os
+import random
 
 import aiosasl
+import aiosasl.stringprep
 
 from . import protocol, nonza
+from .cache import LRUDict
 
 logger = logging.getLogger(__name__)
 
+_system_random = random.SystemRandom()
+
 
 class SASLXMPPInterface(aiosasl.SASLInterface):
     def __init__(self, xmlstream):
@@ -107,3 +124,307 @@ class SASLXMPPInterface(aiosasl.SASLInterface):
                 text="unexpected non-failure after abort: "
                 "{}".format(self._state)
             )
+
+
+class SCRAMKeyCache:
+    """
+    Cache for the salted passwords which SCRAM derives from a password.
+
+    :param maxsize: Maximum number of cached entries.
+    :type maxsize: :class:`int`
+    :param loop: Event loop whose default executor runs the key derivation.
+
+    The key derivation of SCRAM (:rfc:`5802`) runs PBKDF2 with the iteration
+    count chosen by the server, which takes a noticeable amount of CPU time.
+    This cache keeps the derived ``SaltedPassword`` per account, password,
+    salt, iteration count and hash function, so that a reconnect does not
+    repeat the derivation, and runs the derivation which cannot be avoided in
+    an executor instead of on the event loop.
+
+    The account is identified by the bare JID, so that users with the same
+    localpart on different domains never share an entry. Instead of the
+    password, an HMAC of the password is stored, keyed with a random secret
+    which is generated for each cache. An entry is only used if the password
+    matches the one it was derived from, and the cache cannot be used to test
+    password guesses without also knowing the secret. A changed password thus
+    simply derives a new entry; the old entry is evicted eventually.
+
+    A single cache can be shared between any number of accounts and
+    :class:`~aioxmpp.security_layer.PasswordSASLProvider` instances. Pass it
+    as `scram_key_cache` to
+    :class:`~aioxmpp.security_layer.PasswordSASLProvider` to use it with
+    :class:`CachingSCRAM`.
+
+    .. automethod:: derive
+
+    .. automethod:: discard
+
+    .. automethod:: clear
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, *, maxsize=1024, loop=None):
+        super().__init__()
+        self._loop = loop
+        self._secret = os.urandom(32)
+        self._entries = LRUDict()
+        self._entries.maxsize = maxsize
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _key(self, account, encoded_password, salt, iteration_count,
+             hashfun_name):
+        password_digest = hmac.new(
+            self._secret,
+            encoded_password,
+            hashlib.sha256,
+        ).digest()
+        return (account, password_digest, salt, iteration_count,
+                hashfun_name)
+
+    @asyncio.coroutine
+    def derive(self, account, encoded_password, salt, iteration_count,
+               hashfun_name):
+        """
+        Return the salted password for the given parameters.
+
+        :param account: The account which authenticates.
+        :type account: :class:`aioxmpp.JID`
+        :param encoded_password: The prepared and encoded password.
+        :type encoded_password: :class:`bytes`
+        :param salt: The salt announced by the server.
+        :type salt: :class:`bytes`
+        :param iteration_count: The iteration count announced by the server.
+        :type iteration_count: :class:`int`
+        :param hashfun_name: The name of the hash function, as accepted by
+                             :func:`hashlib.new`.
+        :type hashfun_name: :class:`str`
+        :rtype: :class:`bytes`
+
+        `account` should be the bare JID of the account; any hashable value
+        which identifies the account can be used.
+
+        If the salted password is not cached yet, it is derived in the default
+        executor of the event loop and stored in the cache.
+        """
+        key = self._key(account, encoded_password, salt, iteration_count,
+                        hashfun_name)
+        try:
+            return self._entries[key]
+        except KeyError:
+            pass
+
+        loop = self._loop or asyncio.get_event_loop()
+        salted_password = yield from loop.run_in_executor(
+            None,
+            hashlib.pbkdf2_hmac,
+            hashfun_name,
+            encoded_password,
+            salt,
+            iteration_count,
+        )
+        self._entries[key] = salted_password
+        return salted_password
+
+    def discard(self, account, encoded_password, salt, iteration_count,
+                hashfun_name):
+        """
+        Remove the entry for the given parameters, if it exists.
+
+        The arguments are the same as for :meth:`derive`.
+        """
+        self._entries.pop(
+            self._key(account, encoded_password, salt, iteration_count,
+                      hashfun_name),
+            None
+        )
+
+    def clear(self):
+        """
+        Remove all cached entries.
+        """
+        self._entries.clear()
+
+
+def _xor_bytes(a, b):
+    return bytes(x ^ y for x, y in zip(a, b))
+
+
+class CachingSCRAM(aiosasl.SCRAM):
+    """
+    The SCRAM (non-PLUS) SASL mechanism, deriving the keys using a
+    :class:`SCRAMKeyCache`.
+
+    :param credential_provider: A coroutine function which returns
+                                credentials.
+    :param key_cache: The cache to use for the derived keys.
+    :type key_cache: :class:`SCRAMKeyCache`
+    :param account: The account which authenticates.
+    :type account: :class:`aioxmpp.JID` or :data:`None`
+    :param after_scram_plus: Use the GS2 header which signals that SCRAM-PLUS
+                             is supported.
+    :type after_scram_plus: :class:`bool`
+
+    This implements the client side of the :rfc:`5802` exchange like
+    :class:`aiosasl.SCRAM`, but obtains the salted password from `key_cache`
+    via :meth:`SCRAMKeyCache.derive`. Further keyword arguments are passed to
+    :class:`aiosasl.SCRAM`.
+
+    `account` is passed to :meth:`SCRAMKeyCache.derive` and should be the bare
+    JID of the account. If it is :data:`None`, the user name returned by
+    `credential_provider` is used instead, which is only safe if the cache is
+    not shared between accounts on different domains.
+
+    If the authentication fails, the cache entry which has been used is
+    discarded, so that the next attempt derives the keys again.
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, credential_provider, *, key_cache, account=None,
+                 after_scram_plus=False, **kwargs):
+        super().__init__(credential_provider,
+                         after_scram_plus=after_scram_plus,
+                         **kwargs)
+        self._user_credential_provider = credential_provider
+        self._key_cache = key_cache
+        self._account = account
+        self._gs2_header = b"y,," if after_scram_plus else b"n,,"
+
+    @asyncio.coroutine
+    def authenticate(self, sm, token):
+        mechanism, info = token
+        logger.info("attempting %s mechanism (using %s hashfun)",
+                    mechanism,
+                    info)
+
+        hashfun_factory = functools.partial(hashlib.new, info.hashfun_name)
+
+        username, password = yield from self._user_credential_provider()
+        encoded_username = aiosasl.stringprep.saslprep(
+            username,
+            allow_unassigned=True,
+        ).encode("utf-8")
+        encoded_password = aiosasl.stringprep.saslprep(
+            password
+        ).encode("utf-8")
+        account = self._account
+        if account is None:
+            account = encoded_username
+
+        our_nonce = base64.b64encode(_system_random.getrandbits(
+            self.nonce_length * 8
+        ).to_bytes(
+            self.nonce_length, "little"
+        ))
+
+        auth_message = b"n=" + encoded_username + b",r=" + our_nonce
+        state, payload = yield from sm.initiate(
+            mechanism,
+            self._gs2_header + auth_message)
+
+        if state != aiosasl.SASLState.CHALLENGE or payload is None:
+            yield from sm.abort()
+            raise aiosasl.SASLFailure(
+                None,
+                text="protocol violation: expected challenge with payload")
+
+        auth_message += b"," + payload
+
+        parsed_payload = dict(self.parse_message(payload))
+
+        try:
+            iteration_count = int(parsed_payload[b"i"])
+            nonce = parsed_payload[b"r"]
+            salt = base64.b64decode(parsed_payload[b"s"])
+        except (ValueError, KeyError):
+            yield from sm.abort()
+            raise aiosasl.SASLFailure(
+                None,
+                text="malformed server message: {!r}".format(payload),
+            )
+
+        if not nonce.startswith(our_nonce):
+            yield from sm.abort()
+            raise aiosasl.SASLFailure(
+                None,
+                text="server nonce doesn't fit our nonce")
+
+        if (self.enforce_minimum_iteration_count and
+                iteration_count < info.minimum_iteration_count):
+            raise aiosasl.SASLFailure(
+                None,
+                text="minimum iteration count for {} violated "
+                "({} is less than {})".format(
+                    mechanism,
+                    iteration_count,
+                    info.minimum_iteration_count,
+                )
+            )
+
+        cache_key = (account, encoded_password, salt, iteration_count,
+                     info.hashfun_name)
+        salted_password = yield from self._key_cache.derive(*cache_key)
+
+        try:
+            client_key = hmac.new(
+                salted_password,
+                b"Client Key",
+                hashfun_factory).digest()
+
+            stored_key = hashfun_factory(client_key).digest()
+
+            reply = (b"c=" + base64.b64encode(self._gs2_header) +
+                     b",r=" + nonce)
+
+            auth_message += b"," + reply
+
+            client_proof = _xor_bytes(
+                hmac.new(
+                    stored_key,
+                    auth_message,
+                    hashfun_factory).digest(),
+                client_key)
+
+            try:
+                state, payload = yield from sm.response(
+                    reply + b",p=" + base64.b64encode(client_proof)
+                )
+            except aiosasl.SASLFailure as err:
+                raise err.promote_to_authentication_failure() from None
+
+            # this is the pseudo-challenge for the server signature
+            # we have to reply with the empty string!
+            if state != aiosasl.SASLState.CHALLENGE:
+                raise aiosasl.SASLFailure(
+                    "malformed-request",
+                    text="SCRAM protocol violation")
+
+            state, dummy_payload = yield from sm.response(b"")
+            if (state != aiosasl.SASLState.SUCCESS or
+                    dummy_payload is not None):
+                raise aiosasl.SASLFailure(
+                    None,
+                    "SASL protocol violation")
+
+            server_signature = hmac.new(
+                hmac.new(
+                    salted_password,
+                    b"Server Key",
+                    hashfun_factory).digest(),
+                auth_message,
+                hashfun_factory).digest()
+
+            parsed_payload = dict(self.parse_message(payload or b""))
+
+            if base64.b64decode(parsed_payload[b"v"]) != server_signature:
+                raise aiosasl.SASLFailure(
+                    None,
+                    "authentication successful, but server signature "
+                    "invalid",
+                )
+        except aiosasl.AuthenticationFailure:
+            self._key_cache.discard(*cache_key)
+            raise
@@ -40,6 +40,10 @@ for example using :class:`aioxmpp.Client`.
 
 .. autoclass:: SecurityLayer(ssl_context_factory, certificate_verifier_factory, tls_required, sasl_providers)
 
+.. autoclass:: TLSContextCache
+
+.. autofunction:: default_tls_context_cache
+
 .. autofunction:: negotiate_sasl
 
 Certificate verifiers
@@ -121,6 +125,8 @@ import enum
 import functools
 import logging
 import ssl
+import time
+import weakref
 
 import pyasn1
 import pyasn1.codec.der.decoder
@@ -132,6 +138,7 @@ import OpenSSL.SSL
 import aiosasl
 
 from . import errors, sasl, nonza, xso, protocol
+from .cache import LRUDict
 from .utils import namespaces
 
 
@@ -234,6 +241,21 @@ def check_x509_hostname(x509, hostname):
     return True
 
 
+_hostname_check_cache = LRUDict()
+_hostname_check_cache.maxsize = 128
+
+
+def _check_x509_hostname_cached(x509, hostname):
+    key = x509.digest("sha256"), hostname
+    try:
+        return _hostname_check_cache[key]
+    except KeyError:
+        pass
+    result = check_x509_hostname(x509, hostname)
+    _hostname_check_cache[key] = result
+    return result
+
+
 class CertificateVerifier(metaclass=abc.ABCMeta):
     """
     A certificate verifier hooks into the two mechanisms provided by
@@ -250,16 +272,48 @@ class CertificateVerifier(metaclass=abc.ABCMeta):
     which is called before STARTTLS is intiiated is provided.
 
     This baseclass provides a bit of boilerplate.
+
+    .. automethod:: setup_context
+
+    .. automethod:: setup_connection
+
+    .. attribute:: supports_session_resumption
+
+       If true, TLS sessions established using this verifier may be resumed
+       by a :class:`TLSContextCache`. A resumed handshake does not present the
+       certificate again, so :meth:`verify_callback` is not called for it.
+       This is :data:`False` by default and must only be set by verifiers
+       whose decision does not change between connections to the same server.
+
+       .. versionadded:: 0.10
     """
 
+    supports_session_resumption = False
+
     @asyncio.coroutine
     def pre_handshake(self, metadata, domain, host, port):
         pass
 
     def setup_context(self, ctx, transport):
-        self.transport = transport
+        """
+        Configure the :class:`OpenSSL.SSL.Context` `ctx` for use with this
+        verifier and call :meth:`setup_connection`.
+        """
+        self.setup_connection(transport)
         ctx.set_verify(OpenSSL.SSL.VERIFY_PEER, self.verify_callback)
 
+    def setup_connection(self, transport):
+        """
+        Bind the verifier to `transport`.
+
+        This is called by :meth:`setup_context` and by
+        :class:`TLSContextCache` instead of :meth:`setup_context` when a
+        shared context which has already been configured is used.
+
+        .. versionadded:: 0.10
+        """
+        self.transport = transport
+
     @abc.abstractmethod
     def verify_callback(self, conn, x509, errno, errdepth, returncode):
         return returncode
@@ -271,8 +325,10 @@ class CertificateVerifier(metaclass=abc.ABCMeta):
 
 
 class _NullVerifier(CertificateVerifier):
+    supports_session_resumption = True
+
     def setup_context(self, ctx, transport):
-        self.transport = transport
+        self.setup_connection(transport)
         ctx.set_verify(OpenSSL.SSL.VERIFY_NONE, self.verify_callback)
 
     def verify_callback(self, *args):
@@ -290,8 +346,20 @@ class PKIXCertificateVerifier(CertificateVerifier):
 
     The :meth:`verify_callback` checks that the certificate subject matches the
     domain name of the JID of the connection.
+
+    The result of the host name check is cached per certificate fingerprint
+    and host name, so that it is not repeated on each reconnect. The PKIX
+    verification itself is always done by OpenSSL.
+
+    .. versionchanged:: 0.10
+
+       The result of the host name check is cached and TLS sessions
+       established with this verifier may be resumed (see
+       :class:`TLSContextCache`).
     """
 
+    supports_session_resumption = True
+
     def verify_callback(self, ctx, x509, errno, errdepth, returncode):
         logger.info("verifying certificate (preverify=%s)", returncode)
 
@@ -301,7 +369,7 @@ class PKIXCertificateVerifier(CertificateVerifier):
 
         if errdepth == 0:
             hostname = self.transport.get_extra_info("server_hostname")
-            if not check_x509_hostname(
+            if not _check_x509_hostname_cached(
                     x509,
                     hostname):
                 logger.warning("certificate hostname mismatch "
@@ -907,6 +975,9 @@ class PasswordSASLProvider(SASLProvider):
     :param max_auth_attempts: Maximum number of authentication attempts with a
                               single mechansim.
     :type max_auth_attempts: positive :class:`int`
+    :param scram_key_cache: Cache for the keys derived by SCRAM.
+    :type scram_key_cache: :class:`aioxmpp.sasl.SCRAMKeyCache` or
+                           :data:`None`
 
     `password_provider` must be a coroutine taking two arguments, a JID and an
     integer number. The first argument is the JID which is trying to
@@ -918,20 +989,35 @@ class PasswordSASLProvider(SASLProvider):
     :class:`aiosasl.AuthenticationFailure` error will be raised.
 
     The SASL mechanisms used depend on whether TLS has been negotiated
-    successfully before. In any case, :class:`aiosasl.SCRAM` is used. If TLS has
-    been negotiated, :class:`aiosasl.PLAIN` is also supported.
+    successfully before. In any case, :class:`aiosasl.SCRAM` is used. If TLS
+    has been negotiated, :class:`aiosasl.PLAIN` is also supported.
+
+    If `scram_key_cache` is not :data:`None`,
+    :class:`aioxmpp.sasl.CachingSCRAM` is used instead of
+    :class:`aiosasl.SCRAM`. The expensive key derivation of SCRAM then runs in
+    an executor and its result is reused when authenticating again as the
+    same account (bare JID) with the same password, salt and iteration count
+    (for example on a reconnect). The same cache can be shared between
+    providers.
 
     .. seealso::
 
        :class:`SASLProvider`
           for the public interface of this class.
+
+    .. versionchanged:: 0.10
+
+       The `scram_key_cache` argument was added.
     """
 
     def __init__(self, password_provider, *,
-                 max_auth_attempts=3, **kwargs):
+                 max_auth_attempts=3,
+                 scram_key_cache=None,
+                 **kwargs):
         super().__init__(**kwargs)
         self._password_provider = password_provider
         self._max_auth_attempts = max_auth_attempts
+        self._scram_key_cache = scram_key_cache
 
     @asyncio.coroutine
     def execute(self,
@@ -961,9 +1047,14 @@ class PasswordSASLProvider(SASLProvider):
             cached_credentials = password
             return client_jid.localpart, password
 
-        classes = [
-            aiosasl.SCRAM
-        ]
+        if self._scram_key_cache is not None:
+            classes = [
+                sasl.CachingSCRAM
+            ]
+        else:
+            classes = [
+                aiosasl.SCRAM
+            ]
         if tls_transport is not None:
             classes.append(aiosasl.PLAIN)
 
@@ -975,7 +1066,14 @@ class PasswordSASLProvider(SASLProvider):
             if mechanism_class is None:
                 return False
 
-            mechanism = mechanism_class(credential_provider)
+            if mechanism_class is sasl.CachingSCRAM:
+                mechanism = mechanism_class(
+                    credential_provider,
+                    key_cache=self._scram_key_cache,
+                    account=client_jid,
+                )
+            else:
+                mechanism = mechanism_class(credential_provider)
             last_auth_error = None
             for nattempt in range(self._max_auth_attempts):
                 try:
@@ -1092,6 +1190,13 @@ class SecurityLayer(collections.namedtuple(
        connection attempts, as the certificate verifiers may set options which
        cannot be disabled anymore.
 
+       If this is a :class:`TLSContextCache`, the connectors use it to obtain
+       a shared context instead and resume TLS sessions where possible.
+
+       .. versionchanged:: 0.10
+
+          :class:`TLSContextCache` instances are supported.
+
     .. attribute:: certificate_verifier_factory
 
        This is a callable which returns a fresh
@@ -1132,6 +1237,163 @@ def default_ssl_context():
     return ctx
 
 
+class TLSContextCache:
+    """
+    Share :class:`OpenSSL.SSL.Context` objects and TLS sessions between
+    connections.
+
+    :param ssl_context_factory: Callable which returns a fresh
+                                :class:`OpenSSL.SSL.Context`.
+    :param session_ttl: Time in seconds for which a TLS session is offered
+                        for resumption.
+    :type session_ttl: :class:`float`
+    :param max_sessions: Maximum number of TLS sessions to remember.
+    :type max_sessions: :class:`int`
+
+    Creating a context and loading the trust store into it is costly, and
+    a full TLS handshake costs round trips and the certificate verification.
+    A :class:`TLSContextCache` can be used as
+    :attr:`SecurityLayer.ssl_context_factory` to avoid both on reconnects (see
+    also the `tls_context_cache` argument of :func:`make`).
+
+    The connectors in :mod:`aioxmpp.connector` obtain the context using
+    :meth:`get_context`. One context is created and configured per
+    certificate verifier class; later connections with a verifier of the same
+    class reuse it. The verify callback of a shared context dispatches to the
+    verifier of the respective connection, so the verifiers still keep their
+    per-connection state.
+
+    If the verifier has
+    :attr:`~CertificateVerifier.supports_session_resumption` set, the TLS
+    session (session ID or session ticket) negotiated with a server is
+    remembered and offered when connecting to the same server again. Sessions
+    are never shared between different verifier classes.
+
+    Calling the :class:`TLSContextCache` itself returns a fresh context from
+    `ssl_context_factory`, so it can be used wherever a plain context factory
+    is expected.
+
+    .. automethod:: get_context
+
+    .. automethod:: clear
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, ssl_context_factory=None, *,
+                 session_ttl=3600,
+                 max_sessions=64):
+        super().__init__()
+        self._ssl_context_factory = ssl_context_factory or default_ssl_context
+        self._session_ttl = session_ttl
+        self._contexts = {}
+        self._sessions = LRUDict()
+        self._sessions.maxsize = max_sessions
+        self._verifiers = weakref.WeakKeyDictionary()
+
+    def __call__(self):
+        return self._ssl_context_factory()
+
+    def _session_key(self, verifier_type, transport):
+        return (
+            verifier_type,
+            transport.get_extra_info("server_hostname"),
+            transport.get_extra_info("peer_hostname"),
+        )
+
+    def _verify_callback(self, conn, x509, errno, errdepth, returncode):
+        verifier = self._verifiers.get(conn.get_app_data())
+        if verifier is None:
+            logger.warning("no certificate verifier for TLS connection")
+            return False
+        return verifier.verify_callback(conn, x509, errno, errdepth,
+                                        returncode)
+
+    def _info_callback(self, verifier_type, conn, where, ret):
+        transport = conn.get_app_data()
+        verifier = self._verifiers.get(transport)
+        if verifier is None or not verifier.supports_session_resumption:
+            return
+
+        key = self._session_key(verifier_type, transport)
+        if where & OpenSSL.SSL.SSL_CB_HANDSHAKE_START:
+            if conn.get_session() is not None:
+                # renegotiation
+                return
+            try:
+                session, expires_at = self._sessions[key]
+            except KeyError:
+                return
+            if expires_at <= time.monotonic():
+                del self._sessions[key]
+                return
+            logger.debug("offering TLS session for resumption (%s, %s)",
+                         key[1], key[2])
+            conn.set_session(session)
+        elif (where & OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE or
+                (where & OpenSSL.SSL.SSL_CB_CONNECT_EXIT ==
+                 OpenSSL.SSL.SSL_CB_CONNECT_EXIT and ret > 0)):
+            # with TLS 1.3, the session ticket arrives after the handshake;
+            # reading it ends with another successful connect exit
+            session = conn.get_session()
+            if session is not None:
+                self._sessions[key] = (
+                    session,
+                    time.monotonic() + self._session_ttl,
+                )
+
+    def get_context(self, verifier, transport):
+        """
+        Return the shared context for `verifier` and bind `verifier` to
+        `transport`.
+
+        :param verifier: The certificate verifier for the connection.
+        :type verifier: :class:`CertificateVerifier`
+        :param transport: The transport which is about to start TLS.
+        :rtype: :class:`OpenSSL.SSL.Context`
+
+        If no context exists for the class of `verifier` yet, a new one is
+        created and configured using
+        :meth:`~CertificateVerifier.setup_context`. Otherwise, only
+        :meth:`~CertificateVerifier.setup_connection` is called.
+        """
+        verifier_type = type(verifier)
+        try:
+            ctx = self._contexts[verifier_type]
+        except KeyError:
+            ctx = self._ssl_context_factory()
+            verifier.setup_context(ctx, transport)
+            ctx.set_verify(ctx.get_verify_mode(), self._verify_callback)
+            ctx.set_info_callback(
+                functools.partial(self._info_callback, verifier_type)
+            )
+            self._contexts[verifier_type] = ctx
+        else:
+            verifier.setup_connection(transport)
+
+        self._verifiers[transport] = verifier
+        return ctx
+
+    def clear(self):
+        """
+        Drop all shared contexts and remembered sessions.
+        """
+        self._contexts.clear()
+        self._sessions.clear()
+
+
+_default_tls_context_cache = TLSContextCache()
+
+
+def default_tls_context_cache():
+    """
+    Return the process-wide :class:`TLSContextCache`.
+
+    .. versionadded:: 0.10
+    """
+    return _default_tls_context_cache
+
+
 @asyncio.coroutine
 def negotiate_sasl(transport, xmlstream,
                    sasl_providers,
@@ -1298,7 +1560,8 @@ def make(
         pin_type=PinType.PUBLIC_KEY,
         post_handshake_deferred_failure=None,
         anonymous=False,
-        no_verify=False):
+        no_verify=False,
+        tls_context_cache=None):
     """
     Construct a :class:`SecurityLayer`. Depending on the arguments passed,
     different features are enabled or disabled.
@@ -1327,6 +1590,9 @@ def make(
                       discouraged** outside controlled test environments. See
                       below for alternatives.
     :type no_verify: :class:`bool`
+    :param tls_context_cache: Share TLS contexts and sessions using this
+                              cache.
+    :type tls_context_cache: :class:`TLSContextCache` or :data:`None`
     :raise RuntimeError: if `anonymous` is a :class:`str` and the version of
                          :mod:`aiosasl` in use does not provide
                          :class:`aiosasl.ANONYMOUS`
@@ -1391,12 +1657,22 @@ def make(
        the ANONYMOUS SASL mechanism in the XMPP context) into account before
        using `anonymous`.
 
+    If `tls_context_cache` is not :data:`None`, it is used as
+    :attr:`~SecurityLayer.ssl_context_factory` instead of
+    :func:`default_ssl_context`. Pass :func:`default_tls_context_cache` to use
+    the process-wide cache, which allows TLS session resumption across
+    reconnects and across clients connecting to the same server.
+
     The versaility and simplicity of use of this function make (pun intended)
     it the preferred way to construct :class:`SecurityLayer` instances.
 
     .. versionadded:: 0.8
 
        Support for SASL ANONYMOUS was added.
+
+    .. versionadded:: 0.10
+
+       The `tls_context_cache` argument.
     """
 
     if isinstance(password_provider, str):
@@ -1451,8 +1727,13 @@ def make(
             ),
         )
 
+    if tls_context_cache is not None:
+        ssl_context_factory = tls_context_cache
+    else:
+        ssl_context_factory = default_ssl_context
+
     return SecurityLayer(
-        default_ssl_context,
+        ssl_context_factory,
         certificate_verifier_factory,
         True,
         tuple(sasl_providers),
@@ -411,6 +411,22 @@ class StanzaStream:
     response fails to arrive within that interval, the stream fails (see
     :attr:`on_failure`).
 
+    Incoming stanzas are processed by the same task which sends stanzas and
+    pings. By default, only one incoming stanza is processed each time the
+    task wakes up. When many stanzas arrive at once (for example the presence
+    broadcast after joining a large MUC), it is more efficient to process them
+    in bulk:
+
+    .. attribute:: incoming_batch_size = 1
+
+       The maximum number of incoming stanzas which are processed in one
+       iteration of the stanza broker. Larger values reduce the scheduling
+       overhead per stanza when many stanzas are queued, at the cost of
+       delaying outgoing stanzas and ping handling for the duration of the
+       batch.
+
+       .. versionadded:: 0.10
+
     Starting/Stopping the stream:
 
     .. automethod:: start
@@ -750,6 +766,8 @@ class StanzaStream:
         self.ping_interval = timedelta(seconds=15)
         self.ping_opportunistic_interval = timedelta(seconds=15)
 
+        self.incoming_batch_size = 1
+
         self._sm_enabled = False
 
         self._broker_lock = asyncio.Lock(loop=loop)
@@ -1077,6 +1095,21 @@ class StanzaStream:
         elif isinstance(stanza_obj, stanza.Presence):
             self._process_incoming_presence(stanza_obj)
 
+    def _process_incoming_bulk(self, xmlstream, queue_entry):
+        """
+        Process the incoming `queue_entry` and any other entries which are
+        currently in the incoming queue, up to a total of
+        :attr:`incoming_batch_size` entries.
+        """
+
+        self._process_incoming(xmlstream, queue_entry)
+        for i in range(self.incoming_batch_size - 1):
+            try:
+                queue_entry = self._incoming_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            self._process_incoming(xmlstream, queue_entry)
+
     def flush_incoming(self):
         """
         Flush all incoming queues to the respective processing methods. The
@@ -1899,8 +1932,8 @@ class StanzaStream:
                             loop=self._loop)
 
                     if incoming_fut in done:
-                        self._process_incoming(xmlstream,
-                                               incoming_fut.result())
+                        self._process_incoming_bulk(xmlstream,
+                                                    incoming_fut.result())
                         incoming_fut = asyncio.async(
                             self._incoming_queue.get(),
                             loop=self._loop)
@@ -31,15 +31,67 @@ This module implements the Nodeprep (`RFC 6122`_) and Resourceprep (`RFC 6122`_)
 
 .. autofunction:: nameprep
 
+The results of the profile functions are cached in a bounded, thread-safe
+cache, so that recurring input (such as the parts of the JIDs of contacts) is
+processed only once. Input which consists of printable ASCII characters only
+is processed without consulting the stringprep tables, as none of the tables
+relevant for the profiles above affects those characters except for case
+folding and the explicitly prohibited characters.
+
+For other input, the profiles do not consult the :mod:`stringprep` tables for
+each character. Instead, the table memberships relevant for the profiles are
+precomputed into a compact bitmap of flags per block of 256 code points. A
+block is computed when a code point from it is encountered for the first time.
+In the common case where neither mapping nor normalisation changes the input,
+all checks are made in a single pass over the string.
+
 .. _RFC 3454: https://tools.ietf.org/html/rfc3454
 .. _RFC 6122: https://tools.ietf.org/html/rfc6122
 
 """
 
+import functools
+import re
 import stringprep
 import unicodedata
 
 _nodeprep_prohibited = frozenset("\"&'/:<>@")
+# the space is in table C.1.1, which is only prohibited by nodeprep
+_nodeprep_prohibited_ascii = _nodeprep_prohibited | {" "}
+
+_is_printable_ascii = re.compile(r"[\x20-\x7e]*\Z").match
+
+_CACHE_SIZE = 8192
+
+# flags of a code point in the bitmaps
+_MAP_B1 = 0x01  # table B.1: mapped to nothing
+_MAP_B2 = 0x02  # table B.2: changed by case folding
+_PROHIBITED_NODEPREP = 0x04
+_PROHIBITED_RESOURCEPREP = 0x08
+_PROHIBITED_NAMEPREP = 0x10
+_UNASSIGNED = 0x20  # table A.1
+_RANDALCAT = 0x40
+_LCAT = 0x80
+
+# tables prohibited by all three profiles
+_COMMON_PROHIBITED_TABLES = (
+    stringprep.in_table_c12,
+    stringprep.in_table_c22,
+    stringprep.in_table_c3,
+    stringprep.in_table_c4,
+    stringprep.in_table_c5,
+    stringprep.in_table_c6,
+    stringprep.in_table_c7,
+    stringprep.in_table_c8,
+    stringprep.in_table_c9,
+)
+
+_BLOCK_SHIFT = 8
+_BLOCK_MASK = (1 << _BLOCK_SHIFT) - 1
+
+# maps the block number to a bytes object holding the flags of the code points
+# in the block
+_blocks = {}
 
 
 def is_RandALCat(c):
@@ -131,17 +183,128 @@ def check_unassigned(chars, bad_tables):
                          "U+{:04x}".format(ord(violator)))
 
 
-def _nodeprep_do_mapping(chars):
-    i = 0
-    while i < len(chars):
-        c = chars[i]
-        if stringprep.in_table_b1(c):
-            del chars[i]
+def _code_point_flags(c):
+    flags = 0
+
+    if stringprep.in_table_b1(c):
+        flags |= _MAP_B1
+    elif stringprep.map_table_b2(c) != c:
+        flags |= _MAP_B2
+
+    if any(in_table(c) for in_table in _COMMON_PROHIBITED_TABLES):
+        flags |= (_PROHIBITED_NODEPREP |
+                  _PROHIBITED_RESOURCEPREP |
+                  _PROHIBITED_NAMEPREP)
+    if stringprep.in_table_c21(c):
+        flags |= _PROHIBITED_NODEPREP | _PROHIBITED_RESOURCEPREP
+    if stringprep.in_table_c11(c) or c in _nodeprep_prohibited:
+        flags |= _PROHIBITED_NODEPREP
+
+    if stringprep.in_table_a1(c):
+        flags |= _UNASSIGNED
+
+    if is_RandALCat(c):
+        flags |= _RANDALCAT
+    elif is_LCat(c):
+        flags |= _LCAT
+
+    return flags
+
+
+def _load_block(block_no):
+    start = block_no << _BLOCK_SHIFT
+    block = bytes(
+        _code_point_flags(chr(cp))
+        for cp in range(start, start + _BLOCK_MASK + 1)
+    )
+    _blocks[block_no] = block
+    return block
+
+
+def _flags(c):
+    cp = ord(c)
+    try:
+        block = _blocks[cp >> _BLOCK_SHIFT]
+    except KeyError:
+        block = _load_block(cp >> _BLOCK_SHIFT)
+    return block[cp & _BLOCK_MASK]
+
+
+def _string_flags(string):
+    """
+    Return the bitwise or of the flags of all characters in `string`.
+    """
+    blocks = _blocks
+    result = 0
+    for c in string:
+        cp = ord(c)
+        try:
+            block = blocks[cp >> _BLOCK_SHIFT]
+        except KeyError:
+            block = _load_block(cp >> _BLOCK_SHIFT)
+        result |= block[cp & _BLOCK_MASK]
+    return result
+
+
+def _first_with_flag(string, flag):
+    for c in string:
+        if _flags(c) & flag:
+            return c
+
+
+def _map(string, map_mask):
+    result = []
+    for c in string:
+        flags = _flags(c) & map_mask
+        if flags & _MAP_B1:
+            continue
+        if flags & _MAP_B2:
+            result.append(stringprep.map_table_b2(c))
         else:
-            replacement = stringprep.map_table_b2(c)
-            if replacement != c:
-                chars[i:(i + 1)] = list(replacement)
-            i += len(replacement)
+            result.append(c)
+    return "".join(result)
+
+
+def _prepare(string, allow_unassigned, map_mask, prohibited_flag):
+    """
+    Apply a stringprep profile to `string`.
+
+    :param map_mask: The mapping flags (a combination of :data:`_MAP_B1`
+        and :data:`_MAP_B2`) to apply.
+    :param prohibited_flag: The flag marking the code points prohibited by
+        the profile.
+    """
+    flags = _string_flags(string)
+    if flags & map_mask:
+        string = _map(string, map_mask)
+        string = unicodedata.normalize("NFKC", string)
+        flags = _string_flags(string)
+    else:
+        normalized = unicodedata.normalize("NFKC", string)
+        if normalized != string:
+            string = normalized
+            flags = _string_flags(string)
+
+    if flags & prohibited_flag:
+        violator = _first_with_flag(string, prohibited_flag)
+        raise ValueError("Input contains invalid unicode codepoint: "
+                         "U+{:04x}".format(ord(violator)))
+
+    if flags & _RANDALCAT:
+        if flags & _LCAT:
+            raise ValueError("L and R/AL characters must not occur in the"
+                             " same string")
+        if     (not _flags(string[0]) & _RANDALCAT or
+                not _flags(string[-1]) & _RANDALCAT):
+            raise ValueError("R/AL string must start and end with R/AL"
+                             " character.")
+
+    if not allow_unassigned and flags & _UNASSIGNED:
+        violator = _first_with_flag(string, _UNASSIGNED)
+        raise ValueError("Input contains unassigned code point: "
+                         "U+{:04x}".format(ord(violator)))
+
+    return string
 
 
 def nodeprep(string, allow_unassigned=False):
@@ -150,47 +313,21 @@ def nodeprep(string, allow_unassigned=False):
     error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError` is
     raised.
     """
+    return _nodeprep(string, bool(allow_unassigned))
 
-    chars = list(string)
-    _nodeprep_do_mapping(chars)
-    do_normalization(chars)
-    check_prohibited_output(
-        chars,
-        (
-            stringprep.in_table_c11,
-            stringprep.in_table_c12,
-            stringprep.in_table_c21,
-            stringprep.in_table_c22,
-            stringprep.in_table_c3,
-            stringprep.in_table_c4,
-            stringprep.in_table_c5,
-            stringprep.in_table_c6,
-            stringprep.in_table_c7,
-            stringprep.in_table_c8,
-            stringprep.in_table_c9,
-            lambda x: x in _nodeprep_prohibited
-        ))
-    check_bidi(chars)
-
-    if not allow_unassigned:
-        check_unassigned(
-            chars,
-            (
-                stringprep.in_table_a1,
-            )
-        )
-
-    return "".join(chars)
-
-
-def _resourceprep_do_mapping(chars):
-    i = 0
-    while i < len(chars):
-        c = chars[i]
-        if stringprep.in_table_b1(c):
-            del chars[i]
-            continue
-        i += 1
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _nodeprep(string, allow_unassigned):
+    if _is_printable_ascii(string):
+        result = string.lower()
+        for c in result:
+            if c in _nodeprep_prohibited_ascii:
+                raise ValueError("Input contains invalid unicode codepoint: "
+                                 "U+{:04x}".format(ord(c)))
+        return result
+
+    return _prepare(string, allow_unassigned,
+                    _MAP_B1 | _MAP_B2, _PROHIBITED_NODEPREP)
 
 
 def resourceprep(string, allow_unassigned=False):
@@ -199,35 +336,16 @@ def resourceprep(string, allow_unassigned=False):
     the error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError`
     is raised.
     """
+    return _resourceprep(string, bool(allow_unassigned))
 
-    chars = list(string)
-    _resourceprep_do_mapping(chars)
-    do_normalization(chars)
-    check_prohibited_output(
-        chars,
-        (
-            stringprep.in_table_c12,
-            stringprep.in_table_c21,
-            stringprep.in_table_c22,
-            stringprep.in_table_c3,
-            stringprep.in_table_c4,
-            stringprep.in_table_c5,
-            stringprep.in_table_c6,
-            stringprep.in_table_c7,
-            stringprep.in_table_c8,
-            stringprep.in_table_c9,
-        ))
-    check_bidi(chars)
-
-    if not allow_unassigned:
-        check_unassigned(
-            chars,
-            (
-                stringprep.in_table_a1,
-            )
-        )
-
-    return "".join(chars)
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _resourceprep(string, allow_unassigned):
+    if _is_printable_ascii(string):
+        return string
+
+    return _prepare(string, allow_unassigned,
+                    _MAP_B1, _PROHIBITED_RESOURCEPREP)
 
 
 def nameprep(string, allow_unassigned=False):
@@ -236,31 +354,13 @@ def nameprep(string, allow_unassigned=False):
     error cases defined in `RFC 3454`_ (stringprep), a :class:`ValueError` is
     raised.
     """
+    return _nameprep(string, bool(allow_unassigned))
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _nameprep(string, allow_unassigned):
+    if _is_printable_ascii(string):
+        return string.lower()
 
-    chars = list(string)
-    _nodeprep_do_mapping(chars)
-    do_normalization(chars)
-    check_prohibited_output(
-        chars,
-        (
-            stringprep.in_table_c12,
-            stringprep.in_table_c22,
-            stringprep.in_table_c3,
-            stringprep.in_table_c4,
-            stringprep.in_table_c5,
-            stringprep.in_table_c6,
-            stringprep.in_table_c7,
-            stringprep.in_table_c8,
-            stringprep.in_table_c9,
-        ))
-    check_bidi(chars)
-
-    if not allow_unassigned:
-        check_unassigned(
-            chars,
-            (
-                stringprep.in_table_a1,
-            )
-        )
-
-    return "".join(chars)
+    return _prepare(string, allow_unassigned,
+                    _MAP_B1 | _MAP_B2, _PROHIBITED_NAMEPREP)
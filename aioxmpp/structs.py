@@ -756,16 +756,28 @@ class JID(collections.namedtuple("JID", ["localpart", "domain", "resource"])):
         """
         Obtain a :class:`JID` object by parsing a JID from the given string
         `s`.
+
+        The results are kept in a bounded cache; parsing the same string
+        again returns the same (immutable) :class:`JID` object.
+
+        .. versionchanged:: 0.10
+
+           Results are cached.
         """
-        localpart, sep, domain = s.partition("@")
-        if not sep:
-            domain = localpart
-            localpart = None
-
-        domain, sep, resource = domain.partition("/")
-        if not sep:
-            resource = None
-        return cls(localpart, domain, resource, strict=strict)
+        return _jid_fromstr(cls, s, bool(strict))
+
+
+@functools.lru_cache(maxsize=8192)
+def _jid_fromstr(cls, s, strict):
+    localpart, sep, domain = s.partition("@")
+    if not sep:
+        domain = localpart
+        localpart = None
+
+    domain, sep, resource = domain.partition("/")
+    if not sep:
+        resource = None
+    return cls(localpart, domain, resource, strict=strict)
 
 
 @functools.total_ordering
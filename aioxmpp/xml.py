@@ -45,8 +45,12 @@ instances, the following classes and functions can be used:
 
 .. autoclass:: XMPPLexicalHandler
 
+.. autoclass:: StanzaLimits
+
 .. autofunction:: make_parser
 
+.. autoclass:: ExpatParser
+
 Utility functions
 =================
 
@@ -60,12 +64,16 @@ Utility functions
 
 """
 
+import collections
 import copy
 import ctypes
 import ctypes.util
 import contextlib
+import functools
 import io
+import re
 
+import xml.parsers.expat as pyexpat
 import xml.sax
 import xml.sax.saxutils
 
@@ -91,15 +99,164 @@ def xmlValidateNameValue_buf(b):
     return bool(libxml2.xmlValidateNameValue(b))
 
 
+_INVALID_CDATA_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
 def is_valid_cdata_str(s):
-    for c in s:
-        o = ord(c)
-        if o >= 32:
-            continue
-        if o < 9 or 11 <= o <= 12 or 14 <= o <= 31:
-            return False
+    return _INVALID_CDATA_RE.search(s) is None
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_valid_localname(s):
+    # the set of names used in a process is small (it is mostly determined by
+    # the XSO classes), so caching the (relatively expensive) validation pays
+    # off
+    return ":" not in s and xmlValidateNameValue_str(s)
+
+
+@functools.lru_cache(maxsize=256)
+def _ns_decl_bytes(prefix, uri):
+    if prefix:
+        prefix_part = b" xmlns:" + prefix.encode("utf-8")
+    else:
+        prefix_part = b" xmlns"
+    return (prefix_part + b"=" +
+            xml.sax.saxutils.quoteattr(uri).encode("utf-8"))
+
+
+class _NotDirect(Exception):
+    pass
+
+
+_MISSING = object()
+
+
+class _DirectSerialiser:
+    # Sink for the SAX events of a single XSO, used by
+    # XMPPXMLGenerator.unparse_direct. It produces the same bytes the
+    # generator would, as long as all elements are in the default namespace
+    # (or declare it with a prefix mapping for the None prefix) and only
+    # unnamespaced and xml: attributes are used. Anything else (including
+    # errors, so that the generator raises them) makes it raise _NotDirect.
+
+    def __init__(self, ns_map, sorted_attributes):
+        self._parts = []
+        self._ns_map = ns_map
+        self._stack = []
+        self._sorted_attributes = sorted_attributes
+        self._announced = None
+        self._unclosed = False
+        self._pending_start_element = False
+
+    def startPrefixMapping(self, prefix, uri):
+        if prefix is not None or self._announced is not None or not uri:
+            raise _NotDirect()
+        self._announced = uri
+
+    def endPrefixMapping(self, prefix):
+        if prefix is not None or not self._unclosed:
+            raise _NotDirect()
+        self._unclosed = False
+
+    def startElementNS(self, name, qname, attributes=None):
+        if self._unclosed or not isinstance(name, tuple):
+            raise _NotDirect()
+
+        uri, localname = name
+        if not uri or not _is_valid_localname(localname):
+            raise _NotDirect()
+
+        ns_map = self._ns_map
+        prefix = ns_map.get(uri, _MISSING)
+        announced = self._announced
+        if announced is None:
+            if prefix is _MISSING:
+                # the generator would declare it as default namespace
+                declare = True
+            elif prefix is None:
+                declare = False
+            else:
+                raise _NotDirect()
+        elif announced != uri:
+            raise _NotDirect()
+        else:
+            declare = prefix is not None
+
+        parts = self._parts
+        if self._pending_start_element:
+            parts.append(b">")
+
+        parts.append(b"<")
+        parts.append(localname.encode("utf-8"))
+
+        self._stack.append((ns_map, announced is not None))
+        if declare:
+            parts.append(_ns_decl_bytes(None, uri))
+            self._ns_map = dict(ns_map)
+            self._ns_map[uri] = None
+        self._announced = None
+
+        if attributes:
+            attrib = []
+            for attrname, value in attributes.items():
+                if not isinstance(attrname, tuple):
+                    raise _NotDirect()
+                attr_uri, attr_localname = attrname
+                if not _is_valid_localname(attr_localname):
+                    raise _NotDirect()
+                if attr_uri:
+                    if attr_uri != namespaces.xml:
+                        raise _NotDirect()
+                    attr_localname = "xml:" + attr_localname
+                elif attr_localname == "xmlns":
+                    raise _NotDirect()
+                attrib.append((attr_localname, value))
+
+            if self._sorted_attributes:
+                attrib.sort()
+
+            for attrname, value in attrib:
+                parts.append(b" ")
+                parts.append(attrname.encode("utf-8"))
+                parts.append(b"=")
+                parts.append(
+                    xml.sax.saxutils.quoteattr(value).encode("utf-8")
+                )
+
+        self._pending_start_element = name
+
+    def characters(self, chars):
+        if not is_valid_cdata_str(chars):
+            raise _NotDirect()
+        if self._pending_start_element:
+            self._pending_start_element = False
+            self._parts.append(b">")
+        self._parts.append(xml.sax.saxutils.escape(chars).encode("utf-8"))
+
+    def endElementNS(self, name, qname):
+        if self._unclosed or not self._stack:
+            raise _NotDirect()
+
+        if self._pending_start_element:
+            if self._pending_start_element != name:
+                raise _NotDirect()
+            self._pending_start_element = False
+            self._parts.append(b"/>")
+        else:
+            uri, localname = name
+            if (not uri or
+                    self._ns_map.get(uri, _MISSING) is not None or
+                    not _is_valid_localname(localname)):
+                raise _NotDirect()
+            self._parts.append(b"</" + localname.encode("utf-8") + b">")
+
+        self._ns_map, self._unclosed = self._stack.pop()
 
-    return True
+    def getvalue(self):
+        if (self._stack or self._unclosed or
+                self._announced is not None):
+            raise _NotDirect()
+        return b"".join(self._parts)
 
 
 class XMPPXMLGenerator:
@@ -172,6 +329,8 @@ class XMPPXMLGenerator:
 
     .. automethod:: buffer
 
+    .. automethod:: unparse_direct
+
     """
     def __init__(self, out,
                  short_empty_elements=True,
@@ -217,7 +376,7 @@ class XMPPXMLGenerator:
         if not isinstance(name, tuple):
             raise ValueError("names must be tuples")
 
-        if ":" in name[1] or not xmlValidateNameValue_str(name[1]):
+        if not _is_valid_localname(name[1]):
             raise ValueError("invalid name: {!r}".format(name[1]))
 
         if name[0]:
@@ -371,39 +530,31 @@ class XMPPXMLGenerator:
 
         pending_prefixes = self._pin_floating_ns_decls(old_counter)
 
-        self._write(b"<")
-        self._write(qname.encode("utf-8"))
+        # the start tag is assembled in one piece to save write calls
+        parts = [b"<", qname.encode("utf-8")]
 
         if None in pending_prefixes:
-            uri = pending_prefixes.pop(None)
-            self._write(b" xmlns=")
-            self._write(xml.sax.saxutils.quoteattr(uri).encode("utf-8"))
+            parts.append(_ns_decl_bytes(None, pending_prefixes.pop(None)))
 
         for prefix, uri in sorted(pending_prefixes.items()):
-            self._write(b" xmlns")
-            if prefix:
-                self._write(b":")
-                self._write(prefix.encode("utf-8"))
-            self._write(b"=")
-            self._write(
-                xml.sax.saxutils.quoteattr(uri).encode("utf-8")
-            )
+            parts.append(_ns_decl_bytes(prefix, uri))
 
         if self._sorted_attributes:
             attrib.sort()
 
         for attrname, value in attrib:
-            self._write(b" ")
-            self._write(attrname.encode("utf-8"))
-            self._write(b"=")
-            self._write(
-                xml.sax.saxutils.quoteattr(value).encode("utf-8")
-            )
+            parts.append(b" ")
+            parts.append(attrname.encode("utf-8"))
+            parts.append(b"=")
+            parts.append(xml.sax.saxutils.quoteattr(value).encode("utf-8"))
+
+        if not self._short_empty_elements:
+            parts.append(b">")
+
+        self._write(b"".join(parts))
 
         if self._short_empty_elements:
             self._pending_start_element = name
-        else:
-            self._write(b">")
 
     def endElementNS(self, name, qname):
         """
@@ -417,9 +568,7 @@ class XMPPXMLGenerator:
             self._pending_start_element = False
             self._write(b"/>")
         else:
-            self._write(b"</")
-            self._write(self._qname(name).encode("utf-8"))
-            self._write(b">")
+            self._write(b"</" + self._qname(name).encode("utf-8") + b">")
 
         self._curr_ns_map, self._ns_prefixes_floating_out, self._ns_counter = \
             self._ns_map_stack.pop()
@@ -536,6 +685,54 @@ class XMPPXMLGenerator:
             self._ns_auto_prefixes_floating_in = ns_auto_prefixes_floating_in
             raise
 
+    def unparse_direct(self, xso):
+        """
+        Serialise a complete XSO directly to bytes, if possible.
+
+        :param xso: Object to serialise.
+        :type xso: :class:`aioxmpp.xso.XSO`
+        :return: Whether `xso` has been serialised.
+        :rtype: :class:`bool`
+
+        This is a fast path for the common case of an XSO whose elements all
+        use the default namespace (or declare it using the :data:`None`
+        prefix) and which only has unnamespaced and ``xml:`` attributes. The
+        output is the same as when passing the events of
+        :meth:`~.xso.XSO.unparse_to_sax` to this generator, but the namespace
+        handling and the state saving of :meth:`buffer` are skipped. The data
+        is written in one piece and :meth:`flush` is called, like when using
+        :meth:`buffer`.
+
+        If the XSO uses other namespace features, serialisation fails, or the
+        generator is not between two elements (e.g. inside a :meth:`buffer`
+        context or with prefix mappings announced), nothing is written and
+        :data:`False` is returned. The caller should then use the generator
+        as usual, which will also raise the appropriate exceptions.
+
+        .. versionadded:: 0.10
+        """
+        if (self._pending_start_element or
+                self._ns_prefixes_floating_in or
+                self._ns_prefixes_floating_out or
+                self._buf_in_use or
+                not self._short_empty_elements):
+            return False
+
+        serialiser = _DirectSerialiser(self._curr_ns_map,
+                                       self._sorted_attributes)
+        try:
+            xso.unparse_to_sax(serialiser)
+            data = serialiser.getvalue()
+        except Exception:
+            # this includes _NotDirect; the normal code path will raise
+            # serialisation errors with the details from the generator
+            return False
+
+        self._write(data)
+        if self._flush:
+            self._flush()
+        return True
+
     @contextlib.contextmanager
     def buffer(self):
         """
@@ -695,12 +892,27 @@ class XMLStreamWriter:
         re-raised; the :meth:`send` method thus provides strong exception
         safety.
 
+        Objects which only use default namespace declarations are serialised
+        with :meth:`XMPPXMLGenerator.unparse_direct`.
+
+        If `xso` has been received through a :class:`~.xso.XSOParser` with
+        :attr:`~.xso.XSOParser.passthrough` enabled and has not been modified
+        since, the received XML is re-emitted instead of serialising `xso`
+        from its descriptors.
+
         .. warning::
 
            The behaviour of :meth:`send` after :meth:`abort` or :meth:`close`
            and before :meth:`start` is undefined.
 
+        .. versionchanged:: 0.10
+
+           Unmodified objects received with
+           :attr:`~.xso.XSOParser.passthrough` are re-emitted as received.
+
         """
+        if self._writer.unparse_direct(xso):
+            return
         with self._writer.buffer():
             xso.unparse_to_sax(self._writer)
 
@@ -745,6 +957,72 @@ class ProcessorState(Enum):
     EXCEPTION_BACKOFF = 4
 
 
+class StanzaLimits:
+    """
+    Limits for the size and shape of stanzas received on a stream.
+
+    :param max_stanza_bytes: Maximum number of bytes of a single stanza.
+    :type max_stanza_bytes: :class:`int` or :data:`None`
+    :param max_depth: Maximum nesting depth of elements, counting the stanza
+                      element itself as depth one.
+    :type max_depth: :class:`int` or :data:`None`
+    :param max_attributes: Maximum number of attributes of a single element.
+    :type max_attributes: :class:`int` or :data:`None`
+    :param max_text_length: Maximum number of characters of character data in
+                            a single stanza.
+    :type max_text_length: :class:`int` or :data:`None`
+
+    A limit which is :data:`None` is not enforced. The limits are checked by
+    :class:`XMPPXMLProcessor` (and :class:`~aioxmpp.protocol.XMLStream` for
+    `max_stanza_bytes`) while the stanza is being parsed, so that a stanza
+    exceeding a limit is rejected before it has been received completely. A
+    violation is reported as :class:`~.errors.StreamError` with the
+    ``policy-violation`` condition.
+
+    .. attribute:: violations
+
+       A :class:`collections.Counter` which counts the violations by limit.
+       The keys are the names of the limits without the ``max_`` prefix,
+       e.g. ``"depth"``.
+
+    .. automethod:: violation
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self, *,
+                 max_stanza_bytes=None,
+                 max_depth=None,
+                 max_attributes=None,
+                 max_text_length=None):
+        super().__init__()
+        self.max_stanza_bytes = max_stanza_bytes
+        self.max_depth = max_depth
+        self.max_attributes = max_attributes
+        self.max_text_length = max_text_length
+        self.violations = collections.Counter()
+
+    def violation(self, limit, value):
+        """
+        Record a violation of a limit.
+
+        :param limit: Name of the limit without the ``max_`` prefix.
+        :type limit: :class:`str`
+        :param value: The value which exceeded the limit.
+        :return: The stream error to raise.
+        :rtype: :class:`~.errors.StreamError`
+        """
+        self.violations[limit] += 1
+        return errors.StreamError(
+            (namespaces.streams, "policy-violation"),
+            "stanza exceeds {} limit ({} > {})".format(
+                limit.replace("_", " "),
+                value,
+                getattr(self, "max_" + limit),
+            )
+        )
+
+
 class XMPPXMLProcessor:
     """
     This class is a :class:`xml.sax.handler.ContentHandler`. It
@@ -792,7 +1070,21 @@ class XMPPXMLProcessor:
        May be a callable or :data:`None`. If not false, the value will get
        called whenever a stream header is processed.
 
+    .. attribute:: limits
+
+       May be a :class:`StanzaLimits` instance or :data:`None`. If not
+       :data:`None`, the depth, attribute and text limits are enforced on the
+       elements inside the stream; a violation raises a
+       :class:`~.errors.StreamError` immediately, bypassing the exception
+       handling described above.
+
+       .. versionadded:: 0.10
+
     .. autoattribute:: stanza_parser
+
+    .. autoattribute:: in_stanza
+
+    .. autoattribute:: stream_level_events
     """
 
     def __init__(self):
@@ -803,6 +1095,9 @@ class XMPPXMLProcessor:
         self.on_stream_header = None
         self.on_stream_footer = None
         self.on_exception = None
+        self.limits = None
+        self._stream_level_events = 0
+        self._text_length = 0
 
         self.remote_version = None
         self.remote_from = None
@@ -827,18 +1122,69 @@ class XMPPXMLProcessor:
             raise RuntimeError("invalid state: {}".format(self._state))
         self._stanza_parser = value
 
+    @property
+    def in_stanza(self):
+        """
+        Whether a stream-level element (such as a stanza) is currently being
+        parsed.
+
+        .. versionadded:: 0.10
+        """
+        return (
+            self._state in (ProcessorState.STREAM_HEADER_PROCESSED,
+                            ProcessorState.EXCEPTION_BACKOFF) and
+            self._depth > 1
+        )
+
+    @property
+    def stream_level_events(self):
+        """
+        The number of events processed at the stream level, that is, outside
+        of stream-level elements: the stream header, the end of each
+        stream-level element and character data between them.
+
+        This allows to tell whether data fed to the parser in one piece was
+        entirely part of a single stream-level element.
+
+        .. versionadded:: 0.10
+        """
+        return self._stream_level_events
+
+    def _check_element_limits(self, attributes):
+        limits = self.limits
+        if self._depth == 1:
+            self._text_length = 0
+        if limits is None:
+            return
+        if limits.max_depth is not None and self._depth > limits.max_depth:
+            raise limits.violation("depth", self._depth)
+        if (limits.max_attributes is not None and
+                len(attributes) > limits.max_attributes):
+            raise limits.violation("attributes", len(attributes))
+
     def processingInstruction(self, target, foo):
         raise errors.StreamError(
             (namespaces.streams, "restricted-xml"),
             "processing instructions are not allowed in XMPP"
         )
 
+    def _check_text_limits(self, characters):
+        limits = self.limits
+        if limits is not None and limits.max_text_length is not None:
+            self._text_length += len(characters)
+            if self._text_length > limits.max_text_length:
+                raise limits.violation("text_length", self._text_length)
+
     def characters(self, characters):
         if self._state == ProcessorState.EXCEPTION_BACKOFF:
-            pass
+            self._check_text_limits(characters)
         elif self._state != ProcessorState.STREAM_HEADER_PROCESSED:
             raise RuntimeError("invalid state: {}".format(self._state))
         else:
+            if self._depth > 1:
+                self._check_text_limits(characters)
+            else:
+                self._stream_level_events += 1
             self._driver.characters(characters)
 
     def startDocument(self):
@@ -870,6 +1216,7 @@ class XMPPXMLProcessor:
 
     def startElementNS(self, name, qname, attributes):
         if self._state == ProcessorState.STREAM_HEADER_PROCESSED:
+            self._check_element_limits(attributes)
             try:
                 self._driver.startElementNS(name, qname, attributes)
             except Exception as exc:
@@ -878,6 +1225,7 @@ class XMPPXMLProcessor:
             self._depth += 1
             return
         elif self._state == ProcessorState.EXCEPTION_BACKOFF:
+            self._check_element_limits(attributes)
             self._depth += 1
             return
         elif self._state != ProcessorState.STARTED:
@@ -926,6 +1274,7 @@ class XMPPXMLProcessor:
             self.on_stream_header()
 
         self._state = ProcessorState.STREAM_HEADER_PROCESSED
+        self._stream_level_events += 1
         self._depth += 1
 
     def _end_element_exception_handling(self):
@@ -940,6 +1289,8 @@ class XMPPXMLProcessor:
     def endElementNS(self, name, qname):
         if self._state == ProcessorState.STREAM_HEADER_PROCESSED:
             self._depth -= 1
+            if self._depth == 1:
+                self._stream_level_events += 1
             if self._depth > 0:
                 try:
                     return self._driver.endElementNS(name, qname)
@@ -956,6 +1307,7 @@ class XMPPXMLProcessor:
         elif self._state == ProcessorState.EXCEPTION_BACKOFF:
             self._depth -= 1
             if self._depth == 1:
+                self._stream_level_events += 1
                 self._end_element_exception_handling()
         else:
             raise RuntimeError("invalid state: {}".format(self._state))
@@ -1016,6 +1368,188 @@ class XMPPLexicalHandler:
         pass
 
 
+class ExpatParser:
+    """
+    Incremental XML parser which drives :mod:`pyexpat` directly, instead of
+    going through :mod:`xml.sax`.
+
+    The parser implements the subset of the
+    :class:`xml.sax.xmlreader.IncrementalParser` interface which is used by
+    :class:`~.protocol.XMLStream`, so it can be used in place of a parser
+    created by :func:`make_parser`. Parse errors are reported as
+    :class:`xml.sax.SAXParseException`, like with those parsers.
+
+    The events sent to the content handler differ slightly from what the
+    :mod:`xml.sax` expat reader generates:
+
+    * The restrictions enforced by :class:`XMPPLexicalHandler` are built in;
+      there is no need to configure a lexical handler.
+
+    * The `attributes` passed to :meth:`startElementNS` are a plain
+      :class:`dict` mapping ``(namespace_uri, localname)`` tuples to values.
+      The `qname` argument is always :data:`None`.
+
+    * The tuples for element and attribute names are created only once per
+      distinct name and re-used afterwards.
+
+    * Consecutive character data is reported with a single call to
+      :meth:`characters`, up to the end of the data passed to :meth:`feed`.
+
+    * Prefix mapping events are not reported.
+
+    .. automethod:: setContentHandler
+
+    .. automethod:: getContentHandler
+
+    .. automethod:: feed
+
+    .. automethod:: close
+
+    .. versionadded:: 0.10
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._cont_handler = None
+        self._parser = None
+        self._names = {}
+        self._line_number = None
+        self._column_number = None
+
+    def _make_parser(self):
+        parser = pyexpat.ParserCreate(namespace_separator=" ")
+        parser.buffer_text = True
+        parser.SetParamEntityParsing(pyexpat.XML_PARAM_ENTITY_PARSING_NEVER)
+        parser.StartElementHandler = self._start_element
+        parser.EndElementHandler = self._end_element
+        parser.CharacterDataHandler = self._cont_handler.characters
+        parser.ProcessingInstructionHandler = \
+            self._cont_handler.processingInstruction
+        parser.CommentHandler = XMPPLexicalHandler.comment
+        parser.StartDoctypeDeclHandler = self._start_doctype_decl
+        parser.SkippedEntityHandler = self._skipped_entity
+        return parser
+
+    def _split_name(self, name):
+        try:
+            return self._names[name]
+        except KeyError:
+            pass
+
+        uri, sep, localname = name.rpartition(" ")
+        if not sep:
+            result = None, name
+        else:
+            result = uri, localname
+        self._names[name] = result
+        return result
+
+    def _start_element(self, name, attrs):
+        names = self._names
+        try:
+            tag = names[name]
+        except KeyError:
+            tag = self._split_name(name)
+
+        if attrs:
+            new_attrs = {}
+            for key, value in attrs.items():
+                try:
+                    new_attrs[names[key]] = value
+                except KeyError:
+                    new_attrs[self._split_name(key)] = value
+            attrs = new_attrs
+
+        self._cont_handler.startElementNS(tag, None, attrs)
+
+    def _end_element(self, name):
+        try:
+            tag = self._names[name]
+        except KeyError:
+            tag = self._split_name(name)
+        self._cont_handler.endElementNS(tag, None)
+
+    def _start_doctype_decl(self, name, system_id, public_id,
+                            has_internal_subset):
+        XMPPLexicalHandler.startDTD(name, public_id, system_id)
+
+    def _skipped_entity(self, name, is_parameter_entity):
+        XMPPLexicalHandler.startEntity(name)
+
+    def setContentHandler(self, handler):
+        """
+        Set the content handler which receives the SAX events.
+
+        The content handler must be set before the first call to
+        :meth:`feed`.
+        """
+        self._cont_handler = handler
+
+    def getContentHandler(self):
+        """
+        Return the current content handler.
+        """
+        return self._cont_handler
+
+    def feed(self, data):
+        """
+        Feed `data` (:class:`bytes` or :class:`str`) to the parser.
+
+        On the first call, :meth:`startDocument` is called on the content
+        handler before any data is processed.
+
+        :raises xml.sax.SAXParseException: if the data is not well-formed.
+        """
+        if self._parser is None:
+            self._parser = self._make_parser()
+            self._cont_handler.startDocument()
+
+        try:
+            self._parser.Parse(data, False)
+        except pyexpat.ExpatError as exc:
+            self._line_number = exc.lineno
+            self._column_number = exc.offset
+            raise xml.sax.SAXParseException(
+                pyexpat.ErrorString(exc.code), exc, self
+            ) from None
+
+    def close(self):
+        """
+        Signal the end of the document to the parser.
+
+        This checks that the document is complete and calls
+        :meth:`endDocument` on the content handler. The parser must not be
+        used afterwards.
+        """
+        if self._parser is None:
+            return
+        try:
+            self._parser.Parse(b"", True)
+        except pyexpat.ExpatError as exc:
+            self._line_number = exc.lineno
+            self._column_number = exc.offset
+            raise xml.sax.SAXParseException(
+                pyexpat.ErrorString(exc.code), exc, self
+            ) from None
+        finally:
+            self._parser = None
+        self._cont_handler.endDocument()
+
+    # locator interface, required by xml.sax.SAXParseException
+
+    def getColumnNumber(self):
+        return self._column_number
+
+    def getLineNumber(self):
+        return self._line_number
+
+    def getPublicId(self):
+        return None
+
+    def getSystemId(self):
+        return None
+
+
 def make_parser():
     """
     Create a parser which is suitably configured for parsing an XMPP XML
@@ -111,7 +111,7 @@ repeated that detailed on the other classes. Refer to the documentation of the
 
 .. autoclass:: LangAttr(*[, validator=None][, validate=ValidateMode.FROM_RECV][, default=None])
 
-.. autoclass:: Child(classes, *[, required=False][, strict=False])
+.. autoclass:: Child(classes, *[, required=False][, strict=False][, lazy=False])
 
 .. autoclass:: ChildTag(tags, *[, text_policy=UnknownTextPolicy.FAIL][, child_policy=UnknownChildPolicy.FAIL][, attr_policy=UnknownAttrPolicy.FAIL][, default_ns=None][, allow_none=False])
 
@@ -124,7 +124,7 @@ repeated that detailed on the other classes. Refer to the documentation of the
 Non-scalar descriptors
 ^^^^^^^^^^^^^^^^^^^^^^
 
-.. autoclass:: ChildList(classes)
+.. autoclass:: ChildList(classes, *[, lazy=False])
 
 .. autoclass:: ChildMap(classes[, key=None])
 
@@ -266,6 +266,74 @@ class XSOList(list):
         return list(self.filter(type_=type_, lang=lang, attrs=attrs))
 
 
+class _Passthrough:
+    # The captured events of a received top-level XSO. Child XSOs obtained
+    # from the object hold a _PassthroughLink to it, so that modifying any
+    # part of the tree invalidates the events.
+
+    __slots__ = ("events",)
+
+    def __init__(self, events):
+        self.events = events
+
+    def __deepcopy__(self, memo):
+        # the events themselves are never modified
+        return _Passthrough(self.events)
+
+    def link(self):
+        return _PassthroughLink(self)
+
+    def invalidate(self):
+        self.events = None
+
+
+class _PassthroughLink:
+    __slots__ = ("passthrough",)
+
+    events = None
+
+    def __init__(self, passthrough):
+        self.passthrough = passthrough
+
+    def __deepcopy__(self, memo):
+        return _PassthroughLink(copy.deepcopy(self.passthrough, memo))
+
+    def link(self):
+        return self
+
+    def invalidate(self):
+        self.passthrough.events = None
+
+
+class _CopiedPassthrough:
+    # Held by shallow copies of a received XSO: the copy does not replay the
+    # events, but the child XSOs it shares with the original are linked to
+    # the original events.
+
+    __slots__ = ("passthrough",)
+
+    events = None
+
+    def __init__(self, passthrough):
+        self.passthrough = passthrough
+
+    def __deepcopy__(self, memo):
+        return _CopiedPassthrough(copy.deepcopy(self.passthrough, memo))
+
+    def link(self):
+        return self.passthrough.link()
+
+    def invalidate(self):
+        pass
+
+
+def _invalidate_passthrough(instance):
+    passthrough = instance._xso_passthrough
+    if passthrough is not None:
+        instance._xso_passthrough = None
+        passthrough.invalidate()
+
+
 class PropBaseMeta(type):
     def __instancecheck__(self, instance):
         if (isinstance(instance, xso_query.BoundDescriptor) and
@@ -311,6 +379,7 @@ class _PropBase(metaclass=PropBaseMeta):
                 self.validator and
                 not self.validator.validate(value)):
             raise ValueError("invalid value")
+        _invalidate_passthrough(instance)
         self._set(instance, value)
 
     def _set_from_code(self, instance, value):
@@ -391,10 +460,23 @@ class Text(_TypedPropBase):
     The `type_`, `validator`, `validate` and `default` arguments behave like in
     :class:`Attr`.
 
+    If the `type_` supports incremental parsing and formatting (see
+    :attr:`.AbstractCDataType.incremental_parser`), the character data is
+    converted piecewise. In that case, :meth:`.XSO.xso_error_handler` receives
+    the chunk of character data which failed to parse as `ev_args`, instead of
+    the whole text, or :data:`None` if the error is only detected when
+    finishing the parser. Once an error has been suppressed by the handler,
+    the remaining character data of the element is ignored.
+
     .. automethod:: from_value
 
+    .. automethod:: from_parser
+
     .. automethod:: to_sax
 
+    .. versionchanged:: 0.10
+
+       Support for incremental parsing and formatting was added.
     """
 
     def from_value(self, instance, value):
@@ -404,6 +486,16 @@ class Text(_TypedPropBase):
         """
         self._set_from_recv(instance, self.type_.parse(value))
 
+    def from_parser(self, instance, parser):
+        """
+        Finish the incremental parser `parser` (obtained from the
+        :attr:`~.AbstractCDataType.incremental_parser` of the `type_`) and
+        store the result into `instance`’ attribute.
+
+        .. versionadded:: 0.10
+        """
+        self._set_from_recv(instance, parser.close())
+
     def to_sax(self, instance, dest):
         """
         Assign the formatted value stored at `instance`’ attribute to the text
@@ -414,9 +506,87 @@ class Text(_TypedPropBase):
         value = self.__get__(instance, type(instance))
         if value is None:
             return
+        format_chunks = getattr(self.type_, "format_chunks", None)
+        if format_chunks is not None:
+            for chunk in format_chunks(value):
+                dest.characters(chunk)
+            return
         dest.characters(self.type_.format(value))
 
 
+class _LazyChild:
+    """
+    Placeholder for a child XSO which has not been parsed yet.
+
+    Holds the events of the child subtree (including the ``"start"`` event)
+    and the parsing context. The XSO is built on the first call to
+    :meth:`materialise` and cached afterwards.
+    """
+
+    __slots__ = ("cls", "events", "ctx", "value")
+
+    def __init__(self, cls, events, ctx):
+        super().__init__()
+        self.cls = cls
+        self.events = events
+        self.ctx = ctx
+        self.value = None
+
+    @property
+    def materialised(self):
+        return self.value is not None
+
+    def materialise(self):
+        if self.value is None:
+            _, *ev_args = self.events[0]
+            try:
+                parser = self.cls.parse_events(ev_args, self.ctx)
+                next(parser)
+                for ev in self.events[1:]:
+                    parser.send(ev)
+            except StopIteration as exc:
+                self.value = exc.value
+            except ValueError:
+                raise
+            except Exception as exc:
+                raise ValueError(
+                    "failed to parse lazy child {}: {}".format(
+                        self.cls.__name__, exc
+                    )
+                ) from exc
+            else:
+                raise ValueError("incomplete event buffer")
+            self.events = None
+            self.ctx = None
+        return self.value
+
+    def to_sax(self, dest):
+        if self.value is not None:
+            self.value.unparse_to_sax(dest)
+        else:
+            events_to_sax(self.events, dest)
+
+
+class _LazyChildren(list):
+    """
+    List of :class:`_LazyChild` placeholders collected by a lazy
+    :class:`ChildList`.
+    """
+
+
+def _capture_subtree(ev_args):
+    events = [("start", )+tuple(ev_args)]
+    depth = 1
+    while depth:
+        ev = yield
+        events.append(ev)
+        if ev[0] == "start":
+            depth += 1
+        elif ev[0] == "end":
+            depth -= 1
+    return events
+
+
 class _ChildPropBase(_PropBase):
     """
     This is a base class for descriptors related to child :class:`XSO`
@@ -438,6 +608,12 @@ class _ChildPropBase(_PropBase):
         cls = self._tag_map[ev_args[0], ev_args[1]]
         return (yield from cls.parse_events(ev_args, ctx))
 
+    def _process_lazy(self, instance, ev_args, ctx):
+        cls = self._tag_map[ev_args[0], ev_args[1]]
+        events = yield from _capture_subtree(ev_args)
+        with ctx as child_ctx:
+            return _LazyChild(cls, events, child_ctx)
+
     def get_tag_map(self):
         """
         Return a dictionary mapping the tags of the supported classes to the
@@ -476,19 +652,42 @@ class Child(_ChildPropBase):
     the descriptor can be assigned to it. Subclasses of the registered classes
     also need to be registered explicitly to be allowed as types for values.
 
+    If `lazy` is true, a received child is not parsed into an XSO right away.
+    Instead, the events of the child subtree are buffered and the XSO is only
+    built when the attribute is accessed for the first time. If the attribute
+    is never accessed, the buffered events are re-emitted unchanged on
+    serialisation. This saves the cost of building XSOs for payloads which are
+    only passed through (for example when relaying stanzas).
+
+    .. note::
+
+       With `lazy`, errors in the child are only detected when the attribute
+       is accessed (and then raise :class:`ValueError` from the attribute
+       access), and :meth:`.XSO.validate` does not validate the child unless
+       it has been accessed. Errors of other types raised while parsing the
+       child are wrapped in a :class:`ValueError`, with the original exception
+       as its ``__cause__``. As the parent has already been parsed at that
+       point, :meth:`.XSO.xso_error_handler` of the parent is not called for
+       these errors.
+
     .. automethod:: get_tag_map
 
     .. automethod:: from_events
 
     .. automethod:: to_sax
+
+    .. versionchanged:: 0.10
+
+       The `lazy` argument was added.
     """
 
-    def __init__(self, classes, required=False, strict=False):
+    def __init__(self, classes, required=False, strict=False, lazy=False):
         super().__init__(
             classes,
             default=_PropBase.NO_DEFAULT if required else None
         )
         self.__strict = strict
+        self.__lazy = lazy
 
     @property
     def required(self):
@@ -498,6 +697,24 @@ class Child(_ChildPropBase):
     def strict(self):
         return self.__strict
 
+    @property
+    def lazy(self):
+        return self.__lazy
+
+    def __get__(self, instance, type_):
+        value = super().__get__(instance, type_)
+        if instance is None:
+            return value
+        if isinstance(value, _LazyChild):
+            value = value.materialise()
+            self._set(instance, value)
+        passthrough = instance._xso_passthrough
+        if (passthrough is not None and value is not None and
+                value._xso_passthrough is None):
+            # modifications of the child invalidate the passthrough events
+            value._xso_passthrough = passthrough.link()
+        return value
+
     def __set__(self, instance, value):
         if value is None and self.required:
             raise ValueError("cannot set required member to None")
@@ -512,6 +729,7 @@ class Child(_ChildPropBase):
     def __delete__(self, instance):
         if self.required:
             raise AttributeError("cannot delete required member")
+        _invalidate_passthrough(instance)
         try:
             del instance._xso_contents[self]
         except KeyError:
@@ -525,11 +743,17 @@ class Child(_ChildPropBase):
 
         This method is suspendable.
         """
+        if self.__lazy:
+            placeholder = yield from self._process_lazy(instance, ev_args, ctx)
+            self._set(instance, placeholder)
+            return placeholder
         obj = yield from self._process(instance, ev_args, ctx)
         self.__set__(instance, obj)
         return obj
 
     def validate_contents(self, instance):
+        if isinstance(instance._xso_contents.get(self), _LazyChild):
+            return
         try:
             obj = self.__get__(instance, type(instance))
         except AttributeError:
@@ -545,6 +769,10 @@ class Child(_ChildPropBase):
 
         If the object is :data:`None`, no content is generated.
         """
+        value = instance._xso_contents.get(self)
+        if isinstance(value, _LazyChild):
+            value.to_sax(dest)
+            return
         obj = self.__get__(instance, type(instance))
         if obj is None:
             return
@@ -560,13 +788,28 @@ class ChildList(_ChildPropBase):
     * the default is fixed at an empty list.
     * `required` is not supported
 
+    If `lazy` is true, received children are buffered like with the `lazy`
+    argument of :class:`Child`. All buffered children are parsed when the list
+    is accessed for the first time. Errors are reported as described for
+    :class:`Child`; if any child fails to parse, the list stays unparsed and
+    the error is raised again on the next access.
+
     .. automethod:: from_events
 
     .. automethod:: to_sax
+
+    .. versionchanged:: 0.10
+
+       The `lazy` argument was added.
     """
 
-    def __init__(self, classes):
+    def __init__(self, classes, *, lazy=False):
         super().__init__(classes)
+        self.__lazy = lazy
+
+    @property
+    def lazy(self):
+        return self.__lazy
 
     def __get__(self, instance, type_):
         if instance is None:
@@ -576,7 +819,12 @@ class ChildList(_ChildPropBase):
                 xso_query.GetSequenceDescriptor,
             )
 
-        return instance._xso_contents.setdefault(self, XSOList())
+        _invalidate_passthrough(instance)
+        value = instance._xso_contents.setdefault(self, XSOList())
+        if isinstance(value, _LazyChildren):
+            value = XSOList(item.materialise() for item in value)
+            instance._xso_contents[self] = value
+        return value
 
     def _set(self, instance, value):
         if not isinstance(value, list):
@@ -589,11 +837,23 @@ class ChildList(_ChildPropBase):
         value, the new object is appended to the list.
         """
 
+        if self.lazy:
+            placeholder = yield from self._process_lazy(instance, ev_args, ctx)
+            items = instance._xso_contents.setdefault(self, _LazyChildren())
+            if isinstance(items, _LazyChildren):
+                items.append(placeholder)
+            else:
+                # the list has already been accessed
+                items.append(placeholder.materialise())
+            return placeholder
+
         obj = yield from self._process(instance, ev_args, ctx)
         self.__get__(instance, type(instance)).append(obj)
         return obj
 
     def validate_contents(self, instance):
+        if isinstance(instance._xso_contents.get(self), _LazyChildren):
+            return
         for child in self.__get__(instance, type(instance)):
             child.validate()
 
@@ -603,6 +863,12 @@ class ChildList(_ChildPropBase):
         object, all objects in the list are serialized.
         """
 
+        value = instance._xso_contents.get(self)
+        if isinstance(value, _LazyChildren):
+            for item in value:
+                item.to_sax(dest)
+            return
+
         for obj in self.__get__(instance, type(instance)):
             obj.unparse_to_sax(dest)
 
@@ -630,6 +896,7 @@ class Collector(_PropBase):
                 xso_query.GetSequenceDescriptor,
             )
 
+        _invalidate_passthrough(instance)
         return instance._xso_contents.setdefault(self, [])
 
     def _set(self, instance, value):
@@ -758,6 +1025,7 @@ class Attr(Text):
         super().__set__(instance, value)
 
     def __delete__(self, instance):
+        _invalidate_passthrough(instance)
         try:
             del instance._xso_contents[self]
         except KeyError:
@@ -978,6 +1246,7 @@ class ChildMap(_ChildPropBase):
                 xso_query.GetMappingDescriptor,
             )
 
+        _invalidate_passthrough(instance)
         return instance._xso_contents.setdefault(
             self,
             collections.defaultdict(XSOList)
@@ -1264,6 +1533,7 @@ class ChildValueList(_ChildPropBase):
                 expr_kwargs={"sequence_factory": self.container_type},
             )
 
+        _invalidate_passthrough(instance)
         try:
             return instance._xso_contents[self]
         except KeyError:
@@ -1329,6 +1599,7 @@ class ChildValueMap(_ChildPropBase):
                 expr_kwargs={"mapping_factory": self.mapping_type}
             )
 
+        _invalidate_passthrough(instance)
         try:
             return instance._xso_contents[self]
         except KeyError:
@@ -1379,6 +1650,7 @@ class ChildValueMultiMap(_ChildPropBase):
                 expr_kwargs={"mapping_factory": self.mapping_type},
             )
 
+        _invalidate_passthrough(instance)
         try:
             return instance._xso_contents[self]
         except KeyError:
@@ -1421,6 +1693,46 @@ def _mark_attributes_incomplete(attrs, obj):
         attr.mark_incomplete(obj)
 
 
+def _mark_unparsed_attributes_incomplete(attr_map, attrs, failed_key, obj):
+    # mark all attributes which have not been parsed before the attribute
+    # with the key `failed_key` as incomplete, including that attribute
+    parsed = set()
+    for key in attrs:
+        if key == failed_key:
+            break
+        parsed.add(key)
+
+    _mark_attributes_incomplete(
+        (prop for key, prop in attr_map.items() if key not in parsed),
+        obj
+    )
+
+
+_ParsePlan = collections.namedtuple(
+    "_ParsePlan",
+    [
+        "attr_map",
+        "missing_attrs",
+        "lang_prop",
+        "text_prop",
+        "child_map",
+        "collector_prop",
+        "text_parser_factory",
+    ]
+)
+
+
+_UnparsePlan = collections.namedtuple(
+    "_UnparsePlan",
+    [
+        "attr_props",
+        "text_prop",
+        "child_props",
+        "collector_prop",
+    ]
+)
+
+
 class XMLStreamClass(xso_query.Class, abc.ABCMeta):
     """
     This metaclass is used to implement the fancy features of :class:`.XSO`
@@ -1482,6 +1794,29 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
        A set of all :class:`~.xso.Child` (or :class:`~.xso.ChildList`)
        descriptor objects of this class.
 
+    .. attribute:: _xso_parse_plan
+
+       A tuple holding the information :meth:`parse_events` needs, compiled
+       from the attributes above: the attribute map, the attribute descriptors
+       which need :meth:`~.xso.Attr.handle_missing` to be called if the
+       attribute is absent, the ``xml:lang`` attribute descriptor, the text
+       descriptor, the child map and the collector descriptor.
+
+       It is compiled when the class is created and re-compiled whenever
+       descriptors are added to the class. It must not be modified.
+
+       .. versionadded:: 0.10
+
+    .. attribute:: _xso_unparse_plan
+
+       The counterpart of :attr:`_xso_parse_plan` for
+       :meth:`.xso.XSO.unparse_to_sax`: a tuple holding the attribute
+       descriptors, the text descriptor, the child descriptors (in
+       serialisation order) and the collector descriptor. The same rules
+       apply.
+
+       .. versionadded:: 0.10
+
     .. attribute:: DECLARE_NS
 
        A dictionary which defines the namespace mappings which shall be
@@ -1686,6 +2021,54 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
     def __init__(cls, name, bases, namespace, protect=True):
         super().__init__(name, bases, namespace)
+        cls._xso_compile_plans()
+
+    def _xso_compile_plans(cls):
+        attr_map = cls.ATTR_MAP
+
+        missing_attrs = []
+        for key, prop in attr_map.items():
+            if     (type(prop).handle_missing is Attr.handle_missing and
+                    prop.missing is None and
+                    prop.default is not _PropBase.NO_DEFAULT):
+                # handle_missing would be a no-op
+                continue
+            missing_attrs.append((key, prop))
+
+        text_prop = cls.TEXT_PROPERTY
+        text_parser_factory = None
+        if text_prop is not None:
+            text_prop = text_prop.xq_descriptor
+            text_parser_factory = getattr(text_prop.type_,
+                                          "incremental_parser",
+                                          None)
+
+        collector_prop = cls.COLLECTOR_PROPERTY
+        if collector_prop is not None:
+            collector_prop = collector_prop.xq_descriptor
+
+        super().__setattr__(
+            "_xso_parse_plan",
+            _ParsePlan(
+                attr_map,
+                tuple(missing_attrs),
+                attr_map.get((namespaces.xml, "lang")),
+                text_prop,
+                cls.CHILD_MAP,
+                collector_prop,
+                text_parser_factory,
+            )
+        )
+
+        super().__setattr__(
+            "_xso_unparse_plan",
+            _UnparsePlan(
+                tuple(attr_map.values()),
+                text_prop,
+                tuple(cls.CHILD_PROPS),
+                collector_prop,
+            )
+        )
 
     def __setattr__(cls, name, value):
         try:
@@ -1731,6 +2114,9 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         super().__setattr__(name, value)
 
+        if isinstance(value, _PropBase):
+            cls._xso_compile_plans()
+
     def __delattr__(cls, name):
         try:
             existing = getattr(cls, name).xq_descriptor
@@ -1763,13 +2149,15 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         This method is suspendable.
         """
+        (attr_map, missing_attrs, lang_prop, text_prop, child_map,
+         collector_prop, text_parser_factory) = cls._xso_parse_plan
+
         with parent_ctx as ctx:
             obj = cls.__new__(cls)
             attrs = ev_args[2]
-            attr_map = cls.ATTR_MAP.copy()
             for key, value in attrs.items():
                 try:
-                    prop = attr_map.pop(key)
+                    prop = attr_map[key]
                 except KeyError:
                     if cls.UNKNOWN_ATTR_POLICY == UnknownAttrPolicy.DROP:
                         continue
@@ -1782,8 +2170,9 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                 try:
                     prop.from_value(obj, value)
                 except:
-                    prop.mark_incomplete(obj)
-                    _mark_attributes_incomplete(attr_map.values(), obj)
+                    _mark_unparsed_attributes_incomplete(
+                        attr_map, attrs, key, obj
+                    )
                     logger.debug("while parsing XSO", exc_info=True)
                     # true means suppress
                     if not obj.xso_error_handler(
@@ -1792,7 +2181,9 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                             sys.exc_info()):
                         raise
 
-            for key, prop in attr_map.items():
+            for key, prop in missing_attrs:
+                if key in attrs:
+                    continue
                 try:
                     prop.handle_missing(obj, ctx)
                 except:
@@ -1804,22 +2195,21 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                             sys.exc_info()):
                         raise
 
-            try:
-                prop = cls.ATTR_MAP[namespaces.xml, "lang"]
-            except KeyError:
-                pass
-            else:
-                lang = prop.__get__(obj, cls)
+            if lang_prop is not None:
+                lang = lang_prop.__get__(obj, cls)
                 if lang is not None:
                     ctx.lang = lang
 
             collected_text = []
+            text_parser = None
+            if text_parser_factory is not None:
+                text_parser = text_parser_factory()
             while True:
                 ev_type, *ev_args = yield
                 if ev_type == "end":
                     break
                 elif ev_type == "text":
-                    if not cls.TEXT_PROPERTY:
+                    if text_prop is None:
                         if ev_args[0].strip():
                             # true means suppress
                             if not obj.xso_error_handler(
@@ -1827,14 +2217,28 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                                     ev_args[0],
                                     None):
                                 raise ValueError("unexpected text")
-                    else:
+                    elif text_parser is not None:
+                        # only the presence of text matters here
+                        collected_text = True
+                        try:
+                            text_parser.feed(ev_args[0])
+                        except:
+                            text_parser = collected_text = None
+                            logger.debug("while parsing XSO", exc_info=True)
+                            # true means suppress
+                            if not obj.xso_error_handler(
+                                    text_prop,
+                                    ev_args[0],
+                                    sys.exc_info()):
+                                raise
+                    elif collected_text is not None:
                         collected_text.append(ev_args[0])
                 elif ev_type == "start":
                     try:
-                        handler = cls.CHILD_MAP[ev_args[0], ev_args[1]]
+                        handler = child_map[ev_args[0], ev_args[1]]
                     except KeyError:
-                        if cls.COLLECTOR_PROPERTY:
-                            handler = cls.COLLECTOR_PROPERTY.xq_descriptor
+                        if collector_prop is not None:
+                            handler = collector_prop
                         else:
                             yield from enforce_unknown_child_policy(
                                 cls.UNKNOWN_CHILD_POLICY,
@@ -1855,18 +2259,27 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
                                 sys.exc_info()):
                             raise
 
-            if collected_text:
+            if text_parser is not None:
+                if collected_text:
+                    try:
+                        text_prop.from_parser(obj, text_parser)
+                    except:
+                        logger.debug("while parsing XSO", exc_info=True)
+                        # true means suppress
+                        if not obj.xso_error_handler(
+                                text_prop,
+                                None,
+                                sys.exc_info()):
+                            raise
+            elif collected_text:
                 collected_text = "".join(collected_text)
                 try:
-                    cls.TEXT_PROPERTY.xq_descriptor.from_value(
-                        obj,
-                        collected_text
-                    )
+                    text_prop.from_value(obj, collected_text)
                 except:
                     logger.debug("while parsing XSO", exc_info=True)
                     # true means suppress
                     if not obj.xso_error_handler(
-                            cls.TEXT_PROPERTY.xq_descriptor,
+                            text_prop,
                             collected_text,
                             sys.exc_info()):
                         raise
@@ -1922,6 +2335,7 @@ class XMLStreamClass(xso_query.Class, abc.ABCMeta):
 
         prop.xq_descriptor._register(child_cls)
         cls.CHILD_MAP[child_cls.TAG] = prop.xq_descriptor
+        cls._xso_compile_plans()
 
 
 # I know it makes only partially sense to have a separate metasubclass for
@@ -2089,13 +2503,14 @@ class XSO(metaclass=XMLStreamClass):
     UNKNOWN_CHILD_POLICY = UnknownChildPolicy.DROP
     UNKNOWN_ATTR_POLICY = UnknownAttrPolicy.DROP
 
-    __slots__ = ("_xso_contents", "__weakref__")
+    __slots__ = ("_xso_contents", "_xso_passthrough", "__weakref__")
 
     def __new__(cls, *args, **kwargs):
         # XXX: is it always correct to omit the arguments here?
         # the semantics of the __new__ arguments are odd to say the least
         result = super().__new__(cls)
         result._xso_contents = dict()
+        result._xso_passthrough = None
         return result
 
     def __init__(self, *args, **kwargs):
@@ -2104,6 +2519,9 @@ class XSO(metaclass=XMLStreamClass):
     def __copy__(self):
         result = type(self).__new__(type(self))
         result._xso_contents.update(self._xso_contents)
+        passthrough = self._xso_passthrough
+        if passthrough is not None:
+            result._xso_passthrough = _CopiedPassthrough(passthrough)
         return result
 
     def __deepcopy__(self, memo):
@@ -2112,6 +2530,7 @@ class XSO(metaclass=XMLStreamClass):
             k: copy.deepcopy(v, memo)
             for k, v in self._xso_contents.items()
         }
+        result._xso_passthrough = copy.deepcopy(self._xso_passthrough, memo)
         return result
 
     def validate(self):
@@ -2178,30 +2597,43 @@ class XSO(metaclass=XMLStreamClass):
         """
 
     def unparse_to_sax(self, dest):
-        # XXX: if anyone has an idea on how to optimize this, this is a hotspot
-        # when serialising XML
-        # things which do not suffice or even change anything:
-        # 1. pull things in local variables
-        # 2. get rid of the try/finally, even without any replacement
+        # this is a hotspot when serialising XML; the descriptors are taken
+        # from the precompiled plan to avoid the BoundDescriptor round-trips
+        # through the class attributes
         cls = type(self)
+        passthrough = self._xso_passthrough
+        if passthrough is not None and passthrough.events is not None:
+            declare_ns = cls.DECLARE_NS
+            if declare_ns:
+                for prefix, uri in declare_ns.items():
+                    dest.startPrefixMapping(prefix, uri)
+            events_to_sax(passthrough.events, dest)
+            if declare_ns:
+                for prefix, uri in declare_ns.items():
+                    dest.endPrefixMapping(prefix)
+            return
+
+        attr_props, text_prop, child_props, collector_prop = \
+            cls._xso_unparse_plan
         attrib = {}
-        for prop in cls.ATTR_MAP.values():
+        for prop in attr_props:
             prop.to_dict(self, attrib)
-        if cls.DECLARE_NS:
-            for prefix, uri in cls.DECLARE_NS.items():
+        declare_ns = cls.DECLARE_NS
+        if declare_ns:
+            for prefix, uri in declare_ns.items():
                 dest.startPrefixMapping(prefix, uri)
         dest.startElementNS(self.TAG, None, attrib)
         try:
-            if cls.TEXT_PROPERTY:
-                cls.TEXT_PROPERTY.to_sax(self, dest)
-            for prop in cls.CHILD_PROPS:
+            if text_prop is not None:
+                text_prop.to_sax(self, dest)
+            for prop in child_props:
                 prop.to_sax(self, dest)
-            if cls.COLLECTOR_PROPERTY:
-                cls.COLLECTOR_PROPERTY.to_sax(self, dest)
+            if collector_prop is not None:
+                collector_prop.to_sax(self, dest)
         finally:
             dest.endElementNS(self.TAG, None)
-            if cls.DECLARE_NS:
-                for prefix, uri in cls.DECLARE_NS.items():
+            if declare_ns:
+                for prefix, uri in declare_ns.items():
                     dest.endPrefixMapping(prefix)
 
     def unparse_to_node(self, parent):
@@ -2356,11 +2788,41 @@ class XSOParser:
 
     .. automethod:: get_tag_map
 
+    .. attribute:: passthrough
+
+       If true, the events from which a top-level XSO is parsed are kept with
+       the object. As long as the object is not modified, serialising it
+       replays those events instead of serialising the descriptor values.
+       This avoids the cost of re-serialising stanzas which are forwarded
+       unchanged (for example by a component acting as a proxy).
+
+       The object counts as modified as soon as a descriptor value of the
+       object or of a child XSO obtained through :class:`Child` is assigned or
+       deleted, or a descriptor whose value is a mutable container (such as
+       :class:`ChildList` or :class:`Collector`) is accessed on any of them.
+       Reading other descriptors (such as :class:`Attr`, :class:`Text` or
+       :class:`Child`) does not count as modification.
+
+       If the language of the object has been inherited from the stream, it
+       is added as ``xml:lang`` attribute to the replayed events, so that the
+       language is preserved when the object is sent on another stream.
+
+       Copies made with :func:`copy.copy` do not replay the events.
+
+       Combine with the `lazy` argument of :class:`Child` and
+       :class:`ChildList` to also avoid building the XSOs of payloads which
+       are not inspected.
+
+       Defaults to :data:`False`.
+
+       .. versionadded:: 0.10
+
     """
 
-    def __init__(self):
+    def __init__(self, *, passthrough=False):
         self._class_map = {}
         self._tag_map = {}
+        self.passthrough = passthrough
 
     def add_class(self, cls, callback):
         """
@@ -2425,7 +2887,24 @@ class XSOParser:
                 raise UnknownTopLevelTag(
                     "unhandled top-level element",
                     ev_args)
-            cb((yield from cls.parse_events(ev_args, ctx)))
+            if self.passthrough:
+                events = [("start", )+tuple(ev_args)]
+                obj = yield from capture_events(
+                    cls.parse_events(ev_args, ctx),
+                    events,
+                )
+                lang_prop = cls.ATTR_MAP.get((namespaces.xml, "lang"))
+                if (lang_prop is not None and
+                        (namespaces.xml, "lang") not in ev_args[2]):
+                    # the language has been inherited from the stream; it
+                    # needs to be explicit when the events are replayed
+                    attrs = dict(ev_args[2])
+                    lang_prop.to_dict(obj, attrs)
+                    events[0] = ("start", ev_args[0], ev_args[1], attrs)
+                obj._xso_passthrough = _Passthrough(events)
+                cb(obj)
+            else:
+                cb((yield from cls.parse_events(ev_args, ctx)))
 
 
 def drop_handler(ev_args):
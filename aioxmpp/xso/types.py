@@ -102,8 +102,39 @@ class AbstractCDataType(metaclass=abc.ABCMeta):
     .. automethod:: parse
 
     .. automethod:: format
+
+    Types may support converting large values piecewise. The :class:`Text`
+    descriptor makes use of the following attributes if they are not
+    :data:`None`:
+
+    .. attribute:: incremental_parser
+
+       A callable which returns a new parser object. While an element is
+       parsed, its character data is passed to the :meth:`feed` method of the
+       parser object as it arrives, instead of being collected and passed to
+       :meth:`parse` at the end. At the end of the element, :meth:`close` is
+       called without arguments and must return the value. Both methods raise
+       :class:`ValueError` if the data is invalid.
+
+       The result must be equal to what :meth:`parse` returns for the
+       concatenated character data.
+
+    .. attribute:: format_chunks
+
+       A callable which takes a value and returns an iterable of strings. The
+       strings are emitted in order; their concatenation must be equal to what
+       :meth:`format` returns.
+
+    Both default to :data:`None`.
+
+    .. versionadded:: 0.10
+
+       The :attr:`incremental_parser` and :attr:`format_chunks` attributes.
     """
 
+    incremental_parser = None
+    format_chunks = None
+
     def coerce(self, v):
         """
         Force the given value `v` to be of the type represented by this
@@ -358,10 +389,30 @@ class DateTime(AbstractCDataType):
 
        The `legacy` argument was added.
 
+    .. versionchanged:: 0.10
+
+       Timestamps in the canonical formats are parsed and formatted without
+       :func:`~datetime.datetime.strptime`, :meth:`~datetime.datetime.strftime`
+       and :mod:`pytz` time zone normalisation. Other input is still handled
+       by :func:`~datetime.datetime.strptime`, with the same results as
+       before.
+
     """
 
     tzextract = re.compile("((Z)|([+-][0-9]{2}):([0-9]{2}))$")
 
+    _fast_re = re.compile(
+        r"([0-9]{4})-([0-9]{2})-([0-9]{2})"
+        r"T([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]{1,6}))?"
+        r"(?:(Z)|([+-][0-9]{2}):([0-9]{2}))?$"
+    )
+
+    _fast_legacy_re = re.compile(
+        r"([0-9]{4})([0-9]{2})([0-9]{2})"
+        r"T([0-9]{2}):([0-9]{2}):([0-9]{2})"
+        r"(?:Z|[+-][0-9]{2}:[0-9]{2})?$"
+    )
+
     def __init__(self, *, legacy=False):
         super().__init__()
         self.legacy = legacy
@@ -373,6 +424,33 @@ class DateTime(AbstractCDataType):
 
     def parse(self, v):
         v = v.strip()
+        m = self._fast_re.match(v)
+        if m is not None:
+            (year, month, day, hour, minute, second, fraction,
+             utc, hour_offset, minute_offset) = m.groups()
+            dt = datetime(
+                int(year), int(month), int(day),
+                int(hour), int(minute), int(second),
+                int(fraction.ljust(6, "0")) if fraction else 0,
+            )
+            if utc:
+                return dt.replace(tzinfo=pytz.utc)
+            if hour_offset is None:
+                return dt
+            return dt.replace(tzinfo=pytz.utc) - timedelta(
+                minutes=int(minute_offset) + 60 * int(hour_offset)
+            )
+
+        m = self._fast_legacy_re.match(v)
+        if m is not None:
+            return datetime(
+                *map(int, m.groups()),
+                tzinfo=pytz.utc
+            )
+
+        return self._parse_slow(v)
+
+    def _parse_slow(self, v):
         m = self.tzextract.search(v)
         if m:
             _, utc, hour_offset, minute_offset = m.groups()
@@ -402,6 +480,30 @@ class DateTime(AbstractCDataType):
         return dt.replace(tzinfo=tzinfo) - offset
 
     def format(self, v):
+        tzinfo = v.tzinfo
+        if tzinfo and tzinfo is not pytz.utc:
+            v = v.astimezone(pytz.utc)
+        if v.year < 1000:
+            # strftime does not pad the year
+            return self._format_slow(v)
+
+        if self.legacy:
+            return "{:04d}{:02d}{:02d}T{:02d}:{:02d}:{:02d}".format(
+                v.year, v.month, v.day,
+                v.hour, v.minute, v.second,
+            )
+
+        result = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(
+            v.year, v.month, v.day,
+            v.hour, v.minute, v.second,
+        )
+        if v.microsecond:
+            result += ".{:06d}".format(v.microsecond).rstrip("0")
+        if tzinfo:
+            result += "Z"
+        return result
+
+    def _format_slow(self, v):
         if v.tzinfo:
             v = pytz.utc.normalize(v)
         if self.legacy:
@@ -423,9 +525,19 @@ class Date(AbstractCDataType):
     avoid silent loss of information.
 
     .. versionadded:: 0.5
+
+    .. versionchanged:: 0.10
+
+       Dates in the canonical format are parsed without
+       :func:`~datetime.datetime.strptime`.
     """
 
+    _fast_re = re.compile(r"([0-9]{4})-([0-9]{2})-([0-9]{2})$")
+
     def parse(self, s):
+        m = self._fast_re.match(s)
+        if m is not None:
+            return date(*map(int, m.groups()))
         return datetime.strptime(s, "%Y-%m-%d").date()
 
     def coerce(self, v):
@@ -446,10 +558,43 @@ class Time(AbstractCDataType):
     time zones, …).
 
     .. versionadded:: 0.5
+
+    .. versionchanged:: 0.10
+
+       Times in the canonical format are parsed and formatted without
+       :func:`~datetime.datetime.strptime` and
+       :meth:`~datetime.time.strftime`.
     """
 
+    _fast_re = re.compile(
+        r"([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]{1,6}))?"
+        r"(?:(Z)|([+-][0-9]{2}):([0-9]{2}))?$"
+    )
+
     def parse(self, v):
         v = v.strip()
+        m = self._fast_re.match(v)
+        if m is not None:
+            (hour, minute, second, fraction,
+             utc, hour_offset, minute_offset) = m.groups()
+            microsecond = int(fraction.ljust(6, "0")) if fraction else 0
+            if hour_offset is None:
+                return time(
+                    int(hour), int(minute), int(second), microsecond,
+                    tzinfo=pytz.utc if utc else None,
+                )
+            dt = datetime(
+                1900, 1, 1,
+                int(hour), int(minute), int(second), microsecond,
+                tzinfo=pytz.utc,
+            )
+            return (dt - timedelta(
+                minutes=int(minute_offset) + 60 * int(hour_offset)
+            )).timetz()
+
+        return self._parse_slow(v)
+
+    def _parse_slow(self, v):
         m = DateTime.tzextract.search(v)
         if m:
             _, utc, hour_offset, minute_offset = m.groups()
@@ -477,7 +622,7 @@ class Time(AbstractCDataType):
         if v.tzinfo:
             v = pytz.utc.normalize(v)
 
-        result = v.strftime("%H:%M:%S")
+        result = "{:02d}:{:02d}:{:02d}".format(v.hour, v.minute, v.second)
         if v.microsecond:
             result += ".{:06d}".format(v.microsecond).rstrip("0")
         if v.tzinfo:
@@ -507,6 +652,99 @@ class _BinaryType(AbstractCDataType):
         raise TypeError("must be convertible to bytes")
 
 
+# size of the pieces of data which are encoded at once; a multiple of three
+# so that the base64 of the pieces can be concatenated
+_BINARY_CHUNK_SIZE = 3*16384
+
+_BASE64_DELETE = bytes(
+    set(range(256)) -
+    set(b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=")
+)
+
+
+def _check_binary_size(size, max_size):
+    if max_size is not None and size > max_size:
+        raise ValueError(
+            "binary data exceeds maximum size ({} > {} bytes)".format(
+                size, max_size,
+            )
+        )
+
+
+class _Base64Parser:
+    def __init__(self, max_size):
+        super().__init__()
+        self._max_size = max_size
+        self._parts = []
+        self._size = 0
+        self._pending = b""
+        self._tail = None
+
+    def feed(self, v):
+        data = v.encode("ascii").translate(None, _BASE64_DELETE)
+        if self._tail is not None:
+            # everything after padding is decoded in one go in close(), to
+            # get the exact behaviour of decoding the data in one go
+            self._tail.append(data)
+            self._pending_size += len(data)
+            _check_binary_size(self._size + self._pending_size * 3 // 4,
+                               self._max_size)
+            return
+
+        data = self._pending + data
+        padding = data.find(b"=")
+        if padding >= 0:
+            end = padding - padding % 4
+        else:
+            end = len(data) - len(data) % 4
+
+        if end:
+            decoded = binascii.a2b_base64(data[:end])
+            self._size += len(decoded)
+            _check_binary_size(self._size, self._max_size)
+            self._parts.append(decoded)
+
+        self._pending = data[end:]
+        if padding >= 0:
+            self._tail = [self._pending]
+            self._pending_size = len(self._pending)
+
+    def close(self):
+        if self._tail is not None:
+            self._pending = b"".join(self._tail)
+        if self._pending:
+            decoded = binascii.a2b_base64(self._pending)
+            _check_binary_size(self._size + len(decoded), self._max_size)
+            self._parts.append(decoded)
+        return b"".join(self._parts)
+
+
+class _HexParser:
+    def __init__(self, max_size):
+        super().__init__()
+        self._max_size = max_size
+        self._parts = []
+        self._size = 0
+        self._pending = ""
+
+    def feed(self, v):
+        if self._pending:
+            v = self._pending + v
+        end = len(v) - len(v) % 2
+        if end:
+            decoded = binascii.a2b_hex(v[:end])
+            self._size += len(decoded)
+            _check_binary_size(self._size, self._max_size)
+            self._parts.append(decoded)
+        self._pending = v[end:]
+
+    def close(self):
+        if self._pending:
+            # raises the appropriate error
+            binascii.a2b_hex(self._pending)
+        return b"".join(self._parts)
+
+
 class Base64Binary(_BinaryType):
     """
     Parse the value as base64 and return the :class:`bytes` object obtained
@@ -514,33 +752,89 @@ class Base64Binary(_BinaryType):
 
     If `empty_as_equal` is :data:`True`, an empty value is represented using a
     single equal sign. This is used in the SASL protocol.
+
+    If `max_size` is not :data:`None`, values which decode to more than
+    `max_size` bytes are rejected with :class:`ValueError`.
+
+    When used with :class:`Text`, the character data is decoded piecewise as
+    it is received (and the parsing fails as soon as `max_size` is exceeded),
+    and the value is encoded piecewise when it is serialised (see
+    :attr:`~.AbstractCDataType.incremental_parser`). This avoids holding
+    several copies of large payloads in memory.
+
+    .. versionchanged:: 0.10
+
+       The `max_size` argument was added and incremental parsing and
+       formatting were implemented.
     """
 
-    def __init__(self, *, empty_as_equal=False):
+    def __init__(self, *, empty_as_equal=False, max_size=None):
         super().__init__()
         self._empty_as_equal = empty_as_equal
+        self.max_size = max_size
+        if empty_as_equal:
+            # the representation of empty values needs the whole text
+            self.incremental_parser = None
+            self.format_chunks = None
 
     def parse(self, v):
-        return base64.b64decode(v)
+        result = base64.b64decode(v)
+        _check_binary_size(len(result), self.max_size)
+        return result
 
     def format(self, v):
         if self._empty_as_equal and not v:
             return "="
         return base64.b64encode(v).decode("ascii")
 
+    def incremental_parser(self):
+        return _Base64Parser(self.max_size)
+
+    def format_chunks(self, v):
+        v = memoryview(v)
+        for i in range(0, len(v), _BINARY_CHUNK_SIZE):
+            yield binascii.b2a_base64(
+                v[i:i+_BINARY_CHUNK_SIZE]
+            )[:-1].decode("ascii")
+
 
 class HexBinary(_BinaryType):
     """
     Parse the value as hexadecimal blob and return the :class:`bytes` object
     obtained from decoding.
+
+    If `max_size` is not :data:`None`, values which decode to more than
+    `max_size` bytes are rejected with :class:`ValueError`.
+
+    Like :class:`Base64Binary`, this type supports incremental parsing and
+    formatting.
+
+    .. versionchanged:: 0.10
+
+       The `max_size` argument was added and incremental parsing and
+       formatting were implemented.
     """
 
+    def __init__(self, *, max_size=None):
+        super().__init__()
+        self.max_size = max_size
+
     def parse(self, v):
-        return binascii.a2b_hex(v)
+        result = binascii.a2b_hex(v)
+        _check_binary_size(len(result), self.max_size)
+        return result
 
     def format(self, v):
         return binascii.b2a_hex(v).decode("ascii")
 
+    def incremental_parser(self):
+        return _HexParser(self.max_size)
+
+    def format_chunks(self, v):
+        v = memoryview(v)
+        for i in range(0, len(v), _BINARY_CHUNK_SIZE):
+            yield binascii.b2a_hex(v[i:i+_BINARY_CHUNK_SIZE]).decode("ascii")
+
 
 class JID(AbstractCDataType):
     """
@@ -0,0 +1,170 @@
+########################################################################
+# File name: test_stringprep.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import random
+import stringprep
+import unittest
+
+import aioxmpp.stringprep
+import aioxmpp.structs
+
+from aioxmpp.benchtest import times, timed, record
+
+
+LOCALPARTS = [
+    "romeo", "Juliet", "benvolio", "mercutio", "tybalt",
+    "jürgen", "Ærøskøbing", "ßtraße", "иван", "Ελένη", "שלום", "ﬁnn",
+]
+
+DOMAINS = [
+    "montague.example", "Capulet.example", "verona.example",
+    "müller.example", "пример.example", "παράδειγμα.example",
+]
+
+RESOURCES = [
+    "orchard", "balcony", "Mobile", "gajim.XYZ1", "Ⅸ", "Psi+ (home)",
+    "ноутбук", "Büro",
+]
+
+
+def _reference_prepare(string, mapping, tables):
+    # the straightforward implementation of the profiles, calling the
+    # predicates of the stringprep module for each character
+    chars = list(string)
+    mapping(chars)
+    aioxmpp.stringprep.do_normalization(chars)
+    aioxmpp.stringprep.check_prohibited_output(chars, tables)
+    aioxmpp.stringprep.check_bidi(chars)
+    aioxmpp.stringprep.check_unassigned(chars, None)
+    return "".join(chars)
+
+
+def _map_b1_b2(chars):
+    chars[:] = list("".join(
+        stringprep.map_table_b2(c)
+        for c in chars
+        if not stringprep.in_table_b1(c)
+    ))
+
+
+def _map_b1(chars):
+    chars[:] = [c for c in chars if not stringprep.in_table_b1(c)]
+
+
+def reference_nodeprep(string):
+    return _reference_prepare(
+        string,
+        _map_b1_b2,
+        (stringprep.in_table_c11, stringprep.in_table_c21) +
+        aioxmpp.stringprep._COMMON_PROHIBITED_TABLES +
+        (lambda x: x in aioxmpp.stringprep._nodeprep_prohibited,)
+    )
+
+
+def reference_nameprep(string):
+    return _reference_prepare(
+        string,
+        _map_b1_b2,
+        aioxmpp.stringprep._COMMON_PROHIBITED_TABLES,
+    )
+
+
+def reference_resourceprep(string):
+    return _reference_prepare(
+        string,
+        _map_b1,
+        (stringprep.in_table_c21,) +
+        aioxmpp.stringprep._COMMON_PROHIBITED_TABLES,
+    )
+
+
+class TestProfiles(unittest.TestCase):
+    KEY = "aioxmpp.stringprep", "profiles"
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        cls.jids = [
+            (rng.choice(LOCALPARTS),
+             rng.choice(DOMAINS),
+             rng.choice(RESOURCES))
+            for i in range(1000)
+        ]
+
+    def _run(self, key, nodeprep, nameprep, resourceprep):
+        with timed() as t:
+            for localpart, domain, resource in self.jids:
+                nodeprep(localpart)
+                nameprep(domain)
+                resourceprep(resource)
+        record(self.KEY+(key, "rate"), len(self.jids) / t.elapsed, "JID/s")
+
+    @times(20)
+    def test_reference(self):
+        self._run(
+            "reference",
+            reference_nodeprep,
+            reference_nameprep,
+            reference_resourceprep,
+        )
+
+    @times(20)
+    def test_uncached(self):
+        # bypass the result caches to measure the engine itself
+        self._run(
+            "uncached",
+            lambda s: aioxmpp.stringprep._nodeprep.__wrapped__(s, False),
+            lambda s: aioxmpp.stringprep._nameprep.__wrapped__(s, False),
+            lambda s: aioxmpp.stringprep._resourceprep.__wrapped__(s, False),
+        )
+
+    @times(20)
+    def test_cached(self):
+        self._run(
+            "cached",
+            aioxmpp.stringprep.nodeprep,
+            aioxmpp.stringprep.nameprep,
+            aioxmpp.stringprep.resourceprep,
+        )
+
+
+class TestJID(unittest.TestCase):
+    KEY = "aioxmpp.structs", "JID"
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        cls.jids = [
+            "{}@{}/{}".format(
+                rng.choice(LOCALPARTS),
+                rng.choice(DOMAINS),
+                rng.choice(RESOURCES),
+            )
+            for i in range(1000)
+        ]
+
+    @times(20)
+    def test_fromstr(self):
+        with timed() as t:
+            for jid in self.jids:
+                aioxmpp.structs.JID.fromstr(jid)
+        record(self.KEY+("fromstr", "rate"), len(self.jids) / t.elapsed,
+               "JID/s")
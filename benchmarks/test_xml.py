@@ -138,3 +138,61 @@ class Testwrite_single_xso(unittest.TestCase):
             aioxmpp.xml.write_single_xso(item, self.buf)
         record(key+("sz",), self.buf.tell(), "B")
         record(key+("rate",), self.buf.tell() / t.elapsed, "B/s")
+
+
+class Message(xso.XSO):
+    TAG = ("jabber:client", "message")
+
+    from_ = xso.Attr("from")
+    to = xso.Attr("to")
+    type_ = xso.Attr("type")
+    id_ = xso.Attr("id")
+
+    body = xso.ChildText(("jabber:client", "body"), default=None)
+
+
+class TestXMPPXMLProcessor(unittest.TestCase):
+    KEY = "aioxmpp.xml", "XMPPXMLProcessor"
+
+    STREAM_HEADER = (
+        b"<stream:stream xmlns:stream='http://etherx.jabber.org/streams' "
+        b"xmlns='jabber:client' from='example.test' "
+        b"to='foo@example.test' id='foobarbaz' version='1.0'>"
+    )
+
+    @classmethod
+    def setUpClass(cls):
+        buf = io.BytesIO()
+        for i in range(100):
+            item = Message()
+            item.from_ = "romeo@montague.example/orchard"
+            item.to = "juliet@capulet.example/balcony"
+            item.type_ = "chat"
+            item.id_ = "id{}".format(i)
+            item.body = "Art thou not Romeo, and a Montague?" * 4
+            aioxmpp.xml.write_single_xso(item, buf)
+        cls.stanzas = buf.getvalue()
+
+    def _parse(self, parser, key):
+        received = []
+
+        processor = aioxmpp.xml.XMPPXMLProcessor()
+        processor.stanza_parser = xso.XSOParser()
+        processor.stanza_parser.add_class(Message, received.append)
+        parser.setContentHandler(processor)
+        parser.feed(self.STREAM_HEADER)
+
+        with timed() as t:
+            parser.feed(self.stanzas)
+
+        self.assertEqual(len(received), 100)
+        record(key+("rate",), len(self.stanzas) / t.elapsed, "B/s")
+        record(key+("stanza_rate",), len(received) / t.elapsed, "1/s")
+
+    @times(100)
+    def test_sax_backend(self):
+        self._parse(aioxmpp.xml.make_parser(), self.KEY + ("sax",))
+
+    @times(100)
+    def test_expat_backend(self):
+        self._parse(aioxmpp.xml.ExpatParser(), self.KEY + ("expat",))
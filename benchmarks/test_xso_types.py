@@ -0,0 +1,71 @@
+########################################################################
+# File name: test_xso_types.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import random
+import unittest
+
+from datetime import datetime, timedelta
+
+import pytz
+
+import aioxmpp.xso as xso
+
+from aioxmpp.benchtest import times, timed, record
+
+
+class TestDateTime(unittest.TestCase):
+    KEY = "aioxmpp.xso.types", "DateTime"
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(1)
+        start = datetime(2017, 1, 1, tzinfo=pytz.utc)
+        cls.values = [
+            start + timedelta(seconds=rng.randint(0, 86400*365),
+                              microseconds=rng.choice([0, 123000]))
+            for i in range(10000)
+        ]
+        type_ = xso.DateTime()
+        cls.strings = [type_.format(value) for value in cls.values]
+
+    def _run(self, key, fun, values):
+        with timed() as t:
+            for value in values:
+                fun(value)
+        record(self.KEY+(key, "rate"), len(values) / t.elapsed, "1/s")
+
+    @times(20)
+    def test_parse_reference(self):
+        self._run("parse_reference", xso.DateTime()._parse_slow,
+                  self.strings)
+
+    @times(20)
+    def test_parse(self):
+        self._run("parse", xso.DateTime().parse, self.strings)
+
+    @times(20)
+    def test_format_reference(self):
+        self._run("format_reference", xso.DateTime()._format_slow,
+                  self.values)
+
+    @times(20)
+    def test_format(self):
+        self._run("format", xso.DateTime().format, self.values)
@@ -1786,6 +1786,306 @@ class TestDiscoClient(unittest.TestCase):
         self.assertIs(ctx.exception, exc)
 
 
+class TestSharedDiscoCache(unittest.TestCase):
+    def setUp(self):
+        self.c = disco_service.SharedDiscoCache()
+        self.jid = structs.JID.fromstr("muc.foo.example")
+
+    def test_defaults(self):
+        self.assertEqual(self.c.ttl, 300)
+        self.assertEqual(self.c.maxsize, 1000)
+
+    def test_maxsize(self):
+        self.c.maxsize = 1
+        self.assertEqual(self.c.maxsize, 1)
+        self.c.put("info", self.jid, None, asyncio.Future())
+        self.c.put("items", self.jid, None, asyncio.Future())
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+    def test_is_shareable(self):
+        self.assertTrue(self.c.is_shareable(
+            structs.JID.fromstr("foo.example")
+        ))
+        self.assertFalse(self.c.is_shareable(
+            structs.JID.fromstr("user@foo.example")
+        ))
+        self.assertFalse(self.c.is_shareable(
+            structs.JID.fromstr("foo.example/res")
+        ))
+
+    def test_get_raises_KeyError_for_unknown(self):
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+    def test_put_and_get_pending(self):
+        fut = asyncio.Future()
+        self.c.put("info", self.jid, "node", fut)
+        self.assertIs(self.c.get("info", self.jid, "node"), fut)
+        with self.assertRaises(KeyError):
+            self.c.get("items", self.jid, "node")
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+    def test_result_is_kept(self):
+        fut = asyncio.Future()
+        self.c.put("info", self.jid, None, fut)
+        fut.set_result(unittest.mock.sentinel.result)
+        run_coroutine(asyncio.sleep(0))
+        self.assertIs(self.c.get("info", self.jid, None), fut)
+
+    def test_result_expires_after_ttl(self):
+        self.c.ttl = 0
+        fut = asyncio.Future()
+        self.c.put("info", self.jid, None, fut)
+        fut.set_result(unittest.mock.sentinel.result)
+        run_coroutine(asyncio.sleep(0))
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+    def test_exception_removes_entry(self):
+        fut = asyncio.Future()
+        self.c.put("info", self.jid, None, fut)
+        fut.set_exception(ConnectionError())
+        run_coroutine(asyncio.sleep(0))
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+    def test_cancellation_removes_entry(self):
+        fut = asyncio.Future()
+        self.c.put("info", self.jid, None, fut)
+        fut.cancel()
+        run_coroutine(asyncio.sleep(0))
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+    def test_failure_of_replaced_future_keeps_new_entry(self):
+        fut1 = asyncio.Future()
+        fut2 = asyncio.Future()
+        self.c.put("info", self.jid, None, fut1)
+        self.c.put("info", self.jid, None, fut2)
+        fut1.cancel()
+        run_coroutine(asyncio.sleep(0))
+        self.assertIs(self.c.get("info", self.jid, None), fut2)
+
+    def test_clear(self):
+        self.c.put("info", self.jid, None, asyncio.Future())
+        self.c.clear()
+        with self.assertRaises(KeyError):
+            self.c.get("info", self.jid, None)
+
+
+class TestDiscoClientSharedCache(unittest.TestCase):
+    def setUp(self):
+        self.shared = disco_service.SharedDiscoCache()
+        self.cc1 = make_connected_client()
+        self.cc2 = make_connected_client()
+        self.s1 = disco_service.DiscoClient(self.cc1)
+        self.s2 = disco_service.DiscoClient(self.cc2)
+        self.s1.shared_cache = self.shared
+        self.s2.shared_cache = self.shared
+        self.to = structs.JID.fromstr("muc.foo.example")
+
+    def test_shared_cache_defaults_to_None(self):
+        s = disco_service.DiscoClient(make_connected_client())
+        self.assertIsNone(s.shared_cache)
+
+    def test_query_info_coalesces_concurrent_queries(self):
+        response = disco_xso.InfoQuery()
+        fut = asyncio.Future()
+        self.cc1.stream.send = unittest.mock.Mock(return_value=fut)
+        self.cc2.stream.send = CoroutineMock()
+
+        def set_result():
+            fut.set_result(response)
+
+        task1 = asyncio.async(self.s1.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+        task2 = asyncio.async(self.s2.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+        set_result()
+
+        result1 = run_coroutine(task1)
+        result2 = run_coroutine(task2)
+
+        self.assertIs(result1, response)
+        self.assertIs(result2, response)
+        self.assertEqual(len(self.cc1.stream.send.mock_calls), 1)
+        self.cc2.stream.send.assert_not_called()
+
+    def test_query_info_reuses_result_of_other_client(self):
+        response = disco_xso.InfoQuery()
+        self.cc1.stream.send.return_value = response
+
+        on_info_result = unittest.mock.Mock()
+        self.s2.on_info_result.connect(on_info_result)
+
+        result1 = run_coroutine(self.s1.query_info(self.to, node="foo"))
+        result2 = run_coroutine(self.s2.query_info(self.to, node="foo"))
+
+        self.assertIs(result1, response)
+        self.assertIs(result2, response)
+        self.cc2.stream.send.assert_not_called()
+        on_info_result.assert_called_once_with(self.to, "foo", response)
+
+    def test_query_info_emits_result_of_other_client_once(self):
+        response = disco_xso.InfoQuery()
+        self.cc1.stream.send.return_value = response
+
+        on_info_result = unittest.mock.Mock()
+        self.s2.on_info_result.connect(on_info_result)
+
+        run_coroutine(self.s1.query_info(self.to))
+        result2 = run_coroutine(self.s2.query_info(self.to))
+
+        with unittest.mock.patch.object(self.shared, "get") as get:
+            result3 = run_coroutine(self.s2.query_info(self.to))
+
+        get.assert_not_called()
+        self.assertIs(result2, response)
+        self.assertIs(result3, response)
+        self.cc2.stream.send.assert_not_called()
+        on_info_result.assert_called_once_with(self.to, None, response)
+
+    def test_query_info_no_cache_does_not_store_result_of_other_client(self):
+        response = disco_xso.InfoQuery()
+        self.cc1.stream.send.return_value = response
+
+        run_coroutine(self.s1.query_info(self.to))
+        run_coroutine(self.s2.query_info(self.to, no_cache=True))
+
+        self.assertNotIn((self.to, None), self.s2._info_pending)
+
+    def test_query_info_does_not_share_non_domain_jids(self):
+        to = structs.JID.fromstr("user@foo.example")
+        self.cc1.stream.send.return_value = unittest.mock.sentinel.r1
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        result1 = run_coroutine(self.s1.query_info(to))
+        result2 = run_coroutine(self.s2.query_info(to))
+
+        self.assertIs(result1, unittest.mock.sentinel.r1)
+        self.assertIs(result2, unittest.mock.sentinel.r2)
+
+    def test_query_info_no_cache_is_not_shared(self):
+        self.cc1.stream.send.return_value = unittest.mock.sentinel.r1
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        run_coroutine(self.s1.query_info(self.to, no_cache=True))
+        result2 = run_coroutine(self.s2.query_info(self.to))
+
+        self.assertIs(result2, unittest.mock.sentinel.r2)
+
+    def test_query_info_require_fresh_bypasses_shared_cache(self):
+        self.cc1.stream.send.return_value = unittest.mock.sentinel.r1
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        run_coroutine(self.s1.query_info(self.to))
+        result2 = run_coroutine(self.s2.query_info(self.to,
+                                                   require_fresh=True))
+        self.assertIs(result2, unittest.mock.sentinel.r2)
+
+        result1 = run_coroutine(self.s1.query_info(self.to,
+                                                   require_fresh=True))
+        self.assertIs(result1, unittest.mock.sentinel.r1)
+
+    def test_query_info_errors_are_not_shared(self):
+        self.cc1.stream.send.side_effect = ConnectionError()
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        with self.assertRaises(ConnectionError):
+            run_coroutine(self.s1.query_info(self.to))
+
+        result2 = run_coroutine(self.s2.query_info(self.to))
+        self.assertIs(result2, unittest.mock.sentinel.r2)
+
+    def test_query_info_sends_own_query_if_shared_query_fails(self):
+        fut = asyncio.Future()
+        self.cc1.stream.send = unittest.mock.Mock(return_value=fut)
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        def fail():
+            fut.set_exception(ConnectionError())
+
+        task1 = asyncio.async(self.s1.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+        task2 = asyncio.async(self.s2.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+        self.cc2.stream.send.assert_not_called()
+        fail()
+
+        with self.assertRaises(ConnectionError):
+            run_coroutine(task1)
+        self.assertIs(run_coroutine(task2), unittest.mock.sentinel.r2)
+
+    def test_stream_destruction_falls_back_to_own_query(self):
+        self.cc1.stream.send = unittest.mock.Mock(
+            return_value=asyncio.Future()
+        )
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        task1 = asyncio.async(self.s1.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+        task2 = asyncio.async(self.s2.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+        self.cc2.stream.send.assert_not_called()
+
+        self.s1._clear_cache()
+
+        self.assertIs(run_coroutine(task2), unittest.mock.sentinel.r2)
+        with self.assertRaises(asyncio.CancelledError):
+            run_coroutine(task1)
+
+    def test_timeout_while_waiting_for_shared_query(self):
+        fut = asyncio.Future()
+        self.cc1.stream.send = unittest.mock.Mock(return_value=fut)
+
+        task1 = asyncio.async(self.s1.query_info(self.to))
+        run_coroutine(asyncio.sleep(0))
+
+        with self.assertRaises(TimeoutError):
+            run_coroutine(self.s2.query_info(self.to, timeout=0.01))
+
+        self.assertFalse(task1.done())
+        self.cc2.stream.send.assert_not_called()
+        fut.set_result(unittest.mock.sentinel.r1)
+        self.assertIs(run_coroutine(task1), unittest.mock.sentinel.r1)
+
+    def test_query_items_reuses_result_of_other_client(self):
+        response = disco_xso.ItemsQuery()
+        self.cc1.stream.send.return_value = response
+
+        result1 = run_coroutine(self.s1.query_items(self.to, node="foo"))
+        result2 = run_coroutine(self.s2.query_items(self.to, node="foo"))
+
+        self.assertIs(result1, response)
+        self.assertIs(result2, response)
+        self.cc2.stream.send.assert_not_called()
+
+    def test_query_items_stores_result_of_other_client(self):
+        response = disco_xso.ItemsQuery()
+        self.cc1.stream.send.return_value = response
+
+        run_coroutine(self.s1.query_items(self.to))
+        run_coroutine(self.s2.query_items(self.to))
+
+        with unittest.mock.patch.object(self.shared, "get") as get:
+            result = run_coroutine(self.s2.query_items(self.to))
+
+        get.assert_not_called()
+        self.assertIs(result, response)
+
+    def test_query_items_does_not_share_non_domain_jids(self):
+        to = structs.JID.fromstr("user@foo.example")
+        self.cc1.stream.send.return_value = unittest.mock.sentinel.r1
+        self.cc2.stream.send.return_value = unittest.mock.sentinel.r2
+
+        run_coroutine(self.s1.query_items(to))
+        result2 = run_coroutine(self.s2.query_items(to))
+
+        self.assertIs(result2, unittest.mock.sentinel.r2)
+
+
 class Testmount_as_node(unittest.TestCase):
     def setUp(self):
         self.pn = disco_service.mount_as_node(
@@ -153,6 +153,21 @@ class Testbuild_features_string(unittest.TestCase):
             caps115.build_features_string(features)
         )
 
+    def test_escaped_features_are_cached(self):
+        features = [
+            "urn:example:cached-feature",
+        ]
+
+        caps115.build_features_string(features)
+        with unittest.mock.patch(
+                "aioxmpp.entitycaps.caps115.escape") as escape:
+            self.assertEqual(
+                b"urn:example:cached-feature<",
+                caps115.build_features_string(features)
+            )
+
+        escape.assert_not_called()
+
     def test_reject_duplicate_features(self):
         features = [
             "http://jabber.org/protocol/disco#info",
@@ -482,22 +497,22 @@ class Testhash_query(unittest.TestCase):
         self.assertSequenceEqual(
             calls,
             [
-                unittest.mock.call.hashlib_new(base.algo),
                 unittest.mock.call.build_identities_string(
                     base.query.identities,
                 ),
-                unittest.mock.call.hashlib_new().update(
-                    base.build_identities_string()
-                ),
                 unittest.mock.call.build_features_string(
                     base.query.features
                 ),
-                unittest.mock.call.hashlib_new().update(
-                    base.build_features_string()
-                ),
                 unittest.mock.call.build_forms_string(
                     base.query.exts
                 ),
+                unittest.mock.call.hashlib_new(base.algo),
+                unittest.mock.call.hashlib_new().update(
+                    base.build_identities_string()
+                ),
+                unittest.mock.call.hashlib_new().update(
+                    base.build_features_string()
+                ),
                 unittest.mock.call.hashlib_new().update(
                     base.build_forms_string()
                 ),
@@ -514,6 +529,37 @@ class Testhash_query(unittest.TestCase):
             base.base64_b64encode().decode()
         )
 
+    def test_memoises_hash_by_content(self):
+        info = disco.xso.InfoQuery()
+        info.identities.append(
+            disco.xso.Identity(category="client", type_="pc"),
+        )
+        info.features.update({"urn:example:memo:a", "urn:example:memo:b"})
+
+        result = caps115.hash_query(info, "sha1")
+
+        same = disco.xso.InfoQuery()
+        same.identities.append(
+            disco.xso.Identity(category="client", type_="pc"),
+        )
+        same.features.update({"urn:example:memo:b", "urn:example:memo:a"})
+
+        with unittest.mock.patch("hashlib.new") as new:
+            self.assertEqual(result, caps115.hash_query(same, "sha1"))
+        new.assert_not_called()
+
+        same.features.add("urn:example:memo:c")
+        self.assertNotEqual(result, caps115.hash_query(same, "sha1"))
+
+    def test_memoises_per_algorithm(self):
+        info = disco.xso.InfoQuery()
+        info.features.add("urn:example:memo:algo")
+
+        self.assertNotEqual(
+            caps115.hash_query(info, "sha1"),
+            caps115.hash_query(info, "sha256"),
+        )
+
     def test_simple_xep_data(self):
         info = disco.xso.InfoQuery()
         info.identities.extend([
@@ -675,6 +675,34 @@ class TestImplementation(unittest.TestCase):
             }
         )
 
+    def test_calculate_keys_memoises_keys_by_hash_input(self):
+        with contextlib.ExitStack() as stack:
+            _calculate_hash = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.entitycaps.caps390._calculate_hash"
+                )
+            )
+
+            _get_hash_input = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.entitycaps.caps390._get_hash_input"
+                )
+            )
+            _get_hash_input.return_value = unittest.mock.sentinel.hash_input
+
+            result1 = set(self.i.calculate_keys(unittest.mock.sentinel.info))
+            result2 = set(self.i.calculate_keys(unittest.mock.sentinel.info))
+
+            self.assertEqual(_calculate_hash.call_count,
+                             len(self.algorithms))
+            self.assertSetEqual(result1, result2)
+
+            _get_hash_input.return_value = unittest.mock.sentinel.other_input
+            set(self.i.calculate_keys(unittest.mock.sentinel.info))
+
+        self.assertEqual(_calculate_hash.call_count,
+                         2 * len(self.algorithms))
+
     def test_calculate_keys_efficiently_builds_hashes_for_given_algorithms(self):  # NOQA
         def generate_digests(algo, _):
             assert isinstance(algo, type(unittest.mock.sentinel.foo))
@@ -0,0 +1,383 @@
+########################################################################
+# File name: test_db.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import fcntl
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import aioxmpp.entitycaps as entitycaps
+import aioxmpp.entitycaps.db as entitycaps_db
+
+from aioxmpp.entitycaps.db import SingleFileDatabase
+
+
+class TestSingleFileDatabase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tempdir.name) / "caps.db"
+        self.db = SingleFileDatabase(self.path)
+
+    def tearDown(self):
+        self.db.close()
+        self.tempdir.cleanup()
+
+    def _key(self, path):
+        key = unittest.mock.Mock()
+        key.path = pathlib.Path(path)
+        return key
+
+    def test_is_exported(self):
+        self.assertIs(entitycaps.SingleFileDatabase, SingleFileDatabase)
+
+    def test_creates_file(self):
+        self.assertTrue(self.path.exists())
+        self.assertEqual(len(self.db), 0)
+
+    def test_path(self):
+        self.assertEqual(self.db.path, self.path)
+
+    def test_get_raises_KeyError_for_missing_entry(self):
+        with self.assertRaises(KeyError):
+            self.db.get(self._key("hashes/foo.xml"))
+
+    def test_add_is_visible_before_flush(self):
+        key = self._key("hashes/foo.xml")
+        self.db.add(key, b"<foo/>")
+        self.assertEqual(self.db.get(key), b"<foo/>")
+        self.assertEqual(self.db.get("hashes/foo.xml"), b"<foo/>")
+        self.assertIn(key, self.db)
+
+        other = SingleFileDatabase(self.path)
+        self.assertNotIn(key, other)
+        other.close()
+
+    def test_flush_persists_entries(self):
+        self.db.add(self._key("hashes/foo.xml"), b"<foo/>")
+        self.db.add(self._key("caps2/sha-256/ab/cd/ef.xml"), b"<bar/>")
+        self.db.flush()
+        self.db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertSetEqual(
+            db.keys(),
+            {"hashes/foo.xml", "caps2/sha-256/ab/cd/ef.xml"},
+        )
+        self.assertEqual(db.get(self._key("hashes/foo.xml")), b"<foo/>")
+        self.assertEqual(db.get(self._key("caps2/sha-256/ab/cd/ef.xml")),
+                         b"<bar/>")
+        db.close()
+
+    def test_flush_writes_once(self):
+        self.db.add("a", b"1")
+        self.db.add("b", b"2")
+        with unittest.mock.patch.object(
+                pathlib.Path, "open",
+                autospec=True,
+                side_effect=pathlib.Path.open) as open_:
+            self.db.flush()
+            self.db.flush()
+
+        self.assertEqual(
+            [call[1][1] for call in open_.mock_calls if call[0] == ""],
+            ["r+b"],
+        )
+
+    def test_flush_does_not_rescan_file(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+        self.db.add("b", b"2")
+        with unittest.mock.patch.object(self.db, "_scan") as scan:
+            self.db.flush()
+        scan.assert_not_called()
+
+        self.assertEqual(self.db.get("a"), b"1")
+        self.assertEqual(self.db.get("b"), b"2")
+        self.db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertEqual(db.get("a"), b"1")
+        self.assertEqual(db.get("b"), b"2")
+        db.close()
+
+    def test_flush_does_not_hold_lock_during_io(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+        self.db.add("b", b"2")
+
+        def open_(path, *args, **kwargs):
+            self.assertTrue(self.db._lock.acquire(blocking=False))
+            self.db._lock.release()
+            self.assertEqual(self.db.get("a"), b"1")
+            self.assertEqual(self.db.get("b"), b"2")
+            return orig_open(path, *args, **kwargs)
+
+        orig_open = pathlib.Path.open
+        with unittest.mock.patch.object(pathlib.Path, "open", new=open_):
+            self.db.flush()
+
+        self.assertEqual(self.db.get("b"), b"2")
+
+    def test_entries_added_during_flush_are_kept_pending(self):
+        self.db.add("a", b"1")
+
+        def open_(path, *args, **kwargs):
+            self.db.add("a", b"2")
+            return orig_open(path, *args, **kwargs)
+
+        orig_open = pathlib.Path.open
+        with unittest.mock.patch.object(pathlib.Path, "open", new=open_):
+            self.db.flush()
+
+        self.assertEqual(self.db.get("a"), b"2")
+        self.db.flush()
+        self.db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertEqual(db.get("a"), b"2")
+        db.close()
+
+    def test_later_entries_override_earlier_ones(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+        self.db.add("a", b"2")
+        self.db.flush()
+
+        self.assertEqual(self.db.get("a"), b"2")
+        db = SingleFileDatabase(self.path)
+        self.assertEqual(db.get("a"), b"2")
+        db.close()
+
+    def test_compact(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+        self.db.add("a", b"22")
+        self.db.add("b", b"3")
+        self.db.flush()
+        self.db.add("c", b"4")
+
+        self.db.compact()
+
+        # header + three records with six bytes of record header each
+        self.assertEqual(
+            self.path.stat().st_size,
+            len(entitycaps_db._MAGIC) + 3 * 6 + 3 + len(b"2213")
+        )
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertSetEqual(db.keys(), {"a", "b", "c"})
+        self.assertEqual(db.get("a"), b"22")
+        self.assertEqual(db.get("b"), b"3")
+        self.assertEqual(db.get("c"), b"4")
+        db.close()
+
+    def test_ignores_and_overwrites_partial_record(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+        self.db.close()
+
+        with self.path.open("ab") as f:
+            f.write(b"\x00\x05abc")
+
+        db = SingleFileDatabase(self.path)
+        self.assertSetEqual(db.keys(), {"a"})
+        db.add("b", b"2")
+        db.flush()
+        db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertSetEqual(db.keys(), {"a", "b"})
+        self.assertEqual(db.get("b"), b"2")
+        db.close()
+
+    def test_rejects_foreign_file(self):
+        path = pathlib.Path(self.tempdir.name) / "foo"
+        with path.open("wb") as f:
+            f.write(b"<?xml version='1.0'?><foo/>")
+
+        with self.assertRaisesRegex(ValueError, "not an entity caps"):
+            SingleFileDatabase(path)
+
+    def test_readonly_does_not_create_file(self):
+        path = pathlib.Path(self.tempdir.name) / "other.db"
+        db = SingleFileDatabase(path, readonly=True)
+        self.assertFalse(path.exists())
+        with self.assertRaises(KeyError):
+            db.get("a")
+        db.close()
+
+    def test_readonly_rejects_writes(self):
+        db = SingleFileDatabase(self.path, readonly=True)
+        with self.assertRaisesRegex(RuntimeError, "read-only"):
+            db.add("a", b"1")
+        with self.assertRaisesRegex(RuntimeError, "read-only"):
+            db.compact()
+        db.close()
+
+    def test_close_flushes(self):
+        self.db.add("a", b"1")
+        self.db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertEqual(db.get("a"), b"1")
+        db.close()
+
+    def test_close_is_idempotent(self):
+        self.db.add("a", b"1")
+        self.db.close()
+        self.db.close()
+
+        with self.assertRaises(KeyError):
+            self.db.get("a")
+
+    def test_writes_after_close_raise_RuntimeError(self):
+        self.db.close()
+
+        with self.assertRaisesRegex(RuntimeError, "closed"):
+            self.db.add("a", b"1")
+        with self.assertRaisesRegex(RuntimeError, "closed"):
+            self.db.compact()
+
+        # nothing to do, but must not fail
+        self.db.flush()
+
+    def test_compact_after_flush_and_lookups(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+        self.db.compact()
+        self.db.add("b", b"2")
+        self.db.flush()
+
+        self.assertEqual(self.db.get("a"), b"1")
+        self.assertEqual(self.db.get("b"), b"2")
+        self.assertSetEqual(self.db.keys(), {"a", "b"})
+
+    def test_flush_keeps_records_appended_by_other_writer(self):
+        other = SingleFileDatabase(self.path)
+        other.add("a", b"1")
+        other.flush()
+
+        self.db.add("b", b"2")
+        self.db.flush()
+        # the record of the other writer is picked up while appending
+        self.assertEqual(self.db.get("a"), b"1")
+
+        other.add("c", b"3")
+        other.flush()
+        self.assertEqual(other.get("b"), b"2")
+        other.close()
+        self.db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertSetEqual(db.keys(), {"a", "b", "c"})
+        self.assertEqual(db.get("a"), b"1")
+        self.assertEqual(db.get("b"), b"2")
+        self.assertEqual(db.get("c"), b"3")
+        db.close()
+
+    def test_compact_keeps_records_appended_by_other_writer(self):
+        other = SingleFileDatabase(self.path)
+        other.add("a", b"1")
+        other.flush()
+
+        self.db.add("b", b"2")
+        self.db.compact()
+        self.assertEqual(self.db.get("a"), b"1")
+
+        # the other writer notices that the file has been replaced
+        other.add("c", b"3")
+        other.flush()
+        self.assertSetEqual(other.keys(), {"a", "b", "c"})
+        self.assertEqual(other.get("b"), b"2")
+        other.close()
+        self.db.close()
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertSetEqual(db.keys(), {"a", "b", "c"})
+        self.assertEqual(db.get("c"), b"3")
+        db.close()
+
+    def test_compact_does_not_invalidate_mapping_of_other_reader(self):
+        self.db.add("a", b"1")
+        self.db.flush()
+
+        other = SingleFileDatabase(self.path)
+        self.db.add("a", b"2")
+        self.db.compact()
+
+        self.assertEqual(other.get("a"), b"1")
+        other.close()
+
+    def test_flush_takes_file_lock(self):
+        self.db.add("a", b"1")
+        with unittest.mock.patch("fcntl.flock",
+                                 wraps=fcntl.flock) as flock:
+            self.db.flush()
+
+        self.assertSequenceEqual(
+            [call[1][1] for call in flock.mock_calls],
+            [fcntl.LOCK_EX, fcntl.LOCK_UN],
+        )
+
+    def test_load_removes_partial_record(self):
+        self.db.add("a", b"1")
+        self.db.close()
+        size = self.path.stat().st_size
+
+        with self.path.open("ab") as f:
+            f.write(b"\x00\x05abc")
+
+        db = SingleFileDatabase(self.path)
+        self.assertEqual(self.path.stat().st_size, size)
+        db.close()
+
+    def test_readonly_does_not_remove_partial_record(self):
+        self.db.add("a", b"1")
+        self.db.close()
+
+        with self.path.open("ab") as f:
+            f.write(b"\x00\x05abc")
+        size = self.path.stat().st_size
+
+        db = SingleFileDatabase(self.path, readonly=True)
+        self.assertSetEqual(db.keys(), {"a"})
+        self.assertEqual(self.path.stat().st_size, size)
+        db.close()
+
+    def test_import_directory(self):
+        root = pathlib.Path(self.tempdir.name) / "dirdb"
+        (root / "hashes").mkdir(parents=True)
+        (root / "caps2" / "sha-256" / "ab").mkdir(parents=True)
+        with (root / "hashes" / "foo.xml").open("wb") as f:
+            f.write(b"<foo/>")
+        with (root / "caps2" / "sha-256" / "ab" / "cd.xml").open("wb") as f:
+            f.write(b"<bar/>")
+        with (root / "README").open("wb") as f:
+            f.write(b"not an entry")
+
+        self.assertEqual(self.db.import_directory(root), 2)
+        self.db.flush()
+
+        self.assertSetEqual(
+            self.db.keys(),
+            {"hashes/foo.xml", "caps2/sha-256/ab/cd.xml"},
+        )
+        self.assertEqual(self.db.get(self._key("hashes/foo.xml")), b"<foo/>")
@@ -27,6 +27,7 @@ import tempfile
 import unittest
 import unittest.mock
 
+import aioxmpp.cache
 import aioxmpp.disco as disco
 import aioxmpp.service as service
 import aioxmpp.stanza as stanza
@@ -35,6 +36,7 @@ import aioxmpp.xml
 
 from aioxmpp.utils import namespaces
 
+import aioxmpp.entitycaps.db as entitycaps_db
 import aioxmpp.entitycaps.service as entitycaps_service
 
 from aioxmpp.testutils import (
@@ -79,10 +81,185 @@ TEST_DB_ENTRY_HASH = "sha-1"
 TEST_DB_ENTRY_NODE_BARE = "http://tkabber.jabber.ru/"
 
 
+class TestMemoryOverlay(unittest.TestCase):
+    def setUp(self):
+        self.o = entitycaps_service.MemoryOverlay(max_bytes=100)
+
+    def test_defaults(self):
+        o = entitycaps_service.MemoryOverlay()
+        self.assertEqual(o.max_bytes, 4*1024*1024)
+        self.assertEqual(o.total_bytes, 0)
+        self.assertEqual(len(o), 0)
+        self.assertEqual(o.hits, 0)
+        self.assertEqual(o.misses, 0)
+        self.assertEqual(o.evictions, 0)
+
+    def test_get_raises_KeyError_and_counts_miss(self):
+        with self.assertRaises(KeyError):
+            self.o.get(unittest.mock.sentinel.key)
+        self.assertEqual(self.o.misses, 1)
+        self.assertEqual(self.o.hits, 0)
+
+    def test_put_and_get(self):
+        q = disco.xso.InfoQuery(features={"foo"})
+        self.o.put(unittest.mock.sentinel.key, q, 10)
+        result = self.o.get(unittest.mock.sentinel.key)
+        self.assertIsInstance(result, disco.xso.InfoQuery)
+        self.assertSetEqual(result.features, {"foo"})
+        self.assertIn(unittest.mock.sentinel.key, self.o)
+        self.assertEqual(self.o.total_bytes, 10)
+        self.assertEqual(len(self.o), 1)
+        self.assertEqual(self.o.hits, 1)
+
+    def test_put_stores_copy(self):
+        q = disco.xso.InfoQuery(features={"foo"})
+        self.o.put("a", q, 10)
+        q.features.add("bar")
+        self.assertSetEqual(self.o.get("a").features, {"foo"})
+
+    def test_get_returns_copy(self):
+        self.o.put("a", disco.xso.InfoQuery(features={"foo"}), 10)
+        result = self.o.get("a")
+        result.features.add("bar")
+        self.assertIsNot(result, self.o.get("a"))
+        self.assertSetEqual(self.o.get("a").features, {"foo"})
+
+    def test_replace_adjusts_size(self):
+        self.o.put("a", ["e1"], 10)
+        self.o.put("a", ["e2"], 30)
+        self.assertEqual(self.o.total_bytes, 30)
+        self.assertEqual(len(self.o), 1)
+        self.assertEqual(self.o.get("a"), ["e2"])
+        self.assertEqual(self.o.evictions, 0)
+
+    def test_uses_LRUDict(self):
+        self.assertIsInstance(self.o._entries, aioxmpp.cache.LRUDict)
+
+    def test_evicts_least_recently_used_by_size(self):
+        self.o.put("a", unittest.mock.sentinel.a, 40)
+        self.o.put("b", unittest.mock.sentinel.b, 40)
+        self.o.get("a")
+        self.o.put("c", unittest.mock.sentinel.c, 40)
+
+        self.assertIn("a", self.o)
+        self.assertNotIn("b", self.o)
+        self.assertIn("c", self.o)
+        self.assertEqual(self.o.total_bytes, 80)
+        self.assertEqual(self.o.evictions, 1)
+
+    def test_does_not_store_oversized_entries(self):
+        self.o.put("a", unittest.mock.sentinel.a, 40)
+        self.o.put("b", unittest.mock.sentinel.b, 101)
+        self.assertNotIn("b", self.o)
+        self.assertIn("a", self.o)
+        self.assertEqual(self.o.total_bytes, 40)
+
+    def test_oversized_replacement_drops_old_entry(self):
+        self.o.put("a", unittest.mock.sentinel.a, 40)
+        self.o.put("a", unittest.mock.sentinel.b, 101)
+        self.assertNotIn("a", self.o)
+        self.assertEqual(self.o.total_bytes, 0)
+
+    def test_reducing_max_bytes_evicts(self):
+        for i in range(5):
+            self.o.put(i, i, 20)
+        self.o.max_bytes = 50
+        self.assertEqual(self.o.max_bytes, 50)
+        self.assertEqual(self.o.total_bytes, 40)
+        self.assertCountEqual(
+            [i for i in range(5) if i in self.o],
+            [3, 4],
+        )
+        self.assertEqual(self.o.evictions, 3)
+
+    def test_max_bytes_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            self.o.max_bytes = 0
+        self.assertEqual(self.o.max_bytes, 100)
+
+    def test_clear(self):
+        self.o.put("a", unittest.mock.sentinel.a, 40)
+        self.o.clear()
+        self.assertEqual(len(self.o), 0)
+        self.assertEqual(self.o.total_bytes, 0)
+
+    def test_default_memory_overlay(self):
+        self.assertIsInstance(entitycaps_service.default_memory_overlay(),
+                              entitycaps_service.MemoryOverlay)
+        self.assertIs(entitycaps_service.default_memory_overlay(),
+                      entitycaps_service.default_memory_overlay())
+
+
 class TestCache(unittest.TestCase):
     def setUp(self):
         self.c = entitycaps_service.Cache()
 
+    def test_uses_own_overlay_by_default(self):
+        c1 = entitycaps_service.Cache()
+        c2 = entitycaps_service.Cache()
+        self.assertIsNone(c1.memory_overlay)
+
+        q = disco.xso.InfoQuery(features={"foo"})
+        c1.add_cache_entry(unittest.mock.sentinel.key, q)
+
+        result = c1.lookup_in_database(unittest.mock.sentinel.key)
+        self.assertSetEqual(result.features, {"foo"})
+        with self.assertRaises(KeyError):
+            c2.lookup_in_database(unittest.mock.sentinel.key)
+
+    def test_add_cache_entry_does_not_serialise_without_memory_overlay(self):
+        q = disco.xso.InfoQuery(features={"foo"})
+        with unittest.mock.patch("aioxmpp.xml.write_single_xso") as write:
+            self.c.add_cache_entry(unittest.mock.sentinel.key, q)
+        write.assert_not_called()
+
+    def test_memory_overlay_is_shared(self):
+        overlay = entitycaps_service.MemoryOverlay()
+        c1 = entitycaps_service.Cache(memory_overlay=overlay)
+        c2 = entitycaps_service.Cache(memory_overlay=overlay)
+
+        q = disco.xso.InfoQuery(features={"foo"})
+        c1.add_cache_entry(unittest.mock.sentinel.key, q)
+
+        result = c2.lookup_in_database(unittest.mock.sentinel.key)
+        self.assertIsInstance(result, disco.xso.InfoQuery)
+        self.assertSetEqual(result.features, {"foo"})
+        # each user gets its own copy
+        self.assertIsNot(
+            result,
+            c1.lookup_in_database(unittest.mock.sentinel.key),
+        )
+
+    def test_add_cache_entry_accounts_serialised_size(self):
+        self.c = entitycaps_service.Cache(
+            memory_overlay=entitycaps_service.MemoryOverlay(),
+        )
+        q = disco.xso.InfoQuery(features={"foo"})
+        self.c.add_cache_entry(unittest.mock.sentinel.key, q)
+        self.assertEqual(
+            self.c.memory_overlay.total_bytes,
+            len(aioxmpp.xml.serialize_single_xso(q).encode("utf-8")),
+        )
+
+    def test_file_db_hits_are_added_to_memory_overlay(self):
+        self.c = entitycaps_service.Cache(
+            memory_overlay=entitycaps_service.MemoryOverlay(),
+        )
+        q = disco.xso.InfoQuery(features={"foo"})
+        data = aioxmpp.xml.serialize_single_xso(q).encode("utf-8")
+        db = unittest.mock.Mock()
+        db.get.return_value = data
+        self.c.set_system_db(db)
+
+        self.c.lookup_in_database(unittest.mock.sentinel.key)
+        self.assertIn(unittest.mock.sentinel.key, self.c.memory_overlay)
+        self.assertEqual(self.c.memory_overlay.total_bytes, len(data))
+
+        db.get.reset_mock()
+        result = self.c.lookup_in_database(unittest.mock.sentinel.key)
+        self.assertSetEqual(result.features, {"foo"})
+        db.get.assert_not_called()
+
     def tearDown(self):
         del self.c
 
@@ -203,6 +380,123 @@ class TestCache(unittest.TestCase):
             base.read_single_xso()
         )
 
+    def _make_file_db(self, tempdir, name, entries):
+        db = entitycaps_db.SingleFileDatabase(pathlib.Path(tempdir) / name)
+        for key, entry in entries:
+            buf = io.BytesIO()
+            aioxmpp.xml.write_single_xso(entry, buf)
+            db.add(key, buf.getvalue())
+        db.flush()
+        return db
+
+    def test_file_dbs_used_in_lookup(self):
+        key1 = unittest.mock.Mock()
+        key1.path = pathlib.Path("hashes") / "1.xml"
+        key2 = unittest.mock.Mock()
+        key2.path = pathlib.Path("hashes") / "2.xml"
+
+        system_entry = disco.xso.InfoQuery(features=("urn:test:system",))
+        user_entry = disco.xso.InfoQuery(features=("urn:test:user",))
+
+        with tempfile.TemporaryDirectory() as tempdir:
+            system_db = self._make_file_db(tempdir, "system.db",
+                                           [(key1, system_entry)])
+            user_db = self._make_file_db(tempdir, "user.db",
+                                         [(key1, user_entry),
+                                          (key2, user_entry)])
+            self.c.set_system_db(system_db)
+            self.c.set_user_db(user_db)
+
+            result = self.c.lookup_in_database(key1)
+            self.assertIsInstance(result, disco.xso.InfoQuery)
+            self.assertSetEqual(set(result.features), {"urn:test:system"})
+
+            result = self.c.lookup_in_database(key2)
+            self.assertSetEqual(set(result.features), {"urn:test:user"})
+
+            key3 = unittest.mock.Mock()
+            key3.path = pathlib.Path("hashes") / "3.xml"
+            with self.assertRaises(KeyError):
+                self.c.lookup_in_database(key3)
+
+            system_db.close()
+            user_db.close()
+
+    def test_file_db_takes_precedence_over_directory(self):
+        base = unittest.mock.Mock()
+        base.p = unittest.mock.MagicMock()
+        self.c.set_system_db_path(base.p)
+        self.c.set_system_db(base.db)
+        base.db.get.return_value = b"<foo/>"
+
+        with unittest.mock.patch(
+                "aioxmpp.xml.read_single_xso",
+                new=base.read_single_xso):
+            result = self.c.lookup_in_database(base.key)
+
+        base.db.get.assert_called_once_with(base.key)
+        base.p.__truediv__.assert_not_called()
+        self.assertEqual(result, base.read_single_xso())
+
+    def test_add_cache_entry_adds_to_user_file_db_and_batches_flush(self):
+        q = disco.xso.InfoQuery()
+        q.captured_events = [
+            ("start", q.TAG[0], q.TAG[1], {}),
+            ("end",)
+        ]
+        db = unittest.mock.Mock()
+        self.c.set_user_db(db)
+        self.c.set_user_db_path(unittest.mock.MagicMock())
+
+        with contextlib.ExitStack() as stack:
+            call_later = stack.enter_context(unittest.mock.patch.object(
+                asyncio.get_event_loop(),
+                "call_later"
+            ))
+
+            run_in_executor = stack.enter_context(unittest.mock.patch.object(
+                asyncio.get_event_loop(),
+                "run_in_executor"
+            ))
+
+            async = stack.enter_context(unittest.mock.patch(
+                "asyncio.async"
+            ))
+
+            self.c.add_cache_entry(unittest.mock.sentinel.key1, q)
+            self.c.add_cache_entry(unittest.mock.sentinel.key2, q)
+
+            self.assertSequenceEqual(
+                db.mock_calls,
+                [
+                    unittest.mock.call.add(unittest.mock.sentinel.key1,
+                                           unittest.mock.ANY),
+                    unittest.mock.call.add(unittest.mock.sentinel.key2,
+                                           unittest.mock.ANY),
+                ]
+            )
+            _, (_, data), _ = db.mock_calls[0]
+            self.assertEqual(
+                aioxmpp.xml.read_single_xso(io.BytesIO(data),
+                                            disco.xso.InfoQuery).TAG,
+                q.TAG,
+            )
+
+            call_later.assert_called_once_with(
+                self.c.user_db_flush_delay,
+                unittest.mock.ANY,
+            )
+            run_in_executor.assert_not_called()
+
+            _, (_, flush), _ = call_later.mock_calls[0]
+            flush()
+
+            run_in_executor.assert_called_once_with(None, db.flush)
+            async.assert_called_once_with(run_in_executor())
+
+            self.c.add_cache_entry(unittest.mock.sentinel.key3, q)
+            self.assertEqual(len(call_later.mock_calls), 2)
+
     def test_lookup_uses_lookup_in_database(self):
         with unittest.mock.patch.object(
                 self.c,
@@ -1824,6 +2118,24 @@ class TestService(unittest.TestCase):
             self.s.update_hash
         )
 
+    def test__info_changed_coalesces_until_update_hash(self):
+        with contextlib.ExitStack() as stack:
+            get_event_loop = stack.enter_context(unittest.mock.patch(
+                "asyncio.get_event_loop"
+            ))
+
+            self.s._info_changed()
+            self.s._info_changed()
+
+            get_event_loop().call_soon.assert_called_once_with(
+                self.s.update_hash
+            )
+
+            self.s.update_hash()
+            self.s._info_changed()
+
+        self.assertEqual(len(get_event_loop().call_soon.mock_calls), 2)
+
     def test_handle_outbound_presence_inserts_keys(self):
         base = unittest.mock.Mock()
         self.impl115.calculate_keys.return_value = iter([
@@ -24,6 +24,7 @@ import unittest
 import aioxmpp
 import aioxmpp.roster as roster
 import aioxmpp.roster.xso as roster_xso
+import aioxmpp.roster.journal as roster_journal
 import aioxmpp.roster.service as roster_service
 
 
@@ -40,3 +41,6 @@ class TestExports(unittest.TestCase):
 
     def test_Item(self):
         self.assertIs(roster.Item, roster_service.Item)
+
+    def test_RosterJournal(self):
+        self.assertIs(roster.RosterJournal, roster_journal.RosterJournal)
@@ -0,0 +1,169 @@
+########################################################################
+# File name: test_journal.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as
+# published by the Free Software Foundation, either version 3 of the
+# License, or (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# Lesser General Public License for more details.
+#
+# You should have received a copy of the GNU Lesser General Public
+# License along with this program.  If not, see
+# <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import json
+import pathlib
+import tempfile
+import unittest
+import unittest.mock
+
+import aioxmpp.roster.journal as roster_journal
+
+
+ITEM1 = {"subscription": "both", "name": "foo", "groups": ["a"]}
+ITEM2 = {"subscription": "to"}
+
+
+class TestRosterJournal(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = pathlib.Path(self.tempdir.name) / "roster.journal"
+        self.j = roster_journal.RosterJournal(self.path, compact_after=4)
+
+    def tearDown(self):
+        del self.j
+        self.tempdir.cleanup()
+
+    def _records(self):
+        with self.path.open("r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_path(self):
+        self.assertEqual(self.j.path, self.path)
+
+    def test_load_missing_file(self):
+        self.assertEqual(self.j.load(), (None, {}))
+        self.assertFalse(self.path.exists())
+
+    def test_append_and_load(self):
+        self.j.append("v1", [("a@x", ITEM1), ("b@x", ITEM2)])
+        self.j.append("v2", [("a@x", None)])
+        self.j.append("v3", [("b@x", ITEM1)])
+
+        j = roster_journal.RosterJournal(self.path)
+        self.assertEqual(j.load(), ("v3", {"b@x": ITEM1}))
+
+    def test_append_only_writes_changes(self):
+        self.j.append("v1", [("a@x", ITEM1)])
+        self.j.append("v2", [("b@x", ITEM2)])
+
+        self.assertSequenceEqual(
+            self._records(),
+            [
+                {"jid": "a@x", "item": ITEM1},
+                {"ver": "v1"},
+                {"jid": "b@x", "item": ITEM2},
+                {"ver": "v2"},
+            ]
+        )
+
+    def test_compact(self):
+        self.j.append("v1", [("a@x", ITEM1), ("b@x", ITEM2)])
+        self.j.append("v2", [("a@x", None)])
+
+        self.j.compact("v2", {"b@x": ITEM2})
+
+        self.assertSequenceEqual(
+            self._records(),
+            [
+                {"jid": "b@x", "item": ITEM2},
+                {"ver": "v2"},
+            ]
+        )
+        self.assertEqual(self.j.load(), ("v2", {"b@x": ITEM2}))
+
+    def test_compact_keeps_old_file_on_error(self):
+        self.j.append("v1", [("a@x", ITEM1)])
+
+        with self.assertRaises(TypeError):
+            self.j.compact("v2", {"b@x": object()})
+
+        self.assertEqual(self.j.load(), ("v1", {"a@x": ITEM1}))
+        self.assertSequenceEqual(
+            list(pathlib.Path(self.tempdir.name).iterdir()),
+            [self.path],
+        )
+
+    def test_needs_compaction(self):
+        self.assertFalse(self.j.needs_compaction)
+        self.j.append("v1", [("a@x", ITEM1)])
+        self.j.append("v2", [("a@x", ITEM2)])
+        self.assertFalse(self.j.needs_compaction)
+        self.j.append("v3", [("a@x", ITEM1)])
+        self.assertTrue(self.j.needs_compaction)
+
+        self.j.compact("v3", {"a@x": ITEM1})
+        self.assertFalse(self.j.needs_compaction)
+
+    def test_needs_compaction_after_load(self):
+        for i in range(3):
+            self.j.append("v{}".format(i), [("a@x", ITEM1)])
+
+        # six records, of which a compacted journal would contain two
+        j = roster_journal.RosterJournal(self.path, compact_after=3)
+        j.load()
+        self.assertTrue(j.needs_compaction)
+
+        j = roster_journal.RosterJournal(self.path, compact_after=4)
+        j.load()
+        self.assertFalse(j.needs_compaction)
+
+    def test_load_discards_partial_record(self):
+        self.j.append("v1", [("a@x", ITEM1)])
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write('{"jid": "b@x", "it')
+
+        self.assertEqual(self.j.load(), ("v1", {"a@x": ITEM1}))
+
+        self.j.append("v2", [("b@x", ITEM2)])
+        self.assertEqual(
+            self.j.load(),
+            ("v2", {"a@x": ITEM1, "b@x": ITEM2})
+        )
+
+    def test_load_rejects_corrupt_record(self):
+        self.j.append("v1", [("a@x", ITEM1)])
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write('{"jid": "b@x", "it\n')
+        self.j.append("v2", [("b@x", ITEM2)])
+
+        with self.assertRaises(ValueError):
+            self.j.load()
+
+    def test_load_rejects_malformed_record(self):
+        with self.path.open("w", encoding="utf-8") as f:
+            f.write('{"jid": "b@x"}\n')
+
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            self.j.load()
+
+        with self.path.open("w", encoding="utf-8") as f:
+            f.write('[1, 2]\n')
+
+        with self.assertRaisesRegex(ValueError, "line 1"):
+            self.j.load()
+
+    def test_discard(self):
+        self.j.append("v1", [("a@x", ITEM1)])
+        self.j.discard()
+        self.assertFalse(self.path.exists())
+        self.assertEqual(self.j.load(), (None, {}))
+        self.j.discard()
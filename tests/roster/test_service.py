@@ -22,9 +22,11 @@
 import asyncio
 import contextlib
 import unittest
+import unittest.mock
 
 import aioxmpp.dispatcher
 import aioxmpp.errors as errors
+import aioxmpp.roster.journal as roster_journal
 import aioxmpp.roster.service as roster_service
 import aioxmpp.roster.xso as roster_xso
 import aioxmpp.service as service
@@ -1087,6 +1089,267 @@ class TestService(unittest.TestCase):
 
         self.assertSequenceEqual([], cb.mock_calls)
 
+    def test_journal_defaults_to_None(self):
+        self.assertIsNone(self.s.journal)
+
+    def _attach_journal(self):
+        journal = unittest.mock.Mock(spec=roster_journal.RosterJournal)
+        journal.needs_compaction = False
+        journal.load.return_value = (
+            "fromjournal",
+            {
+                "fnord@foo.example": {
+                    "subscription": "both",
+                    "groups": ["a"],
+                },
+            }
+        )
+        self.s.journal = journal
+        return journal
+
+    def test_journal_is_loaded_before_requesting_roster(self):
+        self.cc.stream_features[...] = roster_xso.RosterVersioningFeature()
+        journal = self._attach_journal()
+        self.assertSequenceEqual(journal.mock_calls, [])
+
+        self.cc.stream.send.return_value = None
+        run_coroutine(self.cc.before_stream_established())
+
+        self.assertSequenceEqual(
+            journal.mock_calls,
+            [
+                unittest.mock.call.load(),
+            ]
+        )
+
+        call, = self.cc.stream.send.mock_calls
+        _, (iq_request,), _ = call
+        self.assertEqual(iq_request.payload.ver, "fromjournal")
+
+        jid = structs.JID.fromstr("fnord@foo.example")
+        self.assertSetEqual(set(self.s.items), {jid})
+        self.assertEqual(self.s.items[jid].subscription, "both")
+        self.assertSetEqual(self.s.groups["a"], {self.s.items[jid]})
+
+        self.cc.stream.send.return_value = None
+        run_coroutine(self.cc.before_stream_established())
+        self.assertSequenceEqual(
+            journal.mock_calls,
+            [
+                unittest.mock.call.load(),
+            ]
+        )
+
+    def test_full_roster_replaces_journal(self):
+        journal = self._attach_journal()
+
+        self.cc.stream.send.return_value = roster_xso.Query(
+            items=[
+                roster_xso.Item(jid=self.user1, subscription="to"),
+            ],
+            ver="new",
+        )
+        run_coroutine(self.cc.before_stream_established())
+
+        self.assertSequenceEqual(
+            journal.mock_calls,
+            [
+                unittest.mock.call.load(),
+                unittest.mock.call.compact(
+                    "new",
+                    {
+                        str(self.user1): {"subscription": "to"},
+                    }
+                ),
+            ]
+        )
+
+    def test_roster_push_is_appended_to_journal(self):
+        journal = self._attach_journal()
+        self.cc.stream.send.return_value = None
+        run_coroutine(self.cc.before_stream_established())
+        journal.mock_calls.clear()
+
+        jid = structs.JID.fromstr("fnord@foo.example")
+        iq = stanza.IQ(type_=structs.IQType.SET)
+        iq.payload = roster_xso.Query(
+            items=[
+                roster_xso.Item(jid=jid, subscription="remove"),
+                roster_xso.Item(jid=self.user1, name="foo"),
+            ],
+            ver="pushed",
+        )
+        run_coroutine(self.s.handle_roster_push(iq))
+
+        self.assertSequenceEqual(
+            journal.mock_calls,
+            [
+                unittest.mock.call.append(
+                    "pushed",
+                    [
+                        (str(jid), None),
+                        (str(self.user1), {"subscription": "none",
+                                           "name": "foo"}),
+                    ]
+                ),
+            ]
+        )
+
+    def test_roster_push_compacts_journal_if_needed(self):
+        journal = self._attach_journal()
+        self.cc.stream.send.return_value = None
+        run_coroutine(self.cc.before_stream_established())
+        journal.mock_calls.clear()
+        journal.needs_compaction = True
+
+        iq = stanza.IQ(type_=structs.IQType.SET)
+        iq.payload = roster_xso.Query(
+            items=[
+                roster_xso.Item(jid=self.user1),
+            ],
+            ver="pushed",
+        )
+        run_coroutine(self.s.handle_roster_push(iq))
+
+        self.assertSequenceEqual(
+            journal.mock_calls,
+            [
+                unittest.mock.call.append(
+                    "pushed",
+                    [
+                        (str(self.user1), {"subscription": "none"}),
+                    ]
+                ),
+                unittest.mock.call.compact(
+                    "pushed",
+                    {
+                        "fnord@foo.example": {
+                            "subscription": "both",
+                            "groups": ["a"],
+                        },
+                        str(self.user1): {"subscription": "none"},
+                    }
+                ),
+            ]
+        )
+
+    def test_roster_push_survives_journal_errors(self):
+        journal = self._attach_journal()
+        self.cc.stream.send.return_value = None
+        run_coroutine(self.cc.before_stream_established())
+        journal.append.side_effect = OSError()
+
+        iq = stanza.IQ(type_=structs.IQType.SET)
+        iq.payload = roster_xso.Query(
+            items=[
+                roster_xso.Item(jid=self.user1),
+            ],
+            ver="pushed",
+        )
+        with self.assertLogs("aioxmpp.roster.service", "ERROR"):
+            run_coroutine(self.s.handle_roster_push(iq))
+
+        self.assertIn(self.user1, self.s.items)
+        self.assertEqual(self.s.version, "pushed")
+
+    def test_corrupt_journal_is_discarded(self):
+        self.cc.stream_features[...] = roster_xso.RosterVersioningFeature()
+        for exc in [ValueError(), OSError(), KeyError()]:
+            journal = self._attach_journal()
+            journal.load.side_effect = exc
+            self.cc.stream.send.mock_calls.clear()
+            self.cc.stream.send.return_value = roster_xso.Query(
+                items=[
+                    roster_xso.Item(jid=self.user1, subscription="to"),
+                ],
+                ver="new",
+            )
+
+            with self.assertLogs("aioxmpp.roster.service", "ERROR"):
+                run_coroutine(self.cc.before_stream_established())
+
+            call, = self.cc.stream.send.mock_calls
+            _, (iq_request,), _ = call
+            self.assertIsNone(iq_request.payload.ver)
+
+            self.assertSequenceEqual(
+                journal.mock_calls,
+                [
+                    unittest.mock.call.load(),
+                    unittest.mock.call.discard(),
+                    unittest.mock.call.compact(
+                        "new",
+                        {
+                            str(self.user1): {"subscription": "to"},
+                        }
+                    ),
+                ]
+            )
+            self.assertSetEqual(set(self.s.items), {self.user1})
+            self.assertEqual(self.s.version, "new")
+
+    def test_malformed_journal_data_is_discarded(self):
+        journal = self._attach_journal()
+        journal.load.return_value = (
+            "fromjournal",
+            {
+                "fnord@foo.example": {"subscription": "both"},
+                "@invalid": {},
+            }
+        )
+        self.cc.stream.send.return_value = None
+
+        with self.assertLogs("aioxmpp.roster.service", "ERROR"):
+            run_coroutine(self.cc.before_stream_established())
+
+        self.assertIn(unittest.mock.call.discard(), journal.mock_calls)
+        self.assertFalse(self.s.items)
+        self.assertFalse(self.s.groups)
+        self.assertIsNone(self.s.version)
+
+    def test_journal_io_runs_in_executor(self):
+        journal = self._attach_journal()
+        loop = asyncio.get_event_loop()
+        self.cc.stream.send.return_value = roster_xso.Query(
+            items=[
+                roster_xso.Item(jid=self.user1, subscription="to"),
+            ],
+            ver="new",
+        )
+
+        with unittest.mock.patch.object(
+                loop, "run_in_executor",
+                wraps=loop.run_in_executor) as run_in_executor:
+            run_coroutine(self.cc.before_stream_established())
+
+            iq = stanza.IQ(type_=structs.IQType.SET)
+            iq.payload = roster_xso.Query(
+                items=[
+                    roster_xso.Item(jid=self.user1),
+                ],
+                ver="pushed",
+            )
+            run_coroutine(self.s.handle_roster_push(iq))
+
+        self.assertSequenceEqual(
+            run_in_executor.mock_calls,
+            [
+                unittest.mock.call(None, journal.load),
+                unittest.mock.call(
+                    None,
+                    journal.compact,
+                    "new",
+                    {str(self.user1): {"subscription": "to"}},
+                ),
+                unittest.mock.call(
+                    None,
+                    journal.append,
+                    "pushed",
+                    [(str(self.user1), {"subscription": "none"})],
+                ),
+            ]
+        )
+
     def test_do_not_send_versioned_request_if_not_supported_by_server(self):
         response = roster_xso.Query()
 
@@ -262,3 +262,138 @@ class TestLRUDict(unittest.TestCase):
         for k in keys:
             with self.assertRaises(KeyError):
                 self.d[k]
+
+    def test_overwriting_does_not_purge(self):
+        self.d.maxsize = 2
+        self.d[1] = "a"
+        self.d[2] = "b"
+        self.d[2] = "c"
+
+        self.assertEqual(self.d[1], "a")
+        self.assertEqual(self.d[2], "c")
+        self.assertEqual(self.d.evictions, 0)
+
+    def test_overwriting_counts_as_use(self):
+        self.d.maxsize = 2
+        self.d[1] = "a"
+        self.d[2] = "b"
+        self.d[1] = "c"
+
+        self.d[3] = "d"
+        self.assertNotIn(2, self.d)
+        self.assertEqual(self.d[1], "c")
+        self.assertEqual(self.d[3], "d")
+
+    def test_contains_does_not_count_as_use(self):
+        self.d.maxsize = 2
+        self.d[1] = "a"
+        self.d[2] = "b"
+
+        self.assertIn(1, self.d)
+        self.assertNotIn(3, self.d)
+
+        self.d[3] = "c"
+        self.assertNotIn(1, self.d)
+        self.assertEqual(self.d.hits, 0)
+        self.assertEqual(self.d.misses, 0)
+
+    def test_statistics_start_at_zero(self):
+        self.assertEqual(self.d.hits, 0)
+        self.assertEqual(self.d.misses, 0)
+        self.assertEqual(self.d.evictions, 0)
+
+    def test_hits_and_misses(self):
+        self.d[1] = "a"
+        self.d[1]
+        self.d[1]
+        with self.assertRaises(KeyError):
+            self.d[2]
+        self.assertIsNone(self.d.get(3))
+
+        self.assertEqual(self.d.hits, 2)
+        self.assertEqual(self.d.misses, 2)
+
+    def test_evictions(self):
+        self.d.maxsize = 4
+        for i in range(6):
+            self.d[i] = i
+        self.assertEqual(self.d.evictions, 2)
+
+        del self.d[5]
+        self.assertEqual(self.d.evictions, 2)
+
+        self.d.maxsize = 1
+        self.assertEqual(self.d.evictions, 4)
+        self.assertSetEqual(set(self.d), {4})
+
+    def test_statistics_survive_clear(self):
+        self.d[1] = "a"
+        self.d[1]
+        self.d[2] = "b"
+        self.d.clear()
+
+        self.assertEqual(self.d.hits, 1)
+        self.assertEqual(self.d.evictions, 1)
+
+    def test_statistics_are_read_only(self):
+        with self.assertRaises(AttributeError):
+            self.d.hits = 1
+        with self.assertRaises(AttributeError):
+            self.d.misses = 1
+        with self.assertRaises(AttributeError):
+            self.d.evictions = 1
+
+    def test_size_counts_entries_without_sizeof(self):
+        self.d.maxsize = 3
+        self.d[1] = "a"
+        self.d[2] = "b"
+        self.assertEqual(self.d.size, 2)
+
+    def test_sizeof_limits_total_size(self):
+        d = cache.LRUDict(sizeof=len)
+        d.maxsize = 5
+        d[1] = "aa"
+        d[2] = "bb"
+        self.assertEqual(d.size, 4)
+
+        d[1]
+        d[3] = "cc"
+
+        self.assertSetEqual(set(d), {1, 3})
+        self.assertEqual(d.size, 4)
+        self.assertEqual(d.evictions, 1)
+
+    def test_sizeof_accounts_overwrite_and_delete(self):
+        d = cache.LRUDict(sizeof=len)
+        d.maxsize = 10
+        d[1] = "aa"
+        d[1] = "aaaa"
+        self.assertEqual(d.size, 4)
+        del d[1]
+        self.assertEqual(d.size, 0)
+        d[2] = "bbb"
+        d.clear()
+        self.assertEqual(d.size, 0)
+        self.assertEqual(d.evictions, 0)
+
+    def test_sizeof_does_not_store_oversized_values(self):
+        d = cache.LRUDict(sizeof=len)
+        d.maxsize = 5
+        d[1] = "aa"
+        d[2] = "bbbbbb"
+        self.assertSetEqual(set(d), {1})
+
+        d[1] = "aaaaaa"
+        self.assertEqual(len(d), 0)
+        self.assertEqual(d.size, 0)
+        self.assertEqual(d.evictions, 0)
+
+    def test_sizeof_reducing_maxsize_purges(self):
+        d = cache.LRUDict(sizeof=len)
+        d.maxsize = None
+        for i in range(5):
+            d[i] = "xx"
+        d.maxsize = 5
+        self.assertSetEqual(set(d), {3, 4})
+        self.assertEqual(d.size, 4)
+        self.assertEqual(d.evictions, 3)
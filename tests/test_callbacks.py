@@ -1431,6 +1431,120 @@ class TestFilter(unittest.TestCase):
             calls
         )
 
+    def test_register_with_equal_order_keeps_addition_order(self):
+        mock = unittest.mock.Mock()
+
+        self.f.register(mock.func1, 1)
+        self.f.register(mock.func2, 0)
+        self.f.register(mock.func3, 1)
+        self.f.register(mock.func4, 0)
+
+        self.f.filter(mock.stanza)
+        calls = list(mock.mock_calls)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.func2(mock.stanza),
+                unittest.mock.call.func4(mock.func2()),
+                unittest.mock.call.func1(mock.func4()),
+                unittest.mock.call.func3(mock.func1()),
+            ],
+            calls
+        )
+
+    def test_filter_without_functions_returns_object(self):
+        obj = object()
+        self.assertIs(self.f.filter(obj), obj)
+
+        token = self.f.register(unittest.mock.Mock(), 0)
+        self.f.unregister(token)
+        self.assertIs(self.f.filter(obj), obj)
+
+    def test_unregister_keeps_order_of_other_functions(self):
+        mock = unittest.mock.Mock()
+
+        self.f.register(mock.func1, 1)
+        token = self.f.register(mock.func2, 0)
+        self.f.register(mock.func3, -1)
+        self.f.unregister(token)
+
+        self.f.filter(mock.stanza)
+        calls = list(mock.mock_calls)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.func3(mock.stanza),
+                unittest.mock.call.func1(mock.func3()),
+            ],
+            calls
+        )
+
+    def test_timing_disabled_by_default(self):
+        self.assertIsNone(self.f.timings)
+
+    def test_timing(self):
+        mock = unittest.mock.Mock()
+        mock.func2.return_value = None
+
+        self.f.register(mock.func1, 0)
+        self.f.register(mock.func2, 1)
+        self.f.register(mock.func3, 2)
+
+        self.f.enable_timing()
+        self.assertEqual(self.f.timings, {})
+
+        with unittest.mock.patch("time.perf_counter") as perf_counter:
+            perf_counter.side_effect = [
+                1.0, 1.5,
+                2.0, 2.25,
+                3.0, 3.5,
+                4.0, 4.5,
+            ]
+            self.assertIsNone(self.f.filter(mock.stanza, mock.arg))
+            self.assertIsNone(self.f.filter(mock.stanza, mock.arg))
+
+        mock.func1.assert_called_with(mock.stanza, mock.arg)
+        mock.func3.assert_not_called()
+        self.assertDictEqual(
+            self.f.timings,
+            {
+                mock.func1: Filter.FilterTiming(2, 1.0),
+                mock.func2: Filter.FilterTiming(2, 0.75),
+            }
+        )
+
+    def test_timing_counts_raising_functions(self):
+        class FooException(Exception):
+            pass
+
+        func = unittest.mock.Mock()
+        func.side_effect = FooException()
+        self.f.register(func, 0)
+        self.f.enable_timing()
+
+        with self.assertRaises(FooException):
+            self.f.filter(unittest.mock.sentinel.obj)
+
+        self.assertEqual(self.f.timings[func].calls, 1)
+
+    def test_enable_timing_resets_timings(self):
+        func = unittest.mock.Mock()
+        self.f.register(func, 0)
+        self.f.enable_timing()
+        self.f.filter(unittest.mock.sentinel.obj)
+        self.assertIn(func, self.f.timings)
+
+        self.f.enable_timing()
+        self.assertEqual(self.f.timings, {})
+
+    def test_disable_timing(self):
+        func = unittest.mock.Mock()
+        self.f.register(func, 0)
+        self.f.enable_timing()
+        self.f.disable_timing()
+        self.f.filter(unittest.mock.sentinel.obj)
+        self.assertIsNone(self.f.timings)
+
     def test_context_register_is_context_manager(self):
         cm = self.f.context_register(
             unittest.mock.sentinel.func,
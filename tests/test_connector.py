@@ -299,6 +299,66 @@ class TestSTARTTLSConnector(unittest.TestCase):
             ]
         )
 
+    def test_abort_xmlstream_if_cancelled_after_connecting(self):
+        features_future = asyncio.Future()
+
+        base = unittest.mock.Mock()
+        base.create_starttls_connection = CoroutineMock()
+        base.create_starttls_connection.return_value = (
+            unittest.mock.sentinel.transport,
+            None,
+        )
+        base.XMLStream.return_value = base.protocol
+        base.Future.return_value = features_future
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch(
+                    "asyncio.Future",
+                    new=base.Future,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.ssl_transport.create_starttls_connection",
+                    new=base.create_starttls_connection,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.protocol.XMLStream",
+                    new=base.XMLStream,
+                )
+            )
+
+            task = asyncio.async(self.c.connect(
+                unittest.mock.sentinel.loop,
+                base.metadata,
+                unittest.mock.sentinel.domain,
+                unittest.mock.sentinel.host,
+                unittest.mock.sentinel.port,
+                unittest.mock.sentinel.timeout,
+            ))
+            run_coroutine(asyncio.sleep(0.01))
+            base.create_starttls_connection.assert_called_once_with(
+                unittest.mock.sentinel.loop,
+                unittest.mock.ANY,
+                host=unittest.mock.sentinel.host,
+                port=unittest.mock.sentinel.port,
+                peer_hostname=unittest.mock.sentinel.host,
+                server_hostname=unittest.mock.sentinel.domain,
+                use_starttls=True,
+            )
+            base.protocol.abort.assert_not_called()
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                run_coroutine(task)
+
+        base.protocol.abort.assert_called_once_with()
+
     def test_connect_without_starttls_support_and_with_required(self):
         captured_features_future = None
 
@@ -899,6 +959,146 @@ class TestXMPPOverTLSConnector(unittest.TestCase):
             )
         )
 
+    def test_connect_with_tls_context_cache(self):
+        features_future = asyncio.Future()
+        features_future.set_result(
+            unittest.mock.sentinel.features
+        )
+
+        base = unittest.mock.Mock()
+        base.create_starttls_connection = CoroutineMock()
+        base.create_starttls_connection.return_value = (
+            unittest.mock.sentinel.transport,
+            base.protocol,
+        )
+        base.XMLStream.return_value = base.protocol
+        base.Future.return_value = features_future
+        base.certificate_verifier.pre_handshake = CoroutineMock()
+        base.metadata.certificate_verifier_factory.return_value = \
+            base.certificate_verifier
+        base.metadata.ssl_context_factory = unittest.mock.Mock(
+            spec=security_layer.TLSContextCache
+        )
+        base.metadata.ssl_context_factory.get_context.return_value = \
+            unittest.mock.sentinel.ssl_context
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch(
+                    "asyncio.Future",
+                    new=base.Future,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.ssl_transport.create_starttls_connection",
+                    new=base.create_starttls_connection,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.protocol.XMLStream",
+                    new=base.XMLStream,
+                )
+            )
+
+            run_coroutine(self.c.connect(
+                unittest.mock.sentinel.loop,
+                base.metadata,
+                unittest.mock.sentinel.domain,
+                unittest.mock.sentinel.host,
+                unittest.mock.sentinel.port,
+                unittest.mock.sentinel.timeout,
+            ))
+
+        _, _, kwargs = base.create_starttls_connection.mock_calls[-1]
+        factory = kwargs["ssl_context_factory"]
+
+        base.mock_calls.clear()
+
+        ssl_context = factory(unittest.mock.sentinel.passed_transport)
+
+        self.assertSequenceEqual(
+            base.mock_calls,
+            [
+                unittest.mock.call.metadata.ssl_context_factory.get_context(
+                    base.certificate_verifier,
+                    unittest.mock.sentinel.passed_transport,
+                )
+            ]
+        )
+
+        self.assertEqual(
+            ssl_context,
+            unittest.mock.sentinel.ssl_context
+        )
+
+    def test_abort_xmlstream_if_cancelled_after_connecting(self):
+        features_future = asyncio.Future()
+
+        base = unittest.mock.Mock()
+        base.create_starttls_connection = CoroutineMock()
+        base.create_starttls_connection.return_value = (
+            unittest.mock.sentinel.transport,
+            None,
+        )
+        base.XMLStream.return_value = base.protocol
+        base.Future.return_value = features_future
+        base.metadata.certificate_verifier_factory().pre_handshake = \
+            CoroutineMock()
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch(
+                    "asyncio.Future",
+                    new=base.Future,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.ssl_transport.create_starttls_connection",
+                    new=base.create_starttls_connection,
+                )
+            )
+
+            stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.protocol.XMLStream",
+                    new=base.XMLStream,
+                )
+            )
+
+            task = asyncio.async(self.c.connect(
+                unittest.mock.sentinel.loop,
+                base.metadata,
+                unittest.mock.sentinel.domain,
+                unittest.mock.sentinel.host,
+                unittest.mock.sentinel.port,
+                unittest.mock.sentinel.timeout,
+            ))
+            run_coroutine(asyncio.sleep(0.01))
+            base.create_starttls_connection.assert_called_once_with(
+                unittest.mock.sentinel.loop,
+                unittest.mock.ANY,
+                host=unittest.mock.sentinel.host,
+                port=unittest.mock.sentinel.port,
+                peer_hostname=unittest.mock.sentinel.host,
+                server_hostname=unittest.mock.sentinel.domain,
+                post_handshake_callback=unittest.mock.ANY,
+                ssl_context_factory=unittest.mock.ANY,
+                use_starttls=False,
+            )
+            base.protocol.abort.assert_not_called()
+
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                run_coroutine(task)
+
+        base.protocol.abort.assert_called_once_with()
+
     def test_abort_XMLStream_whin_connect_raises(self):
         captured_features_future = None
 
@@ -20,6 +20,8 @@
 #
 ########################################################################
 import contextlib
+import itertools
+import random
 import unittest
 import unittest.mock
 
@@ -519,6 +521,124 @@ class TestSimpleStanzaDispatcher(unittest.TestCase):
             wildcard_resource=unittest.mock.sentinel.wildcard_resource,
         )
 
+    def test_feed_returns_whether_stanza_was_dispatched(self):
+        stanza = FooStanza(TEST_JID, unittest.mock.sentinel.type_)
+        self.assertTrue(self.d._feed(stanza))
+
+        d = FooDispatcher()
+        self.assertFalse(d._feed(stanza))
+
+    def test_unhandled_count(self):
+        d = FooDispatcher()
+        self.assertEqual(d.unhandled_count, 0)
+
+        d.register_callback(
+            unittest.mock.sentinel.type_,
+            TEST_JID,
+            self.handlers.cb,
+        )
+
+        d._feed(FooStanza(TEST_JID, unittest.mock.sentinel.type_))
+        self.assertEqual(d.unhandled_count, 0)
+
+        d._feed(FooStanza(TEST_JID, unittest.mock.sentinel.othertype))
+        d._feed(FooStanza(TEST_JID.bare(), unittest.mock.sentinel.type_))
+        self.assertEqual(d.unhandled_count, 2)
+
+    def test_wildcard_type_registered_after_typed_callbacks(self):
+        d = FooDispatcher()
+        d.register_callback(
+            unittest.mock.sentinel.type_,
+            None,
+            self.handlers.type_wildcard,
+        )
+        d.register_callback(
+            None,
+            TEST_JID.bare(),
+            self.handlers.wildcard_barejid_wildcard,
+        )
+
+        stanza = FooStanza(TEST_JID, unittest.mock.sentinel.type_)
+        d._feed(stanza)
+
+        d.unregister_callback(
+            None,
+            TEST_JID.bare(),
+        )
+        d._feed(stanza)
+
+        self.assertSequenceEqual(
+            self.handlers.mock_calls,
+            [
+                unittest.mock.call.wildcard_barejid_wildcard(stanza),
+                unittest.mock.call.type_wildcard(stanza),
+            ]
+        )
+
+    def test_dispatch_matches_lookup_order(self):
+        # compare against the lookup order as documented in
+        # register_callback, with random sets of registered callbacks
+        def reference(map_, stanza):
+            from_ = stanza.from_
+            keys = [
+                (stanza.type_, from_, False),
+                (stanza.type_, from_.bare(), True),
+                (None, from_, False),
+                (None, from_.bare(), True),
+                (stanza.type_, None, False),
+                (None, None, False),
+            ]
+            for key in keys:
+                if key in map_:
+                    return map_[key]
+
+        rng = random.Random(1)
+        types = [None, "a", "b"]
+        jids = [
+            None,
+            TEST_JID,
+            TEST_JID.bare(),
+            TEST_JID.replace(resource="other"),
+            TEST_JID.replace(localpart="other"),
+        ]
+        slots = [
+            (type_, from_, wildcard_resource)
+            for type_, from_, wildcard_resource in itertools.product(
+                types, jids, [False, True]
+            )
+            if not wildcard_resource or (from_ is not None and from_.is_bare)
+        ]
+
+        called = []
+        for i in range(200):
+            d = FooDispatcher()
+            map_ = {}
+            for slot in rng.sample(slots, rng.randint(0, len(slots))):
+                type_, from_, wildcard_resource = slot
+                map_[slot] = slot
+                d.register_callback(
+                    type_, from_,
+                    lambda stanza, slot=slot: called.append(slot),
+                    wildcard_resource=wildcard_resource,
+                )
+
+            for slot in rng.sample(list(map_), rng.randint(0, len(map_))):
+                type_, from_, wildcard_resource = slot
+                del map_[slot]
+                d.unregister_callback(type_, from_,
+                                      wildcard_resource=wildcard_resource)
+
+            for type_, from_ in itertools.product(types[1:] + ["c"],
+                                                  jids[1:]):
+                stanza = FooStanza(from_, type_)
+                called.clear()
+                d._feed(stanza)
+                expected = reference(map_, stanza)
+                self.assertSequenceEqual(
+                    called,
+                    [expected] if expected is not None else [],
+                )
+
 
 class TestSimpleMessageDispatcher(unittest.TestCase):
     def setUp(self):
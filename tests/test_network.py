@@ -23,11 +23,17 @@ import asyncio
 import collections
 import concurrent.futures
 import random
+import struct
 import unittest
 import unittest.mock
 
 import dns
 import dns.flags
+import dns.message
+import dns.rcode
+import dns.rdatatype
+import dns.resolver
+import dns.rrset
 
 import aioxmpp.network as network
 
@@ -954,6 +960,347 @@ class Testrepeated_query(unittest.TestCase):
                 ))
 
 
+class StubDNSServer:
+    """
+    Minimal DNS server on the loopback interface for offline tests.
+
+    `handler` is called with the query message and must return the response
+    message or :data:`None` to not respond.
+    """
+
+    class _UDPProtocol(asyncio.DatagramProtocol):
+        def __init__(self, server):
+            super().__init__()
+            self.server = server
+
+        def connection_made(self, transport):
+            self.transport = transport
+
+        def datagram_received(self, data, addr):
+            response = self.server.handle(data, False)
+            if response is not None:
+                self.transport.sendto(response, addr)
+
+    def __init__(self, handler):
+        super().__init__()
+        self.handler = handler
+        self.queries = []
+        self.delay = 0
+
+    def handle(self, data, tcp):
+        request = dns.message.from_wire(data)
+        self.queries.append((request, tcp))
+        response = self.handler(request, tcp)
+        if response is None:
+            return None
+        return response.to_wire()
+
+    @asyncio.coroutine
+    def _handle_tcp(self, reader, writer):
+        length, = struct.unpack(">H", (yield from reader.readexactly(2)))
+        response = self.handle((yield from reader.readexactly(length)), True)
+        if response is not None:
+            writer.write(struct.pack(">H", len(response)) + response)
+        writer.close()
+
+    @asyncio.coroutine
+    def start(self):
+        loop = asyncio.get_event_loop()
+        self.tcp_server = yield from asyncio.start_server(
+            self._handle_tcp,
+            "127.0.0.1", 0,
+        )
+        self.port = self.tcp_server.sockets[0].getsockname()[1]
+        self.udp_transport, _ = yield from loop.create_datagram_endpoint(
+            lambda: self._UDPProtocol(self),
+            local_addr=("127.0.0.1", self.port),
+        )
+
+    def stop(self):
+        self.udp_transport.close()
+        self.tcp_server.close()
+        run_coroutine(self.tcp_server.wait_closed())
+
+
+def make_answer(request, text, ttl=300):
+    response = dns.message.make_response(request)
+    question = request.question[0]
+    response.answer.append(dns.rrset.from_text(
+        question.name, ttl, "IN", question.rdtype, text
+    ))
+    return response
+
+
+def make_negative(request, rcode, soa_ttl=3600, soa_minimum=60):
+    response = dns.message.make_response(request)
+    response.set_rcode(rcode)
+    response.authority.append(dns.rrset.from_text(
+        "example.com.", soa_ttl, "IN", "SOA",
+        "ns.example.com. host.example.com. 1 2 3 4 {}".format(soa_minimum)
+    ))
+    return response
+
+
+class TestAsyncResolver(unittest.TestCase):
+    def setUp(self):
+        self.responses = {}
+        self.server = StubDNSServer(self._handle)
+        run_coroutine(self.server.start())
+        self.r = network.AsyncResolver(
+            ["127.0.0.1"],
+            port=self.server.port,
+            timeout=0.5,
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def _handle(self, request, tcp):
+        question = request.question[0]
+        handler = self.responses[
+            question.name.to_text(), dns.rdatatype.to_text(question.rdtype)
+        ]
+        return handler(request, tcp)
+
+    def test_uses_system_nameservers_by_default(self):
+        with unittest.mock.patch("dns.resolver.Resolver") as Resolver:
+            Resolver().nameservers = ["192.0.2.1"]
+            r = network.AsyncResolver()
+        self.assertEqual(r.nameservers, ["192.0.2.1"])
+        self.assertEqual(r.port, 53)
+
+    def test_query_returns_answer(self):
+        self.responses["_xmpp-client._tcp.example.com.", "SRV"] = \
+            lambda request, tcp: make_answer(
+                request, "0 5 5222 xmpp.example.com."
+            )
+
+        answer = run_coroutine(self.r.query(
+            "_xmpp-client._tcp.example.com",
+            dns.rdatatype.SRV,
+        ))
+
+        rec, = answer
+        self.assertEqual(rec.port, 5222)
+        self.assertEqual(str(rec.target), "xmpp.example.com.")
+
+    def test_positive_responses_are_cached(self):
+        self.responses["example.com.", "A"] = \
+            lambda request, tcp: make_answer(request, "192.0.2.1")
+
+        for i in range(3):
+            answer = run_coroutine(self.r.query("example.com", "A"))
+            self.assertEqual(str(answer[0]), "192.0.2.1")
+
+        self.assertEqual(len(self.server.queries), 1)
+
+    def test_responses_with_zero_ttl_are_not_cached(self):
+        self.responses["example.com.", "A"] = \
+            lambda request, tcp: make_answer(request, "192.0.2.1", ttl=0)
+
+        run_coroutine(self.r.query("example.com", "A"))
+        run_coroutine(self.r.query("example.com", "A"))
+
+        self.assertEqual(len(self.server.queries), 2)
+
+    def test_clear_cache(self):
+        self.responses["example.com.", "A"] = \
+            lambda request, tcp: make_answer(request, "192.0.2.1")
+
+        run_coroutine(self.r.query("example.com", "A"))
+        self.r.clear_cache()
+        run_coroutine(self.r.query("example.com", "A"))
+
+        self.assertEqual(len(self.server.queries), 2)
+
+    def test_cache_is_bounded(self):
+        r = network.AsyncResolver(
+            ["127.0.0.1"],
+            port=self.server.port,
+            timeout=0.5,
+            cache_size=2,
+        )
+        for name in ["a", "b", "c"]:
+            self.responses[name + ".example.com.", "A"] = \
+                lambda request, tcp: make_answer(request, "192.0.2.1")
+
+        run_coroutine(r.query("a.example.com", "A"))
+        run_coroutine(r.query("b.example.com", "A"))
+        run_coroutine(r.query("a.example.com", "A"))
+        run_coroutine(r.query("c.example.com", "A"))
+        self.assertEqual(len(self.server.queries), 3)
+
+        run_coroutine(r.query("a.example.com", "A"))
+        self.assertEqual(len(self.server.queries), 3)
+
+        run_coroutine(r.query("b.example.com", "A"))
+        self.assertEqual(len(self.server.queries), 4)
+
+    def test_cache_respects_flags(self):
+        self.responses["example.com.", "A"] = \
+            lambda request, tcp: make_answer(request, "192.0.2.1")
+
+        run_coroutine(self.r.query("example.com", "A"))
+        self.r.set_flags(dns.flags.RD | dns.flags.AD)
+        run_coroutine(self.r.query("example.com", "A"))
+
+        self.assertEqual(len(self.server.queries), 2)
+        self.assertEqual(self.server.queries[1][0].flags & dns.flags.AD,
+                         dns.flags.AD)
+
+    def test_nxdomain_is_cached(self):
+        self.responses["nx.example.com.", "SRV"] = \
+            lambda request, tcp: make_negative(request, dns.rcode.NXDOMAIN)
+
+        for i in range(2):
+            with self.assertRaises(dns.resolver.NXDOMAIN):
+                run_coroutine(self.r.query("nx.example.com", "SRV"))
+
+        self.assertEqual(len(self.server.queries), 1)
+
+    def test_negative_ttl_is_bounded_by_soa_minimum(self):
+        self.responses["nx.example.com.", "SRV"] = \
+            lambda request, tcp: make_negative(request, dns.rcode.NXDOMAIN,
+                                               soa_minimum=0)
+
+        for i in range(2):
+            with self.assertRaises(dns.resolver.NXDOMAIN):
+                run_coroutine(self.r.query("nx.example.com", "SRV"))
+
+        self.assertEqual(len(self.server.queries), 2)
+
+    def test_empty_answer_is_cached(self):
+        self.responses["example.com.", "SRV"] = \
+            lambda request, tcp: make_negative(request, dns.rcode.NOERROR)
+
+        with self.assertRaises(dns.resolver.NoAnswer):
+            run_coroutine(self.r.query("example.com", "SRV"))
+
+        answer = run_coroutine(self.r.query("example.com", "SRV",
+                                            raise_on_no_answer=False))
+        self.assertIsNone(answer.rrset)
+
+        self.assertEqual(len(self.server.queries), 1)
+
+    def test_concurrent_queries_are_deduplicated(self):
+        self.responses["example.com.", "A"] = \
+            lambda request, tcp: make_answer(request, "192.0.2.1")
+
+        results = run_coroutine(asyncio.gather(
+            self.r.query("example.com", "A"),
+            self.r.query("example.com", "A"),
+            self.r.query("example.com", "A"),
+        ))
+
+        self.assertEqual(len(self.server.queries), 1)
+        for answer in results:
+            self.assertEqual(str(answer[0]), "192.0.2.1")
+
+    def test_truncated_response_is_retried_over_tcp(self):
+        def handler(request, tcp):
+            response = make_answer(request, "192.0.2.1")
+            if not tcp:
+                response.answer.clear()
+                response.flags |= dns.flags.TC
+            return response
+
+        self.responses["example.com.", "A"] = handler
+
+        answer = run_coroutine(self.r.query("example.com", "A"))
+        self.assertEqual(str(answer[0]), "192.0.2.1")
+        self.assertSequenceEqual(
+            [tcp for _, tcp in self.server.queries],
+            [False, True],
+        )
+
+    def test_tcp(self):
+        self.responses["example.com.", "A"] = \
+            lambda request, tcp: make_answer(request, "192.0.2.1")
+
+        answer = run_coroutine(self.r.query("example.com", "A", tcp=True))
+        self.assertEqual(str(answer[0]), "192.0.2.1")
+        self.assertSequenceEqual(
+            [tcp for _, tcp in self.server.queries],
+            [True],
+        )
+
+    def test_timeout(self):
+        self.r.timeout = 0.05
+        self.responses["example.com.", "A"] = lambda request, tcp: None
+
+        with self.assertRaises(dns.resolver.Timeout):
+            run_coroutine(self.r.query("example.com", "A"))
+
+    def test_falls_back_to_next_nameserver(self):
+        # the stub only listens on one address; it stays silent on the first
+        # query, which makes it look like two different nameservers
+        self.r.timeout = 0.05
+        self.r.nameservers = ["127.0.0.1", "127.0.0.1"]
+
+        answers = iter([None, "192.0.2.1"])
+
+        def handler(request, tcp):
+            text = next(answers)
+            if text is None:
+                return None
+            return make_answer(request, text)
+
+        self.responses["example.com.", "A"] = handler
+
+        answer = run_coroutine(self.r.query("example.com", "A"))
+        self.assertEqual(str(answer[0]), "192.0.2.1")
+        self.assertEqual(len(self.server.queries), 2)
+
+    def test_server_failure_raises_NoNameservers_and_is_not_cached(self):
+        def handler(request, tcp):
+            response = dns.message.make_response(request)
+            response.set_rcode(dns.rcode.SERVFAIL)
+            return response
+
+        self.responses["example.com.", "A"] = handler
+
+        for i in range(2):
+            with self.assertRaises(dns.resolver.NoNameservers):
+                run_coroutine(self.r.query("example.com", "A"))
+
+        self.assertEqual(len(self.server.queries), 2)
+
+    def test_lookup_srv_with_async_resolver(self):
+        self.responses["_xmpp-client._tcp.example.com.", "SRV"] = \
+            lambda request, tcp: make_answer(
+                request, "0 5 5222 xmpp.example.com."
+            )
+
+        with unittest.mock.patch.object(
+                asyncio.get_event_loop(),
+                "run_in_executor") as run_in_executor:
+            result = run_coroutine(network.lookup_srv(
+                b"example.com",
+                "xmpp-client",
+                resolver=self.r,
+            ))
+
+        run_in_executor.assert_not_called()
+        self.assertSequenceEqual(
+            result,
+            [(0, 5, (b"xmpp.example.com", 5222))],
+        )
+        self.assertEqual(
+            self.server.queries[0][0].flags & (dns.flags.RD | dns.flags.AD),
+            dns.flags.RD | dns.flags.AD,
+        )
+
+    def test_repeated_query_returns_None_on_NXDOMAIN(self):
+        self.responses["nx.example.com.", "SRV"] = \
+            lambda request, tcp: make_negative(request, dns.rcode.NXDOMAIN)
+
+        self.assertIsNone(run_coroutine(network.repeated_query(
+            b"nx.example.com",
+            dns.rdatatype.SRV,
+            resolver=self.r,
+        )))
+
+
 class Testlookup_srv(unittest.TestCase):
     def setUp(self):
         base = unittest.mock.Mock()
@@ -692,6 +692,129 @@ class Testdiscover_connectors(unittest.TestCase):
             ]
         )
 
+    def test_looks_up_SRV_records_concurrently(self):
+        futures = {
+            "xmpp-client": asyncio.Future(),
+            "xmpps-client": asyncio.Future(),
+        }
+        started = []
+
+        @asyncio.coroutine
+        def lookup_srv(domain, service):
+            started.append(service)
+            return (yield from futures[service])
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch("aioxmpp.network.lookup_srv",
+                                    new=lookup_srv),
+            )
+
+            task = asyncio.async(node.discover_connectors(
+                self.domain,
+            ))
+            run_coroutine(asyncio.sleep(0))
+            run_coroutine(asyncio.sleep(0))
+
+            self.assertCountEqual(started, ["xmpp-client", "xmpps-client"])
+            self.assertFalse(task.done())
+
+            futures["xmpps-client"].set_result(None)
+            futures["xmpp-client"].set_result(None)
+
+            result = run_coroutine(task)
+
+        self.assertEqual(len(result), 1)
+
+    def test_cancels_SRV_lookups_when_cancelled(self):
+        futures = {
+            "xmpp-client": asyncio.Future(),
+            "xmpps-client": asyncio.Future(),
+        }
+
+        @asyncio.coroutine
+        def lookup_srv(domain, service):
+            return (yield from futures[service])
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch("aioxmpp.network.lookup_srv",
+                                    new=lookup_srv),
+            )
+
+            task = asyncio.async(node.discover_connectors(
+                self.domain,
+            ))
+            run_coroutine(asyncio.sleep(0))
+            run_coroutine(asyncio.sleep(0))
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                run_coroutine(task)
+
+        self.assertTrue(futures["xmpp-client"].cancelled())
+        self.assertTrue(futures["xmpps-client"].cancelled())
+
+    def test_cancels_other_SRV_lookup_on_error(self):
+        class FooException(Exception):
+            pass
+
+        futures = {
+            "xmpp-client": asyncio.Future(),
+            "xmpps-client": asyncio.Future(),
+        }
+
+        @asyncio.coroutine
+        def lookup_srv(domain, service):
+            return (yield from futures[service])
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch("aioxmpp.network.lookup_srv",
+                                    new=lookup_srv),
+            )
+
+            task = asyncio.async(node.discover_connectors(
+                self.domain,
+            ))
+            run_coroutine(asyncio.sleep(0))
+            futures["xmpp-client"].set_exception(FooException())
+
+            with self.assertRaises(FooException):
+                run_coroutine(task)
+
+        self.assertTrue(futures["xmpps-client"].cancelled())
+
+    def test_waits_for_other_SRV_lookup_if_one_is_disabled(self):
+        futures = {
+            "xmpp-client": asyncio.Future(),
+            "xmpps-client": asyncio.Future(),
+        }
+
+        @asyncio.coroutine
+        def lookup_srv(domain, service):
+            return (yield from futures[service])
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(
+                unittest.mock.patch("aioxmpp.network.lookup_srv",
+                                    new=lookup_srv),
+            )
+
+            task = asyncio.async(node.discover_connectors(
+                self.domain,
+            ))
+            run_coroutine(asyncio.sleep(0))
+            futures["xmpps-client"].set_exception(ValueError())
+            run_coroutine(asyncio.sleep(0))
+            run_coroutine(asyncio.sleep(0))
+            self.assertFalse(task.done())
+
+            futures["xmpp-client"].set_result(None)
+            result = run_coroutine(task)
+
+        # no records for xmpp-client and xmpps-client disabled
+        self.assertSequenceEqual(result, [])
+
 
 class Testconnect_xmlstream(unittest.TestCase):
     def setUp(self):
@@ -1348,6 +1471,488 @@ class Testconnect_xmlstream(unittest.TestCase):
                 ))
 
 
+class Testconnect_xmlstream_racing(unittest.TestCase):
+    def setUp(self):
+        self.discover_connectors = CoroutineMock()
+        self.negotiate_sasl = CoroutineMock()
+        self.send_stream_error = unittest.mock.Mock()
+
+        self.patches = [
+            unittest.mock.patch("aioxmpp.node.discover_connectors",
+                                new=self.discover_connectors),
+            unittest.mock.patch("aioxmpp.security_layer.negotiate_sasl",
+                                new=self.negotiate_sasl),
+            unittest.mock.patch("aioxmpp.protocol.send_stream_error_and_close",
+                                new=self.send_stream_error),
+        ]
+
+        self.negotiate_sasl.return_value = \
+            unittest.mock.sentinel.post_sasl_features
+
+        for patch in self.patches:
+            patch.start()
+
+        self.loop = asyncio.get_event_loop()
+        self.jid = unittest.mock.Mock()
+        self.metadata = unittest.mock.Mock()
+        self.started = []
+        self.cancelled = []
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def _make_connector(self, name, result_fut):
+        @asyncio.coroutine
+        def connect(*args, **kwargs):
+            self.started.append(name)
+            try:
+                return (yield from asyncio.shield(result_fut))
+            except asyncio.CancelledError:
+                self.cancelled.append(name)
+                raise
+
+        conn = unittest.mock.Mock()
+        conn.connect = connect
+        return conn
+
+    def _make_options(self, futures):
+        return [
+            (name, 5222, self._make_connector(name, fut))
+            for name, fut in futures
+        ]
+
+    def _connect(self, delay=0.01):
+        return asyncio.async(node.connect_xmlstream(
+            self.jid,
+            self.metadata,
+            loop=self.loop,
+            happy_eyeballs_delay=delay,
+        ))
+
+    def _result(self, name):
+        return (
+            getattr(unittest.mock.sentinel, "{}_transport".format(name)),
+            getattr(unittest.mock.sentinel, "{}_stream".format(name)),
+            getattr(unittest.mock.sentinel, "{}_features".format(name)),
+        )
+
+    def test_starts_next_attempt_after_delay_and_cancels_losers(self):
+        f1, f2, f3 = asyncio.Future(), asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2), ("h3", f3)]
+        )
+
+        task = self._connect(delay=0.05)
+        run_coroutine(asyncio.sleep(0))
+        run_coroutine(asyncio.sleep(0))
+        self.assertSequenceEqual(self.started, ["h1"])
+
+        run_coroutine(asyncio.sleep(0.07))
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+
+        f2.set_result(self._result("h2"))
+        result = run_coroutine(task)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertEqual(
+            result,
+            (
+                unittest.mock.sentinel.h2_transport,
+                unittest.mock.sentinel.h2_stream,
+                unittest.mock.sentinel.post_sasl_features,
+            )
+        )
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+        self.assertSequenceEqual(self.cancelled, ["h1"])
+        self.assertEqual(len(self.negotiate_sasl.mock_calls), 1)
+
+    def test_starts_next_attempt_immediately_on_failure(self):
+        f1, f2 = asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2)]
+        )
+
+        exc = OSError()
+        task = self._connect(delay=10)
+        run_coroutine(asyncio.sleep(0))
+        f1.set_exception(exc)
+        run_coroutine(asyncio.sleep(0))
+        run_coroutine(asyncio.sleep(0))
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+
+        f2.set_result(self._result("h2"))
+        result = run_coroutine(task)
+        self.assertEqual(result[0], unittest.mock.sentinel.h2_transport)
+
+    def test_aborts_stream_of_attempt_which_lost_narrowly(self):
+        stream1 = unittest.mock.Mock()
+        f1, f2 = asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2)]
+        )
+
+        task = self._connect(delay=0.001)
+        run_coroutine(asyncio.sleep(0.01))
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+
+        f1.set_result(self._result("h1"))
+        f2.set_result((unittest.mock.sentinel.h2_transport,
+                       stream1,
+                       unittest.mock.sentinel.h2_features))
+        result = run_coroutine(task)
+
+        self.assertEqual(result[0], unittest.mock.sentinel.h1_transport)
+        stream1.abort.assert_called_once_with()
+
+    def test_continues_race_if_SASL_is_unavailable(self):
+        f1, f2, f3 = asyncio.Future(), asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2), ("h3", f3)]
+        )
+        exc = errors.SASLUnavailable("foo")
+        self.negotiate_sasl.side_effect = [
+            exc,
+            unittest.mock.sentinel.post_sasl_features,
+        ]
+
+        task = self._connect(delay=0.01)
+        run_coroutine(asyncio.sleep(0.015))
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+
+        f2.set_result(self._result("h2"))
+        for i in range(3):
+            run_coroutine(asyncio.sleep(0))
+        f1.set_result(self._result("h1"))
+        f3.set_result(self._result("h3"))
+        result = run_coroutine(task)
+
+        self.assertSequenceEqual(self.cancelled, ["h1"])
+        self.assertSequenceEqual(self.started, ["h1", "h2", "h3"])
+        self.assertEqual(result[0], unittest.mock.sentinel.h3_transport)
+        self.send_stream_error.assert_called_once_with(
+            unittest.mock.sentinel.h2_stream,
+            condition=(namespaces.streams, "policy-violation"),
+            text=str(exc),
+        )
+
+    def test_does_not_retry_attempts_cancelled_by_the_winner(self):
+        f1, f2 = asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2)]
+        )
+        exc = errors.SASLUnavailable("foo")
+        self.negotiate_sasl.side_effect = exc
+
+        task = self._connect(delay=0.01)
+        run_coroutine(asyncio.sleep(0.015))
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+
+        f2.set_result(self._result("h2"))
+
+        with self.assertRaises(errors.MultiOSError):
+            run_coroutine(task)
+
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+        self.assertSequenceEqual(self.cancelled, ["h1"])
+
+    def test_raises_MultiOSError_in_order_of_failure(self):
+        f1, f2 = asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2)]
+        )
+        exc1, exc2 = OSError(), OSError()
+
+        task = self._connect(delay=0.001)
+        run_coroutine(asyncio.sleep(0.01))
+        f2.set_exception(exc2)
+        run_coroutine(asyncio.sleep(0))
+        f1.set_exception(exc1)
+
+        with self.assertRaises(errors.MultiOSError) as ctx:
+            run_coroutine(task)
+
+        self.assertSequenceEqual(ctx.exception.exceptions, [exc2, exc1])
+
+    def test_reraises_other_exceptions_and_cancels_attempts(self):
+        f1, f2 = asyncio.Future(), asyncio.Future()
+        self.discover_connectors.return_value = self._make_options(
+            [("h1", f1), ("h2", f2)]
+        )
+        exc = RuntimeError()
+
+        task = self._connect(delay=0.001)
+        run_coroutine(asyncio.sleep(0.01))
+        f2.set_exception(exc)
+
+        with self.assertRaises(RuntimeError):
+            run_coroutine(task)
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertSequenceEqual(self.cancelled, ["h1"])
+
+    def test_override_peer_is_raced_before_discovery(self):
+        f1 = asyncio.Future()
+        f1.set_exception(OSError())
+        f2 = asyncio.Future()
+        f2.set_result(self._result("h2"))
+        override_peer = self._make_options([("h1", f1)])
+        self.discover_connectors.return_value = self._make_options(
+            [("h2", f2)]
+        )
+
+        result = run_coroutine(node.connect_xmlstream(
+            self.jid,
+            self.metadata,
+            override_peer=override_peer,
+            loop=self.loop,
+            happy_eyeballs_delay=0.01,
+        ))
+
+        self.assertSequenceEqual(self.started, ["h1", "h2"])
+        self.assertEqual(result[0], unittest.mock.sentinel.h2_transport)
+
+
+class TestConnectionOptionCache(unittest.TestCase):
+    def setUp(self):
+        self.c = node.ConnectionOptionCache()
+
+    def test_default_ttl(self):
+        self.assertEqual(self.c.ttl, 300)
+
+    def test_get_options_raises_KeyError_if_unset(self):
+        with self.assertRaises(KeyError):
+            self.c.get_options("example.com")
+
+    def test_set_and_get_options(self):
+        options = [unittest.mock.sentinel.o1, unittest.mock.sentinel.o2]
+        self.c.set_options("example.com", options)
+        result = self.c.get_options("example.com")
+        self.assertSequenceEqual(result, options)
+        self.assertIsNot(result, options)
+        with self.assertRaises(KeyError):
+            self.c.get_options("example.net")
+
+    def test_options_expire(self):
+        self.c.ttl = 0
+        self.c.set_options("example.com", [unittest.mock.sentinel.o1])
+        with self.assertRaises(KeyError):
+            self.c.get_options("example.com")
+
+    def test_forget_options(self):
+        self.c.set_options("example.com", [unittest.mock.sentinel.o1])
+        self.c.forget_options("example.com")
+        self.c.forget_options("example.com")
+        with self.assertRaises(KeyError):
+            self.c.get_options("example.com")
+
+    def test_preferred(self):
+        self.assertIsNone(self.c.get_preferred("example.com"))
+        self.c.set_preferred("example.com", unittest.mock.sentinel.o1)
+        self.assertEqual(self.c.get_preferred("example.com"),
+                         unittest.mock.sentinel.o1)
+        self.assertIsNone(self.c.get_preferred("example.net"))
+        self.c.forget_preferred("example.com")
+        self.c.forget_preferred("example.com")
+        self.assertIsNone(self.c.get_preferred("example.com"))
+
+    def test_clear(self):
+        self.c.set_options("example.com", [unittest.mock.sentinel.o1])
+        self.c.set_preferred("example.com", unittest.mock.sentinel.o1)
+        self.c.clear()
+        self.assertIsNone(self.c.get_preferred("example.com"))
+        with self.assertRaises(KeyError):
+            self.c.get_options("example.com")
+
+
+class Testconnect_xmlstream_option_cache(unittest.TestCase):
+    def setUp(self):
+        self.discover_connectors = CoroutineMock()
+        self.negotiate_sasl = CoroutineMock()
+
+        self.patches = [
+            unittest.mock.patch("aioxmpp.node.discover_connectors",
+                                new=self.discover_connectors),
+            unittest.mock.patch("aioxmpp.security_layer.negotiate_sasl",
+                                new=self.negotiate_sasl),
+        ]
+
+        self.negotiate_sasl.return_value = \
+            unittest.mock.sentinel.post_sasl_features
+
+        for patch in self.patches:
+            patch.start()
+
+        self.jid = unittest.mock.Mock()
+        self.jid.domain = "example.com"
+        self.metadata = unittest.mock.Mock()
+        self.cache = node.ConnectionOptionCache()
+        self.base = unittest.mock.Mock()
+
+        self.options = []
+        for i in range(3):
+            conn = getattr(self.base, "c{}".format(i))
+            conn.connect = CoroutineMock()
+            conn.connect.side_effect = OSError()
+            self.options.append(("h{}".format(i), 5222, conn))
+
+        self.discover_connectors.return_value = list(self.options)
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+
+    def _succeed(self, i):
+        conn = self.options[i][2]
+        conn.connect.side_effect = None
+        conn.connect.return_value = (
+            unittest.mock.sentinel.transport,
+            unittest.mock.sentinel.protocol,
+            unittest.mock.sentinel.features,
+        )
+
+    def _fail(self, i):
+        self.options[i][2].connect.side_effect = OSError()
+
+    def _connect(self, **kwargs):
+        return run_coroutine(node.connect_xmlstream(
+            self.jid,
+            self.metadata,
+            option_cache=self.cache,
+            **kwargs
+        ))
+
+    def _tried_hosts(self):
+        return [
+            call[1][3]
+            for call in self.base.mock_calls
+        ]
+
+    def test_discovers_and_caches_options(self):
+        self._succeed(1)
+
+        result = self._connect()
+
+        self.assertEqual(result[0], unittest.mock.sentinel.transport)
+        self.assertEqual(len(self.discover_connectors.mock_calls), 1)
+        self.assertSequenceEqual(self.cache.get_options("example.com"),
+                                 self.options)
+        self.assertEqual(self.cache.get_preferred("example.com"),
+                         self.options[1])
+        self.assertSequenceEqual(self._tried_hosts(), ["h0", "h1"])
+
+    def test_tries_preferred_option_first(self):
+        self._succeed(1)
+        self._connect()
+        self.base.reset_mock()
+
+        result = self._connect()
+
+        self.assertEqual(result[2], unittest.mock.sentinel.post_sasl_features)
+        self.assertEqual(len(self.discover_connectors.mock_calls), 1)
+        self.assertSequenceEqual(self._tried_hosts(), ["h1"])
+
+    def test_uses_cached_options_if_preferred_option_fails(self):
+        self._succeed(1)
+        self._connect()
+        self.base.reset_mock()
+        self._fail(1)
+        self._succeed(2)
+
+        self._connect()
+
+        self.assertEqual(len(self.discover_connectors.mock_calls), 1)
+        self.assertSequenceEqual(self._tried_hosts(), ["h1", "h0", "h2"])
+        self.assertEqual(self.cache.get_preferred("example.com"),
+                         self.options[2])
+
+    def test_rediscovers_if_cached_options_fail(self):
+        self._succeed(1)
+        self._connect()
+        self.base.reset_mock()
+        self._fail(1)
+
+        with self.assertRaises(errors.MultiOSError) as ctx:
+            self._connect()
+
+        self.assertEqual(len(self.discover_connectors.mock_calls), 2)
+        self.assertSequenceEqual(self._tried_hosts(),
+                                 ["h1", "h0", "h2"])
+        self.assertEqual(len(ctx.exception.exceptions), 3)
+        self.assertIsNone(self.cache.get_preferred("example.com"))
+        self.assertSequenceEqual(self.cache.get_options("example.com"),
+                                 self.options)
+
+    def test_rediscovery_only_tries_new_options(self):
+        self._succeed(1)
+        self._connect()
+        self.base.reset_mock()
+        self._fail(1)
+
+        new = self.base.new
+        new.connect = CoroutineMock()
+        new.connect.return_value = (
+            unittest.mock.sentinel.transport,
+            unittest.mock.sentinel.protocol,
+            unittest.mock.sentinel.features,
+        )
+        self.discover_connectors.return_value = \
+            self.options + [("new", 5222, new)]
+
+        self._connect()
+
+        self.assertSequenceEqual(self._tried_hosts(),
+                                 ["h1", "h0", "h2", "new"])
+        self.assertEqual(self.cache.get_preferred("example.com"),
+                         ("new", 5222, new))
+
+    def test_rediscovery_skips_equivalent_connectors(self):
+        connect = CoroutineMock()
+        connect.side_effect = OSError()
+        self.discover_connectors.return_value = [
+            ("h", 5222, aioxmpp.connector.STARTTLSConnector()),
+        ]
+
+        with contextlib.ExitStack() as stack:
+            stack.enter_context(unittest.mock.patch.object(
+                aioxmpp.connector.STARTTLSConnector, "connect",
+                new=connect,
+            ))
+
+            with self.assertRaises(errors.MultiOSError):
+                self._connect(override_peer=[
+                    ("h", 5222, aioxmpp.connector.STARTTLSConnector()),
+                ])
+
+        self.assertEqual(len(connect.mock_calls), 1)
+
+    def test_rediscovers_after_ttl(self):
+        self.cache.ttl = 0
+        self._succeed(1)
+        self._connect()
+        self._fail(1)
+        self._succeed(0)
+        self.base.reset_mock()
+
+        self._connect()
+
+        self.assertEqual(len(self.discover_connectors.mock_calls), 2)
+        self.assertSequenceEqual(self._tried_hosts(), ["h1", "h0"])
+
+    def test_override_peer_takes_precedence(self):
+        self._succeed(1)
+        self._connect()
+        self.base.reset_mock()
+
+        override = self.base.override
+        override.connect = CoroutineMock()
+        override.connect.side_effect = OSError()
+
+        self._connect(override_peer=[("override", 5222, override)])
+
+        self.assertSequenceEqual(self._tried_hosts(), ["override", "h1"])
+
+
 class TestClient(xmltestutils.XMLTestCase):
     @asyncio.coroutine
     def _connect_xmlstream(self, *args, **kwargs):
@@ -1549,6 +2154,37 @@ class TestClient(xmltestutils.XMLTestCase):
             logger=self.client.logger,
         )
 
+    def test_start_with_happy_eyeballs_delay(self):
+        self.assertIsNone(self.client.happy_eyeballs_delay)
+        self.client.happy_eyeballs_delay = 0.25
+        self.client.start()
+        run_coroutine(self.xmlstream.run_test(self.resource_binding))
+        self.connect_xmlstream_rec.assert_called_once_with(
+            self.test_jid,
+            self.security_layer,
+            negotiation_timeout=60.0,
+            override_peer=[],
+            loop=self.loop,
+            logger=self.client.logger,
+            happy_eyeballs_delay=0.25,
+        )
+
+    def test_start_with_connection_option_cache(self):
+        self.assertIsNone(self.client.connection_option_cache)
+        cache = node.ConnectionOptionCache()
+        self.client.connection_option_cache = cache
+        self.client.start()
+        run_coroutine(self.xmlstream.run_test(self.resource_binding))
+        self.connect_xmlstream_rec.assert_called_once_with(
+            self.test_jid,
+            self.security_layer,
+            negotiation_timeout=60.0,
+            override_peer=[],
+            loop=self.loop,
+            logger=self.client.logger,
+            option_cache=cache,
+        )
+
     def test_reject_start_twice(self):
         self.client.start()
         with self.assertRaisesRegex(RuntimeError,
@@ -29,6 +29,7 @@ import aioxmpp.structs as structs
 import aioxmpp.xso as xso
 import aioxmpp.nonza as nonza
 import aioxmpp.errors as errors
+import aioxmpp.xml as xml
 
 from aioxmpp.testutils import (
     TransportMock,
@@ -343,6 +344,163 @@ class TestXMLStream(unittest.TestCase):
             TransportMock.Close()
         ]))
 
+    def test_passes_limits_to_processor(self):
+        limits = xml.StanzaLimits(max_depth=10)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        run_coroutine(t.run_test(
+            [
+                TransportMock.Write(STREAM_HEADER),
+            ],
+            partial=True
+        ))
+        self.assertIs(p._processor.limits, limits)
+
+    def test_send_policy_violation_on_depth_limit(self):
+        limits = xml.StanzaLimits(max_depth=2)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        run_coroutine(t.run_test([
+            TransportMock.Write(
+                STREAM_HEADER,
+                response=[
+                    TransportMock.Receive(self._make_peer_header()),
+                    TransportMock.Receive(
+                        b"<message xmlns='jabber:client'><a><b>"
+                    )
+                ]),
+            TransportMock.Write(
+                STREAM_ERROR_TEMPLATE_WITH_TEXT.format(
+                    condition="policy-violation",
+                    text="stanza exceeds depth limit (3 &gt; 2)"
+                ).encode("utf-8")
+            ),
+            TransportMock.Write(b"</stream:stream>"),
+            TransportMock.WriteEof(),
+            TransportMock.Close()
+        ]))
+        self.assertEqual(limits.violations["depth"], 1)
+
+    def test_send_policy_violation_on_stanza_bytes_limit(self):
+        limits = xml.StanzaLimits(max_stanza_bytes=100)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        run_coroutine(t.run_test([
+            TransportMock.Write(
+                STREAM_HEADER,
+                response=[
+                    TransportMock.Receive(self._make_peer_header()),
+                    TransportMock.Receive(
+                        b"<message xmlns='jabber:client'><body>" +
+                        b"x" * (2 * p.LIMITS_SLICE_SIZE)
+                    )
+                ]),
+            TransportMock.Write(
+                STREAM_ERROR_TEMPLATE_WITH_TEXT.format(
+                    condition="policy-violation",
+                    text="stanza exceeds stanza bytes limit"
+                         " ({} &gt; 100)".format(p.LIMITS_SLICE_SIZE)
+                ).encode("utf-8")
+            ),
+            TransportMock.Write(b"</stream:stream>"),
+            TransportMock.WriteEof(),
+            TransportMock.Close()
+        ]))
+        self.assertEqual(limits.violations["stanza_bytes"], 1)
+
+    def test_stanza_bytes_limit_counts_across_receives(self):
+        limits = xml.StanzaLimits(max_stanza_bytes=100)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        run_coroutine(t.run_test([
+            TransportMock.Write(
+                STREAM_HEADER,
+                response=[
+                    TransportMock.Receive(self._make_peer_header()),
+                    TransportMock.Receive(
+                        b"<message xmlns='jabber:client'><body>"
+                    ),
+                ] + [
+                    TransportMock.Receive(b"x" * 30)
+                    for i in range(4)
+                ]),
+            TransportMock.Write(
+                STREAM_ERROR_TEMPLATE_WITH_TEXT.format(
+                    condition="policy-violation",
+                    text="stanza exceeds stanza bytes limit (127 &gt; 100)"
+                ).encode("utf-8")
+            ),
+            TransportMock.Write(b"</stream:stream>"),
+            TransportMock.WriteEof(),
+            TransportMock.Close()
+        ]))
+
+    def test_stanza_bytes_limit_counts_incomplete_start_tag(self):
+        limits = xml.StanzaLimits(max_stanza_bytes=10000)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        run_coroutine(t.run_test([
+            TransportMock.Write(
+                STREAM_HEADER,
+                response=[
+                    TransportMock.Receive(self._make_peer_header()),
+                    TransportMock.Receive(b"<message a='"),
+                ] + [
+                    TransportMock.Receive(b"x" * 1000)
+                    for i in range(10)
+                ]),
+            TransportMock.Write(
+                STREAM_ERROR_TEMPLATE_WITH_TEXT.format(
+                    condition="policy-violation",
+                    text="stanza exceeds stanza bytes limit"
+                         " (10012 &gt; 10000)"
+                ).encode("utf-8")
+            ),
+            TransportMock.Write(b"</stream:stream>"),
+            TransportMock.WriteEof(),
+            TransportMock.Close()
+        ]))
+        self.assertEqual(limits.violations["stanza_bytes"], 1)
+
+    def test_stanza_bytes_limit_ignores_whitespace_between_stanzas(self):
+        limits = xml.StanzaLimits(max_stanza_bytes=100)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        run_coroutine(t.run_test(
+            [
+                TransportMock.Write(
+                    STREAM_HEADER,
+                    response=[
+                        TransportMock.Receive(self._make_peer_header()),
+                    ] + [
+                        TransportMock.Receive(b" " * 60)
+                        for i in range(5)
+                    ]),
+            ],
+            partial=True
+        ))
+        self.assertFalse(limits.violations)
+
+    def test_stanza_bytes_limit_is_per_stanza(self):
+        limits = xml.StanzaLimits(max_stanza_bytes=100)
+        t, p = self._make_stream(to=TEST_PEER, limits=limits)
+        recv = unittest.mock.Mock()
+        p.stanza_parser.add_class(stanza.Message, recv)
+        run_coroutine(t.run_test(
+            [
+                TransportMock.Write(
+                    STREAM_HEADER,
+                    response=[
+                        TransportMock.Receive(self._make_peer_header()),
+                    ] + [
+                        TransportMock.Receive(data)
+                        for i in range(3)
+                        for data in [
+                            b"<message xmlns='jabber:client'><body>",
+                            b"x" * 60,
+                            b"</body></message>",
+                        ]
+                    ]),
+            ],
+            partial=True
+        ))
+        self.assertEqual(recv.call_count, 3)
+        self.assertFalse(limits.violations)
+
     def test_error_propagation(self):
         def cb(stanza):
             pass
@@ -1593,6 +1751,236 @@ class TestXMLStream(unittest.TestCase):
         )
 
 
+class TestXMLStreamWithExpatParser(TestXMLStream):
+    def _make_stream(self, *args, **kwargs):
+        kwargs.setdefault("parser_factory", xml.ExpatParser)
+        return super()._make_stream(*args, **kwargs)
+
+    def test_uses_parser_factory(self):
+        factory = unittest.mock.Mock()
+        factory.return_value = xml.ExpatParser()
+        t, p = self._make_stream(to=TEST_PEER, parser_factory=factory)
+        run_coroutine(t.run_test(
+            [
+                TransportMock.Write(STREAM_HEADER),
+            ],
+        ))
+        factory.assert_called_once_with()
+        self.assertIsInstance(
+            factory.return_value.getContentHandler(),
+            xml.XMPPXMLProcessor,
+        )
+
+
+class TestCoalescingWrapper(unittest.TestCase):
+    def setUp(self):
+        self.dest = unittest.mock.Mock()
+        self.loop = unittest.mock.Mock()
+        self.w = protocol.CoalescingWrapper(self.dest, self.loop, 0, 16)
+
+    def tearDown(self):
+        del self.w
+        del self.loop
+        del self.dest
+
+    def test_write_schedules_flush_at_end_of_tick(self):
+        self.w.write(b"foo")
+        self.w.write(b"bar")
+        self.loop.call_soon.assert_called_once_with(self.w.flush_pending)
+        self.assertFalse(self.loop.call_later.mock_calls)
+        self.assertFalse(self.dest.mock_calls)
+
+    def test_write_schedules_flush_after_delay(self):
+        w = protocol.CoalescingWrapper(self.dest, self.loop, 0.01, 16)
+        w.write(b"foo")
+        w.write(b"bar")
+        self.loop.call_later.assert_called_once_with(0.01, w.flush_pending)
+        self.assertFalse(self.loop.call_soon.mock_calls)
+        self.assertFalse(self.dest.mock_calls)
+
+    def test_flush_pending_writes_once(self):
+        self.w.write(b"foo")
+        self.w.write(memoryview(b"bar"))
+        self.w.flush_pending()
+        self.dest.write.assert_called_once_with(b"foobar")
+        self.loop.call_soon().cancel.assert_called_once_with()
+
+    def test_flush_pending_without_data_does_not_write(self):
+        self.w.flush_pending()
+        self.assertFalse(self.dest.mock_calls)
+
+    def test_write_reschedules_after_flush(self):
+        self.w.write(b"foo")
+        self.w.flush_pending()
+        self.w.write(b"bar")
+        self.assertEqual(self.loop.call_soon.call_count, 2)
+
+    def test_write_flushes_when_max_bytes_reached(self):
+        self.w.write(b"0123456789")
+        self.assertFalse(self.dest.mock_calls)
+        self.w.write(b"abcdef")
+        self.dest.write.assert_called_once_with(b"0123456789abcdef")
+        self.w.flush_pending()
+        self.dest.write.assert_called_once_with(b"0123456789abcdef")
+
+    def test_write_copies_data(self):
+        buf = bytearray(b"foo")
+        self.w.write(memoryview(buf))
+        buf[:] = b"bar"
+        self.w.flush_pending()
+        self.dest.write.assert_called_once_with(b"foo")
+
+    def test_discard(self):
+        self.w.write(b"foo")
+        self.w.discard()
+        self.loop.call_soon().cancel.assert_called_once_with()
+        self.w.flush_pending()
+        self.assertFalse(self.dest.mock_calls)
+
+    def test_has_no_flush(self):
+        self.assertFalse(hasattr(self.w, "flush"))
+
+
+class TestXMLStreamWriteCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+        self.t, self.p = self._make_stream(to=TEST_PEER)
+        self.writes = []
+        write = self.t.write
+
+        def record_write(data):
+            self.writes.append(bytes(data))
+            write(data)
+
+        self.t.write = record_write
+
+    def tearDown(self):
+        self.p.connection_lost(None)
+        run_coroutine(asyncio.sleep(0))
+        del self.t
+        del self.p
+
+    def _make_stream(self, *args, **kwargs):
+        p = XMLStream(*args, sorted_attributes=True,
+                      features_future=asyncio.Future(),
+                      coalesce_delay=0,
+                      **kwargs)
+        t = TransportMock(self, p)
+        return t, p
+
+    def _make_message(self, i):
+        st = stanza.Message(structs.MessageType.CHAT)
+        st.id_ = str(i)
+        return st
+
+    def _message_bytes(self, i):
+        return '<message id="{}" type="chat"/>'.format(i).encode("ascii")
+
+    def _start(self):
+        run_coroutine(self.t.run_test(
+            [
+                TransportMock.Write(
+                    STREAM_HEADER,
+                    response=[
+                        TransportMock.Receive(
+                            PEER_STREAM_HEADER_TEMPLATE.format(
+                                major=1,
+                                minor=0
+                            ).encode("utf-8")
+                        ),
+                    ]
+                ),
+            ],
+            partial=True
+        ))
+        self.writes.clear()
+
+    def test_stream_header_is_written_immediately(self):
+        self._start()
+        self.assertIsNotNone(self.p._coalescer)
+
+    def test_stanzas_are_written_in_one_piece(self):
+        self._start()
+        for i in range(3):
+            self.p.send_xso(self._make_message(i))
+        self.assertSequenceEqual(self.writes, [])
+
+        run_coroutine(self.t.run_test(
+            [
+                TransportMock.Write(b"".join(
+                    self._message_bytes(i)
+                    for i in range(3)
+                )),
+            ],
+            partial=True
+        ))
+
+        self.assertSequenceEqual(
+            self.writes,
+            [
+                b"".join(self._message_bytes(i) for i in range(3)),
+            ]
+        )
+
+    def test_nonzas_flush_immediately(self):
+        self._start()
+        self.p.send_xso(self._make_message(0))
+        self.p.send_xso(nonza.SMRequest())
+        self.assertSequenceEqual(
+            self.writes,
+            [
+                self._message_bytes(0) +
+                b'<r xmlns="urn:xmpp:sm:3"/>',
+            ]
+        )
+
+        run_coroutine(self.t.run_test(
+            [
+                TransportMock.Write(
+                    self._message_bytes(0) +
+                    b'<r xmlns="urn:xmpp:sm:3"/>'
+                ),
+            ],
+            partial=True
+        ))
+
+    def test_close_flushes_before_eof(self):
+        self._start()
+        self.p.send_xso(self._make_message(0))
+        self.p.close()
+        run_coroutine(self.t.run_test(
+            [
+                TransportMock.Write(
+                    self._message_bytes(0) +
+                    b"</stream:stream>"
+                ),
+                TransportMock.WriteEof(),
+            ],
+            partial=True
+        ))
+
+    def test_abort_flushes_before_closing(self):
+        self._start()
+        self.p.send_xso(self._make_message(0))
+        self.p.abort()
+        run_coroutine(self.t.run_test(
+            [
+                TransportMock.Write(self._message_bytes(0)),
+                TransportMock.WriteEof(),
+                TransportMock.Close(),
+            ],
+            partial=True
+        ))
+
+    def test_connection_lost_discards_pending_data(self):
+        self._start()
+        self.p.send_xso(self._make_message(0))
+        self.p.connection_lost(None)
+        self.assertIsNone(self.p._coalescer)
+        run_coroutine(asyncio.sleep(0))
+        self.assertSequenceEqual(self.writes, [])
+
+
 class Testsend_and_wait_for(xmltestutils.XMLTestCase):
     def setUp(self):
         self.loop = asyncio.get_event_loop()
@@ -20,19 +20,26 @@
 #
 ########################################################################
 import asyncio
+import base64
+import hashlib
+import hmac
+import unittest
+import unittest.mock
 
 import aiosasl
 
 import aioxmpp.nonza as nonza
 import aioxmpp.sasl as sasl
-import aioxmpp.errors as errors
+import aioxmpp.structs as structs
 
 from aioxmpp.utils import namespaces
 
 from aioxmpp import xmltestutils
 from aioxmpp.testutils import (
     XMLStreamMock,
+    run_coroutine,
     run_coroutine_with_peer,
+    CoroutineMock,
 )
 
 
@@ -235,3 +242,378 @@ class TestSASLXMPPInterface(xmltestutils.XMLTestCase):
     def tearDown(self):
         del self.xmlstream
         del self.loop
+
+
+# test vector from RFC 5802, section 5
+RFC5802_NONCE = b"fyko+d2lbbFgONRv9qkxdawL"
+RFC5802_SERVER_FIRST = (
+    b"r=fyko+d2lbbFgONRv9qkxdawL3rfcNHYJY1ZVvWVs7j,"
+    b"s=QSXCR+Q6sek8bf92,i=4096"
+)
+RFC5802_CLIENT_FINAL = (
+    b"c=biws,r=fyko+d2lbbFgONRv9qkxdawL3rfcNHYJY1ZVvWVs7j,"
+    b"p=v0X8v3Bz2T0CJGbJQyF0X+HI4Ts="
+)
+RFC5802_SERVER_FINAL = b"v=rmF9pqV8S7suAoZWja4dJRkFsKQ="
+
+
+def hmac_digest(key, msg):
+    return hmac.new(key, msg, hashlib.sha1).digest()
+
+
+class TestSCRAMKeyCache(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.get_event_loop()
+        self.c = sasl.SCRAMKeyCache(maxsize=2)
+        self.account = structs.JID.fromstr("user@a.example")
+
+    def tearDown(self):
+        del self.c
+
+    def _derive(self, account=None, password=b"pencil", salt=b"salt",
+                iteration_count=4096, hashfun_name="sha1"):
+        if account is None:
+            account = self.account
+        return run_coroutine(self.c.derive(
+            account, password, salt, iteration_count, hashfun_name,
+        ))
+
+    def test_derive_computes_salted_password(self):
+        self.assertEqual(
+            self._derive(),
+            hashlib.pbkdf2_hmac("sha1", b"pencil", b"salt", 4096),
+        )
+
+    def test_derive_runs_in_executor(self):
+        with unittest.mock.patch.object(
+                self.loop, "run_in_executor",
+                wraps=self.loop.run_in_executor) as run_in_executor:
+            salted_password = self._derive()
+
+        run_in_executor.assert_called_once_with(
+            None,
+            hashlib.pbkdf2_hmac,
+            "sha1",
+            b"pencil",
+            b"salt",
+            4096,
+        )
+        self.assertEqual(salted_password, self._derive())
+
+    def test_derive_uses_cache(self):
+        salted_password = self._derive()
+        self.assertEqual(len(self.c), 1)
+
+        with unittest.mock.patch.object(
+                self.loop, "run_in_executor") as run_in_executor:
+            self.assertEqual(self._derive(), salted_password)
+
+        run_in_executor.assert_not_called()
+
+    def test_derive_again_if_parameters_differ(self):
+        salted_password = self._derive()
+
+        self.assertNotEqual(self._derive(salt=b"other"), salted_password)
+        self.assertNotEqual(self._derive(iteration_count=4097),
+                            salted_password)
+        self.assertNotEqual(self._derive(hashfun_name="sha256"),
+                            salted_password)
+
+    def test_derive_again_for_other_account(self):
+        self._derive()
+        with unittest.mock.patch.object(
+                self.loop, "run_in_executor",
+                wraps=self.loop.run_in_executor) as run_in_executor:
+            self._derive(account=structs.JID.fromstr("other@a.example"))
+        self.assertEqual(run_in_executor.call_count, 1)
+        self.assertEqual(len(self.c), 2)
+
+    def test_same_localpart_on_other_domain_does_not_share_entry(self):
+        self._derive()
+        salted_password = self._derive(
+            account=structs.JID.fromstr("user@b.example"),
+            password=b"other",
+        )
+        self.assertEqual(
+            salted_password,
+            hashlib.pbkdf2_hmac("sha1", b"other", b"salt", 4096),
+        )
+        self.assertEqual(len(self.c), 2)
+
+    def test_changed_password_derives_again(self):
+        self._derive()
+        self.assertEqual(
+            self._derive(password=b"other"),
+            hashlib.pbkdf2_hmac("sha1", b"other", b"salt", 4096),
+        )
+
+    def test_does_not_store_password(self):
+        self._derive()
+        key, = self.c._entries.keys()
+        self.assertNotIn(b"pencil", key)
+        self.assertNotIn(
+            hashlib.sha256(b"pencil").digest(),
+            key,
+        )
+
+    def test_password_digest_depends_on_cache(self):
+        other = sasl.SCRAMKeyCache()
+        self._derive()
+        run_coroutine(other.derive(
+            self.account, b"pencil", b"salt", 4096, "sha1",
+        ))
+        self.assertNotEqual(
+            list(self.c._entries.keys()),
+            list(other._entries.keys()),
+        )
+
+    def test_discard(self):
+        self._derive()
+        self.c.discard(self.account, b"pencil", b"salt", 4096, "sha1")
+        self.assertEqual(len(self.c), 0)
+        self.c.discard(self.account, b"pencil", b"salt", 4096, "sha1")
+        self.assertEqual(len(self.c), 0)
+
+    def test_discard_ignores_other_password(self):
+        self._derive()
+        self.c.discard(self.account, b"other", b"salt", 4096, "sha1")
+        self.assertEqual(len(self.c), 1)
+
+    def test_maxsize(self):
+        self._derive(account=structs.JID.fromstr("a@a.example"))
+        self._derive(account=structs.JID.fromstr("b@a.example"))
+        self._derive(account=structs.JID.fromstr("c@a.example"))
+        self.assertEqual(len(self.c), 2)
+
+    def test_clear(self):
+        self._derive()
+        self.c.clear()
+        self.assertEqual(len(self.c), 0)
+
+
+class TestCachingSCRAM(unittest.TestCase):
+    def setUp(self):
+        self.key_cache = sasl.SCRAMKeyCache()
+        self.credential_provider = CoroutineMock()
+        self.credential_provider.return_value = ("user", "pencil")
+        self.mechanism = sasl.CachingSCRAM(
+            self.credential_provider,
+            key_cache=self.key_cache,
+            nonce_length=18,
+        )
+        self.token = aiosasl.SCRAM.any_supported(["SCRAM-SHA-1"])
+
+        self.sm = unittest.mock.Mock()
+        self.sm.initiate = CoroutineMock()
+        self.sm.initiate.return_value = (
+            aiosasl.SASLState.CHALLENGE,
+            RFC5802_SERVER_FIRST,
+        )
+        self.sm.response = CoroutineMock()
+        self.sm.response.side_effect = [
+            (aiosasl.SASLState.CHALLENGE, RFC5802_SERVER_FINAL),
+            (aiosasl.SASLState.SUCCESS, None),
+        ]
+        self.sm.abort = CoroutineMock()
+
+    def tearDown(self):
+        del self.mechanism
+
+    def _authenticate(self, mechanism=None):
+        mechanism = mechanism or self.mechanism
+        system_random = unittest.mock.Mock()
+        system_random.getrandbits.return_value = int.from_bytes(
+            base64.b64decode(RFC5802_NONCE),
+            "little",
+        )
+        with unittest.mock.patch("aioxmpp.sasl._system_random",
+                                 new=system_random):
+            run_coroutine(mechanism.authenticate(self.sm, self.token))
+
+    def test_is_scram(self):
+        self.assertTrue(issubclass(sasl.CachingSCRAM, aiosasl.SCRAM))
+
+    def test_rfc5802_exchange(self):
+        self._authenticate()
+
+        self.assertSequenceEqual(
+            self.sm.initiate.mock_calls,
+            [
+                unittest.mock.call(
+                    "SCRAM-SHA-1",
+                    b"n,,n=user,r=" + RFC5802_NONCE,
+                ),
+            ]
+        )
+        self.assertSequenceEqual(
+            self.sm.response.mock_calls,
+            [
+                unittest.mock.call(RFC5802_CLIENT_FINAL),
+                unittest.mock.call(b""),
+            ]
+        )
+
+    def test_uses_key_cache(self):
+        calls = []
+        derive = self.key_cache.derive
+
+        @asyncio.coroutine
+        def derive_wrapper(*args):
+            calls.append(args)
+            return (yield from derive(*args))
+
+        with unittest.mock.patch.object(self.key_cache, "derive",
+                                        new=derive_wrapper):
+            self._authenticate()
+
+        self.assertSequenceEqual(
+            calls,
+            [
+                (
+                    b"user",
+                    b"pencil",
+                    base64.b64decode(b"QSXCR+Q6sek8bf92"),
+                    4096,
+                    "sha1",
+                ),
+            ]
+        )
+        self.assertEqual(len(self.key_cache), 1)
+
+    def test_uses_account_for_key_cache(self):
+        account = structs.JID.fromstr("user@a.example")
+        mechanism = sasl.CachingSCRAM(
+            self.credential_provider,
+            key_cache=self.key_cache,
+            account=account,
+            nonce_length=18,
+        )
+
+        with unittest.mock.patch.object(
+                self.key_cache, "derive",
+                new=CoroutineMock()) as derive:
+            derive.return_value = hashlib.pbkdf2_hmac(
+                "sha1",
+                b"pencil",
+                base64.b64decode(b"QSXCR+Q6sek8bf92"),
+                4096,
+            )
+            self._authenticate(mechanism)
+
+        derive.assert_called_once_with(
+            account,
+            b"pencil",
+            base64.b64decode(b"QSXCR+Q6sek8bf92"),
+            4096,
+            "sha1",
+        )
+
+    def test_reauthentication_does_not_derive_again(self):
+        self._authenticate()
+
+        self.sm.response.side_effect = [
+            (aiosasl.SASLState.CHALLENGE, RFC5802_SERVER_FINAL),
+            (aiosasl.SASLState.SUCCESS, None),
+        ]
+        with unittest.mock.patch("hashlib.pbkdf2_hmac") as pbkdf2_hmac:
+            self._authenticate()
+
+        pbkdf2_hmac.assert_not_called()
+
+    def test_rejects_invalid_server_signature(self):
+        self.sm.response.side_effect = [
+            (aiosasl.SASLState.CHALLENGE,
+             b"v=" + base64.b64encode(b"x" * 20)),
+            (aiosasl.SASLState.SUCCESS, None),
+        ]
+
+        with self.assertRaisesRegex(aiosasl.SASLFailure,
+                                    "server signature invalid"):
+            self._authenticate()
+
+    def test_rejects_foreign_nonce(self):
+        self.sm.initiate.return_value = (
+            aiosasl.SASLState.CHALLENGE,
+            b"r=foo,s=QSXCR+Q6sek8bf92,i=4096",
+        )
+
+        with self.assertRaisesRegex(aiosasl.SASLFailure,
+                                    "nonce doesn't fit"):
+            self._authenticate()
+
+        self.sm.abort.assert_called_once_with()
+
+    def test_enforces_minimum_iteration_count(self):
+        self.sm.initiate.return_value = (
+            aiosasl.SASLState.CHALLENGE,
+            RFC5802_SERVER_FIRST.replace(b"i=4096", b"i=10"),
+        )
+
+        with self.assertRaisesRegex(aiosasl.SASLFailure,
+                                    "minimum iteration count"):
+            self._authenticate()
+
+        self.assertEqual(len(self.key_cache), 0)
+
+    def test_promotes_failure_on_response(self):
+        self.sm.response.side_effect = aiosasl.SASLFailure(
+            "not-authorized",
+        )
+
+        with self.assertRaises(aiosasl.AuthenticationFailure):
+            self._authenticate()
+
+    def test_failed_authentication_discards_cache_entry(self):
+        self.sm.response.side_effect = aiosasl.SASLFailure(
+            "not-authorized",
+        )
+
+        with self.assertRaises(aiosasl.AuthenticationFailure):
+            self._authenticate()
+
+        self.assertEqual(len(self.key_cache), 0)
+
+    def test_derives_keys_in_executor(self):
+        loop = asyncio.get_event_loop()
+        with unittest.mock.patch.object(
+                loop, "run_in_executor",
+                wraps=loop.run_in_executor) as run_in_executor:
+            self._authenticate()
+
+        run_in_executor.assert_called_once_with(
+            None,
+            hashlib.pbkdf2_hmac,
+            "sha1",
+            b"pencil",
+            base64.b64decode(b"QSXCR+Q6sek8bf92"),
+            4096,
+        )
+
+    def test_after_scram_plus_uses_gs2_header_for_downgrade_protection(self):
+        mechanism = sasl.CachingSCRAM(
+            self.credential_provider,
+            key_cache=self.key_cache,
+            nonce_length=18,
+            after_scram_plus=True,
+        )
+        # the proof does not match the RFC 5802 example anymore
+        self.sm.response.side_effect = aiosasl.SASLFailure(
+            "not-authorized",
+        )
+
+        with self.assertRaises(aiosasl.AuthenticationFailure):
+            self._authenticate(mechanism)
+
+        self.assertSequenceEqual(
+            self.sm.initiate.mock_calls,
+            [
+                unittest.mock.call(
+                    "SCRAM-SHA-1",
+                    b"y,,n=user,r=" + RFC5802_NONCE,
+                ),
+            ]
+        )
+        _, (response, ), _ = self.sm.response.mock_calls[0]
+        self.assertTrue(response.startswith(
+            b"c=" + base64.b64encode(b"y,,") + b",",
+        ))
@@ -34,6 +34,7 @@ import aioxmpp.errors as errors
 import aioxmpp.structs as structs
 import aioxmpp.security_layer as security_layer
 import aioxmpp.nonza as nonza
+import aioxmpp.sasl as sasl
 
 from aioxmpp.utils import namespaces
 
@@ -554,6 +555,73 @@ class TestPKIXCertificateVerifier(unittest.TestCase):
 
         self.assertTrue(result)
 
+    def test_verify_callback_caches_hostname_check(self):
+        x509 = OpenSSL.crypto.load_certificate(
+            OpenSSL.crypto.FILETYPE_PEM,
+            crt_zombofant_net)
+        hostname = "cache-{}.example".format(random.getrandbits(64))
+
+        verifier = security_layer.PKIXCertificateVerifier()
+        verifier.transport = unittest.mock.Mock()
+        verifier.transport.get_extra_info.return_value = hostname
+
+        with unittest.mock.patch(
+                "aioxmpp.security_layer.check_x509_hostname"
+        ) as check_x509_hostname:
+            check_x509_hostname.return_value = False
+
+            result1 = verifier.verify_callback(None, x509, 0, 0, True)
+            result2 = verifier.verify_callback(None, x509, 0, 0, True)
+
+            verifier.transport.get_extra_info.return_value = \
+                "other-" + hostname
+            verifier.verify_callback(None, x509, 0, 0, True)
+
+        self.assertFalse(result1)
+        self.assertFalse(result2)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call(x509, hostname),
+                unittest.mock.call(x509, "other-" + hostname),
+            ],
+            check_x509_hostname.mock_calls
+        )
+
+    def test_supports_session_resumption(self):
+        self.assertTrue(
+            security_layer.PKIXCertificateVerifier.supports_session_resumption
+        )
+        self.assertFalse(
+            security_layer.CertificateVerifier.supports_session_resumption
+        )
+        self.assertFalse(
+            security_layer.HookablePKIXCertificateVerifier.
+            supports_session_resumption
+        )
+
+    def test_setup_context_calls_setup_connection(self):
+        verifier = security_layer.PKIXCertificateVerifier()
+        ctx = unittest.mock.Mock()
+
+        with unittest.mock.patch.object(
+                verifier, "setup_connection") as setup_connection:
+            verifier.setup_context(ctx, unittest.mock.sentinel.transport)
+
+        setup_connection.assert_called_once_with(
+            unittest.mock.sentinel.transport,
+        )
+        ctx.set_verify.assert_called_once_with(
+            OpenSSL.SSL.VERIFY_PEER,
+            verifier.verify_callback,
+        )
+        ctx.set_default_verify_paths.assert_called_once_with()
+
+    def test_setup_connection_sets_transport(self):
+        verifier = security_layer.PKIXCertificateVerifier()
+        verifier.setup_connection(unittest.mock.sentinel.transport)
+        self.assertEqual(verifier.transport, unittest.mock.sentinel.transport)
+
 
 class TestHookablePKIXCertificateVerifier(unittest.TestCase):
     def setUp(self):
@@ -1782,6 +1850,47 @@ class TestPasswordSASLProvider(xmltestutils.XMLTestCase):
             self.password_provider.mock_calls
         )
 
+    def test_uses_caching_scram_with_scram_key_cache(self):
+        self.mechanisms.mechanisms.extend([
+            security_layer.SASLMechanism(name="SCRAM-SHA-1"),
+        ])
+
+        key_cache = sasl.SCRAMKeyCache()
+        provider = security_layer.PasswordSASLProvider(
+            self._password_provider_wrapper,
+            scram_key_cache=key_cache,
+        )
+
+        with unittest.mock.patch.object(
+                provider, "_execute",
+                new=CoroutineMock()) as _execute:
+            _execute.return_value = True
+            self.assertTrue(self._test_provider(provider))
+
+        _, (_, mechanism, token), _ = _execute.mock_calls[0]
+        self.assertIsInstance(mechanism, sasl.CachingSCRAM)
+        self.assertIs(mechanism._key_cache, key_cache)
+        self.assertEqual(mechanism._account, self.client_jid.bare())
+        self.assertEqual(token[0], "SCRAM-SHA-1")
+
+    def test_uses_plain_scram_without_scram_key_cache(self):
+        self.mechanisms.mechanisms.extend([
+            security_layer.SASLMechanism(name="SCRAM-SHA-1"),
+        ])
+
+        provider = security_layer.PasswordSASLProvider(
+            self._password_provider_wrapper,
+        )
+
+        with unittest.mock.patch.object(
+                provider, "_execute",
+                new=CoroutineMock()) as _execute:
+            _execute.return_value = True
+            self.assertTrue(self._test_provider(provider))
+
+        _, (_, mechanism, _), _ = _execute.mock_calls[0]
+        self.assertIs(type(mechanism), aiosasl.SCRAM)
+
     def test_fail_if_out_of_mechanisms(self):
         self.mechanisms.mechanisms.extend([
             security_layer.SASLMechanism(name="SCRAM-SHA-1"),
@@ -2172,6 +2281,288 @@ class TestSTARTTLSProvider(unittest.TestCase):
         )
 
 
+class TestTLSContextCache(unittest.TestCase):
+    class Verifier(security_layer.PKIXCertificateVerifier):
+        pass
+
+    class OtherVerifier(security_layer.CertificateVerifier):
+        def verify_callback(self, *args):
+            return True
+
+        @asyncio.coroutine
+        def post_handshake(self, transport):
+            pass
+
+    def setUp(self):
+        self.ssl_context_factory = unittest.mock.Mock()
+        self.ssl_context_factory.side_effect = \
+            lambda: unittest.mock.Mock(["set_verify", "set_info_callback",
+                                        "get_verify_mode",
+                                        "set_default_verify_paths"])
+        self.c = security_layer.TLSContextCache(
+            self.ssl_context_factory,
+            session_ttl=10,
+            max_sessions=2,
+        )
+
+    def tearDown(self):
+        del self.c
+
+    def _make_transport(self, server_hostname="example.com"):
+        transport = unittest.mock.Mock(["get_extra_info"])
+        extra = {
+            "server_hostname": server_hostname,
+            "peer_hostname": "xmpp." + server_hostname,
+        }
+        transport.get_extra_info.side_effect = extra.get
+        return transport
+
+    def _make_conn(self, transport, session=None):
+        conn = unittest.mock.Mock()
+        conn.get_app_data.return_value = transport
+        conn.get_session.return_value = session
+        return conn
+
+    def _info_callback(self, ctx):
+        (callback,), _ = ctx.set_info_callback.call_args
+        return callback
+
+    def test_default_factory(self):
+        with unittest.mock.patch(
+                "aioxmpp.security_layer.default_ssl_context"
+        ) as default_ssl_context:
+            c = security_layer.TLSContextCache()
+            result = c()
+        default_ssl_context.assert_called_once_with()
+        self.assertEqual(result, default_ssl_context())
+
+    def test_call_returns_fresh_context(self):
+        ctx1 = self.c()
+        ctx2 = self.c()
+        self.assertIsNot(ctx1, ctx2)
+        self.assertEqual(self.ssl_context_factory.call_count, 2)
+
+    def test_get_context_creates_and_configures_context(self):
+        verifier = self.Verifier()
+        transport = self._make_transport()
+
+        ctx = self.c.get_context(verifier, transport)
+
+        self.ssl_context_factory.assert_called_once_with()
+        self.assertIs(verifier.transport, transport)
+        ctx.set_default_verify_paths.assert_called_once_with()
+        self.assertEqual(
+            ctx.set_verify.mock_calls[-1],
+            unittest.mock.call(ctx.get_verify_mode(),
+                               self.c._verify_callback),
+        )
+        ctx.set_info_callback.assert_called_once_with(unittest.mock.ANY)
+
+    def test_get_context_reuses_context_per_verifier_class(self):
+        verifier1 = self.Verifier()
+        verifier2 = self.Verifier()
+        transport1 = self._make_transport()
+        transport2 = self._make_transport()
+
+        ctx1 = self.c.get_context(verifier1, transport1)
+
+        with unittest.mock.patch.object(
+                verifier2, "setup_context") as setup_context:
+            ctx2 = self.c.get_context(verifier2, transport2)
+
+        self.assertIs(ctx1, ctx2)
+        self.ssl_context_factory.assert_called_once_with()
+        setup_context.assert_not_called()
+        self.assertIs(verifier2.transport, transport2)
+
+        ctx3 = self.c.get_context(self.OtherVerifier(), transport2)
+        self.assertIsNot(ctx1, ctx3)
+
+    def test_verify_callback_dispatches_to_verifier_of_connection(self):
+        verifier1 = self.Verifier()
+        verifier2 = self.Verifier()
+        transport1 = self._make_transport()
+        transport2 = self._make_transport()
+
+        self.c.get_context(verifier1, transport1)
+        self.c.get_context(verifier2, transport2)
+
+        with contextlib.ExitStack() as stack:
+            verify_callback1 = stack.enter_context(
+                unittest.mock.patch.object(verifier1, "verify_callback")
+            )
+            verify_callback2 = stack.enter_context(
+                unittest.mock.patch.object(verifier2, "verify_callback")
+            )
+
+            conn = self._make_conn(transport2)
+            result = self.c._verify_callback(
+                conn,
+                unittest.mock.sentinel.x509,
+                0, 0, True,
+            )
+
+        verify_callback1.assert_not_called()
+        verify_callback2.assert_called_once_with(
+            conn,
+            unittest.mock.sentinel.x509,
+            0, 0, True,
+        )
+        self.assertEqual(result, verify_callback2())
+
+    def test_verify_callback_fails_for_unknown_connection(self):
+        conn = self._make_conn(self._make_transport())
+        self.assertFalse(
+            self.c._verify_callback(conn, unittest.mock.sentinel.x509,
+                                    0, 0, True)
+        )
+
+    def test_session_is_stored_and_offered(self):
+        transport1 = self._make_transport()
+        ctx = self.c.get_context(self.Verifier(), transport1)
+        info_callback = self._info_callback(ctx)
+
+        conn1 = self._make_conn(transport1)
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn1.set_session.assert_not_called()
+
+        conn1.get_session.return_value = unittest.mock.sentinel.session
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1)
+
+        transport2 = self._make_transport()
+        self.c.get_context(self.Verifier(), transport2)
+        conn2 = self._make_conn(transport2)
+        info_callback(conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn2.set_session.assert_called_once_with(
+            unittest.mock.sentinel.session
+        )
+
+    def test_session_updated_on_successful_connect_exit(self):
+        transport1 = self._make_transport()
+        ctx = self.c.get_context(self.Verifier(), transport1)
+        info_callback = self._info_callback(ctx)
+
+        conn1 = self._make_conn(transport1, unittest.mock.sentinel.session)
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_CONNECT_EXIT, -1)
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_CONNECT_LOOP, 1)
+
+        transport2 = self._make_transport()
+        self.c.get_context(self.Verifier(), transport2)
+        conn2 = self._make_conn(transport2)
+        info_callback(conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn2.set_session.assert_not_called()
+
+        conn1.get_session.return_value = unittest.mock.sentinel.ticket
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_CONNECT_EXIT, 1)
+
+        info_callback(conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn2.set_session.assert_called_once_with(
+            unittest.mock.sentinel.ticket
+        )
+
+    def test_session_not_offered_to_other_server(self):
+        transport1 = self._make_transport("a.example")
+        ctx = self.c.get_context(self.Verifier(), transport1)
+        info_callback = self._info_callback(ctx)
+
+        conn1 = self._make_conn(transport1, unittest.mock.sentinel.session)
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1)
+
+        transport2 = self._make_transport("b.example")
+        self.c.get_context(self.Verifier(), transport2)
+        conn2 = self._make_conn(transport2)
+        info_callback(conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn2.set_session.assert_not_called()
+
+    def test_session_not_offered_on_renegotiation(self):
+        transport = self._make_transport()
+        ctx = self.c.get_context(self.Verifier(), transport)
+        info_callback = self._info_callback(ctx)
+
+        conn = self._make_conn(transport, unittest.mock.sentinel.session)
+        info_callback(conn, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1)
+        info_callback(conn, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn.set_session.assert_not_called()
+
+    def test_session_expires(self):
+        transport1 = self._make_transport()
+        ctx = self.c.get_context(self.Verifier(), transport1)
+        info_callback = self._info_callback(ctx)
+
+        with unittest.mock.patch("time.monotonic") as monotonic:
+            monotonic.return_value = 100
+            conn1 = self._make_conn(transport1,
+                                    unittest.mock.sentinel.session)
+            info_callback(conn1, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1)
+
+            transport2 = self._make_transport()
+            self.c.get_context(self.Verifier(), transport2)
+            conn2 = self._make_conn(transport2)
+
+            monotonic.return_value = 110
+            info_callback(conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+
+        conn2.set_session.assert_not_called()
+
+    def test_no_sessions_without_resumption_support(self):
+        transport1 = self._make_transport()
+        ctx = self.c.get_context(self.OtherVerifier(), transport1)
+        info_callback = self._info_callback(ctx)
+
+        conn1 = self._make_conn(transport1, unittest.mock.sentinel.session)
+        info_callback(conn1, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1)
+
+        transport2 = self._make_transport()
+        self.c.get_context(self.OtherVerifier(), transport2)
+        conn2 = self._make_conn(transport2)
+        info_callback(conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn2.set_session.assert_not_called()
+
+    def test_sessions_not_shared_between_verifier_classes(self):
+        transport1 = self._make_transport()
+        ctx1 = self.c.get_context(self.Verifier(), transport1)
+        conn1 = self._make_conn(transport1, unittest.mock.sentinel.session)
+        self._info_callback(ctx1)(
+            conn1, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1,
+        )
+
+        transport2 = self._make_transport()
+        verifier2 = security_layer._NullVerifier()
+        ctx2 = self.c.get_context(verifier2, transport2)
+        conn2 = self._make_conn(transport2)
+        self._info_callback(ctx2)(
+            conn2, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1,
+        )
+        conn2.set_session.assert_not_called()
+
+    def test_clear(self):
+        transport = self._make_transport()
+        ctx1 = self.c.get_context(self.Verifier(), transport)
+        conn = self._make_conn(transport, unittest.mock.sentinel.session)
+        self._info_callback(ctx1)(conn, OpenSSL.SSL.SSL_CB_HANDSHAKE_DONE, 1)
+
+        self.c.clear()
+
+        transport = self._make_transport()
+        ctx2 = self.c.get_context(self.Verifier(), transport)
+        self.assertIsNot(ctx1, ctx2)
+        conn = self._make_conn(transport)
+        self._info_callback(ctx2)(conn, OpenSSL.SSL.SSL_CB_HANDSHAKE_START, 1)
+        conn.set_session.assert_not_called()
+
+
+class Testdefault_tls_context_cache(unittest.TestCase):
+    def test_returns_process_wide_cache(self):
+        self.assertIsInstance(
+            security_layer.default_tls_context_cache(),
+            security_layer.TLSContextCache,
+        )
+        self.assertIs(
+            security_layer.default_tls_context_cache(),
+            security_layer.default_tls_context_cache(),
+        )
+
+
 class Testsecurity_layer(unittest.TestCase):
     def test_sanity_checks_on_providers(self):
         with self.assertRaises(AttributeError):
@@ -2716,6 +3107,43 @@ class Testmake(unittest.TestCase):
             SecurityLayer(),
         )
 
+    def test_tls_context_cache(self):
+        with contextlib.ExitStack() as stack:
+            SecurityLayer = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.SecurityLayer"
+                )
+            )
+
+            PasswordSASLProvider = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.PasswordSASLProvider"
+                )
+            )
+
+            PKIXCertificateVerifier = stack.enter_context(
+                unittest.mock.patch(
+                    "aioxmpp.security_layer.PKIXCertificateVerifier"
+                )
+            )
+
+            result = security_layer.make(
+                unittest.mock.sentinel.password_provider,
+                tls_context_cache=unittest.mock.sentinel.tls_context_cache,
+            )
+
+        SecurityLayer.assert_called_with(
+            unittest.mock.sentinel.tls_context_cache,
+            PKIXCertificateVerifier,
+            True,
+            (PasswordSASLProvider(),)
+        )
+
+        self.assertEqual(
+            result,
+            SecurityLayer(),
+        )
+
     def test_anonymous_and_password_provider(self):
         with contextlib.ExitStack() as stack:
             SecurityLayer = stack.enter_context(
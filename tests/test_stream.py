@@ -182,6 +182,10 @@ class TestStanzaStream(StanzaStreamTestBase):
             timedelta(seconds=15),
             self.stream.ping_opportunistic_interval
         )
+        self.assertEqual(
+            1,
+            self.stream.incoming_batch_size
+        )
 
     def test_init_local_jid(self):
         self.assertEqual(
@@ -1268,6 +1272,68 @@ class TestStanzaStream(StanzaStreamTestBase):
 
         self.assertFalse(cb.mock_calls)
 
+    def test_process_incoming_bulk_respects_batch_size(self):
+        entries = [
+            (make_test_presence(), None)
+            for i in range(5)
+        ]
+        for entry in entries[1:]:
+            self.stream._incoming_queue.put_nowait(entry)
+
+        self.stream.incoming_batch_size = 3
+
+        with unittest.mock.patch.object(
+                self.stream,
+                "_process_incoming") as process_incoming:
+            self.stream._process_incoming_bulk(
+                unittest.mock.sentinel.xmlstream,
+                entries[0],
+            )
+
+        self.assertSequenceEqual(
+            process_incoming.mock_calls,
+            [
+                unittest.mock.call(unittest.mock.sentinel.xmlstream, entry)
+                for entry in entries[:3]
+            ]
+        )
+        self.assertEqual(len(self.stream._incoming_queue), 2)
+
+    def test_process_incoming_bulk_stops_on_empty_queue(self):
+        entry = (make_test_presence(), None)
+        self.stream.incoming_batch_size = 10
+
+        with unittest.mock.patch.object(
+                self.stream,
+                "_process_incoming") as process_incoming:
+            self.stream._process_incoming_bulk(
+                unittest.mock.sentinel.xmlstream,
+                entry,
+            )
+
+        self.assertSequenceEqual(
+            process_incoming.mock_calls,
+            [
+                unittest.mock.call(unittest.mock.sentinel.xmlstream, entry),
+            ]
+        )
+
+    def test_bulk_processing_keeps_order(self):
+        received = []
+        self.stream.on_presence_received.connect(received.append)
+        self.stream.incoming_batch_size = 10
+
+        presences = [make_test_presence() for i in range(25)]
+
+        self.stream.start(self.xmlstream)
+        for pres in presences:
+            self.stream.recv_stanza(pres)
+
+        run_coroutine(asyncio.sleep(0))
+        run_coroutine(asyncio.sleep(0))
+
+        self.assertSequenceEqual(received, presences)
+
     def test_rescue_unprocessed_incoming_stanza_on_stop(self):
         pres = make_test_presence()
 
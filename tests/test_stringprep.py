@@ -20,6 +20,9 @@
 #
 ########################################################################
 import unittest
+import unittest.mock
+
+import aioxmpp.stringprep as stringprep
 
 from aioxmpp.stringprep import (
     nodeprep, resourceprep, nameprep,
@@ -223,3 +226,179 @@ class TestResourceprep(unittest.TestCase):
         self.assertEqual(
             "\u0221",
             resourceprep("\u0221", allow_unassigned=True))
+
+
+class TestASCIIFastPath(unittest.TestCase):
+    PRINTABLE_ASCII = [chr(i) for i in range(0x20, 0x7f)]
+
+    def setUp(self):
+        self._clear_caches()
+
+    def tearDown(self):
+        self._clear_caches()
+
+    def _clear_caches(self):
+        stringprep._nodeprep.cache_clear()
+        stringprep._nameprep.cache_clear()
+        stringprep._resourceprep.cache_clear()
+
+    def _run(self, func, s):
+        try:
+            return func(s)
+        except ValueError as exc:
+            return str(exc)
+
+    def _check_profile(self, func):
+        inputs = self.PRINTABLE_ASCII + [
+            "".join(self.PRINTABLE_ASCII),
+            "Juliet",
+            "example.TEST",
+            "",
+        ]
+
+        fast = [self._run(func, s) for s in inputs]
+        self._clear_caches()
+        with unittest.mock.patch(
+                "aioxmpp.stringprep._is_printable_ascii",
+                new=lambda s: None):
+            slow = [self._run(func, s) for s in inputs]
+
+        self.assertSequenceEqual(fast, slow)
+
+    def test_nodeprep_matches_tables(self):
+        self._check_profile(nodeprep)
+
+    def test_nameprep_matches_tables(self):
+        self._check_profile(nameprep)
+
+    def test_resourceprep_matches_tables(self):
+        self._check_profile(resourceprep)
+
+    def test_results_are_cached(self):
+        nodeprep("\u00aaFoo")
+        nodeprep("\u00aaFoo")
+        info = stringprep._nodeprep.cache_info()
+        self.assertEqual(info.hits, 1)
+        self.assertEqual(info.misses, 1)
+
+    def test_cache_distinguishes_allow_unassigned(self):
+        self.assertEqual(nodeprep("\u0221", allow_unassigned=True),
+                         "\u0221")
+        with self.assertRaises(ValueError):
+            nodeprep("\u0221")
+
+
+class TestTableEngine(unittest.TestCase):
+    SAMPLE = "".join(
+        chr(cp)
+        for start, end in [
+                (0x0000, 0x0400),
+                (0x0590, 0x0700),
+                (0x1800, 0x1810),
+                (0x2000, 0x2100),
+                (0x3000, 0x3010),
+                (0xd7f0, 0xe010),
+                (0xfdc0, 0xfe10),
+                (0xfff0, 0x10000),
+                (0x1fff0, 0x20000),
+                (0xe0000, 0xe0080),
+        ]
+        for cp in range(start, end)
+    )
+
+    NODEPREP_TABLES = (
+        stringprep.stringprep.in_table_c11,
+        stringprep.stringprep.in_table_c21,
+    ) + stringprep._COMMON_PROHIBITED_TABLES + (
+        lambda x: x in stringprep._nodeprep_prohibited,
+    )
+
+    RESOURCEPREP_TABLES = (
+        stringprep.stringprep.in_table_c21,
+    ) + stringprep._COMMON_PROHIBITED_TABLES
+
+    NAMEPREP_TABLES = stringprep._COMMON_PROHIBITED_TABLES
+
+    def setUp(self):
+        self._clear_caches()
+
+    def tearDown(self):
+        self._clear_caches()
+
+    def _clear_caches(self):
+        stringprep._nodeprep.cache_clear()
+        stringprep._nameprep.cache_clear()
+        stringprep._resourceprep.cache_clear()
+
+    def _map_b1(self, chars):
+        chars[:] = [
+            c for c in chars
+            if not stringprep.stringprep.in_table_b1(c)
+        ]
+
+    def _map_b1_b2(self, chars):
+        self._map_b1(chars)
+        chars[:] = list("".join(map(stringprep.stringprep.map_table_b2,
+                                    chars)))
+
+    def _reference(self, s, allow_unassigned, mapping, tables):
+        chars = list(s)
+        mapping(chars)
+        stringprep.do_normalization(chars)
+        stringprep.check_prohibited_output(chars, tables)
+        stringprep.check_bidi(chars)
+        if not allow_unassigned:
+            stringprep.check_unassigned(chars, None)
+        return "".join(chars)
+
+    def _run(self, func, *args):
+        try:
+            return func(*args)
+        except ValueError as exc:
+            return str(exc)
+
+    def _check_profile(self, func, mapping, tables):
+        for allow_unassigned in [False, True]:
+            for c in self.SAMPLE:
+                self.assertEqual(
+                    self._run(func, c, allow_unassigned),
+                    self._run(self._reference,
+                              c, allow_unassigned, mapping, tables),
+                    "U+{:04x}".format(ord(c)),
+                )
+
+    def test_nodeprep_matches_reference(self):
+        self._check_profile(nodeprep, self._map_b1_b2, self.NODEPREP_TABLES)
+
+    def test_resourceprep_matches_reference(self):
+        self._check_profile(resourceprep, self._map_b1,
+                            self.RESOURCEPREP_TABLES)
+
+    def test_nameprep_matches_reference(self):
+        self._check_profile(nameprep, self._map_b1_b2, self.NAMEPREP_TABLES)
+
+    def test_reports_first_prohibited_character(self):
+        with self.assertRaisesRegex(ValueError, r"U\+0007"):
+            resourceprep("\u00e4\u0221\u0007\u200e")
+
+    def test_prohibited_characters_are_checked_after_normalisation(self):
+        # EN QUAD normalises to SPACE (C.1.1), which only nodeprep prohibits
+        with self.assertRaisesRegex(ValueError, r"U\+0020"):
+            nodeprep("\u00e4\u2000")
+        self.assertEqual(resourceprep("\u00e4\u2000"), "\u00e4 ")
+
+    def test_bidi(self):
+        self.assertEqual(resourceprep("\u05d0\u05d1"), "\u05d0\u05d1")
+        with self.assertRaisesRegex(ValueError, "L and R/AL"):
+            resourceprep("\u05d0a\u05d1")
+        with self.assertRaisesRegex(ValueError, "start and end"):
+            resourceprep("1\u05d0")
+        with self.assertRaisesRegex(ValueError, "start and end"):
+            resourceprep("\u05d01")
+
+    def test_blocks_are_loaded_on_demand(self):
+        with unittest.mock.patch.dict(stringprep._blocks, clear=True):
+            nodeprep("\u00e4")
+            self.assertSetEqual(set(stringprep._blocks), {0})
+            nodeprep("\u0430")
+            self.assertSetEqual(set(stringprep._blocks), {0, 4})
@@ -533,6 +533,28 @@ class TestJID(unittest.TestCase):
                                 strict=False)
         )
 
+    def test_fromstr_returns_cached_object(self):
+        j1 = structs.JID.fromstr("cache@example.test/res")
+        j2 = structs.JID.fromstr("cache@example.test/res")
+        self.assertIs(j1, j2)
+
+    def test_fromstr_cache_distinguishes_strict(self):
+        j1 = structs.JID.fromstr("\U0001f601@example.test", strict=False)
+        with self.assertRaises(ValueError):
+            structs.JID.fromstr("\U0001f601@example.test")
+        j2 = structs.JID.fromstr("\U0001f601@example.test", strict=False)
+        self.assertIs(j1, j2)
+
+    def test_fromstr_cache_distinguishes_subclasses(self):
+        class Subclass(structs.JID):
+            __slots__ = []
+
+        j1 = structs.JID.fromstr("cache@example.test")
+        j2 = Subclass.fromstr("cache@example.test")
+        self.assertIsInstance(j2, Subclass)
+        self.assertNotIsInstance(j1, Subclass)
+        self.assertEqual(j1, j2)
+
     def test_reject_empty_localpart(self):
         with self.assertRaises(ValueError):
             structs.JID("", "bar.baz", None)
@@ -30,6 +30,8 @@ import lxml.sax
 import xml.sax as xml_sax
 import xml.sax.handler as saxhandler
 
+import aioxmpp.disco.xso as disco_xso
+import aioxmpp.stanza as stanza
 import aioxmpp.xml as xml
 import aioxmpp.structs as structs
 import aioxmpp.errors as errors
@@ -90,6 +92,20 @@ class TestxmlValidateNameValue_str(unittest.TestCase):
         self.assertFalse(xml.xmlValidateNameValue_str("foo<"))
 
 
+class Testis_valid_cdata_str(unittest.TestCase):
+    def test_accepts_text(self):
+        self.assertTrue(xml.is_valid_cdata_str("foo bar\tbaz\r\nfnord"))
+        self.assertTrue(xml.is_valid_cdata_str(""))
+        self.assertTrue(xml.is_valid_cdata_str("\u00e4\U0001f600"))
+
+    def test_rejects_control_characters(self):
+        for i in list(range(0, 9)) + [11, 12] + list(range(14, 32)):
+            self.assertFalse(
+                xml.is_valid_cdata_str("foo" + chr(i) + "bar"),
+                i
+            )
+
+
 class TestXMPPXMLGenerator(XMLTestCase):
     def setUp(self):
         self.buf = io.BytesIO()
@@ -1166,6 +1182,75 @@ class TestXMPPXMLGenerator(XMLTestCase):
             buf.getvalue(),
         )
 
+    def test_unparse_direct(self):
+        gen = xml.XMPPXMLGenerator(self.buf)
+        gen.startDocument()
+        gen.startElementNS(("uri:foo", "foo"), None, {})
+        gen.flush()
+        written = self.buf.getvalue()
+
+        self.assertTrue(gen.unparse_direct(Cls()))
+        self.assertEqual(self.buf.getvalue(),
+                         written + b'<bar/>')
+
+        gen.endElementNS(("uri:foo", "foo"), None)
+        self.assertEqual(self.buf.getvalue(),
+                         written + b'<bar/></foo>')
+
+    def test_unparse_direct_flushes(self):
+        out = unittest.mock.Mock()
+        gen = xml.XMPPXMLGenerator(out)
+        gen.startElementNS(("uri:foo", "foo"), None, {})
+        gen.flush()
+        out.reset_mock()
+
+        self.assertTrue(gen.unparse_direct(Cls()))
+
+        self.assertSequenceEqual(
+            out.mock_calls,
+            [
+                unittest.mock.call.write(b'<bar/>'),
+                unittest.mock.call.flush(),
+            ]
+        )
+
+    def test_unparse_direct_refuses_with_pending_state(self):
+        gen = xml.XMPPXMLGenerator(self.buf)
+        gen.startElementNS(("uri:foo", "foo"), None, {})
+        self.assertFalse(gen.unparse_direct(Cls()))
+        gen.flush()
+
+        gen.startPrefixMapping("x", "uri:x")
+        self.assertFalse(gen.unparse_direct(Cls()))
+
+        with gen.buffer():
+            self.assertFalse(gen.unparse_direct(Cls()))
+
+        self.assertEqual(self.buf.getvalue(), b'<foo xmlns="uri:foo">')
+
+    def test_unparse_direct_writes_nothing_on_error(self):
+        class Cls(xso.XSO):
+            TAG = ("uri:foo", "foo")
+
+            text = xso.Text()
+
+        obj = Cls()
+        obj.text = "foo\0"
+
+        gen = xml.XMPPXMLGenerator(self.buf)
+        self.assertFalse(gen.unparse_direct(obj))
+        self.assertEqual(self.buf.getvalue(), b"")
+
+    def test_unparse_direct_refuses_prefixed_namespaces(self):
+        gen = xml.XMPPXMLGenerator(self.buf)
+        gen.startPrefixMapping("x", "uri:foo")
+        gen.startElementNS(("uri:foo", "foo"), None, {})
+        gen.flush()
+        written = self.buf.getvalue()
+
+        self.assertFalse(gen.unparse_direct(Cls()))
+        self.assertEqual(self.buf.getvalue(), written)
+
     def test_attributes_in_ns_get_prefix_even_if_ns_matches_default(self):
         gen = xml.XMPPXMLGenerator(self.buf, sorted_attributes=True)
         gen.startDocument()
@@ -1410,6 +1495,165 @@ class TestXMLStreamWriter(unittest.TestCase):
             b'</stream:stream>',
             self.buf.getvalue())
 
+    def test_send_uses_direct_serialisation(self):
+        m = stanza.Message(type_=structs.MessageType.CHAT,
+                           to=self.TEST_FROM)
+        m.body[None] = "foo <&>"
+        m.body[structs.LanguageTag.fromstr("de")] = "bar"
+
+        gen = self._make_gen(nsmap={None: "jabber:client"})
+        gen.start()
+        with unittest.mock.patch.object(xml.XMPPXMLGenerator,
+                                        "buffer") as buffer_:
+            gen.send(m)
+        buffer_.assert_not_called()
+        gen.close()
+
+        self.assertEqual(
+            b'<?xml version="1.0"?>'
+            b'<stream:stream xmlns="jabber:client" '
+            b'xmlns:stream="http://etherx.jabber.org/streams" '
+            b'to="'+str(self.TEST_TO).encode("utf-8")+b'" '
+            b'version="1.0">'
+            b'<message to="foo@example.test" type="chat">'
+            b'<body>foo &lt;&amp;&gt;</body>'
+            b'<body xml:lang="de">bar</body>'
+            b'</message>'
+            b'</stream:stream>',
+            self.buf.getvalue())
+
+    def test_direct_serialisation_matches_generator(self):
+        class Child(xso.XSO):
+            TAG = ("uri:bar", "child")
+
+            attr = xso.Attr("a", default=None)
+            text = xso.Text(default=None)
+
+        class Parent(xso.XSO):
+            TAG = ("jabber:client", "parent")
+            DECLARE_NS = {}
+
+            children = xso.ChildList([Child])
+            text = xso.ChildText(("jabber:client", "text"), default=None)
+
+        objs = []
+
+        obj = Parent()
+        objs.append(obj)
+
+        obj = Parent()
+        obj.text = ""
+        obj.children.append(Child())
+        objs.append(obj)
+
+        obj = Parent()
+        obj.text = "foo"
+        child = Child()
+        child.attr = "\"'<>"
+        child.text = "foo"
+        obj.children.append(child)
+        objs.append(obj)
+
+        for obj in objs:
+            buf = io.BytesIO()
+            direct = xml.XMPPXMLGenerator(buf)
+            direct.startPrefixMapping(None, "jabber:client")
+            direct.startElementNS(("uri:foo", "stream"), None, {})
+            direct.flush()
+            buf.seek(0)
+            buf.truncate()
+            self.assertTrue(direct.unparse_direct(obj))
+
+            gen = xml.XMPPXMLGenerator(self.buf)
+            gen.startPrefixMapping(None, "jabber:client")
+            gen.startElementNS(("uri:foo", "stream"), None, {})
+            gen.flush()
+            self.buf.seek(0)
+            self.buf.truncate()
+            obj.unparse_to_sax(gen)
+            gen.flush()
+
+            self.assertEqual(self.buf.getvalue(), buf.getvalue())
+
+    def test_send_falls_back_for_namespaced_attributes(self):
+        class Cls(xso.XSO):
+            TAG = ("uri:foo", "foo")
+
+            attr = xso.Attr(("uri:bar", "a"))
+
+        obj = Cls()
+        obj.attr = "x"
+
+        gen = self._make_gen()
+        gen.start()
+        gen.send(obj)
+        gen.close()
+
+        self.assertEqual(
+            b'<?xml version="1.0"?>' +
+            self.STREAM_HEADER +
+            b'<foo xmlns="uri:foo" xmlns:ns0="uri:bar" ns0:a="x"/>'
+            b'</stream:stream>',
+            self.buf.getvalue())
+
+    def test_send_passthrough_object(self):
+        class Cls(xso.XSO):
+            TAG = ("uri:foo", "foo")
+
+            text = xso.Text(default=None)
+
+        results = []
+        parser = xso.XSOParser(passthrough=True)
+        parser.add_class(Cls, results.append)
+        lxml.sax.saxify(
+            etree.fromstring(
+                "<foo xmlns='uri:foo' unknown='x'>text"
+                "<bar xmlns='uri:bar' a='b'/></foo>"
+            ),
+            xso.SAXDriver(parser),
+        )
+        obj, = results
+
+        gen = self._make_gen()
+        gen.start()
+        gen.send(obj)
+        obj.text = "changed"
+        gen.send(obj)
+        gen.close()
+
+        self.assertEqual(
+            b'<?xml version="1.0"?>' +
+            self.STREAM_HEADER +
+            b'<foo xmlns="uri:foo" unknown="x">text'
+            b'<bar xmlns="uri:bar" a="b"/></foo>'
+            b'<foo xmlns="uri:foo">changed</foo>'
+            b'</stream:stream>',
+            self.buf.getvalue())
+
+    def test_send_passthrough_iq_after_payload_read(self):
+        results = []
+        parser = xso.XSOParser(passthrough=True)
+        parser.add_class(stanza.IQ, results.append)
+        lxml.sax.saxify(
+            etree.fromstring(
+                "<iq xmlns='jabber:client' type='get' id='x' unknown='y'>"
+                "<query xmlns='http://jabber.org/protocol/disco#info'/></iq>"
+            ),
+            xso.SAXDriver(parser),
+        )
+        iq, = results
+        # this is what the stanza stream does to route the IQ
+        self.assertIsInstance(iq.payload, disco_xso.InfoQuery)
+
+        gen = self._make_gen()
+        gen.start()
+        gen.send(iq)
+        gen.close()
+
+        self.assertIn(
+            b' unknown="y"',
+            self.buf.getvalue())
+
     def test_close_is_idempotent(self):
         obj = Cls()
         gen = self._make_gen()
@@ -1995,6 +2239,122 @@ class TestXMPPXMLProcessor(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.proc.endElementNS((None, "foo"), None)
 
+    def _make_collecting_parser(self):
+        class Foo(xso.XSO):
+            TAG = ("uri:foo", "foo")
+
+            text = xso.Text(default=None)
+            children = xso.Collector()
+
+        parser = xso.XSOParser()
+        parser.add_class(Foo, unittest.mock.Mock())
+        return parser
+
+    def _start_limited_stream(self, **kwargs):
+        self.proc.limits = xml.StanzaLimits(**kwargs)
+        self.proc.stanza_parser = self._make_collecting_parser()
+        self.parser.feed(self.VALID_STREAM_HEADER)
+
+    def test_limits_default_to_none(self):
+        self.assertIsNone(self.proc.limits)
+
+    def test_in_stanza_and_stream_level_events(self):
+        self.proc.stanza_parser = self._make_collecting_parser()
+        self.assertFalse(self.proc.in_stanza)
+        self.assertEqual(self.proc.stream_level_events, 0)
+        self.parser.feed(self.VALID_STREAM_HEADER)
+        self.assertFalse(self.proc.in_stanza)
+        self.assertEqual(self.proc.stream_level_events, 1)
+        self.parser.feed("<foo xmlns='uri:foo'><bar/>text")
+        self.assertTrue(self.proc.in_stanza)
+        self.assertEqual(self.proc.stream_level_events, 1)
+        self.parser.feed("</foo>")
+        self.assertFalse(self.proc.in_stanza)
+        self.assertEqual(self.proc.stream_level_events, 2)
+        self.parser.feed(" <foo xmlns='uri:foo'/>")
+        self.assertFalse(self.proc.in_stanza)
+        self.assertEqual(self.proc.stream_level_events, 4)
+
+    def test_incomplete_start_tag_is_not_a_stream_level_event(self):
+        self.proc.stanza_parser = self._make_collecting_parser()
+        self.parser.feed(self.VALID_STREAM_HEADER)
+        self.parser.feed("<foo xmlns='uri:foo' a='")
+        self.parser.feed("x" * 1024)
+        self.assertEqual(self.proc.stream_level_events, 1)
+
+    def test_depth_limit(self):
+        self._start_limited_stream(max_depth=3)
+        self.parser.feed("<foo xmlns='uri:foo'><a><b></b></a></foo>")
+        with self.assertRaises(errors.StreamError) as cm:
+            self.parser.feed("<foo xmlns='uri:foo'><a><b><c>")
+        self.assertEqual(
+            (namespaces.streams, "policy-violation"),
+            cm.exception.condition
+        )
+        self.assertEqual(self.proc.limits.violations["depth"], 1)
+
+    def test_depth_limit_enforced_during_exception_backoff(self):
+        self.proc.on_exception = unittest.mock.Mock()
+        self.proc.limits = xml.StanzaLimits(max_depth=2)
+        self.proc.stanza_parser = unittest.mock.Mock()
+        self.proc.startDocument()
+        self.proc.startElementNS(self.STREAM_HEADER_TAG,
+                                 None,
+                                 self.STREAM_HEADER_ATTRS)
+        with unittest.mock.patch.object(
+                xso.SAXDriver, "startElementNS",
+                side_effect=ValueError()):
+            self.proc.startElementNS((None, "foo"), None, {})
+            self.proc.startElementNS((None, "bar"), None, {})
+            with self.assertRaises(errors.StreamError) as cm:
+                self.proc.startElementNS((None, "baz"), None, {})
+        self.assertEqual(
+            (namespaces.streams, "policy-violation"),
+            cm.exception.condition
+        )
+
+    def test_attributes_limit(self):
+        self._start_limited_stream(max_attributes=2)
+        self.parser.feed("<foo xmlns='uri:foo' a='1' b='2'/>")
+        with self.assertRaises(errors.StreamError) as cm:
+            self.parser.feed("<foo xmlns='uri:foo'><bar a='1' b='2' c='3'/>")
+        self.assertEqual(
+            (namespaces.streams, "policy-violation"),
+            cm.exception.condition
+        )
+        self.assertEqual(self.proc.limits.violations["attributes"], 1)
+
+    def test_text_length_limit_is_per_stanza(self):
+        self._start_limited_stream(max_text_length=10)
+        self.parser.feed("<foo xmlns='uri:foo'><a>01234</a>56789</foo>")
+        self.parser.feed("<foo xmlns='uri:foo'>0123456789</foo>")
+        with self.assertRaises(errors.StreamError) as cm:
+            self.parser.feed("<foo xmlns='uri:foo'><a>01234</a>")
+            self.parser.feed("56789x")
+        self.assertEqual(
+            (namespaces.streams, "policy-violation"),
+            cm.exception.condition
+        )
+        self.assertEqual(self.proc.limits.violations["text_length"], 1)
+
+    def test_text_length_limit_enforced_during_exception_backoff(self):
+        self.proc.on_exception = unittest.mock.Mock()
+        self._start_limited_stream(max_text_length=10)
+        self.parser.feed("<bar xmlns='uri:foo'>01234")
+        with self.assertRaises(errors.StreamError) as cm:
+            self.parser.feed("56789x")
+        self.assertEqual(
+            (namespaces.streams, "policy-violation"),
+            cm.exception.condition
+        )
+        self.assertEqual(self.proc.limits.violations["text_length"], 1)
+
+    def test_text_between_stanzas_is_not_limited(self):
+        self._start_limited_stream(max_text_length=1)
+        self.parser.feed("   \n   ")
+        self.parser.feed("<foo xmlns='uri:foo'>x</foo>")
+        self.assertFalse(self.proc.limits.violations)
+
     # def test_depth_limit(self):
     #     def dummy_parser():
     #         while True:
@@ -2026,6 +2386,50 @@ class TestXMPPXMLProcessor(unittest.TestCase):
         del self.parser
 
 
+class TestXMPPXMLProcessorWithExpatParser(TestXMPPXMLProcessor):
+    def setUp(self):
+        self.proc = xml.XMPPXMLProcessor()
+        self.parser = xml.ExpatParser()
+        self.parser.setContentHandler(self.proc)
+
+
+class TestStanzaLimits(unittest.TestCase):
+    def test_defaults(self):
+        limits = xml.StanzaLimits()
+        self.assertIsNone(limits.max_stanza_bytes)
+        self.assertIsNone(limits.max_depth)
+        self.assertIsNone(limits.max_attributes)
+        self.assertIsNone(limits.max_text_length)
+        self.assertFalse(limits.violations)
+
+    def test_init(self):
+        limits = xml.StanzaLimits(
+            max_stanza_bytes=1,
+            max_depth=2,
+            max_attributes=3,
+            max_text_length=4,
+        )
+        self.assertEqual(limits.max_stanza_bytes, 1)
+        self.assertEqual(limits.max_depth, 2)
+        self.assertEqual(limits.max_attributes, 3)
+        self.assertEqual(limits.max_text_length, 4)
+
+    def test_violation(self):
+        limits = xml.StanzaLimits(max_text_length=4)
+        exc = limits.violation("text_length", 5)
+        self.assertIsInstance(exc, errors.StreamError)
+        self.assertEqual(
+            (namespaces.streams, "policy-violation"),
+            exc.condition
+        )
+        self.assertEqual(
+            exc.text,
+            "stanza exceeds text length limit (5 > 4)"
+        )
+        limits.violation("text_length", 6)
+        self.assertEqual(limits.violations, {"text_length": 2})
+
+
 class Testmake_parser(unittest.TestCase):
     def setUp(self):
         self.p = xml.make_parser()
@@ -2062,6 +2466,172 @@ class Testmake_parser(unittest.TestCase):
         )
 
 
+class TestExpatParser(unittest.TestCase):
+    STREAM_HEADER = (
+        "<stream:stream xmlns:stream='{}' xmlns='jabber:client'>".format(
+            namespaces.xmlstream
+        )
+    )
+
+    def setUp(self):
+        self.handler = unittest.mock.Mock()
+        self.p = xml.ExpatParser()
+        self.p.setContentHandler(self.handler)
+
+    def tearDown(self):
+        del self.p
+        del self.handler
+
+    def test_is_incremental(self):
+        self.assertTrue(
+            hasattr(self.p, "feed")
+        )
+
+    def test_getContentHandler(self):
+        self.assertIs(self.p.getContentHandler(), self.handler)
+
+    def test_start_document_on_first_feed(self):
+        self.p.feed(b"<foo")
+        self.p.feed(b"/>")
+        self.assertSequenceEqual(
+            self.handler.mock_calls[:1],
+            [
+                unittest.mock.call.startDocument(),
+            ]
+        )
+        self.assertEqual(
+            1,
+            self.handler.startDocument.call_count,
+        )
+
+    def test_events(self):
+        self.p.feed(
+            self.STREAM_HEADER.encode("utf-8") +
+            b"<message xml:lang='de' to='foo@bar.example' "
+            b"xmlns:x='uri:x' x:y='z'>"
+            b"<body>foo &amp; bar</body><x:x/></message>"
+        )
+        self.assertSequenceEqual(
+            self.handler.mock_calls,
+            [
+                unittest.mock.call.startDocument(),
+                unittest.mock.call.startElementNS(
+                    (namespaces.xmlstream, "stream"),
+                    None,
+                    {},
+                ),
+                unittest.mock.call.startElementNS(
+                    ("jabber:client", "message"),
+                    None,
+                    {
+                        (namespaces.xml, "lang"): "de",
+                        (None, "to"): "foo@bar.example",
+                        ("uri:x", "y"): "z",
+                    },
+                ),
+                unittest.mock.call.startElementNS(
+                    ("jabber:client", "body"),
+                    None,
+                    {},
+                ),
+                unittest.mock.call.characters("foo & bar"),
+                unittest.mock.call.endElementNS(
+                    ("jabber:client", "body"),
+                    None,
+                ),
+                unittest.mock.call.startElementNS(
+                    ("uri:x", "x"),
+                    None,
+                    {},
+                ),
+                unittest.mock.call.endElementNS(
+                    ("uri:x", "x"),
+                    None,
+                ),
+                unittest.mock.call.endElementNS(
+                    ("jabber:client", "message"),
+                    None,
+                ),
+            ]
+        )
+
+    def test_unnamespaced_element(self):
+        self.p.feed(b"<foo a='b'/>")
+        self.assertSequenceEqual(
+            self.handler.mock_calls,
+            [
+                unittest.mock.call.startDocument(),
+                unittest.mock.call.startElementNS(
+                    (None, "foo"),
+                    None,
+                    {(None, "a"): "b"},
+                ),
+                unittest.mock.call.endElementNS(
+                    (None, "foo"),
+                    None,
+                ),
+            ]
+        )
+
+    def test_reuses_name_tuples(self):
+        self.p.feed(b"<foo xmlns='uri:foo'><bar/><bar/></foo>")
+        first = self.handler.startElementNS.mock_calls[1][1][0]
+        second = self.handler.startElementNS.mock_calls[2][1][0]
+        self.assertEqual(first, ("uri:foo", "bar"))
+        self.assertIs(first, second)
+
+    def test_coalesces_character_data(self):
+        self.p.feed(b"<foo>foo\nbar&amp;baz</foo>")
+        self.handler.characters.assert_called_once_with("foo\nbar&baz")
+
+    def test_reject_comments(self):
+        with self.assertRaises(errors.StreamError) as cm:
+            self.p.feed(b"<foo><!-- bar --></foo>")
+        self.assertEqual(
+            (namespaces.streams, "restricted-xml"),
+            cm.exception.condition
+        )
+
+    def test_reject_dtd(self):
+        with self.assertRaises(errors.StreamError) as cm:
+            self.p.feed(b"<!DOCTYPE foo []><foo/>")
+        self.assertEqual(
+            (namespaces.streams, "restricted-xml"),
+            cm.exception.condition
+        )
+
+    def test_forward_processing_instruction(self):
+        self.p.feed(b"<foo><?foo bar?></foo>")
+        self.handler.processingInstruction.assert_called_once_with(
+            "foo", "bar"
+        )
+
+    def test_undefined_entity_raises_SAXParseException(self):
+        with self.assertRaises(xml_sax.SAXParseException) as cm:
+            self.p.feed(b"<foo>&bar;</foo>")
+        self.assertTrue(
+            cm.exception.getException().args[0].startswith(
+                xml.pyexpat.errors.XML_ERROR_UNDEFINED_ENTITY
+            )
+        )
+        self.assertEqual(cm.exception.getLineNumber(), 1)
+
+    def test_malformed_xml_raises_SAXParseException(self):
+        with self.assertRaises(xml_sax.SAXParseException):
+            self.p.feed(b"<foo></bar>")
+
+    def test_close_calls_endDocument(self):
+        self.p.feed(b"<foo/>")
+        self.p.close()
+        self.handler.endDocument.assert_called_once_with()
+
+    def test_close_raises_on_incomplete_document(self):
+        self.p.feed(b"<foo>")
+        with self.assertRaises(xml_sax.SAXParseException):
+            self.p.close()
+        self.handler.endDocument.assert_not_called()
+
+
 class TestXMPPLexicalHandler(unittest.TestCase):
     def setUp(self):
         self.proc = xml.XMPPLexicalHandler()
@@ -686,6 +686,153 @@ class TestXMLStreamClass(unittest.TestCase):
             Cls.xso_error_handler.mock_calls
         )
 
+    def test_parse_plan_has_incremental_text_parser(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary())
+
+        self.assertEqual(
+            Cls._xso_parse_plan.text_parser_factory,
+            Cls.text.type_.incremental_parser,
+        )
+
+    def test_parse_plan_without_incremental_text_parser(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = "foo"
+
+            text = xso.Text()
+
+        self.assertIsNone(Cls._xso_parse_plan.text_parser_factory)
+
+    def test_parse_feeds_text_to_incremental_parser(self):
+        parser = unittest.mock.Mock()
+        parser.close.return_value = b"fnord"
+
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary())
+
+        with unittest.mock.patch.object(
+                Cls.text.type_, "incremental_parser",
+                return_value=parser):
+            Cls._xso_compile_plans()
+            gen = Cls.parse_events((None, "foo", {}), self.ctx)
+            next(gen)
+            gen.send(("text", "Zm5v"))
+            gen.send(("text", "cmQ="))
+            with self.assertRaises(StopIteration) as ctx:
+                gen.send(("end", ))
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.feed("Zm5v"),
+                unittest.mock.call.feed("cmQ="),
+                unittest.mock.call.close(),
+            ],
+            parser.mock_calls
+        )
+        self.assertEqual(ctx.exception.value.text, b"fnord")
+
+    def test_parse_does_not_close_incremental_parser_without_text(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary(), default=None)
+
+        gen = Cls.parse_events((None, "foo", {}), self.ctx)
+        next(gen)
+        with self.assertRaises(StopIteration) as ctx:
+            gen.send(("end", ))
+
+        self.assertIsNone(ctx.exception.value.text)
+
+    def test_parse_incremental_text(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary())
+
+        gen = Cls.parse_events((None, "foo", {}), self.ctx)
+        next(gen)
+        gen.send(("text", "Zm"))
+        gen.send(("text", "5vc\n"))
+        gen.send(("text", "mQ="))
+        with self.assertRaises(StopIteration) as ctx:
+            gen.send(("end", ))
+
+        self.assertEqual(ctx.exception.value.text, b"fnord")
+
+    def test_call_error_handler_on_broken_incremental_text(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary(max_size=3))
+
+        Cls.xso_error_handler = unittest.mock.MagicMock()
+        Cls.xso_error_handler.return_value = False
+
+        gen = Cls.parse_events((None, "foo", {}), self.ctx)
+        next(gen)
+        with self.assertRaisesRegex(ValueError, "exceeds maximum size"):
+            gen.send(("text", "Zm5vcmQx"))
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call(
+                    Cls.text.xq_descriptor,
+                    "Zm5vcmQx",
+                    unittest.mock.ANY)
+            ],
+            Cls.xso_error_handler.mock_calls
+        )
+
+    def test_error_handler_on_broken_incremental_text_can_suppress(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary(max_size=3),
+                            default=None)
+
+        Cls.xso_error_handler = unittest.mock.MagicMock()
+        Cls.xso_error_handler.return_value = True
+
+        gen = Cls.parse_events((None, "foo", {}), self.ctx)
+        next(gen)
+        gen.send(("text", "Zm5vcmQx"))
+        gen.send(("text", "Zm5vcmQx"))
+        with self.assertRaises(StopIteration) as ctx:
+            gen.send(("end", ))
+
+        self.assertEqual(len(Cls.xso_error_handler.mock_calls), 1)
+        self.assertIsNone(ctx.exception.value.text)
+
+    def test_call_error_handler_on_broken_incremental_text_at_end(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            text = xso.Text(type_=xso.Base64Binary())
+
+        Cls.xso_error_handler = unittest.mock.MagicMock()
+        Cls.xso_error_handler.return_value = False
+
+        gen = Cls.parse_events((None, "foo", {}), self.ctx)
+        next(gen)
+        gen.send(("text", "Zm5vcm"))
+        with self.assertRaises(ValueError):
+            gen.send(("end", ))
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call(
+                    Cls.text.xq_descriptor,
+                    None,
+                    unittest.mock.ANY)
+            ],
+            Cls.xso_error_handler.mock_calls
+        )
+
     def test_error_handler_on_broken_child_can_suppress(self):
         class Bar(xso.XSO):
             TAG = "bar"
@@ -1781,6 +1928,137 @@ class TestXMLStreamClass(unittest.TestCase):
         self.assertIs(ClsA.DECLARE_NS, d)
         self.assertIs(ClsB.DECLARE_NS, d)
 
+    def test_parse_plan(self):
+        class Child(metaclass=xso_model.XMLStreamClass):
+            TAG = (None, "child")
+
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = (None, "foo")
+
+            lang = xso.LangAttr()
+            required = xso.Attr("required")
+            optional = xso.Attr("optional", default=None)
+            with_missing = xso.Attr("with_missing", default=None,
+                                    missing=unittest.mock.sentinel.missing)
+            text = xso.Text()
+            child = xso.Child([Child])
+            collector = xso.Collector()
+
+        plan = Cls._xso_parse_plan
+
+        self.assertIs(plan.attr_map, Cls.ATTR_MAP)
+        self.assertCountEqual(
+            [
+                ((namespaces.xml, "lang"), Cls.lang.xq_descriptor),
+                ((None, "required"), Cls.required.xq_descriptor),
+                ((None, "with_missing"), Cls.with_missing.xq_descriptor),
+            ],
+            plan.missing_attrs,
+        )
+        self.assertIs(plan.lang_prop, Cls.lang.xq_descriptor)
+        self.assertIs(plan.text_prop, Cls.text.xq_descriptor)
+        self.assertIs(plan.child_map, Cls.CHILD_MAP)
+        self.assertIs(plan.collector_prop, Cls.collector.xq_descriptor)
+
+    def test_parse_plan_of_empty_class(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            pass
+
+        plan = Cls._xso_parse_plan
+
+        self.assertSequenceEqual(plan.missing_attrs, ())
+        self.assertIsNone(plan.lang_prop)
+        self.assertIsNone(plan.text_prop)
+        self.assertIsNone(plan.collector_prop)
+
+    def test_parse_plan_is_not_shared_with_subclasses(self):
+        class ClsA(metaclass=xso_model.XMLStreamClass):
+            attr = xso.Attr("foo")
+
+        class ClsB(ClsA):
+            text = xso.Text()
+
+        self.assertIsNone(ClsA._xso_parse_plan.text_prop)
+        self.assertIs(ClsB._xso_parse_plan.text_prop,
+                      ClsB.text.xq_descriptor)
+        self.assertIs(ClsB._xso_parse_plan.attr_map, ClsB.ATTR_MAP)
+
+    def test_setattr_recompiles_parse_plan(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            pass
+
+        Cls.attr = xso.Attr("bar")
+        Cls.text = xso.Text()
+        Cls.collector = xso.Collector()
+
+        plan = Cls._xso_parse_plan
+        self.assertSequenceEqual(
+            [((None, "bar"), Cls.attr.xq_descriptor)],
+            plan.missing_attrs,
+        )
+        self.assertIs(plan.text_prop, Cls.text.xq_descriptor)
+        self.assertIs(plan.collector_prop, Cls.collector.xq_descriptor)
+
+    def test_unparse_plan(self):
+        class Child(metaclass=xso_model.XMLStreamClass):
+            TAG = (None, "child")
+
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            TAG = (None, "foo")
+
+            attr1 = xso.Attr("a1")
+            attr2 = xso.Attr("a2")
+            text = xso.Text()
+            child = xso.Child([Child])
+            child_list = xso.ChildList([])
+            collector = xso.Collector()
+
+        plan = Cls._xso_unparse_plan
+
+        self.assertSequenceEqual(
+            [Cls.attr1.xq_descriptor, Cls.attr2.xq_descriptor],
+            plan.attr_props,
+        )
+        self.assertIs(plan.text_prop, Cls.text.xq_descriptor)
+        self.assertSequenceEqual(
+            [Cls.child.xq_descriptor, Cls.child_list.xq_descriptor],
+            plan.child_props,
+        )
+        self.assertIs(plan.collector_prop, Cls.collector.xq_descriptor)
+
+    def test_setattr_recompiles_unparse_plan(self):
+        class Cls(metaclass=xso_model.XMLStreamClass):
+            pass
+
+        Cls.attr = xso.Attr("bar")
+        Cls.child = xso.ChildList([])
+
+        plan = Cls._xso_unparse_plan
+        self.assertSequenceEqual([Cls.attr.xq_descriptor], plan.attr_props)
+        self.assertSequenceEqual([Cls.child.xq_descriptor], plan.child_props)
+        self.assertIsNone(plan.text_prop)
+        self.assertIsNone(plan.collector_prop)
+
+    def test_parse_events_uses_child_registered_later(self):
+        class Cls(xso.XSO):
+            TAG = (None, "foo")
+
+            child = xso.Child([])
+
+        class Child(xso.XSO):
+            TAG = (None, "bar")
+
+        Cls.register_child(Cls.child, Child)
+
+        gen = Cls.parse_events((None, "foo", {}), self.ctx)
+        next(gen)
+        gen.send(("start", None, "bar", {}))
+        gen.send(("end",))
+        with self.assertRaises(StopIteration) as ctx:
+            gen.send(("end",))
+
+        self.assertIsInstance(ctx.exception.value.child, Child)
+
 
 class TestCapturingXMLStreamClass(unittest.TestCase):
     def test_parse_events_uses_capture(self):
@@ -2725,6 +3003,43 @@ class TestText(XMLTestCase):
             ],
             dest.mock_calls)
 
+    def test_to_sax_uses_format_chunks(self):
+        type_ = unittest.mock.Mock()
+        type_.format_chunks.return_value = ["foo", "bar"]
+        instance = make_instance_mock()
+
+        prop = xso.Text(type_=type_)
+        prop._set_from_recv(instance, unittest.mock.sentinel.value)
+
+        dest = unittest.mock.MagicMock()
+        prop.to_sax(instance, dest)
+
+        type_.format_chunks.assert_called_once_with(
+            unittest.mock.sentinel.value
+        )
+        type_.format.assert_not_called()
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.characters("foo"),
+                unittest.mock.call.characters("bar"),
+            ],
+            dest.mock_calls)
+
+    def test_from_parser(self):
+        parser = unittest.mock.Mock()
+        instance = make_instance_mock()
+
+        prop = xso.Text(type_=xso.Base64Binary())
+        prop.from_parser(instance, parser)
+
+        parser.close.assert_called_once_with()
+        self.assertDictEqual(
+            {
+                prop: parser.close(),
+            },
+            instance._xso_contents
+        )
+
     def tearDown(self):
         del self.obja
         del self.objb
@@ -2973,6 +3288,217 @@ class TestChild(XMLTestCase):
         instance = Cls()
         instance.prop = None
 
+    def test_default_lazy_is_False(self):
+        prop = xso.Child([])
+        self.assertIs(prop.lazy, False)
+
+    def test_lazy_controllable_from_init(self):
+        prop = xso.Child([], lazy=True)
+        self.assertIs(prop.lazy, True)
+
+    def test_lazy_is_not_writable(self):
+        prop = xso.Child([], lazy=True)
+        with self.assertRaises(AttributeError):
+            prop.lazy = False
+
+    def _make_lazy_classes(self):
+        class ClsLeaf(xso.XSO):
+            TAG = "bar"
+
+            attr = xso.Attr("a")
+            text = xso.Text()
+
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            child = xso.Child([ClsLeaf], lazy=True)
+
+        return Cls, ClsLeaf
+
+    def test_lazy_does_not_parse_child_until_access(self):
+        Cls, ClsLeaf = self._make_lazy_classes()
+        obj = Cls()
+
+        with unittest.mock.patch.object(
+                ClsLeaf, "parse_events",
+                new=unittest.mock.Mock(
+                    wraps=ClsLeaf.parse_events)) as parse_events:
+            drive_from_events(
+                Cls.child.from_events, obj,
+                etree.fromstring("<bar a='x'>text<baz/></bar>"),
+                self.ctx,
+            )
+            parse_events.assert_not_called()
+
+            child = obj.child
+
+        parse_events.assert_called_once_with(
+            [None, "bar", {(None, "a"): "x"}],
+            unittest.mock.ANY,
+        )
+
+        self.assertIsInstance(child, ClsLeaf)
+        self.assertEqual(child.attr, "x")
+        self.assertEqual(child.text, "text")
+        self.assertIs(child, obj.child)
+
+    def test_lazy_to_sax_replays_untouched_child(self):
+        Cls, ClsLeaf = self._make_lazy_classes()
+        obj = Cls()
+
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar a='x' b='y'>text<baz/></bar>"),
+            self.ctx,
+        )
+
+        dest = unittest.mock.MagicMock()
+        with unittest.mock.patch.object(ClsLeaf, "parse_events") as \
+                parse_events:
+            Cls.child.to_sax(obj, dest)
+        parse_events.assert_not_called()
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    (None, "bar"), None,
+                    {(None, "a"): "x", (None, "b"): "y"}
+                ),
+                unittest.mock.call.characters("text"),
+                unittest.mock.call.startElementNS((None, "baz"), None, {}),
+                unittest.mock.call.endElementNS((None, "baz"), None),
+                unittest.mock.call.endElementNS((None, "bar"), None),
+            ],
+            dest.mock_calls
+        )
+
+    def test_lazy_to_sax_serialises_accessed_child(self):
+        Cls, ClsLeaf = self._make_lazy_classes()
+        obj = Cls()
+
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar a='x'>text<baz/></bar>"),
+            self.ctx,
+        )
+        obj.child.attr = "z"
+
+        dest = unittest.mock.MagicMock()
+        Cls.child.to_sax(obj, dest)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    (None, "bar"), None,
+                    {(None, "a"): "z"}
+                ),
+                unittest.mock.call.characters("text"),
+                unittest.mock.call.endElementNS((None, "bar"), None),
+            ],
+            dest.mock_calls
+        )
+
+    def test_lazy_defers_errors_to_access(self):
+        Cls, ClsLeaf = self._make_lazy_classes()
+        ClsLeaf.UNKNOWN_CHILD_POLICY = xso.UnknownChildPolicy.FAIL
+        obj = Cls()
+
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar a='x'><baz/></bar>"),
+            self.ctx,
+        )
+
+        obj.validate()
+
+        with self.assertRaisesRegex(ValueError, "unexpected child"):
+            obj.child
+
+    def test_lazy_wraps_other_errors_in_ValueError(self):
+        class FailingType(xso.AbstractCDataType):
+            def parse(self, value):
+                raise TypeError("foobar")
+
+        class ClsLeaf(xso.XSO):
+            TAG = "bar"
+
+            attr = xso.Attr("a", type_=FailingType())
+
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            child = xso.Child([ClsLeaf], lazy=True)
+
+        obj = Cls()
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar a='x'/>"),
+            self.ctx,
+        )
+
+        with self.assertRaisesRegex(ValueError, "foobar") as ctx:
+            obj.child
+
+        self.assertIsInstance(ctx.exception.__cause__, TypeError)
+
+        # the error is raised again on the next access
+        with self.assertRaisesRegex(ValueError, "foobar"):
+            obj.child
+
+    def test_lazy_passes_context_to_child(self):
+        class ClsLeaf(xso.XSO):
+            TAG = "bar"
+
+            lang = xso.LangAttr()
+
+        class Cls(xso.XSO):
+            TAG = "foo"
+
+            child = xso.Child([ClsLeaf], lazy=True)
+
+        obj = Cls()
+        self.ctx.lang = structs.LanguageTag.fromstr("de")
+
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar/>"),
+            self.ctx,
+        )
+
+        self.ctx.lang = structs.LanguageTag.fromstr("en")
+
+        self.assertEqual(
+            obj.child.lang,
+            structs.LanguageTag.fromstr("de"),
+        )
+
+    def test_lazy_shallow_copies_share_child(self):
+        Cls, ClsLeaf = self._make_lazy_classes()
+        obj = Cls()
+
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar a='x'/>"),
+            self.ctx,
+        )
+
+        obj_copy = copy.copy(obj)
+        self.assertIs(obj.child, obj_copy.child)
+
+    def test_lazy_deep_copies_do_not_share_child(self):
+        Cls, ClsLeaf = self._make_lazy_classes()
+        obj = Cls()
+
+        drive_from_events(
+            Cls.child.from_events, obj,
+            etree.fromstring("<bar a='x'/>"),
+            self.ctx,
+        )
+
+        obj_copy = copy.deepcopy(obj)
+        self.assertIsNot(obj.child, obj_copy.child)
+        self.assertEqual(obj_copy.child.attr, "x")
+
     def tearDown(self):
         del self.ClsA
         del self.ClsLeaf
@@ -3120,6 +3646,95 @@ class TestChildList(XMLTestCase):
             b_validate.mock_calls
         )
 
+    def test_default_lazy_is_False(self):
+        self.assertIs(self.prop.lazy, False)
+
+    def test_lazy_is_not_writable(self):
+        with self.assertRaises(AttributeError):
+            self.prop.lazy = True
+
+    def test_lazy_parses_all_children_on_access(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+            children = xso.ChildList([self.ClsLeafA, self.ClsLeafB],
+                                     lazy=True)
+
+        obj = Cls()
+        subtrees = [etree.Element(s) for s in ["bar", "baz", "bar"]]
+
+        with contextlib.ExitStack() as stack:
+            a_parse_events = stack.enter_context(unittest.mock.patch.object(
+                self.ClsLeafA, "parse_events",
+                new=unittest.mock.Mock(wraps=self.ClsLeafA.parse_events),
+            ))
+            b_parse_events = stack.enter_context(unittest.mock.patch.object(
+                self.ClsLeafB, "parse_events",
+                new=unittest.mock.Mock(wraps=self.ClsLeafB.parse_events),
+            ))
+
+            for subtree in subtrees:
+                drive_from_events(Cls.children.from_events, obj, subtree,
+                                  self.ctx)
+
+            obj.validate()
+
+            a_parse_events.assert_not_called()
+            b_parse_events.assert_not_called()
+
+            children = obj.children
+
+        self.assertEqual(a_parse_events.call_count, 2)
+        self.assertEqual(b_parse_events.call_count, 1)
+
+        self.assertIsInstance(children, xso_model.XSOList)
+        self.assertEqual(len(children), 3)
+        self.assertIsInstance(children[0], self.ClsLeafA)
+        self.assertIsInstance(children[1], self.ClsLeafB)
+        self.assertIsInstance(children[2], self.ClsLeafA)
+        self.assertIs(children, obj.children)
+
+    def test_lazy_to_sax_replays_untouched_children(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+            children = xso.ChildList([self.ClsLeafA, self.ClsLeafB],
+                                     lazy=True)
+
+        obj = Cls()
+        for subtree in [etree.fromstring("<bar x='1'/>"),
+                        etree.fromstring("<baz>text</baz>")]:
+            drive_from_events(Cls.children.from_events, obj, subtree,
+                              self.ctx)
+
+        dest = unittest.mock.MagicMock()
+        Cls.children.to_sax(obj, dest)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    (None, "bar"), None, {(None, "x"): "1"}
+                ),
+                unittest.mock.call.endElementNS((None, "bar"), None),
+                unittest.mock.call.startElementNS((None, "baz"), None, {}),
+                unittest.mock.call.characters("text"),
+                unittest.mock.call.endElementNS((None, "baz"), None),
+            ],
+            dest.mock_calls
+        )
+
+    def test_lazy_from_events_after_access_appends_object(self):
+        class Cls(xso.XSO):
+            TAG = "foo"
+            children = xso.ChildList([self.ClsLeafA], lazy=True)
+
+        obj = Cls()
+        self.assertSequenceEqual(obj.children, [])
+
+        drive_from_events(Cls.children.from_events, obj,
+                          etree.Element("bar"), self.ctx)
+
+        self.assertEqual(len(obj.children), 1)
+        self.assertIsInstance(obj.children[0], self.ClsLeafA)
+
     def tearDown(self):
         del self.ClsLeafB
         del self.ClsLeafA
@@ -5823,7 +6438,7 @@ class TestChildTextMap(unittest.TestCase):
 
 
 class TestXSOParser(XMLTestCase):
-    def run_parser(self, classes, tree):
+    def run_parser(self, classes, tree, **kwargs):
         results = []
 
         def catch_result(value):
@@ -5833,7 +6448,7 @@ class TestXSOParser(XMLTestCase):
         def fail_hard(*args):
             raise AssertionError("this should not be reached")
 
-        parser = xso.XSOParser()
+        parser = xso.XSOParser(**kwargs)
         for cls in classes:
             parser.add_class(cls, catch_result)
 
@@ -5845,8 +6460,8 @@ class TestXSOParser(XMLTestCase):
 
         return results
 
-    def run_parser_one(self, stanza_cls, tree):
-        results = self.run_parser(stanza_cls, tree)
+    def run_parser_one(self, stanza_cls, tree, **kwargs):
+        results = self.run_parser(stanza_cls, tree, **kwargs)
         self.assertEqual(1, len(results))
         return results[0]
 
@@ -6208,6 +6823,316 @@ class TestXSOParser(XMLTestCase):
             cb.mock_calls
         )
 
+    def _make_passthrough_classes(self):
+        class Payload(xso.XSO):
+            TAG = "uri:bar", "payload"
+            DECLARE_NS = {}
+
+            items = xso.Collector()
+
+        class Stanza(xso.XSO):
+            TAG = "uri:bar", "foo"
+            DECLARE_NS = {}
+
+            attr = xso.Attr("a", default=None)
+            text = xso.Text(default=None)
+            payload = xso.Child([Payload])
+
+        return Stanza, Payload
+
+    def _unparse(self, obj):
+        dest = unittest.mock.MagicMock()
+        obj.unparse_to_sax(dest)
+        return dest.mock_calls
+
+    def test_passthrough_defaults_to_false(self):
+        self.assertIs(xso.XSOParser().passthrough, False)
+
+    def test_passthrough_controllable_from_init(self):
+        self.assertIs(xso.XSOParser(passthrough=True).passthrough, True)
+
+    def test_passthrough_replays_events_of_unmodified_object(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring(
+            "<foo xmlns='uri:bar' a='x' unknown='y'>text"
+            "<payload><item xmlns='uri:baz'/></payload></foo>"
+        )
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        self.assertEqual(result.attr, "x")
+        self.assertEqual(result.text, "text")
+
+        with unittest.mock.patch.object(
+                Stanza.attr.xq_descriptor, "to_dict") as to_dict:
+            calls = self._unparse(result)
+        to_dict.assert_not_called()
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None,
+                    {(None, "a"): "x", (None, "unknown"): "y"},
+                ),
+                unittest.mock.call.characters("text"),
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "payload"), None, {},
+                ),
+                unittest.mock.call.startElementNS(
+                    ("uri:baz", "item"), None, {},
+                ),
+                unittest.mock.call.endElementNS(("uri:baz", "item"), None),
+                unittest.mock.call.endElementNS(("uri:bar", "payload"), None),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            calls
+        )
+
+    def test_passthrough_is_disabled_by_default(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring("<foo xmlns='uri:bar' a='x' unknown='y'/>")
+        result = self.run_parser_one([Stanza], tree)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None,
+                    {(None, "a"): "x"},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_passthrough_dropped_on_assignment(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring("<foo xmlns='uri:bar' a='x' unknown='y'/>")
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        result.attr = "z"
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None,
+                    {(None, "a"): "z"},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_passthrough_dropped_on_deletion(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring("<foo xmlns='uri:bar' a='x' unknown='y'/>")
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        del result.attr
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None, {},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_passthrough_dropped_on_child_access(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring(
+            "<foo xmlns='uri:bar' unknown='y'>"
+            "<payload><item xmlns='uri:baz'/></payload></foo>"
+        )
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        result.payload.items.clear()
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None, {},
+                ),
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "payload"), None, {},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "payload"), None),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_passthrough_kept_on_child_read(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring(
+            "<foo xmlns='uri:bar' unknown='y'>"
+            "<payload><item xmlns='uri:baz'/></payload></foo>"
+        )
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        expected = self._unparse(result)
+        self.assertIsInstance(result.payload, Payload)
+
+        self.assertSequenceEqual(expected, self._unparse(result))
+        self.assertIn(
+            unittest.mock.call.startElementNS(
+                ("uri:bar", "foo"), None, {(None, "unknown"): "y"},
+            ),
+            expected,
+        )
+
+    def test_passthrough_dropped_on_modification_of_child(self):
+        class Payload(xso.XSO):
+            TAG = "uri:bar", "payload"
+            DECLARE_NS = {}
+
+            attr = xso.Attr("a", default=None)
+
+        class Stanza(xso.XSO):
+            TAG = "uri:bar", "foo"
+            DECLARE_NS = {}
+
+            payload = xso.Child([Payload])
+
+        tree = etree.fromstring(
+            "<foo xmlns='uri:bar' unknown='y'><payload a='x'/></foo>"
+        )
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        payload = result.payload
+        payload.attr = "z"
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None, {},
+                ),
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "payload"), None, {(None, "a"): "z"},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "payload"), None),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_passthrough_includes_inherited_lang(self):
+        class Stanza(xso.XSO):
+            TAG = "uri:bar", "foo"
+            DECLARE_NS = {}
+
+            lang = xso.LangAttr()
+
+        class LangContext(xso_model.Context):
+            def __init__(self):
+                super().__init__()
+                self.lang = structs.LanguageTag.fromstr("de-DE")
+
+        tree = etree.fromstring("<foo xmlns='uri:bar' unknown='y'/>")
+        with unittest.mock.patch("aioxmpp.xso.model.Context", LangContext):
+            result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        self.assertEqual(result.lang, structs.LanguageTag.fromstr("de-DE"))
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None,
+                    {
+                        (None, "unknown"): "y",
+                        (namespaces.xml, "lang"): "de-DE",
+                    },
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_passthrough_not_replayed_by_copy(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring("<foo xmlns='uri:bar' a='x' unknown='y'/>")
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        expected = self._unparse(result)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None,
+                    {(None, "a"): "x"},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(copy.copy(result))
+        )
+        self.assertSequenceEqual(expected,
+                                 self._unparse(copy.deepcopy(result)))
+
+        result_copy = copy.copy(result)
+        result_copy.attr = "z"
+        self.assertSequenceEqual(expected, self._unparse(result))
+
+    def test_passthrough_dropped_on_modification_through_copy(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring(
+            "<foo xmlns='uri:bar' unknown='y'>"
+            "<payload><item xmlns='uri:baz'/></payload></foo>"
+        )
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        result_copy = copy.copy(result)
+        self.assertIs(result_copy.payload, result.payload)
+        result_copy.payload.items.clear()
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None, {},
+                ),
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "payload"), None, {},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "payload"), None),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+            ],
+            self._unparse(result)
+        )
+
+    def test_deepcopy_of_passthrough_is_independent(self):
+        Stanza, Payload = self._make_passthrough_classes()
+        tree = etree.fromstring(
+            "<foo xmlns='uri:bar' unknown='y'>"
+            "<payload><item xmlns='uri:baz'/></payload></foo>"
+        )
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+        expected = self._unparse(result)
+        # link the child to the original
+        result.payload
+
+        result_copy = copy.deepcopy(result)
+        result_copy.payload.items.clear()
+
+        self.assertSequenceEqual(expected, self._unparse(result))
+
+    def test_passthrough_declares_namespaces(self):
+        class Stanza(xso.XSO):
+            TAG = "uri:bar", "foo"
+            DECLARE_NS = {None: "uri:bar"}
+
+        tree = etree.fromstring("<foo xmlns='uri:bar'/>")
+        result = self.run_parser_one([Stanza], tree, passthrough=True)
+
+        self.assertSequenceEqual(
+            [
+                unittest.mock.call.startPrefixMapping(None, "uri:bar"),
+                unittest.mock.call.startElementNS(
+                    ("uri:bar", "foo"), None, {},
+                ),
+                unittest.mock.call.endElementNS(("uri:bar", "foo"), None),
+                unittest.mock.call.endPrefixMapping(None),
+            ],
+            self._unparse(result)
+        )
+
 
 class TestContext(unittest.TestCase):
     def setUp(self):
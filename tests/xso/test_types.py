@@ -26,6 +26,7 @@ import fractions
 import inspect
 import ipaddress
 import itertools
+import random
 import unittest
 import unittest.mock
 import warnings
@@ -422,6 +423,36 @@ class TestBoolType(unittest.TestCase):
         mock.__bool__.assert_called_once_with()
 
 
+def _random_datetime(rng):
+    dt = datetime(
+        rng.randint(1000, 9999),
+        rng.randint(1, 12),
+        rng.randint(1, 28),
+        rng.randint(0, 23),
+        rng.randint(0, 59),
+        rng.randint(0, 59),
+        rng.choice([0, rng.randint(0, 999999), rng.randint(0, 999) * 1000]),
+    )
+    return dt
+
+
+def _random_timestamp(rng):
+    dt = _random_datetime(rng)
+    result = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(
+        dt.year, dt.month, dt.day, dt.hour, dt.minute, dt.second,
+    )
+    if rng.randint(0, 1):
+        result += "." + "".join(
+            str(rng.randint(0, 9)) for i in range(rng.randint(1, 6))
+        )
+    result += rng.choice([
+        "",
+        "Z",
+        "{:+03d}:{:02d}".format(rng.randint(-14, 14), rng.randint(0, 59)),
+    ])
+    return result
+
+
 class TestDateTimeType(unittest.TestCase):
     def test_is_cdata_type(self):
         self.assertIsInstance(
@@ -562,6 +593,88 @@ class TestDateTimeType(unittest.TestCase):
             t.coerce(dt)
         )
 
+    def test_parse_matches_strptime_implementation(self):
+        rng = random.Random(1)
+        t = xso.DateTime()
+        for i in range(2000):
+            value = _random_timestamp(rng)
+            self.assertEqual(
+                t.parse(value),
+                t._parse_slow(value),
+                value,
+            )
+
+    def test_parse_matches_strptime_implementation_for_legacy(self):
+        rng = random.Random(1)
+        t = xso.DateTime()
+        for i in range(2000):
+            dt = _random_datetime(rng)
+            value = dt.strftime("%Y%m%dT%H:%M:%S") + rng.choice(
+                ["", "Z", "+01:00"]
+            )
+            parsed = t.parse(value)
+            self.assertEqual(parsed, t._parse_slow(value), value)
+            self.assertEqual(
+                parsed,
+                dt.replace(microsecond=0, tzinfo=pytz.utc),
+                value,
+            )
+
+    def test_parse_uses_strptime_for_non_canonical_input(self):
+        t = xso.DateTime()
+        for value in ["2014-1-26T19:40:10Z",
+                      " 2014-01-26T19:40:10.1+01:00\n",
+                      "2014-01-26T9:40:10"]:
+            self.assertEqual(t.parse(value), t._parse_slow(value.strip()))
+
+    def test_parse_rejects_invalid_values(self):
+        t = xso.DateTime()
+        for value in ["2014-13-26T19:40:10Z",
+                      "2014-02-30T19:40:10Z",
+                      "2014-01-26T24:40:10Z",
+                      "2014-01-26T19:40:60Z",
+                      "2014-01-26T19:40:10.1234567Z",
+                      "20141326T19:40:10"]:
+            with self.assertRaises(ValueError, msg=value):
+                t.parse(value)
+
+    def test_format_matches_strftime_implementation(self):
+        rng = random.Random(1)
+        tz = pytz.timezone("Europe/Berlin")
+        for legacy in [False, True]:
+            t = xso.DateTime(legacy=legacy)
+            for i in range(2000):
+                dt = _random_datetime(rng)
+                dt = rng.choice([
+                    dt,
+                    dt.replace(tzinfo=pytz.utc),
+                    tz.localize(dt),
+                ])
+                self.assertEqual(t.format(dt), t._format_slow(dt), dt)
+
+    def test_format_small_years_like_strftime(self):
+        t = xso.DateTime()
+        dt = datetime(999, 1, 1, tzinfo=pytz.utc)
+        self.assertEqual(t.format(dt), t._format_slow(dt))
+
+    def test_roundtrip(self):
+        rng = random.Random(1)
+        tz = pytz.timezone("Europe/Berlin")
+        t = xso.DateTime()
+        for i in range(2000):
+            dt = _random_datetime(rng)
+            self.assertEqual(t.parse(t.format(dt)), dt)
+            dt = tz.localize(dt)
+            self.assertEqual(t.parse(t.format(dt)), dt)
+
+    def test_roundtrip_legacy(self):
+        rng = random.Random(1)
+        t = xso.DateTime(legacy=True)
+        for i in range(2000):
+            dt = _random_datetime(rng).replace(microsecond=0,
+                                               tzinfo=pytz.utc)
+            self.assertEqual(t.parse(t.format(dt)), dt)
+
 
 class TestDate(unittest.TestCase):
     def test_is_cdata_type(self):
@@ -602,6 +715,23 @@ class TestDate(unittest.TestCase):
         v = datetime.utcnow().date()
         self.assertEqual(t.coerce(v), v)
 
+    def test_roundtrip(self):
+        rng = random.Random(1)
+        t = xso.Date()
+        for i in range(2000):
+            d = _random_datetime(rng).date()
+            self.assertEqual(t.parse(t.format(d)), d)
+
+    def test_parse_uses_strptime_for_non_canonical_input(self):
+        t = xso.Date()
+        self.assertEqual(t.parse("1776-7-4"), date(1776, 7, 4))
+
+    def test_parse_rejects_invalid_values(self):
+        t = xso.Date()
+        for value in ["1776-13-04", "1776-02-30", "1776-07-04T00:00:00"]:
+            with self.assertRaises(ValueError, msg=value):
+                t.parse(value)
+
 
 class TestTime(unittest.TestCase):
     def test_is_cdata_type(self):
@@ -668,6 +798,32 @@ class TestTime(unittest.TestCase):
             t.format(time(19, 40, 10, 123400))
         )
 
+    def test_parse_matches_strptime_implementation(self):
+        rng = random.Random(1)
+        t = xso.Time()
+        for i in range(2000):
+            value = _random_timestamp(rng).partition("T")[2]
+            self.assertEqual(
+                t.parse(value),
+                t._parse_slow(value),
+                value,
+            )
+
+    def test_roundtrip(self):
+        rng = random.Random(1)
+        t = xso.Time()
+        for i in range(2000):
+            v = _random_datetime(rng).time()
+            v = rng.choice([v, v.replace(tzinfo=pytz.utc)])
+            self.assertEqual(t.parse(t.format(v)), v)
+            self.assertEqual(
+                t.format(v),
+                v.strftime("%H:%M:%S") + (
+                    ".{:06d}".format(v.microsecond).rstrip("0")
+                    if v.microsecond else ""
+                ) + ("Z" if v.tzinfo else ""),
+            )
+
     def test_coerce_rejects_non_utc_timezone(self):
         t = xso.Time()
         with self.assertRaisesRegex(
@@ -799,6 +955,91 @@ class TestBase64Binary(unittest.TestCase):
             t.coerce(value)
         )
 
+    def test_parse_rejects_values_exceeding_max_size(self):
+        t = xso.Base64Binary(max_size=4)
+        self.assertEqual(t.parse("Zm5vcg=="), b"fnor")
+        with self.assertRaisesRegex(ValueError, "exceeds maximum size"):
+            t.parse("Zm5vcmQ=")
+
+    def _parse_incrementally(self, t, value, rng):
+        parser = t.incremental_parser()
+        while value:
+            n = rng.randint(1, 10)
+            parser.feed(value[:n])
+            value = value[n:]
+        return parser.close()
+
+    def test_incremental_parser_matches_parse(self):
+        rng = random.Random(1)
+        t = xso.Base64Binary()
+        for i in range(500):
+            data = bytes(rng.getrandbits(8)
+                         for j in range(rng.randint(0, 100)))
+            value = t.format(data)
+            value = "".join(
+                c + rng.choice(["", "", "", "\n", " ", "\t"])
+                for c in value
+            )
+            self.assertEqual(
+                self._parse_incrementally(t, value, rng),
+                t.parse(value),
+            )
+
+    def test_incremental_parser_matches_parse_for_irregular_values(self):
+        rng = random.Random(1)
+        t = xso.Base64Binary()
+        for value in ["=", "QQ==QQ==", "QQ==\nQUFB", "Zm5v\x00cmQ=",
+                      "Zm5vcm"]:
+            for i in range(10):
+                try:
+                    expected = t.parse(value)
+                except ValueError as exc:
+                    with self.assertRaises(type(exc)):
+                        self._parse_incrementally(t, value, rng)
+                else:
+                    self.assertEqual(
+                        self._parse_incrementally(t, value, rng),
+                        expected,
+                        value,
+                    )
+
+    def test_incremental_parser_rejects_non_ascii(self):
+        t = xso.Base64Binary()
+        parser = t.incremental_parser()
+        with self.assertRaises(ValueError):
+            parser.feed("Zm5vcmQ=ä")
+
+    def test_incremental_parser_rejects_values_exceeding_max_size_early(self):
+        t = xso.Base64Binary(max_size=1024)
+        parser = t.incremental_parser()
+        parser.feed(t.format(b"x" * 1023))
+        with self.assertRaisesRegex(ValueError, "exceeds maximum size"):
+            parser.feed(t.format(b"x" * 3))
+
+    def test_incremental_parser_rejects_data_after_padding_exceeding_max_size(
+            self):
+        t = xso.Base64Binary(max_size=1024)
+        parser = t.incremental_parser()
+        parser.feed("QQ==")
+        with self.assertRaisesRegex(ValueError, "exceeds maximum size"):
+            parser.feed("QUFB" * 400)
+
+    def test_no_incremental_parsing_with_empty_as_equal(self):
+        t = xso.Base64Binary(empty_as_equal=True)
+        self.assertIsNone(t.incremental_parser)
+        self.assertIsNone(t.format_chunks)
+
+    def test_format_chunks(self):
+        t = xso.Base64Binary()
+        data = bytes(range(256)) * 1000
+        chunks = list(t.format_chunks(data))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), t.format(data))
+
+    def test_format_chunks_of_empty_value(self):
+        t = xso.Base64Binary()
+        self.assertEqual("".join(t.format_chunks(b"")), t.format(b""))
+
 
 class TestHexBinary(unittest.TestCase):
     def test_is_cdata_type(self):
@@ -861,6 +1102,51 @@ class TestHexBinary(unittest.TestCase):
             t.coerce(value)
         )
 
+    def test_parse_rejects_values_exceeding_max_size(self):
+        t = xso.HexBinary(max_size=4)
+        self.assertEqual(t.parse("666e6f72"), b"fnor")
+        with self.assertRaisesRegex(ValueError, "exceeds maximum size"):
+            t.parse("666e6f7264")
+
+    def test_incremental_parser_matches_parse(self):
+        rng = random.Random(1)
+        t = xso.HexBinary()
+        for i in range(500):
+            data = bytes(rng.getrandbits(8)
+                         for j in range(rng.randint(0, 100)))
+            value = t.format(data)
+            parser = t.incremental_parser()
+            while value:
+                n = rng.randint(1, 10)
+                parser.feed(value[:n])
+                value = value[n:]
+            self.assertEqual(parser.close(), data)
+
+    def test_incremental_parser_rejects_invalid_values(self):
+        t = xso.HexBinary()
+        parser = t.incremental_parser()
+        with self.assertRaises(ValueError):
+            parser.feed("66xx")
+
+        parser = t.incremental_parser()
+        parser.feed("666")
+        with self.assertRaises(ValueError):
+            parser.close()
+
+    def test_incremental_parser_rejects_values_exceeding_max_size_early(self):
+        t = xso.HexBinary(max_size=1024)
+        parser = t.incremental_parser()
+        parser.feed("00" * 1024)
+        with self.assertRaisesRegex(ValueError, "exceeds maximum size"):
+            parser.feed("00")
+
+    def test_format_chunks(self):
+        t = xso.HexBinary()
+        data = bytes(range(256)) * 1000
+        chunks = list(t.format_chunks(data))
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual("".join(chunks), t.format(data))
+
 
 class TestJID(unittest.TestCase):
     def test_is_cdata_type(self):
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+########################################################################
+# File name: caps_dir_to_file.py
+# This file is part of: aioxmpp
+#
+# LICENSE
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or (at
+# your option) any later version.
+#
+# This program is distributed in the hope that it will be useful, but
+# WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+# General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+########################################################################
+import argparse
+import pathlib
+
+import aioxmpp.entitycaps
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert a directory based entity capabilities database "
+        "into a single file database."
+    )
+    parser.add_argument(
+        "source",
+        type=pathlib.Path,
+        metavar="DIRECTORY",
+        help="Root directory of the database to convert"
+    )
+    parser.add_argument(
+        "dest",
+        type=pathlib.Path,
+        metavar="FILE",
+        help="Database file to add the entries to (created if needed)"
+    )
+
+    args = parser.parse_args()
+
+    db = aioxmpp.entitycaps.SingleFileDatabase(args.dest)
+    count = db.import_directory(args.source)
+    db.compact()
+    db.close()
+
+    print("imported {} entries".format(count))
+
+
+if __name__ == "__main__":
+    main()